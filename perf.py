@@ -1,4 +0,0 @@
-# from pycodetags import PureDataSchema
-# from pycodetags.__main__ import source_and_modules_searcher
-#
-# source_and_modules_searcher("validate", [""], ["c:\\github"], PureDataSchema)
@@ -4,9 +4,9 @@ A module for calculating health metrics based on TODO items.
 
 from __future__ import annotations
 
-from collections import defaultdict
 from typing import Any
 
+from pycodetags.data_tags.tag_table import TagTable
 from pycodetags_issue_tracker.schema.issue_tracker_classes import TODO
 
 
@@ -37,6 +37,8 @@ class HealthOMeter:
         self.todos = todos
         # Cache the total number of TODOs to avoid repeated recalculations
         self.total_todos_count = len(todos)
+        # Per-file and per-tag counts are read off the columnar table rather than recounted per metric.
+        self.table = TagTable.of(todos)
 
     def calculate_todos_per_file(self) -> dict[str, int]:
         """
@@ -48,11 +50,7 @@ class HealthOMeter:
         Returns:
             A dictionary mapping file paths to the count of TODOs in them.
         """
-        todos_per_file: dict[str, int] = defaultdict(int)
-        for todo in self.todos:
-            if todo.file_path:
-                todos_per_file[todo.file_path] += 1
-        return dict(todos_per_file)
+        return {file_path: count for file_path, count in self.table.counts("file_path").items() if file_path}
 
     def calculate_total_dones(self) -> int:
         """
@@ -90,10 +88,10 @@ class HealthOMeter:
             return 1.0
 
         raw_sentiment_sum = 0
-        for todo in self.todos:
+        for code_tag, count in self.table.counts("code_tag").items():
             # Check if the code_tag exists and is in our sentiment mapping
-            if todo.code_tag and todo.code_tag.upper() in self.SENTIMENT_SCORES_PER_TAG:
-                raw_sentiment_sum += self.SENTIMENT_SCORES_PER_TAG[todo.code_tag.upper()]
+            if code_tag and code_tag.upper() in self.SENTIMENT_SCORES_PER_TAG:
+                raw_sentiment_sum += self.SENTIMENT_SCORES_PER_TAG[code_tag.upper()] * count
 
         # Determine the min and max possible sentiment sums for normalization
         max_score_per_todo = max(self.SENTIMENT_SCORES_PER_TAG.values())
@@ -123,7 +121,7 @@ class HealthOMeter:
         if self.total_todos_count == 0:
             return 1.0
 
-        total_bugs = sum(1 for todo in self.todos if todo.code_tag and todo.code_tag.upper() == "BUG")
+        total_bugs = self._count_bugs()
         # Quality decreases with more bugs. Scale from 1.0 (no bugs) to 0.0 (all todos are bugs, worst case).
         return max(0.0, (self.total_todos_count - total_bugs) / self.total_todos_count)
 
@@ -142,9 +140,16 @@ class HealthOMeter:
         if self.total_todos_count == 0:
             return 0.0  # No bugs if no todos
 
-        total_bugs = sum(1 for todo in self.todos if todo.code_tag and todo.code_tag.upper() == "BUG")
+        total_bugs = self._count_bugs()
         return total_bugs / self.total_todos_count
 
+    def _count_bugs(self) -> int:
+        return sum(
+            count
+            for code_tag, count in self.table.counts("code_tag").items()
+            if code_tag and code_tag.upper() == "BUG"
+        )
+
     def get_total_todos_scale(self, total_todos_value: int) -> str:
         """Provides a descriptive scale for the total number of TODOs."""
         if total_todos_value == 0:
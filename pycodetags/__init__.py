@@ -6,6 +6,8 @@ Only the strongly typed decorators, exceptions and context managers are exported
 Everything else is a plugin.
 """
 
+from __future__ import annotations
+
 __all__ = [
     # Data tag support
     "DATA",
@@ -28,21 +30,87 @@ __all__ = [
     # Interactive use
     "inspect_file",
     "list_available_schemas",
+    # Library use
+    "scan",
+    "ScanStats",
 ]
 
-from pycodetags.app_config import CodeTagsConfig
-from pycodetags.common_interfaces import (
-    dump,
-    dump_all,
-    dumps,
-    dumps_all,
-    inspect_file,
-    list_available_schemas,
-    load,
-    load_all,
-    loads,
-    loads_all,
-)
-from pycodetags.data_tags import DATA, DataTag, DataTagSchema
-from pycodetags.plugin_specs import CodeTagsSpec
-from pycodetags.pure_data_schema import PureDataSchema
+import importlib
+import os
+from collections.abc import Iterable, Iterator, Sequence
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from pycodetags.app_config import CodeTagsConfig
+    from pycodetags.common_interfaces import (
+        dump,
+        dump_all,
+        dumps,
+        dumps_all,
+        inspect_file,
+        list_available_schemas,
+        load,
+        load_all,
+        loads,
+        loads_all,
+    )
+    from pycodetags.data_tags import DATA, DataTag, DataTagSchema
+    from pycodetags.plugin_specs import CodeTagsSpec
+    from pycodetags.pure_data_schema import PureDataSchema
+    from pycodetags.scan_stats import ScanStats
+
+# Exports are imported on first use, so `import pycodetags` (and every CLI start) stays cheap: pluggy,
+# the parsers and the config loader are only loaded by the code that needs them.
+_LAZY_EXPORTS = {
+    "DATA": "pycodetags.data_tags",
+    "DataTag": "pycodetags.data_tags",
+    "DataTagSchema": "pycodetags.data_tags",
+    "PureDataSchema": "pycodetags.pure_data_schema",
+    "dumps": "pycodetags.common_interfaces",
+    "dump": "pycodetags.common_interfaces",
+    "dump_all": "pycodetags.common_interfaces",
+    "dumps_all": "pycodetags.common_interfaces",
+    "loads": "pycodetags.common_interfaces",
+    "load": "pycodetags.common_interfaces",
+    "load_all": "pycodetags.common_interfaces",
+    "loads_all": "pycodetags.common_interfaces",
+    "CodeTagsSpec": "pycodetags.plugin_specs",
+    "CodeTagsConfig": "pycodetags.app_config",
+    "inspect_file": "pycodetags.common_interfaces",
+    "list_available_schemas": "pycodetags.common_interfaces",
+    "ScanStats": "pycodetags.scan_stats",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
+
+
+def scan(
+    paths: str | os.PathLike[str] | Iterable[str | os.PathLike[str]],
+    schemas: Sequence[DataTagSchema] | None = None,
+    include_folk_tags: bool | None = None,
+    jobs: int | None = None,
+    prefilter: bool | None = None,
+    use_index: bool | None = None,
+    batch_size: int = 64,
+    stats: ScanStats | None = None,
+) -> Iterator[DATA]:
+    """
+    Scan source files and folders, yielding tags file by file in bounded memory.
+
+    See :func:`pycodetags.aggregate.scan`.
+    """
+    # Imported here so `import pycodetags` does not load the walker, parsers and worker pools.
+    from pycodetags.aggregate import scan as _scan
+
+    return _scan(paths, schemas, include_folk_tags, jobs, prefilter, use_index, batch_size, stats)
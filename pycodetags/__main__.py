@@ -7,24 +7,44 @@ from __future__ import annotations
 import argparse
 import logging
 import logging.config
+import os
 import sys
-from collections.abc import Sequence
+import time
+from collections.abc import Iterable, Sequence
+from typing import TYPE_CHECKING
 
 import pluggy
 
 import pycodetags.__about__ as __about__
 import pycodetags.pure_data_schema as pure_data_schema
-from pycodetags.aggregate import aggregate_all_kinds_multiple_input
+from pycodetags.aggregate import aggregate_all_kinds_multiple_input, iter_aggregate_by_file
 from pycodetags.app_config.config import CodeTagsConfig, get_code_tags_config
 from pycodetags.app_config.config_init import init_pycodetags_config
 from pycodetags.data_tags.data_tags_classes import DATA
 from pycodetags.data_tags.data_tags_schema import DataTagSchema
+from pycodetags.data_tags.tag_record import LazyDataList
 from pycodetags.exceptions import CommentNotFoundError
 from pycodetags.filters import InvalidJMESPathFilter, filter_data_by_expression
 from pycodetags.logging_config import generate_config
 from pycodetags.plugin_manager import get_plugin_manager, plugin_currently_loaded
+from pycodetags.profiling import Profiler, span
+from pycodetags.report_writer import INTERNAL_VIEWS, parse_formats, report_file_name, write_reports
+from pycodetags.scan_session import ScanSession
+from pycodetags.scan_stats import ScanStats
 from pycodetags.utils import load_dotenv
-from pycodetags.views import print_html, print_json, print_summary, print_text, print_validate
+from pycodetags.views import (
+    print_html,
+    print_json,
+    print_jsonl,
+    print_summary,
+    print_text,
+    print_validate,
+    write_jsonl,
+)
+
+if TYPE_CHECKING:
+    from pycodetags.hook_stats import HookStats
+    from pycodetags.memory_profiling import MemoryProfiler
 
 
 class InternalViews:
@@ -54,6 +74,9 @@ class InternalViews:
         if format_name == "summary":
             print_summary(found_data)
             return True
+        if format_name == "jsonl":
+            print_jsonl(found_data)
+            return True
         return False
 
 
@@ -64,11 +87,58 @@ def main(argv: Sequence[str] | None = None) -> int:
     Args:
         argv (Sequence[str] | None): Command line arguments. If None, uses sys.argv.
     """
+    started_ns = time.perf_counter_ns()
     pm = get_plugin_manager()
 
-    pm.register(InternalViews())
+    # main() can run several times in one process (tests, embedding); register the built-in views once,
+    # or every report would be printed once per call so far.
+    if not pm.has_plugin(INTERNAL_VIEWS):
+        pm.register(InternalViews(), name=INTERNAL_VIEWS)
     # --- end pluggy setup ---
 
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if not hook_stats_requested(argv):
+        return parse_and_run(argv, pm, started_ns)
+
+    # Imported here: hook timing is opt-in. It starts before the command line is parsed, so the hooks that
+    # build the parser are counted too.
+    from pycodetags.hook_stats import HookStats
+
+    hook_stats = HookStats()
+    with hook_stats.monitor(pm):
+        return parse_and_run(argv, pm, started_ns, hook_stats)
+
+
+def hook_stats_requested(argv: Sequence[str]) -> bool:
+    """
+    Whether the command line asks for plugin hook timing: ``--profile``, or ``plugin-info --stats``.
+
+    >>> hook_stats_requested(["plugin-info", "--stats"]), hook_stats_requested(["data", "--src", "."])
+    (True, False)
+    """
+    if "--profile" in argv:
+        return True
+    return "plugin-info" in argv and "--stats" in argv
+
+
+def parse_and_run(
+    argv: Sequence[str],
+    pm: pluggy.PluginManager,
+    started_ns: int,
+    hook_stats: HookStats | None = None,
+) -> int:
+    """
+    Build the command line parser, with the plugins' formats and commands, parse ``argv`` and run it.
+
+    Args:
+        argv (Sequence[str]): Command line arguments.
+        pm (pluggy.PluginManager): The plugin manager.
+        started_ns (int): ``time.perf_counter_ns()`` when the CLI started, for ``--profile``.
+        hook_stats (HookStats | None): Counting plugin hook calls, when asked for.
+
+    Returns:
+        int: The exit code.
+    """
     parser = argparse.ArgumentParser(
         description=f"{__about__.__description__} (v{__about__.__version__})",
         epilog="Install pycodetags-issue-tracker plugin for TODO tags. ",
@@ -82,6 +152,7 @@ def main(argv: Sequence[str] | None = None) -> int:
     base_parser.add_argument("--validate", action="store_true", help="Validate all the items found")
 
     base_parser.add_argument("--filter", help="JMESPath filter expression")
+    add_jobs_switch(base_parser)
 
     # Create subparsers for commands
     subparsers = parser.add_subparsers(dest="command", help="Available commands")
@@ -96,23 +167,46 @@ def main(argv: Sequence[str] | None = None) -> int:
     report_parser.add_argument("--src", action="append", help="file or folder of source code")
 
     report_parser.add_argument("--output", help="destination file or folder")
+    report_parser.add_argument(
+        "--output-dir", help="folder to write one report file per --format into (same as a folder --output)"
+    )
+    report_parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="print what the scan did to stderr: files walked, skipped, parsed, cached, failed; tags; stage times",
+    )
+    report_parser.add_argument("--stats-json", metavar="FILE", help="write the --stats counts as JSON")
 
     extra_supported_formats = []
     for result in pm.hook.print_report_style_name():
         extra_supported_formats.extend(result)
 
-    supported_formats = list(set(["text", "html", "json", "summary"] + extra_supported_formats))
+    supported_formats = list(set(["text", "html", "json", "jsonl", "summary"] + extra_supported_formats))
+
+    def format_list(value: str) -> list[str]:
+        try:
+            return parse_formats(value, supported_formats)
+        except ValueError as ve:
+            raise argparse.ArgumentTypeError(str(ve)) from ve
 
     report_parser.add_argument(
         "--format",
-        choices=supported_formats,
-        default="text",
-        help="Output format for the report.",
+        type=format_list,
+        default=["text"],
+        metavar="FORMAT[,FORMAT...]",
+        help=f"Output format(s) for the report, comma separated: {', '.join(sorted(supported_formats))}.",
     )
 
-    _plugin_info_parser = subparsers.add_parser(
+    plugin_info_parser = subparsers.add_parser(
         "plugin-info", parents=[base_parser], help="Display information about loaded plugins"
     )
+    plugin_info_parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="Also show calls and time per plugin hook; scans --src/--module (or configured sources) to measure",
+    )
+    plugin_info_parser.add_argument("--module", action="append", help="Python module to scan for --stats")
+    plugin_info_parser.add_argument("--src", action="append", help="file or folder of source code to scan for --stats")
 
     # 'id' command: lazily assign stable local ids (id=N) to data tags.
     id_parser = subparsers.add_parser(
@@ -122,7 +216,7 @@ def main(argv: Sequence[str] | None = None) -> int:
         description=(
             "Scan source for data tags and assign a stable local id to any tag that has neither an "
             "id nor a tracker issue. Ids come from the per-project .pycodetags_ids counter (commit it). "
-            "This is a full O(files) scan; an incremental index is on the roadmap."
+            "Unchanged files are answered from the incremental scan index."
         ),
     )
     id_parser.add_argument("paths", nargs="*", help="Files or folders to scan (defaults to config src)")
@@ -133,6 +227,35 @@ def main(argv: Sequence[str] | None = None) -> int:
         help="Exit nonzero if any tag is missing an id (for CI / pre-commit). Assigns nothing.",
     )
 
+    # 'index' command: build or refresh the incremental scan index.
+    index_parser = subparsers.add_parser(
+        "index",
+        parents=[base_parser],
+        help="Build or refresh the incremental scan index",
+        description=(
+            "Parse changed files and record the results in .pycodetags_cache/index, so later scans only "
+            "re-parse what changed. Entries for deleted files are removed."
+        ),
+    )
+    index_parser.add_argument("paths", nargs="*", help="Files or folders to index (defaults to config src)")
+    index_parser.add_argument(
+        "--clear", action="store_true", help="Delete the index and parse cache first and rebuild them"
+    )
+
+    # 'cache' command: inspect and maintain .pycodetags_cache.
+    cache_parser = subparsers.add_parser(
+        "cache",
+        parents=[base_parser],
+        help="Show cache statistics, or clear, prune or verify the cache",
+        description=(
+            "stats: entries held and per-function hit/miss counts accumulated across runs. "
+            "clear: delete everything in .pycodetags_cache. prune: drop expired and over-budget entries. "
+            "verify: decode every entry and remove broken ones (exit 1 if a store is damaged)."
+        ),
+    )
+    cache_parser.add_argument("action", choices=["stats", "clear", "prune", "verify"], help="What to do")
+    cache_parser.add_argument("--json", action="store_true", help="Print the result as JSON")
+
     # Allow plugins to add their own subparsers
     new_subparsers = pm.hook.add_cli_subcommands(subparsers=subparsers)
     # Hack because we don't want plugins to have to wire up the basic stuff
@@ -141,6 +264,7 @@ def main(argv: Sequence[str] | None = None) -> int:
         # validate switch
         new_subparser.add_argument("--validate", action="store_true", help="Validate all the items found")
         new_subparser.add_argument("--filter", help="JMESPath filter")
+        add_jobs_switch(new_subparser)
 
     args = parser.parse_args(args=argv)
 
@@ -167,6 +291,62 @@ def main(argv: Sequence[str] | None = None) -> int:
         config = generate_config(level="FATAL", enable_bug_trail=bug_trail)
         logging.config.dictConfig(config)
 
+    memory_profile = getattr(args, "memory_profile", False) or getattr(args, "memory_profile_out", None)
+    if not (getattr(args, "profile", False) or getattr(args, "trace_out", None) or memory_profile):
+        return run_command(args, parser, pm, code_tags_config, hook_stats)
+
+    # Whether to profile is only known once the command line is parsed; count the setup so far as a stage.
+    profiler: Profiler
+    memory_profiler: MemoryProfiler | None = None
+    if memory_profile:
+        # Imported here: tracemalloc is only needed for --memory-profile.
+        from pycodetags.memory_profiling import MemoryProfiler
+
+        profiler = memory_profiler = MemoryProfiler(
+            started_ns=started_ns, record_spans=bool(args.profile or args.trace_out)
+        )
+    else:
+        profiler = Profiler(started_ns=started_ns)
+    profiler.add_span("cli setup", started_ns, time.perf_counter_ns())
+    try:
+        with profiler.activate():
+            return run_command(args, parser, pm, code_tags_config, hook_stats)
+    finally:
+        if args.profile:
+            print(profiler.report(top_files=args.profile_files), file=sys.stderr)
+            if hook_stats is not None:
+                print(hook_stats.report(), file=sys.stderr)
+        if args.trace_out:
+            profiler.write_chrome_trace(args.trace_out)
+            print(f"Wrote trace to {args.trace_out}", file=sys.stderr)
+        if memory_profiler is not None:
+            if args.memory_profile:
+                print(memory_profiler.memory_report(top=args.memory_top), file=sys.stderr)
+            if args.memory_profile_out:
+                memory_profiler.write_memory_summary(args.memory_profile_out, top=args.memory_top)
+                print(f"Wrote memory profile to {args.memory_profile_out}", file=sys.stderr)
+
+
+def run_command(
+    args: argparse.Namespace,
+    parser: argparse.ArgumentParser,
+    pm: pluggy.PluginManager,
+    code_tags_config: CodeTagsConfig,
+    hook_stats: HookStats | None = None,
+) -> int:
+    """
+    Run the parsed command.
+
+    Args:
+        args (argparse.Namespace): The parsed command line.
+        parser (argparse.ArgumentParser): The top-level parser, for help.
+        pm (pluggy.PluginManager): The plugin manager.
+        code_tags_config (CodeTagsConfig): The configuration for this run.
+        hook_stats (HookStats | None): Counting plugin hook calls, for ``plugin-info --stats``.
+
+    Returns:
+        int: The exit code.
+    """
     if not args.command:
         parser.print_help()
         return 1
@@ -188,8 +368,24 @@ def main(argv: Sequence[str] | None = None) -> int:
             )
             sys.exit(1)
 
+        scan_stats = ScanStats() if args.stats or args.stats_json else None
+        if args.format == ["jsonl"] and not args.validate:
+            try:
+                return stream_jsonl_report(
+                    modules,
+                    src,
+                    args.filter,
+                    args.output_dir or args.output,
+                    jobs=getattr(args, "jobs", None),
+                    stats=scan_stats,
+                )
+            finally:
+                report_scan_stats(args, scan_stats)
+
         try:
-            found = aggregate_all_kinds_multiple_input(modules, src, pure_data_schema.PureDataSchema)
+            found = aggregate_all_kinds_multiple_input(
+                modules, src, pure_data_schema.PureDataSchema, jobs=getattr(args, "jobs", None), stats=scan_stats
+            )
 
             if args.filter:
                 try:
@@ -201,27 +397,65 @@ def main(argv: Sequence[str] | None = None) -> int:
         except ImportError:
             print(f"Error: Could not import module(s) '{args.module}'", file=sys.stderr)
             return 1
+        finally:
+            report_scan_stats(args, scan_stats)
 
         if args.validate:
             if len(found) == 0:
                 raise CommentNotFoundError("No data to validate.")
-            found_problems = print_validate(found)
+            with span("render", format="validate"):
+                found_problems = print_validate(found)
             print(f"{len(found)} validation problems.")
             if found_problems:
                 return 100
         else:
             if len(found) == 0:
                 raise CommentNotFoundError("No data to report.")
-            # Call the hook.
-            results = pm.hook.print_report(
-                format_name=args.format, output_path=args.output, found_data=found, config=get_code_tags_config()
-            )
-            if not any(results):
-                print(f"Error: Format '{args.format}' is not supported.", file=sys.stderr)
+            formats = args.format
+            output_dir = args.output_dir
+            if output_dir is None and args.output and (len(formats) > 1 or os.path.isdir(args.output)):
+                output_dir = args.output
+            if output_dir is None and args.output is None and len(formats) > 1:
+                print("Error: Several formats need --output-dir (or a folder for --output).", file=sys.stderr)
+                return 1
+            if output_dir is None and args.output is None:
+                # Call the hook.
+                with span("render", format=formats[0]):
+                    results = pm.hook.print_report(
+                        format_name=formats[0],
+                        output_path=args.output,
+                        found_data=found,
+                        config=get_code_tags_config(),
+                    )
+                handled = {formats[0]: any(results)}
+            else:
+                # One scan, one print_report dispatch per format, one file each.
+                with span("render", format=",".join(formats)):
+                    handled = write_reports(
+                        pm,
+                        formats,
+                        found,
+                        get_code_tags_config(),
+                        output_dir=output_dir,
+                        output_file=None if output_dir else args.output,
+                    )
+            unsupported = [name for name, was_handled in handled.items() if not was_handled]
+            if unsupported:
+                print(f"Error: Format '{', '.join(unsupported)}' is not supported.", file=sys.stderr)
                 return 1
                 # --- NEW: Handle 'plugin-info' command ---
     elif args.command == "plugin-info":
         plugin_currently_loaded(pm)
+        if args.stats and hook_stats is not None:
+            modules = args.module or code_tags_config.modules_to_scan()
+            src = args.src or code_tags_config.source_folders_to_scan()
+            if modules or src:
+                # A scan runs the hooks that cost the most: find_source_tags on every file that is not Python.
+                found = aggregate_all_kinds_multiple_input(
+                    modules, src, pure_data_schema.PureDataSchema, jobs=getattr(args, "jobs", None)
+                )
+                print(f"Scanned {len(found)} tags.")
+            print(hook_stats.report())
     elif args.command == "id":
         from pycodetags import id_command
 
@@ -232,7 +466,26 @@ def main(argv: Sequence[str] | None = None) -> int:
                 file=sys.stderr,
             )
             return 1
-        exit_code, _result = id_command.run(paths, dry_run=args.dry_run, check=args.check)
+        exit_code, _result = id_command.run(
+            paths, dry_run=args.dry_run, check=args.check, jobs=getattr(args, "jobs", None)
+        )
+        return exit_code
+    elif args.command == "index":
+        from pycodetags import index_command
+
+        paths = args.paths or code_tags_config.source_folders_to_scan()
+        if not paths:
+            print(
+                "Need to specify one or more source files/folders, or set src in the config file.",
+                file=sys.stderr,
+            )
+            return 1
+        exit_code, _index_result = index_command.run(paths, clear=args.clear, jobs=getattr(args, "jobs", None))
+        return exit_code
+    elif args.command == "cache":
+        from pycodetags import cache_command
+
+        exit_code, _cache_report = cache_command.run(args.action, as_json=args.json)
         return exit_code
     else:
         # Pass control to plugins for other commands
@@ -247,9 +500,14 @@ def main(argv: Sequence[str] | None = None) -> int:
         else:
             src = code_tags_config.source_folders_to_scan()
 
-        def found_data_for_plugins_callback(schema: DataTagSchema) -> list[DATA]:
+        # One scan serves every callback call and every plugin handling the command.
+        session = ScanSession(modules, src, jobs=getattr(args, "jobs", None))
+
+        def found_data_for_plugins_callback(schema: DataTagSchema) -> Sequence[DATA]:
             try:
-                return source_and_modules_searcher(args.command, modules, src, schema, args.filter)
+                return source_and_modules_searcher(
+                    args.command, modules, src, schema, args.filter, jobs=getattr(args, "jobs", None), session=session
+                )
             except InvalidJMESPathFilter as e:
                 print(f"Filter error: {e}", file=sys.stderr)
                 sys.exit(200)
@@ -266,16 +524,94 @@ def main(argv: Sequence[str] | None = None) -> int:
     return 0
 
 
+def report_scan_stats(args: argparse.Namespace, scan_stats: ScanStats | None) -> None:
+    """Print and/or write the scan statistics ``--stats`` and ``--stats-json`` ask for."""
+    if scan_stats is None:
+        return
+    if args.stats:
+        print(scan_stats.report(), file=sys.stderr)
+    if args.stats_json:
+        scan_stats.write_json(args.stats_json)
+
+
+def stream_jsonl_report(
+    modules: list[str],
+    src: list[str],
+    filter_expr: str | None,
+    output: str | None,
+    jobs: int | None = None,
+    stats: ScanStats | None = None,
+) -> int:
+    """
+    ``--format jsonl`` on its own: write each file's tags as soon as they are parsed, without holding the
+    whole scan.
+
+    Args:
+        modules (list[str]): Modules to collect from.
+        src (list[str]): Source folders or files to scan.
+        filter_expr (str | None): JMESPath filter, applied to each file's tags.
+        output (str | None): File to write, or folder to write ``codetags.jsonl`` into; stdout if None.
+        jobs (int | None): Parallel parse workers.
+        stats (ScanStats | None): Filled in as the scan goes.
+
+    Returns:
+        int: The exit code.
+    """
+    batches: Iterable[Sequence[DATA]] = (
+        LazyDataList(batch)
+        for batch in iter_aggregate_by_file(modules, src, pure_data_schema.PureDataSchema, jobs=jobs, stats=stats)
+    )
+    if filter_expr:
+        batches = (filter_data_by_expression(batch, filter_expr) for batch in batches)
+    if output and (os.path.isdir(output) or output.endswith(os.sep)):
+        os.makedirs(output, exist_ok=True)
+        output = os.path.join(output, report_file_name("jsonl"))
+    try:
+        # Streaming interleaves the scan with writing, so this span covers both.
+        with span("render", format="jsonl"):
+            if output:
+                with open(output, "w", encoding="utf-8") as stream:
+                    written = write_jsonl(batches, stream)
+            else:
+                written = write_jsonl(batches)
+    except BrokenPipeError:
+        # The reader (head, a closed pager) stopped early; that is not an error. Point stdout at devnull
+        # so the interpreter's final flush does not fail again.
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        return 0
+    except InvalidJMESPathFilter as e:
+        print(f"Filter error: {e}", file=sys.stderr)
+        return 200
+    except ImportError:
+        print(f"Error: Could not import module(s) '{modules}'", file=sys.stderr)
+        return 1
+    if written == 0:
+        raise CommentNotFoundError("No data to report.")
+    return 0
+
+
 def source_and_modules_searcher(
-    command: str, modules: list[str], src: list[str], schema: DataTagSchema, filter_expr: str
-) -> list[DATA]:
+    command: str,
+    modules: list[str],
+    src: list[str],
+    schema: DataTagSchema,
+    filter_expr: str,
+    jobs: int | None = None,
+    session: ScanSession | None = None,
+) -> Sequence[DATA]:
     try:
-        all_found: list[DATA] = []
-        for source in src:
-            found_tags = aggregate_all_kinds_multiple_input([""], [source], schema)
-            all_found.extend(found_tags)
-        more_found = aggregate_all_kinds_multiple_input(modules, [], schema)
-        all_found.extend(more_found)
+        all_found: Sequence[DATA]
+        if session is not None:
+            all_found = session.tags(schema)
+        else:
+            collected: list[DATA] = []
+            for source in src:
+                found_tags = aggregate_all_kinds_multiple_input([""], [source], schema, jobs=jobs)
+                collected.extend(found_tags)
+            more_found = aggregate_all_kinds_multiple_input(modules, [], schema, jobs=jobs)
+            collected.extend(more_found)
+            all_found = collected
 
         if filter_expr:
             all_found = filter_data_by_expression(all_found, filter_expr)
@@ -288,11 +624,43 @@ def source_and_modules_searcher(
     return found_data_for_plugins
 
 
+def add_jobs_switch(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Parse source files with N parallel workers (0 = one per CPU). Defaults to config, else 1.",
+    )
+
+
 def common_switches(parser: argparse.ArgumentParser) -> None:
     parser.add_argument("--config", help="Path to config file, defaults to current folder pyproject.toml")
     parser.add_argument("--verbose", default=False, action="store_true", help="verbose level logging output")
     parser.add_argument("--info", default=False, action="store_true", help="info level logging output")
     parser.add_argument("--bug-trail", default=False, action="store_true", help="enable bug trail, local logging")
+    parser.add_argument(
+        "--profile",
+        default=False,
+        action="store_true",
+        help="print the time spent per stage and the slowest files to stderr",
+    )
+    parser.add_argument(
+        "--profile-files", type=int, default=10, metavar="N", help="slowest files listed by --profile (default 10)"
+    )
+    parser.add_argument("--trace-out", metavar="FILE", help="write a Chrome/Perfetto trace of the run's stages")
+    parser.add_argument(
+        "--memory-profile",
+        default=False,
+        action="store_true",
+        help="trace memory with tracemalloc; print the peak per stage and the top allocation sites to stderr",
+    )
+    parser.add_argument(
+        "--memory-profile-out", metavar="FILE", help="write the --memory-profile summary as JSON, for diffing runs"
+    )
+    parser.add_argument(
+        "--memory-top", type=int, default=10, metavar="N", help="allocation sites listed per stage (default 10)"
+    )
 
 
 if __name__ == "__main__":
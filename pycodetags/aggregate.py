@@ -6,38 +6,54 @@ in the object graph of the specified modules.
 from __future__ import annotations
 
 import importlib
+import itertools
 import logging
 import logging.config
+import os
 import pathlib
-from typing import Any
-
-from pycodetags.app_config import get_code_tags_config
-from pycodetags.data_tags import (
-    DATA,
-    DataTag,
-    DataTagSchema,
-    convert_data_tag_to_data_object,
-    iterate_comments_from_file,
-)
+from collections.abc import Iterable, Iterator, Sequence
+from typing import Any, TypeVar
+
+from pycodetags.app_config import CodeTagsConfig, get_code_tags_config
+from pycodetags.data_tags import DATA, DataTag, DataTagSchema
+from pycodetags.data_tags.tag_record import LazyDataList, TagItem, TagRecord
 from pycodetags.exceptions import FileParsingError, ModuleImportError
+from pycodetags.parallel import WorkerPool, iter_parse_python_files
+from pycodetags.profiling import span
 from pycodetags.pure_data_schema import PureDataSchema
 from pycodetags.python.collect import collect_all_data
+from pycodetags.scan_index import ScanIndex
+from pycodetags.scan_stats import ScanStats, stage
+from pycodetags.walker import WalkStats, walk_source_files
 
 logger = logging.getLogger(__name__)
 
+_Tag = TypeVar("_Tag", bound=TagItem)
+
 
 def aggregate_all_kinds_multiple_input(
-    module_names: list[str], source_paths: list[str], schema: DataTagSchema
-) -> list[DATA]:
+    module_names: list[str],
+    source_paths: list[str],
+    schema: DataTagSchema,
+    jobs: int | None = None,
+    use_index: bool | None = None,
+    stats: ScanStats | None = None,
+) -> LazyDataList:
     """Refactor to support lists of modules and lists of source paths
 
+    Source tags are held as compact :class:`TagRecord` objects and deduplicated as such; a DATA object
+    is only built when an element of the returned sequence is read.
+
     Args:
         module_names (list[str]): List of module names to search in.
         source_paths (list[str]): List of source paths to search in.
         schema (DataTagSchema): The schema to use for the data tags.
+        jobs (int | None): Parallel parse workers, see :func:`aggregate_all_kinds`.
+        use_index (bool | None): Reuse the incremental scan index, see :func:`aggregate_all_kinds`.
+        stats (ScanStats | None): Filled in with what the scan did, see :mod:`pycodetags.scan_stats`.
 
     Returns:
-        list[DATA]: A list of DATA objects containing collected TODOs and DATA.
+        LazyDataList: A read-only sequence of DATA objects containing collected TODOs and DATA.
     """
     if not module_names:
         module_names = []
@@ -46,31 +62,37 @@ def aggregate_all_kinds_multiple_input(
     if schema is None:
         schema = PureDataSchema
     logger.info(f"aggregate_all_kinds_multiple_input: module_names={module_names}, source_paths={source_paths}")
-    collected_DATA: list[DATA] = []
     collected: list[DataTag] = []
     found_in_modules: list[DATA] = []
 
     # AST Tags
     for module_name in module_names:
-        found_tags, found_in_modules = aggregate_all_kinds(module_name, "", schema)
+        found_tags, found_in_module = aggregate_all_kinds(
+            module_name, "", schema, jobs=jobs, use_index=use_index, stats=stats
+        )
         collected.extend(found_tags)
-        logger.debug(f"Found {len(found_in_modules)} by looking at imported module: {module_name}")
+        found_in_modules.extend(found_in_module)
+        logger.debug(f"Found {len(found_in_module)} by looking at imported module: {module_name}")
 
     # Source Tags
     for source_path in source_paths:
-        found_tags, found_in_modules = aggregate_all_kinds("", source_path, schema)
+        found_tags, _found_in_modules = aggregate_all_kinds(
+            "", source_path, schema, jobs=jobs, use_index=use_index, stats=stats
+        )
         collected.extend(found_tags)
         logger.debug(f"Found {len(found_tags)} by looking at src folder {source_path}")
 
-    for found_tag in collected:
-        item = convert_data_tag_to_data_object(found_tag, schema)
-        collected_DATA.append(item)
-    collected_DATA.extend(found_in_modules)
+    with span("convert"), stage(stats, "convert"):
+        records: list[TagItem] = [TagRecord.from_data_tag(found_tag, schema) for found_tag in collected]
+    records.extend(found_in_modules)
 
-    return dedup_data_objects(collected_DATA)
+    deduped = dedup_data_objects(records, stats)
+    if stats is not None:
+        stats.count_tags(deduped)
+    return LazyDataList(deduped)
 
 
-def dedup_data_objects(tags: list[DATA]) -> list[DATA]:
+def dedup_data_objects(tags: list[_Tag], stats: ScanStats | None = None) -> list[_Tag]:
     """Drop duplicate tags produced when several active schemas match the same comment block.
 
     When both ``PureDataSchema`` and a plugin schema (e.g. the issue-tracker ``TODO`` schema) recognize
@@ -82,28 +104,85 @@ def dedup_data_objects(tags: list[DATA]) -> list[DATA]:
     pass through untouched.
 
     Args:
-        tags: Collected DATA objects, in discovery order.
+        tags: Collected DATA objects or tag records, in discovery order.
+        stats: Counts the duplicates dropped and times the ``dedup`` stage.
 
     Returns:
         The list with block-level duplicates removed, order preserved.
     """
     seen: set[tuple[Any, ...]] = set()
-    out: list[DATA] = []
-    for tag in tags:
-        if tag.offsets is None or tag.file_path is None:
-            # No reliable source key (module-collected tag); keep it.
+    out: list[_Tag] = []
+    with span("dedup"), stage(stats, "dedup"):
+        for tag in tags:
+            if tag.offsets is None or tag.file_path is None:
+                # No reliable source key (module-collected tag); keep it.
+                out.append(tag)
+                continue
+            key = (tag.file_path, tag.offsets, tag.code_tag, tag.comment)
+            if key in seen:
+                logger.debug("Deduped tag %s at %s:%s", tag.code_tag, tag.file_path, tag.offsets)
+                continue
+            seen.add(key)
             out.append(tag)
-            continue
-        key = (tag.file_path, tag.offsets, tag.code_tag, tag.comment)
-        if key in seen:
-            logger.debug("Deduped tag %s at %s:%s", tag.code_tag, tag.file_path, tag.offsets)
-            continue
-        seen.add(key)
-        out.append(tag)
+    if stats is not None:
+        stats.tags_deduped += len(tags) - len(out)
     return out
 
 
-def aggregate_all_kinds(module_name: str, source_path: str, schema: DataTagSchema) -> tuple[list[DataTag], list[DATA]]:
+def scan_schemas(schema: DataTagSchema, active_schemas: list[str]) -> list[DataTagSchema]:
+    """The primary schema plus any plugin-provided schemas the user activated (e.g. "TDG").
+
+    TDG-format comments are then parsed alongside the primary schema. The primary schema is not
+    duplicated if it is also active.
+    """
+    # cyclical import
+    from pycodetags.common_interfaces import get_active_schemas
+
+    schemas: list[DataTagSchema] = [schema]
+    for extra in get_active_schemas(active_schemas):
+        if extra.get("name") != schema.get("name"):
+            schemas.append(extra)
+    return schemas
+
+
+def walk_files(source_path: str, config: CodeTagsConfig) -> list[str]:
+    """Every file under ``source_path`` the ignore rules and ``exclude``/``include`` config keys allow."""
+    walk_stats = WalkStats()
+    files = list(
+        walk_source_files(
+            source_path,
+            exclude=config.exclude(),
+            include=config.include(),
+            use_ignore_files=config.use_ignore_files(),
+            stats=walk_stats,
+        )
+    )
+    logger.info(
+        f"Walked {source_path}: {walk_stats.files_walked} files, skipped {walk_stats.files_skipped} files "
+        f"and {walk_stats.dirs_skipped} folders by ignore rules"
+    )
+    return files
+
+
+def find_plugin_source_tags(file: str) -> list[list[DataTag]]:
+    """Tags plugins find in a non-Python file, one list per plugin that answered."""
+    from pycodetags.plugin_manager import get_plugin_manager
+
+    pm = get_plugin_manager()
+    # Collect folk tags from plugins
+    return pm.hook.find_source_tags(  # type: ignore[no-any-return]
+        already_processed=False, file_path=file, config=get_code_tags_config()
+    )
+
+
+def aggregate_all_kinds(
+    module_name: str,
+    source_path: str,
+    schema: DataTagSchema,
+    jobs: int | None = None,
+    use_index: bool | None = None,
+    stats: ScanStats | None = None,
+) -> tuple[list[DataTag], list[DATA]]:
     """
     Aggregate all TODOs and DONEs from a module and source files.
 
@@ -111,6 +190,12 @@ def aggregate_all_kinds(module_name: str, source_path: str, schema: DataTagSchem
         module_name (str): The name of the module to search in.
         source_path (str): The path to the source files.
         schema (DataTagSchema): The schema to use for the data tags.
+        jobs (int | None): Parallel workers for parsing ``.py`` files. ``None`` reads ``jobs`` from
+            config, ``1`` is serial, ``0`` means one worker per CPU.
+        use_index (bool | None): Reuse parse results for unchanged files from the on-disk scan index and
+            record new ones. ``None`` reads ``use_index`` from config (default on).
+        stats (ScanStats | None): Filled in with the walk and parse counts and stage times of the source
+            scan. Tags are counted per schema by the caller, once deduplicated.
 
     Returns:
         list[DATA]: A dictionary containing collected TODOs, DONEs, and exceptions.
@@ -133,43 +218,280 @@ def aggregate_all_kinds(module_name: str, source_path: str, schema: DataTagSchem
             raise ModuleImportError(f"Error: Could not import module(s) '{module_name}'") from ie
 
     found_tags: list[DataTag] = []
-    schemas: list[DataTagSchema] = [schema]
-    # Add plugin-provided schemas the user activated (e.g. "TDG"), so TDG-format comments are parsed
-    # alongside the primary schema. PureDataSchema / the passed schema are not duplicated.
-    from pycodetags.common_interfaces import get_active_schemas
-
-    for extra in get_active_schemas(active_schemas):
-        if extra.get("name") != schema.get("name"):
-            schemas.append(extra)
+    schemas = scan_schemas(schema, active_schemas)
+    include_folk_tags = "folk" in active_schemas
 
     if source_path:
-        src_found = 0
-        path = pathlib.Path(source_path)
-        files = [path] if path.is_file() else path.rglob("*.*")
-        for file in files:
-            if file.name.endswith(".py"):
-                # Finds both folk and data tags
-                found_items = list(
-                    _
-                    for _ in iterate_comments_from_file(
-                        str(file), schemas=schemas, include_folk_tags="folk" in active_schemas
-                    )
-                )
-                found_tags.extend(found_items)
-                src_found += 1
-            else:
-                from pycodetags.plugin_manager import get_plugin_manager
-
-                pm = get_plugin_manager()
-                # Collect folk tags from plugins
-                plugin_results = pm.hook.find_source_tags(
-                    already_processed=False, file_path=str(file), config=get_code_tags_config()
-                )
-                for result_list in plugin_results:
-                    found_tags.extend(result_list)
-                if plugin_results:
-                    src_found += 1
-        if src_found == 0:
-            raise FileParsingError(f"Can't find any files in source folder {source_path}")
+        scanned = iter_source_tags(source_path, schemas, include_folk_tags, config, jobs, use_index, stats=stats)
+        for _file, tags in scanned:
+            found_tags.extend(tags)
 
     return found_tags, found_in_modules
+
+
+def iter_source_tags(
+    source_path: str,
+    schemas: list[DataTagSchema],
+    include_folk_tags: bool,
+    config: CodeTagsConfig,
+    jobs: int | None = None,
+    use_index: bool | None = None,
+    batch_size: int | None = None,
+    prefilter: bool | None = None,
+    stats: ScanStats | None = None,
+) -> Iterator[tuple[str, list[DataTag]]]:
+    """
+    Each file under ``source_path`` with the tags found in it, in walk order.
+
+    ``.py`` files are parsed (possibly in parallel, on one pool for the whole walk) ``batch_size``
+    walked files at a time, or all at once by default; other files are offered to the
+    ``find_source_tags`` plugins and yielded if one answers. With a ``batch_size`` the walk itself is
+    consumed batch by batch, so only one batch of paths and tags is held. The scan index, when used,
+    is pruned and saved once every file has been yielded.
+
+    Args:
+        source_path (str): Folder or file to scan.
+        schemas (list[DataTagSchema]): Schemas to detect, see :func:`scan_schemas`.
+        include_folk_tags (bool): Include folk tags.
+        config (CodeTagsConfig): Walker, parallelism, index and prefilter settings.
+        jobs (int | None): Parallel parse workers. ``None`` reads ``jobs`` from config.
+        use_index (bool | None): Reuse the scan index. ``None`` reads ``use_index`` from config.
+        batch_size (int | None): Walked files per batch.
+        prefilter (bool | None): Skip files that cannot hold a tag. ``None`` reads ``prefilter`` from config.
+        stats (ScanStats | None): Counts files walked, skipped, parsed, cached, failed and answered by
+            plugins, and times the walk, index, parse and plugin stages.
+
+    Yields:
+        tuple[str, list[DataTag]]: A file and its tags.
+
+    Raises:
+        FileParsingError: If nothing under ``source_path`` could be scanned.
+    """
+    if jobs is None:
+        jobs = config.jobs()
+    if use_index is None:
+        use_index = config.use_index()
+    if prefilter is None:
+        prefilter = config.prefilter()
+    walk_stats = WalkStats()
+    walked = walk_source_files(
+        source_path,
+        exclude=config.exclude(),
+        include=config.include(),
+        use_ignore_files=config.use_ignore_files(),
+        stats=walk_stats,
+    )
+    index = ScanIndex.open(schemas, include_folk_tags, sources=[source_path]) if use_index else None
+    indexed_files: list[str] = []
+    src_found = 0
+    with WorkerPool(jobs, config.parallel_backend()) as pool:
+        while True:
+            with span("walk"), stage(stats, "walk"):
+                batch = list(itertools.islice(walked, batch_size)) if batch_size else list(walked)
+            if not batch:
+                break
+            python_files = [file for file in batch if file.endswith(".py")]
+            if index:
+                indexed_files.extend(python_files)
+            # Python files are parsed ahead (possibly in parallel) and merged back in walk order below,
+            # so the result does not depend on how the work was scheduled.
+            parsed = iter_parse_python_files(
+                python_files,
+                schemas=schemas,
+                include_folk_tags=include_folk_tags,
+                index=index,
+                prefilter=prefilter,
+                pool=pool,
+                stats=stats,
+            )
+            for file in batch:
+                if file.endswith(".py"):
+                    # Finds both folk and data tags
+                    _parsed_file, tags = next(parsed)
+                    src_found += 1
+                    yield file, tags
+                else:
+                    with span("plugin_source_tags", file=file), stage(stats, "plugins"):
+                        plugin_results = find_plugin_source_tags(file)
+                    if plugin_results:
+                        src_found += 1
+                        if stats is not None:
+                            stats.plugin_files += 1
+                        yield file, [tag for result_list in plugin_results for tag in result_list]
+            if not batch_size:
+                break
+    logger.info(
+        f"Walked {source_path}: {walk_stats.files_walked} files, skipped {walk_stats.files_skipped} files "
+        f"and {walk_stats.dirs_skipped} folders by ignore rules"
+    )
+    if stats is not None:
+        stats.add_walk(walk_stats)
+    if index:
+        with span("index"), stage(stats, "index"):
+            if not pathlib.Path(source_path).is_file():
+                index.prune(under=source_path, keep=indexed_files)
+            index.save()
+    if src_found == 0:
+        raise FileParsingError(f"Can't find any files in source folder {source_path}")
+
+
+def _overlapping(source_paths: list[str]) -> bool:
+    """True if some source path is, or is inside, an earlier one, so a file can be reached twice."""
+    resolved = [os.path.abspath(path) for path in source_paths]
+    for i, path in enumerate(resolved):
+        for earlier in resolved[:i]:
+            if path == earlier or path.startswith(earlier.rstrip(os.sep) + os.sep):
+                return True
+    return False
+
+
+def _iter_file_records(
+    source_paths: list[str],
+    schemas: list[DataTagSchema],
+    include_folk_tags: bool,
+    config: CodeTagsConfig,
+    jobs: int | None,
+    use_index: bool | None,
+    prefilter: bool | None,
+    batch_size: int,
+    stats: ScanStats | None = None,
+) -> Iterator[list[TagRecord]]:
+    """Deduplicated records of each file with tags, classified under ``schemas[0]``.
+
+    Duplicates always share a file, so deduplicating each file on its own drops exactly what
+    :func:`dedup_data_objects` over the whole scan drops. The one exception, a file reached again
+    through a later source path, only needs the set of files seen when the source paths overlap.
+    """
+    schema = schemas[0]
+    seen_files: set[str] | None = set() if _overlapping(source_paths) else None
+    for source_path in source_paths:
+        scanned = iter_source_tags(
+            source_path, schemas, include_folk_tags, config, jobs, use_index, batch_size, prefilter, stats
+        )
+        for file, tags in scanned:
+            if not tags:
+                continue
+            if seen_files is not None:
+                if file in seen_files:
+                    if stats is not None:
+                        stats.tags_deduped += len(tags)
+                    continue
+                seen_files.add(file)
+            with span("convert"), stage(stats, "convert"):
+                records = [TagRecord.from_data_tag(tag, schema) for tag in tags]
+            deduped = dedup_data_objects(records, stats)
+            if stats is not None:
+                stats.count_tags(deduped)
+            yield deduped
+
+
+STREAM_BATCH_FILES = 64
+"""Walked files per batch when streaming: small enough for the first tags to come out quickly, large
+enough to keep a worker pool busy."""
+
+
+def iter_aggregate_by_file(
+    module_names: list[str],
+    source_paths: list[str],
+    schema: DataTagSchema,
+    jobs: int | None = None,
+    use_index: bool | None = None,
+    batch_size: int = STREAM_BATCH_FILES,
+    stats: ScanStats | None = None,
+) -> Iterator[list[TagItem]]:
+    """
+    The streaming counterpart of :func:`aggregate_all_kinds_multiple_input`: one list per file.
+
+    Yields the deduplicated tag records of each source file with tags as soon as its batch is parsed,
+    then, last, the DATA objects collected from ``module_names``. The tags come out as the list version
+    returns them, while no more than one batch of tags is held.
+
+    Args:
+        module_names (list[str]): Modules to collect live DATA objects from; imported up front.
+        source_paths (list[str]): Folders or files to scan.
+        schema (DataTagSchema): The schema to use for the data tags.
+        jobs (int | None): Parallel parse workers, see :func:`aggregate_all_kinds`.
+        use_index (bool | None): Reuse the incremental scan index, see :func:`aggregate_all_kinds`.
+        batch_size (int): Walked files per batch.
+        stats (ScanStats | None): Filled in as the scan goes, see :mod:`pycodetags.scan_stats`.
+
+    Yields:
+        list[TagItem]: The tags of one file (or of all modules), never empty.
+    """
+    config = get_code_tags_config()
+    active_schemas = config.active_schemas()
+    schema = schema or PureDataSchema
+    found_in_modules: list[DATA] = []
+    for module_name in module_names or []:
+        found_in_modules.extend(aggregate_all_kinds(module_name, "", schema)[1])
+
+    yield from _iter_file_records(
+        source_paths or [],
+        scan_schemas(schema, active_schemas),
+        "folk" in active_schemas,
+        config,
+        jobs,
+        use_index,
+        None,
+        batch_size,
+        stats,
+    )
+    if found_in_modules:
+        deduped = dedup_data_objects(found_in_modules, stats)
+        if stats is not None:
+            stats.count_tags(deduped)
+        yield deduped
+
+
+def scan(
+    paths: str | os.PathLike[str] | Iterable[str | os.PathLike[str]],
+    schemas: Sequence[DataTagSchema] | None = None,
+    include_folk_tags: bool | None = None,
+    jobs: int | None = None,
+    prefilter: bool | None = None,
+    use_index: bool | None = None,
+    batch_size: int = STREAM_BATCH_FILES,
+    stats: ScanStats | None = None,
+) -> Iterator[DATA]:
+    """
+    Scan source files and folders, yielding tags file by file in bounded memory.
+
+    The walk, the parse and the deduplication all stream: only one batch of files and tags is held at a
+    time however large the tree is, and each tag is built as a :class:`DATA` object only as it is
+    yielded. Options left as ``None`` come from the ``[tool.pycodetags]`` config.
+
+    Args:
+        paths: A file or folder, or several.
+        schemas: Schemas to detect; the first one classifies the tags. Defaults to ``PureDataSchema``
+            plus the schemas activated in config.
+        include_folk_tags: Also find folk tags (``# TODO something``). Defaults to ``"folk"`` being active.
+        jobs: Parallel parse workers; ``1`` is serial, ``0`` one per CPU.
+        prefilter: Skip files whose bytes cannot hold a tag.
+        use_index: Answer unchanged files from the incremental scan index and record new results.
+        batch_size: Walked files per batch; the latency and memory bound.
+        stats: A :class:`~pycodetags.scan_stats.ScanStats` to fill in as the scan goes; complete once the
+            generator is exhausted.
+
+    Yields:
+        DATA: Each tag found, in walk order, duplicates dropped.
+
+    Raises:
+        FileParsingError: If a path has nothing to scan.
+
+    Examples:
+        >>> sorted({tag.code_tag for tag in scan("tests/demo/pep350_tags.py", use_index=False)})
+        ['BUG', 'FIXME', 'NOTE', 'RFE', 'TODO']
+    """
+    config = get_code_tags_config()
+    active_schemas = config.active_schemas()
+    if isinstance(paths, (str, os.PathLike)):
+        paths = [paths]
+    source_paths = [os.fspath(path) for path in paths]
+    schema_list = list(schemas) if schemas else scan_schemas(PureDataSchema, active_schemas)
+    if include_folk_tags is None:
+        include_folk_tags = "folk" in active_schemas
+    for records in _iter_file_records(
+        source_paths, schema_list, include_folk_tags, config, jobs, use_index, prefilter, batch_size, stats
+    ):
+        for record in records:
+            yield record.to_data()
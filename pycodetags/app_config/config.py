@@ -76,6 +76,23 @@ disable_on_ci = true
 
 # Use .env file
 use_dot_env = true
+
+# Skip these while walking source folders (gitignore syntax), on top of .gitignore/.pycodetagsignore.
+exclude = ["docs/_build/", "*_pb2.py"]
+# When not empty, only matching files are scanned.
+include = []
+use_ignore_files = true
+
+# Reuse parse results of unchanged files (.pycodetags_cache/index). Rebuild with `pycodetags index`.
+use_index = true
+
+# Skip files whose bytes cannot contain a tag without decoding or parsing them.
+prefilter = true
+
+# Parallel parsing of source files. 1 is serial, 0 means one worker per CPU.
+jobs = 1
+# "process" or "thread". Blank picks threads on free-threaded Python builds, processes otherwise.
+parallel_backend = ""
 ```
 
 """
@@ -176,6 +193,42 @@ class CodeTagsConfig:
         """Schemas to detect in source comments."""
         return [str(_).lower() for _ in self.config.get("active_schemas", [])]
 
+    def exclude(self) -> list[str]:
+        """Gitignore-style patterns for files and folders to skip while walking source folders."""
+        return [str(_) for _ in self.config.get("exclude", [])]
+
+    def include(self) -> list[str]:
+        """Gitignore-style patterns; when set, only matching files are scanned."""
+        return [str(_) for _ in self.config.get("include", [])]
+
+    def use_ignore_files(self) -> bool:
+        """Honour .gitignore and .pycodetagsignore files while walking source folders."""
+        return careful_to_bool(self.config.get("use_ignore_files", True), True)
+
+    def use_index(self) -> bool:
+        """Reuse parse results of unchanged files from the incremental scan index."""
+        return careful_to_bool(self.config.get("use_index", True), True)
+
+    def prefilter(self) -> bool:
+        """Skip files that cannot contain a tag after a cheap byte-level search."""
+        return careful_to_bool(self.config.get("prefilter", True), True)
+
+    def jobs(self) -> int:
+        """Parallel workers for parsing source files. 1 is serial, 0 means one per CPU."""
+        value = self.config.get("jobs", 1)
+        try:
+            return int(value)
+        except (TypeError, ValueError) as e:
+            raise ConfigError(f"Invalid configuration: jobs must be an integer, got {value!r}") from e
+
+    def parallel_backend(self) -> str | None:
+        """Worker pool used when jobs > 1: "process" or "thread". Empty means pick for this interpreter."""
+        result = str(self.config.get("parallel_backend", "") or "").lower()
+        accepted = ("process", "thread", "")
+        if result not in accepted:
+            raise ConfigError(f"Invalid configuration: parallel_backend must be in {accepted}")
+        return result or None
+
     @classmethod
     def get_instance(cls, pyproject_path: str = "pyproject.toml") -> CodeTagsConfig:
         """Get the singleton instance of CodeTagsConfig."""
@@ -0,0 +1,4 @@
+"""
+Benchmarks for pycodetags: synthetic trees (:mod:`.synthetic`) and the suite that times each stage over
+them and over the standard library (:mod:`.suite`). Run ``pycodetags-bench run --help``.
+"""
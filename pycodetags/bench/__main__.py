@@ -0,0 +1,230 @@
+"""
+CLI for the pycodetags benchmarks: ``pycodetags-bench`` or ``python -m pycodetags.bench``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import logging
+import sys
+import tempfile
+from collections.abc import Sequence
+from pathlib import Path
+
+from pycodetags.bench.compare import (
+    Thresholds,
+    compare_results,
+    comparison_table,
+    environment_notes,
+    parse_tolerance,
+)
+from pycodetags.bench.suite import BENCHMARKS, RESULT_FORMAT, Corpus, bench_config, run_suite, stdlib_root
+from pycodetags.bench.synthetic import PRESETS, TreeSpec, ensure_tree, generate_tree, tree_spec
+
+DEFAULT_SIZES = "1k"
+COMPARE_REPEAT = 5
+"""Timed runs per benchmark when comparing: enough for quartiles to mean something."""
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """
+    Main entry point for ``pycodetags-bench``.
+
+    Args:
+        argv (Sequence[str] | None): Command line arguments. If None, uses sys.argv.
+    """
+    parser = argparse.ArgumentParser(prog="pycodetags-bench", description="Benchmark pycodetags")
+    subparsers = parser.add_subparsers(dest="command", help="Available commands")
+
+    run_parser = subparsers.add_parser(
+        "run",
+        help="Run the benchmarks and write the results as JSON",
+        description=(
+            "Generate synthetic trees (reused from --workdir when already there), run each benchmark over "
+            "them and over the standard library, and write times, files/s, tags/s and peak memory as JSON."
+        ),
+    )
+    add_run_switches(run_parser)
+    add_suite_switches(run_parser, repeat=3)
+    run_parser.add_argument("--output", "-o", help="write the JSON here instead of stdout")
+
+    compare_parser = subparsers.add_parser(
+        "compare",
+        help="Run the benchmarks and fail when they got slower or use more memory than a baseline",
+        description=(
+            "Run the trees and benchmarks recorded in BASELINE (a JSON file written by `run`) again and compare. "
+            "A benchmark fails when its median time grew by more than its tolerance and the interquartile ranges "
+            "of the two runs do not overlap, or when its peak memory grew by more than the memory tolerance. "
+            "Exits with 1 when any benchmark failed."
+        ),
+    )
+    compare_parser.add_argument("baseline", help="result JSON of an earlier run, usually committed")
+    compare_parser.add_argument("--current", help="compare this result JSON instead of running the benchmarks")
+    add_suite_switches(compare_parser, repeat=COMPARE_REPEAT)
+    add_compare_switches(compare_parser)
+    compare_parser.add_argument("--output", "-o", help="also write the new run's JSON here, e.g. as the next baseline")
+
+    generate_parser = subparsers.add_parser("generate", help="Write a synthetic source tree")
+    generate_parser.add_argument("folder", help="where to write it")
+    generate_parser.add_argument("--size", default="1k", help=f"{', '.join(PRESETS)} or a number of files")
+    generate_parser.add_argument("--seed", type=int, default=None, help="another tree of the same shape")
+
+    args = parser.parse_args(args=argv)
+
+    if args.command == "run":
+        result = run_from_args(args)
+        text = json.dumps(result, indent=2)
+        if args.output:
+            Path(args.output).write_text(text + "\n", encoding="utf-8")
+        else:
+            print(text)
+        return 0
+    if args.command == "compare":
+        try:
+            baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+            current = json.loads(Path(args.current).read_text(encoding="utf-8")) if args.current else None
+            tolerances = [parse_tolerance(text) for text in args.tolerance_for or ()]
+        except (OSError, ValueError) as error:
+            parser.error(str(error))
+        for name, document in (("baseline", baseline), ("current", current)):
+            if document is not None and document.get("format") != RESULT_FORMAT:
+                parser.error(f"The {name} is not a pycodetags-bench result of format {RESULT_FORMAT}")
+        if current is None:
+            current = compare_from_args(args, baseline)
+            if args.output:
+                Path(args.output).write_text(json.dumps(current, indent=2) + "\n", encoding="utf-8")
+        default = Thresholds(args.tolerance, args.memory_tolerance, args.min_time, args.min_memory)
+        comparisons = compare_results(baseline, current, default, tolerances)
+        for note in environment_notes(baseline, current):
+            print(f"Note: {note}", file=sys.stderr)
+        print(comparison_table(comparisons, title=f"benchmarks against {args.baseline}"))
+        return 1 if any(comparison.regressed for comparison in comparisons) else 0
+    if args.command == "generate":
+        spec = tree_spec(args.size)
+        if args.seed is not None:
+            spec = spec._replace(seed=args.seed)
+        info = generate_tree(args.folder, spec)
+        print(f"Wrote {info.files} files, {info.lines} lines, {info.bytes} bytes to {info.root} ({info.digest[:12]})")
+        return 0
+    parser.print_help()
+    return 1
+
+
+def add_run_switches(parser: argparse.ArgumentParser) -> None:
+    """Switches that choose the trees a ``run`` covers."""
+    parser.add_argument(
+        "--sizes",
+        default=DEFAULT_SIZES,
+        help=f"comma separated synthetic tree sizes: {', '.join(PRESETS)} or numbers of files (default {DEFAULT_SIZES})",
+    )
+    parser.add_argument("--no-stdlib", action="store_true", help="do not benchmark against the standard library")
+
+
+def add_suite_switches(parser: argparse.ArgumentParser, repeat: int) -> None:
+    """Switches for how the benchmarks run."""
+    parser.add_argument("--only", help=f"comma separated benchmarks to run: {', '.join(BENCHMARKS)}")
+    parser.add_argument("--repeat", type=int, default=repeat, help=f"timed runs of each benchmark (default {repeat})")
+    parser.add_argument("--no-memory", action="store_true", help="skip the extra run that traces peak memory")
+    parser.add_argument("--jobs", type=int, default=1, help="parse workers for the scanning benchmarks (default 1)")
+    parser.add_argument("--workdir", help="keep generated trees here and reuse them on the next run")
+
+
+def add_compare_switches(parser: argparse.ArgumentParser) -> None:
+    """Switches that say how much worse is too much."""
+    default = Thresholds()
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=default.time,
+        help=f"allowed growth of median times, as a fraction (default {default.time})",
+    )
+    parser.add_argument(
+        "--memory-tolerance",
+        type=float,
+        default=default.memory,
+        help=f"allowed growth of peak memory, as a fraction (default {default.memory})",
+    )
+    parser.add_argument(
+        "--tolerance-for",
+        action="append",
+        metavar="PATTERN=TIME[,MEMORY]",
+        help="tolerances of the benchmarks matching PATTERN (view_*, 10k/aggregate); repeatable, later ones win",
+    )
+    parser.add_argument(
+        "--min-time",
+        type=float,
+        default=default.min_time,
+        help=f"seconds of growth that never fail a benchmark (default {default.min_time})",
+    )
+    parser.add_argument(
+        "--min-memory",
+        type=int,
+        default=default.min_memory,
+        help=f"bytes of growth that never fail a benchmark (default {default.min_memory})",
+    )
+
+
+def run_from_args(args: argparse.Namespace) -> dict:
+    """Run the benchmarks the ``run`` switches ask for, with progress on stderr."""
+    sizes = [size.strip() for size in args.sizes.split(",") if size.strip()]
+    return _run(args, [(size, tree_spec(size)) for size in sizes], stdlib=not args.no_stdlib, names=_only(args))
+
+
+def compare_from_args(args: argparse.Namespace, baseline: dict) -> dict:
+    """Run again the trees and benchmarks a baseline holds, narrowed by ``--only``."""
+    trees = []
+    stdlib = False
+    for name, described in baseline.get("corpora", {}).items():
+        if "spec" in described:
+            trees.append((name, TreeSpec(**described["spec"])))
+        else:
+            stdlib = True
+    recorded = {key.rpartition("/")[2] for key in baseline["benchmarks"]}
+    only = _only(args)
+    names = [name for name in BENCHMARKS if name in recorded and (only is None or name in only)]
+    return _run(args, trees, stdlib=stdlib, names=names)
+
+
+def _only(args: argparse.Namespace) -> list[str] | None:
+    return [name.strip() for name in args.only.split(",")] if args.only else None
+
+
+def _run(args: argparse.Namespace, trees: list[tuple[str, TreeSpec]], stdlib: bool, names: list[str] | None) -> dict:
+    with contextlib.ExitStack() as stack:
+        workdir = Path(args.workdir) if args.workdir else Path(stack.enter_context(tempfile.TemporaryDirectory()))
+        workdir.mkdir(parents=True, exist_ok=True)
+        stack.enter_context(bench_config(workdir, jobs=args.jobs))
+        # The pathological files log a warning per parse, which would swamp the progress lines.
+        logging.disable(logging.WARNING)
+        stack.callback(logging.disable, logging.NOTSET)
+        corpora = []
+        described: dict[str, dict] = {}
+        for name, spec in trees:
+            info = ensure_tree(workdir / "trees" / f"{spec.files}-{spec.seed}", spec)
+            print(f"tree {name}: {info.files} files, {info.lines} lines ({info.digest[:12]})", file=sys.stderr)
+            corpora.append(Corpus(name, info.root, _scratch(workdir, name), jobs=args.jobs))
+            described[name] = {"spec": spec._asdict(), "lines": info.lines, "bytes": info.bytes, "digest": info.digest}
+        if stdlib:
+            corpora.append(Corpus("stdlib", stdlib_root(), _scratch(workdir, "stdlib"), jobs=args.jobs))
+            described["stdlib"] = {"root": stdlib_root()}
+        result = run_suite(
+            corpora,
+            names=names,
+            repeat=args.repeat,
+            memory=not args.no_memory,
+            progress=lambda line: print(line, file=sys.stderr),
+        )
+    result["corpora"] = described
+    return result
+
+
+def _scratch(workdir: Path, name: str) -> Path:
+    scratch = workdir / "scratch" / name
+    scratch.mkdir(parents=True, exist_ok=True)
+    return scratch
+
+
+if __name__ == "__main__":
+    sys.exit(main())
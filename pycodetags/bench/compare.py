@@ -0,0 +1,238 @@
+"""
+Comparing a benchmark run with a baseline, to stop regressions.
+
+Both sides are result documents of :func:`pycodetags.bench.suite.run_suite`. Timings are noisy, so a
+benchmark only counts as slower when all of these hold:
+
+* its median time grew by more than its time tolerance (a fraction: ``0.10`` is 10 %),
+* by more than ``min_time`` seconds, so sub-millisecond benchmarks do not flap,
+* and the interquartile ranges of the two runs do not overlap: the fastest quarter of the new times is
+  slower than the slowest quarter of the baseline's.
+
+A median over the tolerance whose ranges still overlap is reported as ``noise``, not as a failure.
+Peak memory traced by ``tracemalloc`` comes from a single run, so it has a tolerance of its own and
+``min_memory`` bytes of slack instead: it hardly varies, except that interpreter-wide tables (the interned
+string dict, for one) grow in steps of up to about a megabyte whenever earlier work happened to fill them.
+
+Tolerances can be set per benchmark, by ``fnmatch`` patterns over the benchmark name (``view_*``) or
+its full key (``10k/aggregate``), on the command line or in a ``"tolerances"`` object added to the
+baseline file; later patterns win.
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import statistics
+from collections.abc import Sequence
+from typing import Any, NamedTuple
+
+__all__ = [
+    "Thresholds",
+    "Comparison",
+    "compare_results",
+    "comparison_table",
+    "environment_notes",
+    "parse_tolerance",
+    "quartiles",
+]
+
+
+class Thresholds(NamedTuple):
+    """How much worse a benchmark may get before it fails the comparison."""
+
+    time: float = 0.10
+    """Allowed growth of the median time, as a fraction."""
+    memory: float = 0.10
+    """Allowed growth of the peak memory, as a fraction."""
+    min_time: float = 0.001
+    """Growth in seconds that never counts, however large a fraction it is."""
+    min_memory: int = 1024 * 1024
+    """Growth in bytes that never counts."""
+
+
+class Comparison(NamedTuple):
+    """One benchmark in both runs."""
+
+    key: str
+    status: list[str]
+    """``slower``, ``more memory``, ``noise``, ``faster``, ``new`` or ``missing``; empty when unchanged."""
+    thresholds: Thresholds
+    baseline: tuple[float, float, float] | None = None
+    """First quartile, median and third quartile of the times, in seconds."""
+    current: tuple[float, float, float] | None = None
+    baseline_peak: int | None = None
+    current_peak: int | None = None
+
+    @property
+    def regressed(self) -> bool:
+        return "slower" in self.status or "more memory" in self.status
+
+    @property
+    def time_change(self) -> float | None:
+        if not self.baseline or not self.current or not self.baseline[1]:
+            return None
+        return self.current[1] / self.baseline[1] - 1
+
+    @property
+    def memory_change(self) -> float | None:
+        if not self.baseline_peak or self.current_peak is None:
+            return None
+        return self.current_peak / self.baseline_peak - 1
+
+
+def quartiles(times: Sequence[float]) -> tuple[float, float, float]:
+    """
+    First quartile, median and third quartile; all three are the time itself for a single run.
+
+    >>> quartiles([0.5, 0.1, 0.2, 0.4, 0.3])
+    (0.2, 0.3, 0.4)
+    >>> quartiles([0.25])
+    (0.25, 0.25, 0.25)
+    """
+    if len(times) < 2:
+        return (times[0],) * 3
+    first, median, third = statistics.quantiles(times, n=4, method="inclusive")
+    return first, median, third
+
+
+def parse_tolerance(text: str) -> tuple[str, dict[str, float]]:
+    """
+    Read a ``PATTERN=TIME[,MEMORY]`` command line tolerance.
+
+    >>> parse_tolerance("view_*=0.5")
+    ('view_*', {'time': 0.5})
+    >>> parse_tolerance("10k/aggregate=0.2,0.05")
+    ('10k/aggregate', {'time': 0.2, 'memory': 0.05})
+    """
+    pattern, separator, values = text.rpartition("=")
+    if not separator or not pattern:
+        raise ValueError(f"Expected PATTERN=TIME[,MEMORY], got {text!r}")
+    fractions = [float(value) for value in values.split(",")]
+    if not 1 <= len(fractions) <= 2:
+        raise ValueError(f"Expected PATTERN=TIME[,MEMORY], got {text!r}")
+    return pattern, dict(zip(("time", "memory"), fractions))
+
+
+def _baseline_tolerances(baseline: dict[str, Any]) -> list[tuple[str, dict[str, float]]]:
+    """The ``"tolerances"`` of a baseline file: pattern -> time fraction, or -> {"time": .., "memory": ..}."""
+    tolerances = []
+    for pattern, value in (baseline.get("tolerances") or {}).items():
+        if isinstance(value, dict):
+            tolerances.append((pattern, {field: float(value[field]) for field in ("time", "memory") if field in value}))
+        else:
+            tolerances.append((pattern, {"time": float(value)}))
+    return tolerances
+
+
+def _thresholds_for(key: str, default: Thresholds, tolerances: list[tuple[str, dict[str, float]]]) -> Thresholds:
+    name = key.rpartition("/")[2]
+    thresholds = default
+    for pattern, fields in tolerances:
+        if fnmatch.fnmatchcase(key, pattern) or fnmatch.fnmatchcase(name, pattern):
+            thresholds = thresholds._replace(**fields)
+    return thresholds
+
+
+def _compare_one(key: str, thresholds: Thresholds, before: dict[str, Any], after: dict[str, Any]) -> Comparison:
+    baseline = quartiles(before["times_s"])
+    current = quartiles(after["times_s"])
+    status = []
+    grown = current[1] - baseline[1]
+    if grown > baseline[1] * thresholds.time and grown > thresholds.min_time:
+        status.append("slower" if current[0] > baseline[2] else "noise")
+    elif -grown > baseline[1] * thresholds.time and -grown > thresholds.min_time and current[2] < baseline[0]:
+        status.append("faster")
+    baseline_peak, current_peak = before.get("peak_bytes"), after.get("peak_bytes")
+    if baseline_peak is not None and current_peak is not None:
+        grown_bytes = current_peak - baseline_peak
+        if grown_bytes > baseline_peak * thresholds.memory and grown_bytes > thresholds.min_memory:
+            status.append("more memory")
+    return Comparison(key, status, thresholds, baseline, current, baseline_peak, current_peak)
+
+
+def compare_results(
+    baseline: dict[str, Any],
+    current: dict[str, Any],
+    default: Thresholds = Thresholds(),
+    tolerances: Sequence[tuple[str, dict[str, float]]] = (),
+) -> list[Comparison]:
+    """
+    Compare every benchmark of two result documents.
+
+    Args:
+        baseline: The result to hold ``current`` to. Its ``"tolerances"``, if any, apply.
+        current: The new result.
+        default: Thresholds of benchmarks no tolerance pattern matches.
+        tolerances: ``(pattern, {"time": .., "memory": ..})`` overrides, applied after the baseline's.
+
+    Returns:
+        One comparison per benchmark in either document, baseline order first.
+    """
+    patterns = _baseline_tolerances(baseline) + list(tolerances)
+    before, after = baseline["benchmarks"], current["benchmarks"]
+    comparisons = []
+    for key in list(before) + [key for key in after if key not in before]:
+        thresholds = _thresholds_for(key, default, patterns)
+        if key not in after:
+            comparisons.append(Comparison(key, ["missing"], thresholds, quartiles(before[key]["times_s"])))
+        elif key not in before:
+            comparisons.append(Comparison(key, ["new"], thresholds, current=quartiles(after[key]["times_s"])))
+        else:
+            comparisons.append(_compare_one(key, thresholds, before[key], after[key]))
+    return comparisons
+
+
+def environment_notes(baseline: dict[str, Any], current: dict[str, Any]) -> list[str]:
+    """What differs between the machines or interpreters of two runs, which makes times less comparable."""
+    notes = []
+    for field in ("python", "implementation", "machine", "cpus", "pycodetags"):
+        if baseline.get(field) != current.get(field):
+            notes.append(f"{field} differs: baseline {baseline.get(field)}, now {current.get(field)}")
+    return notes
+
+
+def _seconds(value: float) -> str:
+    return f"{value:.3f} s" if value >= 1 else f"{value * 1000:.2f} ms"
+
+
+def _timing(value: tuple[float, float, float] | None) -> str:
+    if value is None:
+        return "-"
+    return f"{_seconds(value[1])} ±{_seconds((value[2] - value[0]) / 2)}"
+
+
+def _change(value: float | None) -> str:
+    return "-" if value is None else f"{value:+.1%}"
+
+
+def _mebibytes(value: int | None) -> str:
+    return "-" if value is None else f"{value / (1024 * 1024):.1f}"
+
+
+def comparison_table(comparisons: Sequence[Comparison], title: str = "benchmarks") -> str:
+    """The comparisons as a text table, then a one-line summary."""
+    rows = [
+        (
+            comparison.key,
+            _timing(comparison.baseline),
+            _timing(comparison.current),
+            _change(comparison.time_change),
+            f"{comparison.thresholds.time:.0%}",
+            f"{_mebibytes(comparison.baseline_peak)} -> {_mebibytes(comparison.current_peak)}",
+            _change(comparison.memory_change),
+            ", ".join(comparison.status) or "ok",
+        )
+        for comparison in comparisons
+    ]
+    header = ("benchmark", "baseline (±IQR/2)", "now (±IQR/2)", "time", "allowed", "peak MiB", "memory", "status")
+    widths = [max(len(row[column]) for row in [header] + rows) for column in range(len(header))]
+    lines = [f"--- pycodetags {title} ---"]
+    for row in [header] + rows:
+        cells = [row[0].ljust(widths[0])] + [cell.rjust(width) for cell, width in zip(row[1:-1], widths[1:-1])]
+        lines.append("  ".join(cells + [row[-1]]))
+    counts: dict[str, int] = {}
+    for comparison in comparisons:
+        for status in comparison.status or ["ok"]:
+            counts[status] = counts.get(status, 0) + 1
+    lines.append(", ".join(f"{count} {status}" for status, count in counts.items()) or "No benchmarks.")
+    return "\n".join(lines)
@@ -0,0 +1,364 @@
+"""
+The benchmarks, and running them over source trees into one JSON result.
+
+Each benchmark times one part of pycodetags over a whole corpus -- a synthetic tree from
+:mod:`pycodetags.bench.synthetic`, or the standard library of the running interpreter as real-world
+code -- and reports the time of each repeat, files per second, tags per second and the peak memory
+traced while it ran once more under ``tracemalloc``:
+
+``comment_finder``
+    ``find_comment_blocks_from_string`` over every Python file, already read.
+``parse_fields``
+    ``parse_fields`` over the field string of every PEP-350 tag.
+``aggregate``
+    ``aggregate_all_kinds_multiple_input``: walk, read, parse, convert, dedup, without the scan index.
+``id``
+    ``id_command.run`` in dry-run mode.
+``mutate``
+    ``mutator.apply_mutations`` giving every tag of up to :data:`MUTATED_FILES` files an id, on copies.
+``filter`` / ``filter_jmespath``
+    ``filter_data_by_expression`` over the aggregated tags, answered from the tag table and by JMESPath.
+``view_text``, ``view_html``, ``view_json``, ``view_jsonl``, ``view_summary``
+    Each built-in report, written to ``os.devnull``.
+
+Benchmarks run with a configuration of their own (folk and TDG tags active, no scan index), whatever
+the current folder's ``pyproject.toml`` says.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import dataclasses
+import gc
+import os
+import platform
+import shutil
+import statistics
+import sys
+import sysconfig
+import time
+import tracemalloc
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any, Callable, NamedTuple
+
+from pycodetags.__about__ import __version__
+from pycodetags.aggregate import aggregate_all_kinds_multiple_input, walk_files
+from pycodetags.app_config.config import CodeTagsConfig
+from pycodetags.data_tags.data_tags_classes import DATA
+from pycodetags.data_tags.data_tags_parsers import parse_fields, scan_codetags
+from pycodetags.data_tags.tag_record import LazyDataList
+from pycodetags.exceptions import DataTagError
+from pycodetags.filters import filter_data_by_expression
+from pycodetags.pure_data_schema import PureDataSchema
+from pycodetags.python.comment_finder import find_comment_blocks_from_string
+from pycodetags.scan_index import decode_source
+
+__all__ = ["Corpus", "Workload", "BENCHMARKS", "RESULT_FORMAT", "run_suite", "bench_config", "stdlib_root"]
+
+RESULT_FORMAT = 1
+MUTATED_FILES = 200
+"""Files the ``mutate`` benchmark rewrites per repeat."""
+
+_CONFIG = """\
+[tool.pycodetags]
+active_schemas = ["folk", "tdg"]
+use_index = false
+jobs = {jobs}
+"""
+
+
+class Workload(NamedTuple):
+    """One benchmark, ready to run."""
+
+    run: Callable[[], int | None]
+    """Does the timed work; returns how many tags it handled, or None when that does not apply."""
+    files: int
+    setup: Callable[[], None] | None = None
+    """Untimed preparation before every run."""
+
+
+class Corpus:
+    """A tree of source files to benchmark against, and what the benchmarks share about it."""
+
+    def __init__(self, name: str, root: str | os.PathLike[str], scratch: str | os.PathLike[str], jobs: int = 1):
+        self.name = name
+        self.root = str(root)
+        self.scratch = Path(scratch)
+        """A folder the benchmarks may write to."""
+        self.jobs = jobs
+        self._files: list[str] | None = None
+        self._sources: list[str] | None = None
+        self._found: LazyDataList | None = None
+
+    @property
+    def files(self) -> list[str]:
+        """Every file a scan of the corpus walks."""
+        if self._files is None:
+            self._files = walk_files(self.root, CodeTagsConfig.get_instance())
+        return self._files
+
+    @property
+    def python_files(self) -> list[str]:
+        return [file for file in self.files if file.endswith(".py")]
+
+    @property
+    def sources(self) -> list[str]:
+        """The text of every Python file that decodes."""
+        if self._sources is None:
+            self._sources = []
+            for file in self.python_files:
+                try:
+                    self._sources.append(decode_source(Path(file).read_bytes()))
+                except (OSError, UnicodeDecodeError):
+                    continue
+        return self._sources
+
+    @property
+    def found(self) -> LazyDataList:
+        """The tags of the whole corpus."""
+        if self._found is None:
+            self._found = self.aggregate()
+        return self._found
+
+    def aggregate(self) -> LazyDataList:
+        return aggregate_all_kinds_multiple_input([], [self.root], PureDataSchema, jobs=self.jobs, use_index=False)
+
+
+def _comment_finder(corpus: Corpus) -> Workload:
+    sources = corpus.sources
+
+    def run() -> None:
+        for source in sources:
+            try:
+                find_comment_blocks_from_string(source)
+            except SyntaxError:
+                # tokenize.TokenError and IndentationError included; the scan logs and skips these too.
+                continue
+
+    return Workload(run, len(sources))
+
+
+def _parse_fields(corpus: Corpus) -> Workload:
+    field_strings = [
+        field_string
+        for source in corpus.sources
+        if "<" in source
+        for _tag, _comment, field_string, _span in scan_codetags(source)
+    ]
+
+    def run() -> int:
+        for field_string in field_strings:
+            parse_fields(field_string, PureDataSchema, strict=False)
+        return len(field_strings)
+
+    return Workload(run, len(corpus.sources))
+
+
+def _aggregate(corpus: Corpus) -> Workload:
+    return Workload(lambda: len(corpus.aggregate()), len(corpus.files))
+
+
+def _id(corpus: Corpus) -> Workload:
+    # Imported here: like the CLI, only the id benchmark needs the id command.
+    from pycodetags import id_command
+
+    def run() -> int:
+        _exit_code, result = id_command.run(
+            [corpus.root], dry_run=True, counter_root=corpus.scratch, writer=lambda _line: None, jobs=corpus.jobs
+        )
+        return result.scanned
+
+    return Workload(run, len(corpus.python_files))
+
+
+def _mutate(corpus: Corpus) -> Workload:
+    # Imported here: only the mutate benchmark rewrites files.
+    from pycodetags.mutator import apply_mutations
+
+    by_file: dict[str, list[DATA]] = {}
+    for tag in corpus.found:
+        if tag.file_path and tag.offsets and tag.file_path.endswith(".py"):
+            by_file.setdefault(tag.file_path, []).append(tag)
+    chosen = sorted(by_file)[:MUTATED_FILES]
+    copies = corpus.scratch / "mutate"
+    targets = [copies / f"{number}.py" for number in range(len(chosen))]
+    mutations = []
+    for number, file in enumerate(chosen):
+        changed = []
+        for tag in by_file[file]:
+            new_tag = dataclasses.replace(tag)
+            new_tag.custom_fields = {**(tag.custom_fields or {}), "id": str(number)}
+            changed.append((tag, new_tag))
+        mutations.append(changed)
+
+    def setup() -> None:
+        copies.mkdir(parents=True, exist_ok=True)
+        for file, target in zip(chosen, targets):
+            shutil.copyfile(file, target)
+
+    def run() -> int:
+        done = 0
+        for target, changed in zip(targets, mutations):
+            try:
+                apply_mutations(target, changed)
+            except DataTagError:
+                continue
+            done += len(changed)
+        return done
+
+    return Workload(run, len(chosen), setup)
+
+
+def _filter(expression: str, as_list: bool) -> Callable[[Corpus], Workload]:
+    def workload(corpus: Corpus) -> Workload:
+        found: Any = list(corpus.found) if as_list else corpus.found
+
+        def run() -> int:
+            filter_data_by_expression(found, expression)
+            return len(found)
+
+        return Workload(run, len(corpus.files))
+
+    return workload
+
+
+def _view(name: str) -> Callable[[Corpus], Workload]:
+    def workload(corpus: Corpus) -> Workload:
+        # Imported here: the views pull in the report machinery.
+        from pycodetags import views
+
+        printer = getattr(views, f"print_{name}")
+        found = corpus.found
+
+        def run() -> int:
+            with open(os.devnull, "w", encoding="utf-8") as devnull, contextlib.redirect_stdout(devnull):
+                printer(found)
+            return len(found)
+
+        return Workload(run, len(corpus.files))
+
+    return workload
+
+
+BENCHMARKS: dict[str, Callable[[Corpus], Workload]] = {
+    "comment_finder": _comment_finder,
+    "parse_fields": _parse_fields,
+    "aggregate": _aggregate,
+    "id": _id,
+    "mutate": _mutate,
+    "filter": _filter("code_tag=='TODO' && status=='done'", as_list=False),
+    "filter_jmespath": _filter("contains(comment, 'cache') || priority=='1'", as_list=True),
+    "view_text": _view("text"),
+    "view_html": _view("html"),
+    "view_json": _view("json"),
+    "view_jsonl": _view("jsonl"),
+    "view_summary": _view("summary"),
+}
+"""Benchmark name -> prepares it for a corpus."""
+
+
+def stdlib_root() -> str:
+    """The standard library of the running interpreter."""
+    return sysconfig.get_paths()["stdlib"]
+
+
+@contextlib.contextmanager
+def bench_config(folder: str | os.PathLike[str], jobs: int = 1) -> Iterator[CodeTagsConfig]:
+    """Use the benchmark configuration, written to ``folder/pyproject.toml``, while the block runs."""
+    path = Path(folder) / "pyproject.toml"
+    path.write_text(_CONFIG.format(jobs=jobs), encoding="utf-8")
+    previous = CodeTagsConfig._instance  # pylint: disable=protected-access
+    config = CodeTagsConfig(str(path))
+    CodeTagsConfig.set_instance(config)
+    try:
+        yield config
+    finally:
+        CodeTagsConfig.set_instance(previous)
+
+
+def _measure(workload: Workload, repeat: int, memory: bool) -> dict[str, Any]:
+    times = []
+    tags = None
+    for _ in range(repeat):
+        if workload.setup:
+            workload.setup()
+        gc.collect()
+        started = time.perf_counter()
+        tags = workload.run()
+        times.append(time.perf_counter() - started)
+    median = statistics.median(times)
+    result: dict[str, Any] = {
+        "files": workload.files,
+        "tags": tags,
+        "times_s": times,
+        "median_s": median,
+        "files_per_s": workload.files / median if median else None,
+        "tags_per_s": tags / median if tags is not None and median else None,
+        "peak_bytes": None,
+    }
+    if memory:
+        if workload.setup:
+            workload.setup()
+        gc.collect()
+        tracemalloc.start()
+        try:
+            workload.run()
+            result["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return result
+
+
+def run_suite(
+    corpora: list[Corpus],
+    names: list[str] | None = None,
+    repeat: int = 3,
+    memory: bool = True,
+    progress: Callable[[str], None] | None = None,
+) -> dict[str, Any]:
+    """
+    Run benchmarks over corpora.
+
+    Args:
+        corpora: What to run against; each under :func:`bench_config` already.
+        names: Benchmarks to run, in :data:`BENCHMARKS` order; all when None.
+        repeat: Timed runs of each.
+        memory: Also run each once under ``tracemalloc`` for its peak.
+        progress: Called with a line after each benchmark.
+
+    Returns:
+        The result document: run metadata and one entry per corpus and benchmark, keyed ``corpus/name``.
+    """
+    unknown = sorted(set(names or ()) - set(BENCHMARKS))
+    if unknown:
+        raise ValueError(f"Unknown benchmarks {', '.join(unknown)}, expected some of {', '.join(BENCHMARKS)}")
+    chosen = [name for name in BENCHMARKS if names is None or name in names]
+    results: dict[str, Any] = {}
+    for corpus in corpora:
+        for name in chosen:
+            measured = _measure(BENCHMARKS[name](corpus), repeat, memory)
+            results[f"{corpus.name}/{name}"] = measured
+            if progress:
+                progress(_progress_line(f"{corpus.name}/{name}", measured))
+    return {
+        "format": RESULT_FORMAT,
+        "pycodetags": __version__,
+        "python": platform.python_version(),
+        "implementation": sys.implementation.name,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "repeat": repeat,
+        "benchmarks": results,
+    }
+
+
+def _progress_line(key: str, measured: dict[str, Any]) -> str:
+    tags_per_s = measured["tags_per_s"]
+    peak = measured["peak_bytes"]
+    return (
+        f"{key:<28} {measured['median_s']:>9.4f} s {measured['files_per_s'] or 0:>11.0f} files/s"
+        f" {'-' if tags_per_s is None else f'{tags_per_s:.0f}':>11} tags/s"
+        f" {'-' if peak is None else f'{peak / (1024 * 1024):.1f}':>8} MiB"
+    )
@@ -0,0 +1,275 @@
+"""
+Deterministic synthetic source trees to benchmark against.
+
+:func:`generate_tree` writes ``spec.files`` files under a folder: Python modules made of functions with
+comment blocks of varying size, some holding PEP-350 tags, folk tags or TDG tags, sometimes several in
+one block, plus a few text files for the plugins' ``find_source_tags``. One file in
+``spec.pathological_every`` is one of the :data:`PATHOLOGICAL` inputs instead: a 200 kB comment line, a
+5,000-line comment block, an unclosed ``<`` field list, a file that does not tokenize, a byte order mark
+and non-ASCII text, CRLF line endings, tags inside strings, an empty file, a file that is not UTF-8.
+
+Everything is drawn from ``random.Random(spec.seed)``, so the same spec always writes the same bytes;
+:attr:`TreeInfo.digest` says so.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import random
+from pathlib import Path
+from typing import Callable, NamedTuple
+
+__all__ = ["TreeSpec", "TreeInfo", "PRESETS", "PATHOLOGICAL", "generate_tree", "tree_spec", "ensure_tree"]
+
+_FORMAT = 2
+_MARKER = ".bench.json"
+_FILES_PER_FOLDER = 50
+_FOLDERS_PER_PACKAGE = 50
+_TAGS = ("TODO", "FIXME", "BUG", "HACK", "NOTE", "DONE")
+_OWNERS = ("alice", "bob", "carol", "dev", "ops")
+_WORDS = (
+    "refactor parse cache index walker field schema report render filter tag block comment value offset "
+    "worker batch config plugin token module release"
+).split()
+
+
+class TreeSpec(NamedTuple):
+    """What a synthetic tree looks like."""
+
+    files: int
+    seed: int = 350
+    tag_density: float = 0.3
+    """Share of comment blocks that hold a tag."""
+    max_block_lines: int = 12
+    """Comment blocks are 1 to this many lines."""
+    pep350: float = 0.6
+    folk: float = 0.25
+    tdg: float = 0.15
+    """Relative weights of the tag styles."""
+    multi_tag: float = 0.1
+    """Share of tagged blocks that hold 2 to 4 tags."""
+    text_files: float = 0.05
+    """Share of files that are not Python."""
+    pathological_every: int = 100
+    """One file in this many is a pathological input; 0 for none."""
+
+
+PRESETS = {
+    "1k": TreeSpec(files=1_000),
+    "10k": TreeSpec(files=10_000),
+    "100k": TreeSpec(files=100_000),
+}
+"""The standard sizes."""
+
+
+class TreeInfo(NamedTuple):
+    """What :func:`generate_tree` wrote."""
+
+    root: str
+    files: int
+    python_files: int
+    lines: int
+    bytes: int
+    digest: str
+    """sha256 over every path and its contents, in order: equal digests, equal trees."""
+
+
+def tree_spec(size: str) -> TreeSpec:
+    """
+    A preset by name, or a default spec with that many files.
+
+    >>> tree_spec("1k").files, tree_spec("2500").files
+    (1000, 2500)
+    """
+    if size in PRESETS:
+        return PRESETS[size]
+    try:
+        return TreeSpec(files=int(size))
+    except ValueError:
+        raise ValueError(f"Unknown tree size {size!r}, expected one of {', '.join(PRESETS)} or a number") from None
+
+
+def _words(rng: random.Random, count: int) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(count))
+
+
+def _pep350(rng: random.Random, indent: str) -> list[str]:
+    fields = [f"owner:{rng.choice(_OWNERS)}", f"priority:{rng.randint(0, 3)}"]
+    if rng.random() < 0.5:
+        fields.append(f"due:20{rng.randint(25, 35)}-{rng.randint(1, 12):02}-{rng.randint(1, 28):02}")
+    if rng.random() < 0.3:
+        fields.append(f"status:{rng.choice(('open', 'development', 'done'))}")
+    if rng.random() < 0.2:
+        fields.append(f'category:"{_words(rng, 2)}"')
+    return [f"{indent}# {rng.choice(_TAGS)}: {_words(rng, rng.randint(2, 8))} <{' '.join(fields)}>"]
+
+
+def _folk(rng: random.Random, indent: str) -> list[str]:
+    owner = f"({rng.choice(_OWNERS)})" if rng.random() < 0.5 else ""
+    lines = [f"{indent}# {rng.choice(_TAGS)}{owner}: {_words(rng, rng.randint(2, 8))}"]
+    if rng.random() < 0.3:
+        lines.append(f"{indent}# {_words(rng, rng.randint(3, 8))}")
+    return lines
+
+
+def _tdg(rng: random.Random, indent: str) -> list[str]:
+    lines = [
+        f"{indent}# {rng.choice(_TAGS)}: {_words(rng, rng.randint(2, 8))}",
+        f"{indent}# category={rng.choice(_WORDS)} issue={rng.randint(1, 999)} estimate={rng.randint(1, 90)}m",
+    ]
+    lines.extend(f"{indent}# {_words(rng, rng.randint(3, 10))}" for _ in range(rng.randint(0, 3)))
+    return lines
+
+
+_STYLES: tuple[Callable[[random.Random, str], list[str]], ...] = (_pep350, _folk, _tdg)
+
+
+def _comment_block(rng: random.Random, spec: TreeSpec, indent: str) -> list[str]:
+    block = [f"{indent}# {_words(rng, rng.randint(2, 10))}" for _ in range(rng.randint(1, spec.max_block_lines))]
+    if rng.random() >= spec.tag_density:
+        return block
+    tags = rng.randint(2, 4) if rng.random() < spec.multi_tag else 1
+    for _ in range(tags):
+        style = rng.choices(_STYLES, weights=(spec.pep350, spec.folk, spec.tdg))[0]
+        position = rng.randint(0, len(block))
+        block[position:position] = style(rng, indent)
+    return block
+
+
+def _python_module(rng: random.Random, spec: TreeSpec, number: int) -> str:
+    lines = [f'"""Synthetic module {number}. # TODO: not a tag, this is a docstring"""', "import os", ""]
+    for function in range(rng.randint(3, 30)):
+        lines.extend(_comment_block(rng, spec, ""))
+        lines.append(f"def function_{function}(value):")
+        lines.append('    """Docstring with a # hash that is not a comment."""')
+        if rng.random() < 0.5:
+            lines.extend(_comment_block(rng, spec, "    "))
+        lines.append(f"    total = value + {function}  # {_words(rng, 3)}")
+        lines.append('    return "# TODO: still not a comment" if total else total')
+        lines.append("")
+    return "\n".join(lines) + "\n"
+
+
+def _text_file(rng: random.Random, spec: TreeSpec, number: int) -> str:
+    lines = [f"Notes {number}", ""]
+    for _ in range(rng.randint(5, 40)):
+        lines.append(f"TODO: {_words(rng, 5)}" if rng.random() < spec.tag_density else _words(rng, 8))
+    return "\n".join(lines) + "\n"
+
+
+def _huge_line(rng: random.Random) -> bytes:
+    return ("# " + _words(rng, 30_000) + " TODO: at the far end <owner:me>\nx = 1\n").encode("utf-8")
+
+
+def _huge_block(rng: random.Random) -> bytes:
+    lines = [f"# {_words(rng, 8)}" if i % 97 else f"# FIXME: line {i} <priority:{i % 4}>" for i in range(5_000)]
+    return ("\n".join(lines) + "\nx = 1\n").encode("utf-8")
+
+
+def _unclosed_fields(rng: random.Random) -> bytes:
+    fields = " ".join(f"key{i}:{rng.choice(_WORDS)}" for i in range(2_000))
+    return f"# TODO: never closed <{fields}\n# BUG: next one <owner:me>\nx = 1\n".encode("utf-8")
+
+
+def _does_not_tokenize(rng: random.Random) -> bytes:
+    return f'# TODO: before the break <owner:me>\ndef broken(:\n    """{_words(rng, 10)}\n'.encode("utf-8")
+
+
+def _non_ascii(rng: random.Random) -> bytes:
+    text = f"# TODO: caf\xe9 cr\xe8me \u6f22\u5b57 \U0001f41b <owner:\xe9milie>\n\xe9t\xe9 = '{_words(rng, 3)}'\n"
+    return b"\xef\xbb\xbf" + text.encode("utf-8")
+
+
+def _latin1(rng: random.Random) -> bytes:
+    return f"# TODO: caf\xe9 {_words(rng, 3)} <owner:\xe9milie>\nx = 1\n".encode("latin-1")
+
+
+def _crlf_tabs(rng: random.Random) -> bytes:
+    return f"def f():\r\n\t# TODO: crlf and tabs <owner:me>\r\n\t# {_words(rng, 5)}\r\n\treturn 1\r\n".encode("utf-8")
+
+
+def _tags_in_strings(rng: random.Random) -> bytes:
+    lines = [f'text_{i} = "# TODO: {_words(rng, 4)} <owner:nobody>"' for i in range(200)]
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def _empty(rng: random.Random) -> bytes:
+    return b""
+
+
+PATHOLOGICAL: dict[str, Callable[[random.Random], bytes]] = {
+    "huge_line": _huge_line,
+    "huge_block": _huge_block,
+    "unclosed_fields": _unclosed_fields,
+    "does_not_tokenize": _does_not_tokenize,
+    "non_ascii": _non_ascii,
+    "crlf_tabs": _crlf_tabs,
+    "tags_in_strings": _tags_in_strings,
+    "empty": _empty,
+    "latin1": _latin1,
+}
+"""Inputs that are slow, odd or broken, taken in turn."""
+
+
+def _relative_path(number: int, suffix: str) -> str:
+    package = number // (_FILES_PER_FOLDER * _FOLDERS_PER_PACKAGE)
+    folder = number // _FILES_PER_FOLDER % _FOLDERS_PER_PACKAGE
+    return f"pkg_{package:03}/mod_{folder:02}/file_{number:06}{suffix}"
+
+
+def generate_tree(root: str | os.PathLike[str], spec: TreeSpec) -> TreeInfo:
+    """
+    Write the tree ``spec`` describes under ``root``.
+
+    Args:
+        root: Folder to write into; created if needed. Existing files of the same names are overwritten.
+        spec: What to write.
+
+    Returns:
+        What was written.
+    """
+    rng = random.Random(spec.seed)
+    root_path = Path(root)
+    digest = hashlib.sha256()
+    python_files = lines = size = 0
+    kinds = list(PATHOLOGICAL.values())
+    for number in range(spec.files):
+        if spec.pathological_every and number % spec.pathological_every == spec.pathological_every - 1:
+            content = kinds[number // spec.pathological_every % len(kinds)](rng)
+            suffix = ".py"
+        elif rng.random() < spec.text_files:
+            content = _text_file(rng, spec, number).encode("utf-8")
+            suffix = ".md"
+        else:
+            content = _python_module(rng, spec, number).encode("utf-8")
+            suffix = ".py"
+        relative = _relative_path(number, suffix)
+        path = root_path / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(content)
+        python_files += suffix == ".py"
+        lines += content.count(b"\n")
+        size += len(content)
+        digest.update(relative.encode("utf-8") + b"\0" + content)
+    return TreeInfo(str(root_path), spec.files, python_files, lines, size, digest.hexdigest())
+
+
+def ensure_tree(root: str | os.PathLike[str], spec: TreeSpec) -> TreeInfo:
+    """
+    :func:`generate_tree`, unless ``root`` already holds that tree from an earlier call.
+
+    A marker file next to ``root`` (so scans of ``root`` do not see it) records the spec the folder was
+    generated from; a folder with no marker, or another spec's, is generated again.
+    """
+    marker = Path(root).with_name(Path(root).name + _MARKER)
+    try:
+        recorded = json.loads(marker.read_text(encoding="utf-8"))
+        if recorded["format"] == _FORMAT and recorded["spec"] == list(spec):
+            return TreeInfo(**recorded["info"])
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    info = generate_tree(root, spec)
+    marker.write_text(json.dumps({"format": _FORMAT, "spec": list(spec), "info": info._asdict()}), encoding="utf-8")
+    return info
@@ -0,0 +1,190 @@
+"""
+The ``pycodetags cache`` command: inspect and maintain ``.pycodetags_cache``.
+
+``stats`` shows what the memoization stores and parse packs hold, and the per-function hit/miss counts
+``persistent_memoize`` accumulated across runs (only functions decorated by code built on pycodetags;
+its own scans use the parse cache), ``clear`` empties the folder, ``prune`` drops expired and
+over-budget entries (including stale parse packs and index entries) and ``verify`` decodes every entry
+and removes the broken ones.
+Every action can print JSON, so CI can track hit rates from run to run.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from pycodetags.parse_cache import PARSE_DIRNAME, ParseCache, load_tags
+from pycodetags.scan_index import INDEX_DIRNAME, INDEX_FILENAME, ScanIndex
+from pycodetags.utils.cache_utils import CacheStats, clear_cache, find_project_root, open_stores, stored_cache_stats
+
+logger = logging.getLogger(__name__)
+
+ACTIONS = ("stats", "clear", "prune", "verify")
+
+
+def _parse_packs(cache_dir: Path) -> list[ParseCache]:
+    directory = cache_dir / PARSE_DIRNAME
+    if not directory.is_dir():
+        return []
+    return [ParseCache.load(path, path.stem) for path in sorted(directory.glob("*.pack"))]
+
+
+def _stats(cache_dir: Path) -> dict[str, Any]:
+    stores = []
+    for store in open_stores(cache_dir):
+        try:
+            entries, size = store.usage()
+        except sqlite3.DatabaseError as e:
+            stores.append({"backend": store.backend, "error": str(e)})
+            continue
+        stores.append({"backend": store.backend, "entries": entries, "bytes": size})
+    functions = stored_cache_stats(cache_dir)
+    totals = sum(functions.values(), CacheStats())
+    packs = _parse_packs(cache_dir)
+    return {
+        "cache_dir": str(cache_dir),
+        "stores": stores,
+        "functions": {name: stats.to_dict() for name, stats in functions.items()},
+        "totals": totals.to_dict(),
+        "parse_cache": {
+            "packs": len(packs),
+            "entries": sum(len(pack.entries) for pack in packs),
+            "bytes": sum(pack.path.stat().st_size for pack in packs if pack.path is not None),
+        },
+    }
+
+
+def _prune(cache_dir: Path) -> dict[str, Any]:
+    memoize = sum(store.prune() for store in open_stores(cache_dir))
+    parse = 0
+    for pack in _parse_packs(cache_dir):
+        parse += pack.expire()
+        pack.save()
+    index_entries = 0
+    index_path = cache_dir / INDEX_DIRNAME / INDEX_FILENAME
+    if index_path.is_file():
+        index = ScanIndex.load(index_path, ParseCache(None, ""))
+        index_entries = index.prune()
+        index.save()
+    return {"memoize": memoize, "parse_cache": parse, "index": index_entries}
+
+
+def _verify(cache_dir: Path) -> dict[str, Any]:
+    errors = []
+    checked = removed = 0
+    for store in open_stores(cache_dir):
+        try:
+            store_checked, store_removed = store.verify()
+        except sqlite3.DatabaseError as e:
+            errors.append(str(e))
+            continue
+        checked += store_checked
+        removed += store_removed
+    parse_checked = parse_removed = 0
+    for pack in _parse_packs(cache_dir):
+        for digest, (_day, blob) in list(pack.entries.items()):
+            parse_checked += 1
+            try:
+                load_tags(blob)
+            except Exception:  # nosec # any failure to decode means the entry is useless
+                del pack.entries[digest]
+                pack.failures.pop(digest, None)
+                pack.dirty = True
+                parse_removed += 1
+        pack.save()
+    return {
+        "memoize": {"checked": checked, "removed": removed},
+        "parse_cache": {"checked": parse_checked, "removed": parse_removed},
+        "errors": errors,
+    }
+
+
+def _format_stats(report: dict[str, Any]) -> list[str]:
+    lines = [f"Cache folder: {report['cache_dir']}"]
+    for store in report["stores"]:
+        if "error" in store:
+            lines.append(f"  {store['backend']} store: unreadable ({store['error']})")
+        else:
+            lines.append(f"  {store['backend']} store: {store['entries']} entries, {store['bytes']} bytes")
+    parse = report["parse_cache"]
+    lines.append(f"  parse cache: {parse['packs']} pack(s), {parse['entries']} entries, {parse['bytes']} bytes")
+    if not report["functions"]:
+        lines.append(
+            "No memoization stats recorded yet (only functions decorated with persistent_memoize are counted)."
+        )
+        return lines
+    lines.append(
+        f"{'function':<50} {'hits':>8} {'misses':>8} {'hit rate':>8} {'writes':>8} {'evicted':>8} "
+        f"{'read':>10} {'written':>10} {'serde s':>8}"
+    )
+    for name, stats in [*report["functions"].items(), ("TOTAL", report["totals"])]:
+        serde = stats["serialize_seconds"] + stats["deserialize_seconds"]
+        lines.append(
+            f"{name:<50} {stats['hits']:>8} {stats['misses']:>8} {stats['hit_rate']:>8.1%} {stats['writes']:>8} "
+            f"{stats['evictions']:>8} {stats['bytes_read']:>10} {stats['bytes_written']:>10} {serde:>8.3f}"
+        )
+    return lines
+
+
+def run(
+    action: str,
+    *,
+    as_json: bool = False,
+    cache_dir_override: Path | None = None,
+    writer: Callable[[str], None] = print,
+) -> tuple[int, dict[str, Any]]:
+    """Run the ``cache`` command.
+
+    Args:
+        action: One of ``stats``, ``clear``, ``prune`` or ``verify``.
+        as_json: Print one JSON document instead of text.
+        cache_dir_override: Cache folder to work on; defaults to ``.pycodetags_cache`` at the project root.
+        writer: Sink for output (defaults to ``print``).
+
+    Returns:
+        ``(exit_code, report)``. Exit code is 1 when there is no project root or ``verify`` found a
+        damaged store.
+    """
+    if action not in ACTIONS:
+        raise ValueError(f"Unknown cache action {action!r}, expected one of {ACTIONS}")
+    try:
+        cache_dir = cache_dir_override or find_project_root() / ".pycodetags_cache"
+    except FileNotFoundError:
+        writer("No project root (pyproject.toml) found, so there is no cache folder.")
+        return 1, {}
+
+    exit_code = 0
+    if action == "stats":
+        report = _stats(cache_dir)
+        text = _format_stats(report)
+    elif action == "clear":
+        report = {"cache_dir": str(cache_dir), "removed": clear_cache(cache_dir, writer=logger.info)}
+        text = [f"Removed {report['removed']} item(s) from {cache_dir}."]
+    elif action == "prune":
+        report = _prune(cache_dir)
+        text = [
+            f"Pruned {report['memoize']} memoized result(s), {report['parse_cache']} parse cache "
+            f"entr{'y' if report['parse_cache'] == 1 else 'ies'} and {report['index']} index "
+            f"entr{'y' if report['index'] == 1 else 'ies'}."
+        ]
+    else:
+        report = _verify(cache_dir)
+        memoize, parse = report["memoize"], report["parse_cache"]
+        text = [
+            f"Checked {memoize['checked']} memoized result(s), removed {memoize['removed']} broken.",
+            f"Checked {parse['checked']} parse cache entries, removed {parse['removed']} broken.",
+            *(f"Error: {error}" for error in report["errors"]),
+        ]
+        exit_code = 1 if report["errors"] else 0
+
+    if as_json:
+        writer(json.dumps(report, indent=2))
+    else:
+        for line in text:
+            writer(line)
+    return exit_code, report
@@ -9,7 +9,7 @@ import os
 from collections.abc import Iterable
 from io import StringIO, TextIOWrapper
 from pathlib import Path
-from typing import TextIO, Union
+from typing import Any, TextIO, Union
 
 from pycodetags.data_tags import DATA, DataTag, DataTagSchema, convert_data_tag_to_data_object, iterate_comments
 from pycodetags.pure_data_schema import PureDataSchema
@@ -155,6 +155,10 @@ def inspect_file(
     return list(string_to_data(content, file_path=file_path, schema=schema, include_folk_tags=include_folk_tags))
 
 
+# (plugin manager, its plugins, schemas) from the last call to list_available_schemas.
+_SCHEMAS_CACHE: tuple[Any, set[Any], list[DataTagSchema]] | None = None
+
+
 def list_available_schemas() -> list[DataTagSchema]:
     """
     Discover all available schemas from pycodetags core and any loaded plugins.
@@ -162,16 +166,23 @@ def list_available_schemas() -> list[DataTagSchema]:
     Returns:
         List of DataTagSchema definitions.
     """
-    schemas = [PureDataSchema]
+    global _SCHEMAS_CACHE  # pylint: disable=global-statement
     # cyclical import
     from pycodetags.plugin_manager import get_plugin_manager
 
     pm = get_plugin_manager()
-    if hasattr(pm.hook, "provide_schemas"):
-        for result in pm.hook.provide_schemas():
-            if isinstance(result, list):
-                schemas.extend(result)
-    return schemas
+    # Plugins return the same schema dicts every time, so the hook only needs calling again when the
+    # plugin manager or its set of plugins changed. Returning the same dicts also keeps compiled schemas
+    # (pycodetags.data_tags.compiled_schema) cached by identity.
+    plugins = pm.get_plugins()
+    if _SCHEMAS_CACHE is None or _SCHEMAS_CACHE[0] is not pm or _SCHEMAS_CACHE[1] != plugins:
+        schemas = [PureDataSchema]
+        if hasattr(pm.hook, "provide_schemas"):
+            for result in pm.hook.provide_schemas():
+                if isinstance(result, list):
+                    schemas.extend(result)
+        _SCHEMAS_CACHE = (pm, plugins, schemas)
+    return list(_SCHEMAS_CACHE[2])
 
 
 def get_active_schemas(active_schema_names: list[str]) -> list[DataTagSchema]:
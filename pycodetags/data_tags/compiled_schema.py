@@ -0,0 +1,144 @@
+"""
+Per-process compiled form of a :class:`DataTagSchema`.
+
+A schema is a plain dict, convenient to write and to ship across process boundaries but slow to
+consult: the parsers used to rebuild the alias table, recompile patterns and re-derive the default
+field dispatch for every tag. :func:`compile_schema` does that once per schema and caches the result,
+first by identity (the usual case: the same dict object is passed again) and then by content (a
+process-pool worker receives an equal copy of the schema with every task).
+
+Compiled schemas are read-only snapshots. A schema dict mutated after it was compiled keeps its old
+compiled form; build a new dict instead, as :func:`~pycodetags.data_tags.data_tags_schema.merge_schemas`
+does.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import json
+from typing import TYPE_CHECKING
+
+from pycodetags.data_tags.data_tags_schema import DataTagSchema
+
+if TYPE_CHECKING:
+    from jmespath.parser import ParsedResult
+
+__all__ = ["CompiledSchema", "compile_schema", "clear_compiled_schemas", "union_matching_tags"]
+
+# Order in which parse_fields tries default-field types for a bare token. str must go last, it matches
+# everything.
+DEFAULT_TYPE_ORDER = ("int", "date", "str", "str|list[str]")
+
+# Caches never grow past this; a long-running process generating schemas on the fly just recompiles.
+_MAX_CACHED = 256
+
+
+@dataclasses.dataclass(frozen=True)
+class CompiledSchema:
+    """Everything the parsers derive from a schema, derived once."""
+
+    schema: DataTagSchema
+    name: str
+    matching_tags: frozenset[str]
+    sorted_matching_tags: tuple[str, ...]
+    field_aliases: dict[str, str]
+    """Alias or field name -> field name, as ``parse_fields`` resolves ``key:value`` pairs."""
+    promotion_aliases: dict[str, str]
+    """The schema's own ``data_field_aliases``, as ``promote_fields`` moves custom fields over."""
+    default_dispatch: tuple[tuple[str, str], ...]
+    """``(default_type, field_name)`` pairs ``parse_fields`` tries for a bare token, in order."""
+    promotion_defaults: tuple[tuple[str, str], ...]
+    """``default_fields`` items in schema order, as ``promote_fields`` converts unprocessed defaults."""
+    blank_expressions: tuple[tuple[str, str, ParsedResult | None], ...]
+    """``(field_name, expression, compiled)`` for each ``value_on_blank``; compiled is None if invalid.
+    Empty means no meta object is needed."""
+
+    def matches(self, code_tag: str) -> bool:
+        """True if ``code_tag`` is one of this schema's ``matching_tags``."""
+        return code_tag in self.matching_tags
+
+
+def _compile(schema: DataTagSchema) -> CompiledSchema:
+    field_aliases = dict(schema.get("data_field_aliases", {}))
+    field_aliases.update({key: key for key in schema.get("data_fields", {})})
+    default_fields = schema.get("default_fields", {})
+    dispatch = []
+    for default_type in DEFAULT_TYPE_ORDER:
+        default_key = default_fields.get(default_type)
+        if default_key:
+            dispatch.append((default_type.replace(" ", ""), default_key))
+    blank_expressions = []
+    for field_name, info in schema.get("field_infos", {}).items():
+        expression = info.get("value_on_blank")
+        if not expression:
+            continue
+        # Imported here: most schemas have no expressions and jmespath is slow to import.
+        import jmespath
+        from jmespath.exceptions import JMESPathError
+
+        try:
+            parsed: ParsedResult | None = jmespath.compile(expression)
+        except JMESPathError:
+            # Reported when the expression is first evaluated, as before compiling existed.
+            parsed = None
+        blank_expressions.append((field_name, expression, parsed))
+    matching_tags = schema.get("matching_tags", [])
+    return CompiledSchema(
+        schema=schema,
+        name=schema.get("name", ""),
+        matching_tags=frozenset(matching_tags),
+        sorted_matching_tags=tuple(sorted(set(matching_tags))),
+        field_aliases=field_aliases,
+        promotion_aliases=dict(schema.get("data_field_aliases", {})),
+        default_dispatch=tuple(dispatch),
+        promotion_defaults=tuple(default_fields.items()),
+        blank_expressions=tuple(blank_expressions),
+    )
+
+
+# id(schema) -> compiled; the compiled form holds the schema, so the id cannot be reused while cached.
+_BY_IDENTITY: dict[int, CompiledSchema] = {}
+_BY_CONTENT: dict[str, CompiledSchema] = {}
+
+
+def compile_schema(schema: DataTagSchema | CompiledSchema) -> CompiledSchema:
+    """Return the compiled form of ``schema``, compiling it on first use in this process.
+
+    Examples:
+        >>> from pycodetags.pure_data_schema import PureDataSchema
+        >>> compiled = compile_schema(PureDataSchema)
+        >>> compiled is compile_schema(PureDataSchema), compiled.matches("DATA")
+        (True, True)
+        >>> compile_schema(dict(PureDataSchema)) is compiled  # equal content, e.g. unpickled in a worker
+        True
+    """
+    if isinstance(schema, CompiledSchema):
+        return schema
+    compiled = _BY_IDENTITY.get(id(schema))
+    if compiled is not None and compiled.schema is schema:
+        return compiled
+    content_key = json.dumps(schema, sort_keys=True, default=str)
+    compiled = _BY_CONTENT.get(content_key)
+    if compiled is None:
+        if len(_BY_CONTENT) >= _MAX_CACHED:
+            _BY_CONTENT.clear()
+        compiled = _BY_CONTENT[content_key] = _compile(schema)
+    if len(_BY_IDENTITY) >= _MAX_CACHED:
+        _BY_IDENTITY.clear()
+    if compiled.schema is schema:
+        _BY_IDENTITY[id(schema)] = compiled
+    return compiled
+
+
+def clear_compiled_schemas() -> None:
+    """Forget every compiled schema (for tests that mutate schema dicts in place)."""
+    _BY_IDENTITY.clear()
+    _BY_CONTENT.clear()
+
+
+def union_matching_tags(schemas: list[DataTagSchema]) -> frozenset[str]:
+    """All tag names any of ``schemas`` recognizes."""
+    tags: set[str] = set()
+    for schema in schemas:
+        tags.update(compile_schema(schema).matching_tags)
+    return frozenset(tags)
@@ -1,13 +1,11 @@
 from __future__ import annotations
 
 import datetime
+import functools
 import logging
 from typing import Any
 
-import jmespath
-from jmespath.functions import Functions
-from jmespath.visitor import Options
-
+from pycodetags.data_tags.compiled_schema import CompiledSchema, compile_schema
 from pycodetags.data_tags.data_tags_classes import DATA
 from pycodetags.data_tags.data_tags_schema import DataTagFields, DataTagSchema, FieldInfo
 from pycodetags.data_tags.meta_builder import build_meta_object
@@ -133,12 +131,13 @@ def upgrade_to_specific_schema(tag_value: DataTag, schema: DataTagSchema, flat:
     return kwargs  # type: ignore[return-value]
 
 
-def promote_fields(tag: DataTag, data_tag_schema: DataTagSchema) -> None:
+def promote_fields(tag: DataTag, data_tag_schema: DataTagSchema | CompiledSchema) -> None:
+    compiled = compile_schema(data_tag_schema)
     fields = tag["fields"]
     if fields["unprocessed_defaults"]:
         for value in fields.get("unprocessed_defaults", []):
             consumed = False
-            for the_type, the_name in data_tag_schema["default_fields"].items():
+            for the_type, the_name in compiled.promotion_defaults:
                 if the_type == "int" and not fields["data_fields"].get(the_name) and not consumed:
                     try:
                         fields["data_fields"][the_name] = int(value)
@@ -183,7 +182,7 @@ def promote_fields(tag: DataTag, data_tag_schema: DataTagSchema) -> None:
             fields["data_fields"][default_key] = default_value
 
     # promote a custom_field to root field if it should have been a root field.
-    field_aliases: dict[str, str] = data_tag_schema["data_field_aliases"]
+    field_aliases: dict[str, str] = compiled.promotion_aliases
     # putative custom field, is it actually standard?
     for custom_field, custom_value in fields["custom_fields"].copy().items():
         if custom_field in field_aliases:
@@ -237,8 +236,31 @@ def promote_fields(tag: DataTag, data_tag_schema: DataTagSchema) -> None:
                     logger.warning(f"Failed to promote custom_field {full_alias}/{custom_value}, not consumed")
 
     # jmespath processing
-    meta = build_meta_object(tag.get("file_path"))
-    initialize_fields_from_schema(tag, meta, data_tag_schema["field_infos"], is_new=False)
+    _initialize_blank_fields(tag, compiled)
+
+
+def _initialize_blank_fields(tag: DataTag, compiled: CompiledSchema) -> None:
+    """``initialize_fields_from_schema(..., is_new=False)`` with the schema's precompiled expressions.
+
+    The meta object is only built when some field is actually blank.
+    """
+    result_fields = tag["fields"]["data_fields"]
+    meta: dict[str, Any] | None = None
+    for field_name, expr, parsed in compiled.blank_expressions:
+        if result_fields.get(field_name):
+            continue
+        if meta is None:
+            meta = build_meta_object(tag.get("file_path"))
+        if parsed is None:
+            value = evaluate_field_expression(expr, tag=tag, meta=meta)
+        else:
+            try:
+                value = parsed.search({"tag": tag, "meta": meta}, options=_jmespath_options())
+            except Exception as e:
+                raise ExpressionEvaluationError(f"Error evaluating expression '{expr}': {e}") from e
+        if value is not None:
+            logger.debug(f"Setting {field_name} using jmespath expression {expr}")
+            result_fields[field_name] = value
 
 
 def merge_two_dicts(x: dict[str, Any], y: dict[str, Any]) -> dict[str, Any]:
@@ -251,16 +273,25 @@ class ExpressionEvaluationError(Exception):
     pass
 
 
-class CodeTagsCustomFunctions(Functions):  # type: ignore[misc]
-    """Custom JMESPath functions for pycodetags."""
+@functools.lru_cache(maxsize=None)
+def _jmespath_options() -> Any:
+    """JMESPath options with the pycodetags custom functions; built on first use, jmespath is slow to import."""
+    import jmespath
+    from jmespath.functions import Functions
+    from jmespath.visitor import Options
 
-    @jmespath.functions.signature({"types": ["object"]}, {"types": []})  # type: ignore[untyped-decorator]
-    def _func_lookup(self, dictionary: dict[str, Any], key: Any) -> Any:
-        """
-        Performs a dynamic key lookup in a dictionary.
-        Allows expressions like lookup(my.dict, my.key_name).
-        """
-        return dictionary.get(key)
+    class CodeTagsCustomFunctions(Functions):  # type: ignore[misc]
+        """Custom JMESPath functions for pycodetags."""
+
+        @jmespath.functions.signature({"types": ["object"]}, {"types": []})  # type: ignore[untyped-decorator]
+        def _func_lookup(self, dictionary: dict[str, Any], key: Any) -> Any:
+            """
+            Performs a dynamic key lookup in a dictionary.
+            Allows expressions like lookup(my.dict, my.key_name).
+            """
+            return dictionary.get(key)
+
+    return Options(custom_functions=CodeTagsCustomFunctions())
 
 
 def evaluate_field_expression(expr: str | None, *, tag: DataTag, meta: dict[str, Any]) -> Any:
@@ -286,9 +317,11 @@ def evaluate_field_expression(expr: str | None, *, tag: DataTag, meta: dict[str,
         "meta": meta,
     }
 
+    import jmespath
+
     try:
         # compiled = jmespath.compile(expr, custom_functions=CodeTagsCustomFunctions())
-        return jmespath.search(expr, context, options=Options(custom_functions=CodeTagsCustomFunctions()))
+        return jmespath.search(expr, context, options=_jmespath_options())
         # return compiled.search(context)
     except Exception as e:
         print(expr)
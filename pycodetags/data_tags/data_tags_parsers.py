@@ -4,21 +4,31 @@ Parse specific schemas of data tags
 
 from __future__ import annotations
 
+import dataclasses
 import logging
 import re
-from collections.abc import Generator
+from collections.abc import Generator, Iterator
 from pathlib import Path
 
 from pycodetags.data_tags import folk_tags_parser
-from pycodetags.data_tags.data_tags_methods import DataTag, merge_two_dicts, promote_fields
+from pycodetags.data_tags.compiled_schema import CompiledSchema, compile_schema
+from pycodetags.data_tags.data_tags_methods import DataTag, merge_two_dicts, promote_fields  # noqa: F401
 from pycodetags.data_tags.data_tags_schema import DataTagFields, DataTagSchema
 from pycodetags.exceptions import SchemaError
+from pycodetags.profiling import span
 from pycodetags.python.comment_finder import find_comment_blocks_from_string
+from pycodetags.utils.source_text import SourceText
 
 logger = logging.getLogger(__name__)
 
 
-__all__ = ["iterate_comments_from_file", "iterate_comments"]
+__all__ = [
+    "iterate_comments_from_file",
+    "iterate_comments",
+    "RawCommentBlock",
+    "scan_comment_blocks",
+    "project_comment_blocks",
+]
 
 
 def iterate_comments_from_file(file: str, schemas: list[DataTagSchema], include_folk_tags: bool) -> Generator[DataTag]:
@@ -33,8 +43,17 @@ def iterate_comments_from_file(file: str, schemas: list[DataTagSchema], include_
     Yields:
         PEP350Tag: A generator yielding PEP-350 style code tags found in the file.
     """
+    # Imported here to avoid an import cycle.
+    from pycodetags.prefilter import prefilter_for, read_candidate
+    from pycodetags.scan_index import decode_source
+
+    _fingerprint, data = read_candidate(file, prefilter_for(schemas, include_folk_tags))
+    if data is None:
+        logger.debug(f"prefilter: no tag candidates in {file}")
+        return
     logger.info(f"iterate_comments: processing {file}")
-    yield from iterate_comments(Path(file).read_text(encoding="utf-8"), Path(file), schemas, include_folk_tags)
+    source = SourceText(decode_source(data))
+    yield from iterate_comments(source, Path(file), schemas, include_folk_tags)
 
 
 def _extend_to_comment_prefix(block: str, line_start: int, match_start: int) -> int:
@@ -54,91 +73,171 @@ def _extend_to_comment_prefix(block: str, line_start: int, match_start: int) ->
     return match_start
 
 
-def _span_to_offsets(
-    block: str, span: tuple[int, int], block_start_line: int, block_start_char: int
-) -> tuple[tuple[int, int, int, int], str]:
-    """Convert a block-relative char ``span`` to absolute file offsets + the per-tag substring.
+def _block_to_source(block_start_line: int, block_start_char: int, line: int, col: int) -> tuple[int, int]:
+    """Map a block-relative ``(line, col)`` to a source ``(line, col)``.
 
     The block string's first line is sliced at ``block_start_char`` in the source, so a column on that
     first line must be shifted by ``block_start_char``; later lines are full source lines, so their
     columns are already absolute (spec/id_and_tdg.md §7.3.5).
     """
+    return block_start_line + line, col + block_start_char if line == 0 else col
+
+
+def _span_to_offsets(
+    block: SourceText, span: tuple[int, int], block_start_line: int, block_start_char: int
+) -> tuple[tuple[int, int, int, int], str]:
+    """Convert a block-relative char ``span`` to absolute file offsets + the per-tag substring."""
     raw_start, end = span
     # Start of the block-line that contains raw_start.
-    line_start = block.rfind("\n", 0, raw_start) + 1  # 0 if no newline before
-    start = _extend_to_comment_prefix(block, line_start, raw_start)
+    line_start = block.line_starts[block.position(raw_start)[0]]
+    start = _extend_to_comment_prefix(block.text, line_start, raw_start)
+
+    start_line, start_char = _block_to_source(block_start_line, block_start_char, *block.position(start))
+    end_line, end_char = _block_to_source(block_start_line, block_start_char, *block.position(end))
+    return (start_line, start_char, end_line, end_char), block.text[start:end]
+
+
+def _relocate(
+    offsets: tuple[int, int, int, int] | None, block_start_line: int, block_start_char: int
+) -> tuple[int, int, int, int]:
+    """Map block-relative offsets reported by the folk and TDG parsers to source offsets."""
+    a, b, c, d = offsets or (0, 0, 0, 0)
+    return (
+        *_block_to_source(block_start_line, block_start_char, a, b),
+        *_block_to_source(block_start_line, block_start_char, c, d),
+    )
 
-    def to_abs(char_index: int) -> tuple[int, int]:
-        dline = block.count("\n", 0, char_index)
-        cur_line_start = block.rfind("\n", 0, char_index) + 1
-        col = char_index - cur_line_start
-        if dline == 0:
-            col += block_start_char
-        return block_start_line + dline, col
 
-    start_line, start_char = to_abs(start)
-    end_line, end_char = to_abs(end)
-    return (start_line, start_char, end_line, end_char), block[start:end]
+@dataclasses.dataclass(frozen=True)
+class RawCommentBlock:
+    """A comment block as found in a file, before any schema has looked at it.
 
+    PEP-350 tags are recognized and tokenized without a schema, so they are kept as matches with their
+    source offsets; blocks without one keep only their text for the folk and TDG passes, which depend on
+    the schemas' tag names. See :func:`scan_comment_blocks` and :func:`project_comment_blocks`.
+    """
 
-def iterate_comments(
-    source: str, source_file: Path | None, schemas: list[DataTagSchema], include_folk_tags: bool
-) -> Generator[DataTag]:
+    start_line: int
+    start_char: int
+    text: str
+    matches: tuple[tuple[_CodeTagMatch, tuple[int, int, int, int], str], ...] = ()
+    """``(match, offsets, original_text)`` for each PEP-350 tag in the block."""
+
+    def to_plain(self) -> tuple:
+        """The block as nested tuples of strings and ints, which ``marshal`` can store."""
+        matches = tuple(
+            (match.code_tag, match.comment, match.field_tokens.pairs, match.field_tokens.tokens, match.span, *located)
+            for match, *located in self.matches
+        )
+        return self.start_line, self.start_char, self.text, matches
+
+    @classmethod
+    def from_plain(cls, plain: tuple) -> RawCommentBlock:
+        """Inverse of :meth:`to_plain`."""
+        start_line, start_char, text, matches = plain
+        return cls(
+            start_line,
+            start_char,
+            text,
+            tuple(
+                (
+                    _CodeTagMatch(code_tag, comment, FieldTokens(tuple(pairs), tuple(tokens)), tuple(span)),
+                    tuple(offsets),
+                    original,
+                )
+                for code_tag, comment, pairs, tokens, span, offsets, original in matches
+            ),
+        )
+
+
+def scan_comment_blocks(source: str | SourceText, keep_untagged: bool = True) -> list[RawCommentBlock]:
     """
-    Collect PEP-350 style code tags from a given file.
+    Find the comment blocks of a source and the PEP-350 tags in them: the schema-independent half of
+    :func:`iterate_comments`.
 
     Args:
-        source (str): The source text to process.
-        source_file (Path): Where did the source come from
-        schemas (DataTaSchema): Schemas that will be detected in file
-        include_folk_tags (bool): Include folk schemas that do not strictly follow PEP350
+        source (str | SourceText): The source text to process.
+        keep_untagged (bool): Keep blocks without a PEP-350 tag. Only the folk and TDG passes use them.
 
-    Yields:
-        PEP350Tag: A generator yielding PEP-350 style code tags found in the file.
+    Returns:
+        list[RawCommentBlock]: The blocks, in source order.
+    """
+    blocks: list[RawCommentBlock] = []
+    with span("find_comment_blocks"):
+        found_blocks = find_comment_blocks_from_string(SourceText.coerce(source))
+    with span("parse_fields"):
+        for start_line, start_char, _end_line, _end_char, final_comment in found_blocks:
+            # Recognize and tokenize once; only classifying the fields is done per schema.
+            matches = _match_codetags(final_comment)
+            if matches:
+                block = SourceText(final_comment)
+                # Per-tag offsets/original_text from each match's block span, so multiple tags in one
+                # comment block do not all claim the whole block (spec/id_and_tdg.md Part 7).
+                located = tuple(
+                    (match, *_span_to_offsets(block, match.span, start_line, start_char)) for match in matches
+                )
+                blocks.append(RawCommentBlock(start_line, start_char, final_comment, located))
+            elif keep_untagged:
+                blocks.append(RawCommentBlock(start_line, start_char, final_comment))
+    return blocks
+
+
+def project_comment_blocks(
+    blocks: list[RawCommentBlock],
+    source_file: Path | str | None,
+    schemas: list[DataTagSchema],
+    include_folk_tags: bool,
+) -> list[DataTag]:
+    """
+    Classify scanned comment blocks against schemas: the schema-dependent half of
+    :func:`iterate_comments`. Projecting the same blocks again, with other schemas, reads nothing.
+
+    Args:
+        blocks (list[RawCommentBlock]): From :func:`scan_comment_blocks`.
+        source_file (Path | str | None): Where the source came from.
+        schemas (list[DataTagSchema]): Schemas that will be detected.
+        include_folk_tags (bool): Include folk schemas that do not strictly follow PEP350.
+
+    Returns:
+        list[DataTag]: The tags, exactly as :func:`iterate_comments` yields them.
     """
     if not schemas and not include_folk_tags:
         raise SchemaError("No active schemas, not looking for folk tags. Won't find anything.")
+    compiled = [compile_schema(schema) for schema in schemas]
+    folk_tag_sets = [schema.matching_tags for schema in compiled if schema.matching_tags] if include_folk_tags else []
+    tdg_schemas = [schema for schema in schemas if schema.get("name") == "TDG"]
+    file_path = str(source_file) if source_file else None
     things: list[DataTag] = []
-    for _start_line, _start_char, _end_line, _end_char, final_comment in find_comment_blocks_from_string(source):
+    for raw in blocks:
         # Can only be one comment block now!
         logger.debug(f"Search for {[_['name'] for _ in schemas]} schema tags")
-        found_data_tags = []
-        for schema in schemas:
-            tags_with_spans = parse_codetags_with_spans(final_comment, schema, strict=False)
-            found_data_tags = [tag for tag, _ in tags_with_spans]
-
-            for found, span in tags_with_spans:
-                found["file_path"] = str(source_file) if source_file else None
-                found["original_schema"] = "PEP350"
-                # Per-tag offsets/original_text from each match's block span, so multiple tags in one
-                # comment block do not all claim the whole block (spec/id_and_tdg.md Part 7).
-                offsets, original_text = _span_to_offsets(final_comment, span, _start_line, _start_char)
-                found["offsets"] = offsets
-                found["original_text"] = original_text
-
-            if found_data_tags:
-                logger.debug(f"Found data tags! : {','.join(_['code_tag'] for _ in found_data_tags)}")
-            things.extend(found_data_tags)
-
-        for schema in schemas:
-            if not found_data_tags and include_folk_tags and schema["matching_tags"]:
-                # BUG: fails if there are two in the same. Blank out consumed text, reconsume bock <matth 2025-07-04
-                #  category:parser priority:high status:development release:1.0.0 iteration:1>
-                found_folk_tags: list[DataTag] = []
-                # TODO: support config of folk schema.<matth 2025-07-04 category:config priority:high status:development release:1.0.0 iteration:1>
-                folk_tags_parser.process_text(
-                    final_comment,
-                    allow_multiline=True,
-                    default_field_meaning="assignee",
-                    found_tags=found_folk_tags,
-                    file_path=str(source_file) if source_file else "",
-                    valid_tags=schema["matching_tags"],
-                )
+        # Every schema yields its own copy of each tag, dedup_data_objects keeps the first.
+        if raw.matches and compiled:
+            logger.debug(f"Found data tags! : {','.join(match.code_tag for match, _o, _t in raw.matches)}")
+            for compiled_schema in compiled:
+                for match, offsets, original_text in raw.matches:
+                    found = _build_codetag(match, compiled_schema)
+                    found["file_path"] = file_path
+                    found["original_schema"] = "PEP350"
+                    found["offsets"] = offsets
+                    found["original_text"] = original_text
+                    things.append(found)
+            continue
+
+        block = SourceText(raw.text)
+        if folk_tag_sets:
+            # BUG: fails if there are two in the same. Blank out consumed text, reconsume bock <matth 2025-07-04
+            #  category:parser priority:high status:development release:1.0.0 iteration:1>
+            # TODO: support config of folk schema.<matth 2025-07-04 category:config priority:high status:development release:1.0.0 iteration:1>
+            for found_folk_tags in folk_tags_parser.process_text_for_tag_sets(
+                block,
+                allow_multiline=True,
+                default_field_meaning="assignee",
+                file_path=file_path or "",
+                tag_sets=folk_tag_sets,
+            ):
                 for found_folk_tag in found_folk_tags:
-                    # BUG: Offsets here are buggy. <matth 2025-07-04 category:config priority:high status:development release:1.0.0>
-                    a, b, c, d = found_folk_tag["offsets"] or (0, 0, 0, 0)
-                    new_offset = _start_line + a, _start_char + b, _end_line + c, _end_char + d
-                    found_folk_tag["offsets"] = new_offset
+                    found_folk_tag["offsets"] = _relocate(found_folk_tag["offsets"], raw.start_line, raw.start_char)
 
                 if found_folk_tags:
                     logger.debug(f"Found folk tags! : {','.join(_['code_tag'] for _ in found_folk_tags)}")
@@ -146,21 +245,39 @@ def iterate_comments(
 
         # TDG pass: only for TDG-named schemas, only when PEP-350 found nothing in this block.
         # PEP-350 wins; TDG is the fallback. Imported here to avoid an import cycle.
-        if not found_data_tags:
+        if tdg_schemas:
             from pycodetags.data_tags import tdg_tags_parser
 
-            for schema in schemas:
-                if schema.get("name") != "TDG":
-                    continue
-                for tdg_tag in tdg_tags_parser.iterate_comments(final_comment, source_file, [schema]):
-                    a, b, c, d = tdg_tag["offsets"] or (0, 0, 0, 0)
-                    # The block string's first line is sliced at _start_char, so its in-block char
-                    # offset is relative to that; later lines are full source lines, so their char
-                    # offset is already absolute.
-                    abs_start_char = _start_char + b if a == 0 else b
-                    tdg_tag["offsets"] = (_start_line + a, abs_start_char, _start_line + c, d)
+            source_path = Path(source_file) if isinstance(source_file, str) else source_file
+            for schema in tdg_schemas:
+                for tdg_tag in tdg_tags_parser.iterate_comments(block, source_path, [schema]):
+                    tdg_tag["offsets"] = _relocate(tdg_tag["offsets"], raw.start_line, raw.start_char)
                     things.append(tdg_tag)
 
+    return things
+
+
+def iterate_comments(
+    source: str | SourceText, source_file: Path | None, schemas: list[DataTagSchema], include_folk_tags: bool
+) -> Generator[DataTag]:
+    """
+    Collect PEP-350 style code tags from a given file.
+
+    Args:
+        source (str | SourceText): The source text to process.
+        source_file (Path): Where did the source come from
+        schemas (DataTaSchema): Schemas that will be detected in file
+        include_folk_tags (bool): Include folk schemas that do not strictly follow PEP350
+
+    Yields:
+        PEP350Tag: A generator yielding PEP-350 style code tags found in the file.
+    """
+    if not schemas and not include_folk_tags:
+        raise SchemaError("No active schemas, not looking for folk tags. Won't find anything.")
+    keep_untagged = include_folk_tags or any(schema.get("name") == "TDG" for schema in schemas)
+    blocks = scan_comment_blocks(source, keep_untagged=keep_untagged)
+    with span("parse_fields"):
+        things = project_comment_blocks(blocks, source_file, schemas, include_folk_tags)
     yield from things
 
 
@@ -191,8 +308,34 @@ def is_int(s: str) -> bool:
     return s.isdigit()
 
 
+# key:value / key=value pairs in a field string.
+# - Handles quoted values (single or double) allowing any characters inside.
+# - For unquoted values, it now strictly matches one or more characters that are NOT:
+#   - whitespace `\s`
+#   - single quote `'`
+#   - double quote `"`
+#   - angle bracket `<` (which signals end of field string)
+#   - a comma `,` (unless it's part of a quoted string or explicitly for assignee splitting)
+#   The change here ensures it stops at whitespace, which correctly separates '1' from '2025-06-15'.
+_KEY_VALUE_PATTERN = re.compile(
+    r"""
+    ([a-zA-Z_][a-zA-Z0-9_]*) # Key (group 1): alphanumeric key name
+    \s*[:=]\s* # Separator (colon or equals, with optional spaces)
+    (                        # Start of value group (group 2)
+        '(?:[^'\\]|\\.)*' |  # Match single-quoted string (non-greedy, allowing escaped quotes)
+        "(?:[^"\\]|\\.)*" |  # Match double-quoted string (non-greedy, allowing escaped quotes)
+        (?:[^\s'"<]+)       # Unquoted value: one or more characters not in \s ' " <
+    )
+    """,
+    re.VERBOSE,  # Enable verbose regex for comments and whitespace
+)
+
+# A standalone date token, assigned to the schema's "date" default field.
+_DATE_PATTERN = re.compile(r"(\d{4}-\d{2}-\d{2})")
+
+
 def parse_fields(
-    field_string: str, schema: DataTagSchema, strict: bool  # pylint: disable=unused-argument
+    field_string: str, schema: DataTagSchema | CompiledSchema, strict: bool  # pylint: disable=unused-argument
 ) -> DataTagFields:
     """
     Parse a field string from a PEP-350 style code tag and return a dictionary of fields.
@@ -205,73 +348,41 @@ def parse_fields(
     Returns:
         Fields: A dictionary containing the parsed fields.
     """
-    legit_names = {}
-    for key in schema["data_fields"]:
-        legit_names[key] = key
-    field_aliases: dict[str, str] = merge_two_dicts(schema["data_field_aliases"], legit_names)
+    return classify_fields(tokenize_field_string(field_string), schema)
 
-    fields: DataTagFields = {
-        "default_fields": {},
-        "data_fields": {},
-        "custom_fields": {},
-        "unprocessed_defaults": [],
-        "identity_fields": [],
-    }
 
-    # Updated key_value_pattern:
-    # - Handles quoted values (single or double) allowing any characters inside.
-    # - For unquoted values, it now strictly matches one or more characters that are NOT:
-    #   - whitespace `\s`
-    #   - single quote `'`
-    #   - double quote `"`
-    #   - angle bracket `<` (which signals end of field string)
-    #   - a comma `,` (unless it's part of a quoted string or explicitly for assignee splitting)
-    #   The change here ensures it stops at whitespace, which correctly separates '1' from '2025-06-15'.
-    key_value_pattern = re.compile(
-        r"""
-        ([a-zA-Z_][a-zA-Z0-9_]*) # Key (group 1): alphanumeric key name
-        \s*[:=]\s* # Separator (colon or equals, with optional spaces)
-        (                        # Start of value group (group 2)
-            '(?:[^'\\]|\\.)*' |  # Match single-quoted string (non-greedy, allowing escaped quotes)
-            "(?:[^"\\]|\\.)*" |  # Match double-quoted string (non-greedy, allowing escaped quotes)
-            (?:[^\s'"<]+)       # Unquoted value: one or more characters not in \s ' " <
-        )
-        """,
-        re.VERBOSE,  # Enable verbose regex for comments and whitespace
-    )
+@dataclasses.dataclass(frozen=True)
+class FieldTokens:
+    """A field string split into ``key:value`` pairs and bare tokens, before any schema is applied."""
+
+    pairs: tuple[tuple[str, str], ...]
+    """``(key, value)`` in order of appearance, quotes stripped from the value."""
+    tokens: tuple[str, ...]
+    """Whitespace-separated tokens that were not part of a pair."""
 
+
+def tokenize_field_string(field_string: str) -> FieldTokens:
+    """Split a field string into pairs and bare tokens. This part of parsing does not depend on the schema.
+
+    Examples:
+        >>> tokenize_field_string("alice p:high note='two words' 2025-01-02")
+        FieldTokens(pairs=(('p', 'high'), ('note', 'two words')), tokens=('alice', '2025-01-02'))
+    """
     key_value_matches = []
     # Find all key-value pairs in the field_string
-    for match in key_value_pattern.finditer(field_string):
+    for match in _KEY_VALUE_PATTERN.finditer(field_string):
         # Store the span (start, end indices) of the match, the key, and the raw value
         key_value_matches.append((match.span(), match.group(1), match.group(2)))
 
-    # Process extracted key-value pairs
-    for (_start_idx, _end_idx), key, value_raw in key_value_matches:
-        key_lower = key.lower()
-
+    pairs = []
+    for _span, key, value_raw in key_value_matches:
         # Strip quotes from the value if it was quoted
         value = value_raw
         if value.startswith("'") and value.endswith("'"):
             value = value[1:-1]
         elif value.startswith('"') and value.endswith('"'):
             value = value[1:-1]
-
-        # Assign the parsed value to the appropriate field
-        if key_lower in field_aliases:
-            normalized_key: str = field_aliases[key_lower]
-            # TODO: handle assignee/ str|list[str] catdogs in a more general fashion <matth 2025-07-13 status=inprogress category=catdogs priority=high release=1.0.0>
-            # if normalized_key == "assignee":
-            #     # Assignees can be comma-separated in unquoted values
-            #     if "assignee" in fields["data_fields"]:
-            #         fields["data_fields"]["assignee"].extend([v.strip() for v in value.split(",") if v])
-            #     else:
-            #         fields["data_fields"]["assignee"] = [v.strip() for v in value.split(",") if v]
-            # else:
-            fields["data_fields"][normalized_key] = value
-        else:
-            # If not a predefined field, add to custom_fields
-            fields["custom_fields"][key] = value
+        pairs.append((key, value))
 
     # Extract remaining tokens that were not part of any key-value pair
     consumed_spans = sorted([span for span, _, _ in key_value_matches])
@@ -297,13 +408,55 @@ def parse_fields(
     other_tokens_raw = " ".join(unconsumed_segments)
     other_tokens = [token.strip() for token in other_tokens_raw.split() if token.strip()]
 
-    # Process these remaining tokens for dates (origination_date) and assignees (initials)
-    date_pattern = re.compile(r"(\d{4}-\d{2}-\d{2})")
+    return FieldTokens(tuple(pairs), tuple(other_tokens))
+
+
+def classify_fields(field_tokens: FieldTokens, schema: DataTagSchema | CompiledSchema) -> DataTagFields:
+    """Assign tokenized fields to a schema's data, custom and default fields.
+
+    Args:
+        field_tokens (FieldTokens): Output of :func:`tokenize_field_string`.
+        schema (DataTagSchema): The schema defining the fields and their aliases.
+
+    Returns:
+        Fields: A dictionary containing the parsed fields.
+    """
+    compiled = compile_schema(schema)
+    field_aliases = compiled.field_aliases
+
+    fields: DataTagFields = {
+        "default_fields": {},
+        "data_fields": {},
+        "custom_fields": {},
+        "unprocessed_defaults": [],
+        "identity_fields": [],
+    }
 
+    # Process extracted key-value pairs
+    for key, value in field_tokens.pairs:
+        key_lower = key.lower()
+
+        # Assign the parsed value to the appropriate field
+        if key_lower in field_aliases:
+            normalized_key: str = field_aliases[key_lower]
+            # TODO: handle assignee/ str|list[str] catdogs in a more general fashion <matth 2025-07-13 status=inprogress category=catdogs priority=high release=1.0.0>
+            # if normalized_key == "assignee":
+            #     # Assignees can be comma-separated in unquoted values
+            #     if "assignee" in fields["data_fields"]:
+            #         fields["data_fields"]["assignee"].extend([v.strip() for v in value.split(",") if v])
+            #     else:
+            #         fields["data_fields"]["assignee"] = [v.strip() for v in value.split(",") if v]
+            # else:
+            fields["data_fields"][normalized_key] = value
+        else:
+            # If not a predefined field, add to custom_fields
+            fields["custom_fields"][key] = value
+
+    # Process these remaining tokens for dates (origination_date) and assignees (initials)
     # This is too domain specific. Let a plugin handle user aliases.
     # initials_pattern = re.compile(r"^[A-Z,]+$")  # Matches comma-separated uppercase initials
 
-    for token in other_tokens:
+    for token in field_tokens.tokens:
         # handles this case:
         # <foo:bar
         #   fizz:buzz
@@ -312,31 +465,28 @@ def parse_fields(
             continue
         matched_default = False
 
-        # for default_type, default_key in schema["default_fields"].items():
-        # str must go last, it matches everything!
+        # str must go last, it matches everything! compiled.default_dispatch keeps that order.
         matched_default = False
-        for default_type in ["int", "date", "str", "str|list[str]"]:
-            default_key = schema["default_fields"].get(default_type)
-            if default_key:
-                # Default fields!
-                if not matched_default:
-                    if default_type == "date" and date_pattern.match(token):
-                        # Assign default_key from a standalone date token
-                        fields["default_fields"][default_key] = token  # type: ignore[assignment]
-                        matched_default = True
-                    elif default_type.replace(" ", "") == "str|list[str]":  # initials_pattern.match(token):
-                        # Add standalone initials to assignees list
-                        if default_key in fields["default_fields"]:
-                            fields["default_fields"][default_key].extend([t.strip() for t in token.split(",") if t])
-                        else:
-                            fields["default_fields"][default_key] = [t.strip() for t in token.split(",") if t]
-                        matched_default = True
-                    elif default_type == "int" and is_int(token):
-                        fields["default_fields"][default_key] = token  # type: ignore[assignment]
-                        matched_default = True
-                    elif default_type == "str":
-                        fields["default_fields"][default_key] = token  # type: ignore[assignment]
-                        matched_default = True
+        for default_type, default_key in compiled.default_dispatch:
+            # Default fields!
+            if not matched_default:
+                if default_type == "date" and _DATE_PATTERN.match(token):
+                    # Assign default_key from a standalone date token
+                    fields["default_fields"][default_key] = token  # type: ignore[assignment]
+                    matched_default = True
+                elif default_type == "str|list[str]":  # initials_pattern.match(token):
+                    # Add standalone initials to assignees list
+                    if default_key in fields["default_fields"]:
+                        fields["default_fields"][default_key].extend([t.strip() for t in token.split(",") if t])
+                    else:
+                        fields["default_fields"][default_key] = [t.strip() for t in token.split(",") if t]
+                    matched_default = True
+                elif default_type == "int" and is_int(token):
+                    fields["default_fields"][default_key] = token  # type: ignore[assignment]
+                    matched_default = True
+                elif default_type == "str":
+                    fields["default_fields"][default_key] = token  # type: ignore[assignment]
+                    matched_default = True
 
         if not matched_default:
             fields["unprocessed_defaults"].append(token)
@@ -344,21 +494,99 @@ def parse_fields(
     return fields
 
 
-_CODE_TAG_REGEX = re.compile(
-    r"""
-    (?P<code_tag>[A-Z\?\!]{3,}) # Code tag (e.g., TODO, FIXME, BUG)
-    \s*:\s* # Colon separator with optional whitespace
-    (?P<comment>.*?)            # Comment text (non-greedy)
-    <                           # Opening angle bracket for fields
-    (?P<field_string>.*?)       # Field string (non-greedy)
-    >                           # Closing angle bracket for fields
-    """,
-    re.DOTALL | re.VERBOSE,  # DOTALL allows . to match newlines, VERBOSE allows comments in regex
-)
+# A run of code tag characters (e.g., TODO, FIXME, BUG); a tag is a run of at least three.
+_TAG_RUN = re.compile(r"[A-Z\?\!]+")
+_WHITESPACE = re.compile(r"\s*")
+
+
+def scan_codetags(text_block: str) -> Iterator[tuple[str, str, str, tuple[int, int]]]:
+    """Find PEP-350 tags in a block in one left-to-right pass.
+
+    A tag is a run of at least three of ``A-Z?!``, optional whitespace and a colon, the comment up to the
+    next ``<`` and the field string up to the next ``>`` (both may span lines). This is what the former
+    ``re.DOTALL`` regex ``(?P<code_tag>[A-Z?!]{3,})\\s*:\\s*(?P<comment>.*?)<(?P<field_string>.*?)>`` matched,
+    with the same ``finditer`` spans, but that regex restarted at every position and rescanned the rest
+    of the block whenever a ``TAG:`` had no ``<...>`` after it. Here every character is looked at a
+    bounded number of times: an anchor without a bracket pair after it ends the scan, because no later
+    anchor can have one either, and a run that is not followed by a colon is skipped as a whole, because
+    no suffix of it is.
+
+    Yields:
+        ``(code_tag, comment, field_string, (start, end))``, with comment and field string unstripped and
+        the span from the start of the tag through the closing ``>``.
+
+    Examples:
+        >>> list(scan_codetags("# TODO: fix this <alice 2025-01-01> and FIXME: that <p:1>"))
+        [('TODO', 'fix this ', 'alice 2025-01-01', (2, 35)), ('FIXME', 'that ', 'p:1', (40, 57))]
+        >>> list(scan_codetags("# NOTE: no fields, so nothing < here"))
+        []
+    """
+    pos = 0
+    while True:
+        run = _TAG_RUN.search(text_block, pos)
+        if run is None:
+            return
+        after_tag = _WHITESPACE.match(text_block, run.end()).end()
+        if run.end() - run.start() < 3 or text_block[after_tag : after_tag + 1] != ":":
+            # Every later start inside the run is shorter and is followed by the same text.
+            pos = after_tag if after_tag > run.end() else run.end()
+            continue
+        open_bracket = text_block.find("<", after_tag + 1)
+        if open_bracket == -1:
+            return
+        close_bracket = text_block.find(">", open_bracket + 1)
+        if close_bracket == -1:
+            return
+        comment_start = _WHITESPACE.match(text_block, after_tag + 1).end()
+        yield (
+            run.group(),
+            text_block[comment_start:open_bracket],
+            text_block[open_bracket + 1 : close_bracket],
+            (run.start(), close_bracket + 1),
+        )
+        pos = close_bracket + 1
+
+
+@dataclasses.dataclass(frozen=True)
+class _CodeTagMatch:
+    """One PEP-350 tag found in a block: the schema-independent part of parsing it."""
+
+    code_tag: str
+    comment: str
+    field_tokens: FieldTokens
+    span: tuple[int, int]
+
+
+def _match_codetags(text_block: str) -> list[_CodeTagMatch]:
+    """Find and tokenize the PEP-350 tags in a block. Done once per block, whatever the number of schemas."""
+    matches = []
+    for code_tag, comment, field_string, span in scan_codetags(text_block):
+        matches.append(
+            _CodeTagMatch(
+                code_tag=code_tag,
+                comment=comment.strip().rstrip(" \n#"),  # Clean up comment
+                # Replace newlines in fields with spaces
+                field_tokens=tokenize_field_string(field_string.strip().replace("\n", " ")),
+                span=span,
+            )
+        )
+    return matches
+
+
+def _build_codetag(match: _CodeTagMatch, compiled: CompiledSchema) -> DataTag:
+    """Classify a matched tag against one schema."""
+    tag: DataTag = {
+        "code_tag": match.code_tag,
+        "comment": match.comment,
+        "fields": classify_fields(match.field_tokens, compiled),
+        "original_text": "N/A",  # Overwritten per-tag by iterate_comments when from a file.
+    }
+    promote_fields(tag, compiled)
+    return tag
 
 
 def parse_codetags_with_spans(
-    text_block: str, data_tag_schema: DataTagSchema, strict: bool
+    text_block: str, data_tag_schema: DataTagSchema | CompiledSchema, strict: bool  # pylint: disable=unused-argument
 ) -> list[tuple[DataTag, tuple[int, int]]]:
     """Parse PEP-350 tags and return each with its block-relative ``(start, end)`` char span.
 
@@ -367,25 +595,8 @@ def parse_codetags_with_spans(
     (spec/id_and_tdg.md Part 7). This is the internal worker; :func:`parse_codetags` is the public
     shape and does not expose spans.
     """
-    results: list[tuple[DataTag, tuple[int, int]]] = []
-    for match in _CODE_TAG_REGEX.finditer(text_block):
-        tag_parts = {
-            "code_tag": match.group("code_tag").strip(),
-            "comment": match.group("comment").strip().rstrip(" \n#"),  # Clean up comment
-            "field_string": match.group("field_string")
-            .strip()
-            .replace("\n", " "),  # Replace newlines in fields with spaces
-        }
-        fields = parse_fields(tag_parts["field_string"], data_tag_schema, strict)
-        tag: DataTag = {
-            "code_tag": tag_parts["code_tag"],
-            "comment": tag_parts["comment"],
-            "fields": fields,
-            "original_text": "N/A",  # Overwritten per-tag by iterate_comments when from a file.
-        }
-        promote_fields(tag, data_tag_schema)
-        results.append((tag, match.span()))
-    return results
+    compiled = compile_schema(data_tag_schema)
+    return [(_build_codetag(match, compiled), match.span) for match in _match_codetags(text_block)]
 
 
 def parse_codetags(text_block: str, data_tag_schema: DataTagSchema, strict: bool) -> list[DataTag]:
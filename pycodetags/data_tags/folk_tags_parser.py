@@ -24,13 +24,39 @@ from __future__ import annotations
 
 import logging
 import re
+from collections.abc import Collection
+from functools import lru_cache
 
 from pycodetags.data_tags.data_tags_methods import DataTag
+from pycodetags.utils.source_text import SourceText
 
-__all__ = ["process_text"]
+__all__ = ["process_text", "process_text_for_tag_sets"]
 
 logger = logging.getLogger(__name__)
 
+# Regex pattern to match URLs with or without scheme
+_URL_PATTERN = re.compile(r"(https?://[^\s]+|[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}/[^\s]+)")
+_TAG_LINE_PATTERN = re.compile(r"\s*#\s*([A-Z]+)\b(.*)")
+_FIELDS_PATTERN = re.compile(r"\(([^)]*)\):(.*)")
+_ID_PATTERN = re.compile(r"(\d+):(.*)")
+
+
+_LINE_TAG_SHAPE = re.compile(r"[A-Z]+")
+
+
+@lru_cache(maxsize=64)
+def _split_tag_set(valid_tags: frozenset[str]) -> tuple[frozenset[str], frozenset[str]]:
+    """Split tags into those with the shape ``_TAG_LINE_PATTERN`` captures and the rest."""
+    line_tags = frozenset(tag for tag in valid_tags if _LINE_TAG_SHAPE.fullmatch(tag))
+    return line_tags, valid_tags - line_tags
+
+
+@lru_cache(maxsize=64)
+def _next_tag_pattern(valid_tags: frozenset[str]) -> re.Pattern[str]:
+    """One pattern for "this comment line starts another valid tag", instead of one search per tag."""
+    words = "|".join(re.escape(tag) for tag in sorted(valid_tags, key=lambda tag: (-len(tag), tag)))
+    return re.compile(rf"#\s*(?:{words})\b")
+
 
 def extract_first_url(text: str) -> str | None:
     """
@@ -42,9 +68,7 @@ def extract_first_url(text: str) -> str | None:
     Returns:
         str | None: The first URL found in the text, or None if no URL is found.
     """
-    # Regex pattern to match URLs with or without scheme
-    pattern = r"(https?://[^\s]+|[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}/[^\s]+)"
-    match = re.search(pattern, text)
+    match = _URL_PATTERN.search(text)
     return match.group(0) if match else None
 
 
@@ -53,22 +77,43 @@ def probably_pep350(text: str) -> bool:
 
 
 def process_text(
-    text: str,
+    text: str | SourceText,
     allow_multiline: bool,
     default_field_meaning: str,
     found_tags: list[DataTag],
     file_path: str,
-    valid_tags: list[str],
+    valid_tags: Collection[str],
 ) -> None:
-    if probably_pep350(text):
+    found_tags.extend(
+        process_text_for_tag_sets(text, allow_multiline, default_field_meaning, file_path, [valid_tags])[0]
+    )
+
+
+def process_text_for_tag_sets(
+    text: str | SourceText,
+    allow_multiline: bool,
+    default_field_meaning: str,
+    file_path: str,
+    tag_sets: list[Collection[str]],
+) -> list[list[DataTag]]:
+    """Like :func:`process_text` once per entry of ``tag_sets``, matching each line against the tag shape once.
+
+    Which lines end a multi-line tag depends on the valid tags, so each distinct tag set still assembles
+    its own tags, but only from the lines already recognized; repeated tag sets get copies.
+
+    Returns:
+        The found tags for each entry of ``tag_sets``, in the same order.
+    """
+    source = SourceText.coerce(text)
+    if probably_pep350(source.text):
         # This will miss a folk tag in a block with a pep350 tag.
         # Without this guard, pep350 tags spread across 2 lines are interpreted as folk tags.
-        return
+        return [[] for _ in tag_sets]
 
-    if "\r\n" in text:
-        lines = text.split("\r\n")
-    else:
-        lines = text.split("\n")
+    lines = source.lines()
+    tag_lines = [_TAG_LINE_PATTERN.match(line) for line in lines]
+    if not any(tag_lines):
+        return [[] for _ in tag_sets]
 
     if len(lines) == 1:
         logger.debug(f"Processing  {file_path}: {lines[0]}")
@@ -76,18 +121,50 @@ def process_text(
         for log_line in lines:
             logger.debug(f"Processing {file_path} ==>: {log_line}")
 
-    line_index = 0
-    while line_index < len(lines):
-        consumed_lines = process_line(
-            file_path,
-            found_tags,
-            lines,
-            line_index,
-            valid_tags,
-            allow_multiline,
-            default_field_meaning,
-        )
-        line_index += consumed_lines
+    # Tags that cannot start any line of this block do not change the result, so tag sets that agree on
+    # the rest share one assembly. Tags outside the [A-Z]+ line shape are always kept.
+    present = {match.group(1) for match in tag_lines if match}
+    by_tag_set: dict[tuple[bool, frozenset[str]], list[DataTag]] = {}
+    results = []
+    for valid_tags in tag_sets:
+        line_tags, other_tags = _split_tag_set(frozenset(valid_tags))
+        key = (bool(valid_tags), line_tags.intersection(present) | other_tags)
+        if key in by_tag_set:
+            # Callers update the tags they get (offsets), so never hand out the same dicts twice.
+            results.append([_copy_tag(tag) for tag in by_tag_set[key]])
+            continue
+        found_tags: list[DataTag] = []
+        line_index = 0
+        while line_index < len(lines):
+            consumed_lines = process_line(
+                file_path,
+                found_tags,
+                lines,
+                line_index,
+                valid_tags,
+                allow_multiline,
+                default_field_meaning,
+                tag_lines,
+            )
+            line_index += consumed_lines
+        by_tag_set[key] = found_tags
+        results.append(found_tags)
+    return results
+
+
+def _copy_tag(tag: DataTag) -> DataTag:
+    """Copy a folk tag down to its field lists (cheaper than ``copy.deepcopy``)."""
+    fields = tag["fields"]
+    return {
+        **tag,  # type: ignore[typeddict-item]
+        "fields": {
+            "unprocessed_defaults": list(fields["unprocessed_defaults"]),
+            "default_fields": {key: list(value) for key, value in fields["default_fields"].items()},
+            "data_fields": dict(fields["data_fields"]),
+            "custom_fields": dict(fields["custom_fields"]),
+            "identity_fields": list(fields["identity_fields"]),
+        },
+    }
 
 
 def process_line(
@@ -95,13 +172,14 @@ def process_line(
     found_tags: list[DataTag],
     lines: list[str],
     start_idx: int,
-    valid_tags: list[str],
+    valid_tags: Collection[str],
     allow_multiline: bool,
     default_field_meaning: str,
+    tag_lines: list[re.Match[str] | None] | None = None,
 ) -> int:
     current_line = lines[start_idx]
 
-    match = re.match(r"\s*#\s*([A-Z]+)\b(.*)", current_line)
+    match = tag_lines[start_idx] if tag_lines is not None else _TAG_LINE_PATTERN.match(current_line)
     if not match:
         return 1
 
@@ -119,11 +197,12 @@ def process_line(
 
     current_idx = start_idx
     if allow_multiline and valid_tags:
+        next_tag = _next_tag_pattern(frozenset(valid_tags))
         multiline_content = [content]
         next_idx = current_idx + 1
         while next_idx < len(lines):
             next_line = lines[next_idx].strip()
-            if next_line.startswith("#") and not any(re.match(rf"#\s*{t}\b", next_line) for t in valid_tags):
+            if next_line.startswith("#") and not next_tag.match(next_line):
                 multiline_content.append(next_line.lstrip("# "))
                 next_idx += 1
             else:
@@ -141,7 +220,7 @@ def process_line(
     custom_fields = {}
     comment = content
 
-    field_match = re.match(r"\(([^)]*)\):(.*)", content)
+    field_match = _FIELDS_PATTERN.match(content)
     if field_match:
         field_section = field_match.group(1).strip()
         comment = field_match.group(2).strip()
@@ -159,7 +238,7 @@ def process_line(
                 else:
                     default_field += ", " + part
     else:
-        id_match = re.match(r"(\d+):(.*)", content)
+        id_match = _ID_PATTERN.match(content)
         if id_match:
             default_field = id_match.group(1)
             comment = id_match.group(2).strip()
@@ -6,6 +6,7 @@ from __future__ import annotations
 
 import datetime
 import os
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, cast
 
@@ -34,9 +35,18 @@ def get_project_version_from_toml(pyproject_path: str = "pyproject.toml") -> str
     Returns:
         The project version string, or "0.0.0" if not found.
     """
-    if tomllib is None or not os.path.exists(pyproject_path):
+    if tomllib is None:
         return "0.0.0"
+    try:
+        st = os.stat(pyproject_path)
+    except OSError:
+        return "0.0.0"
+    # Called for every tag that needs meta; only re-read the file when it changed.
+    return _read_project_version(os.path.abspath(pyproject_path), st.st_mtime_ns, st.st_size)
+
 
+@lru_cache(maxsize=16)
+def _read_project_version(pyproject_path: str, _mtime_ns: int, _size: int) -> str:
     try:
         with open(pyproject_path, "rb") as f:
             data = tomllib.load(f)
@@ -0,0 +1,339 @@
+"""
+Compact, immutable tag records and a sequence that turns them into :class:`DATA` on demand.
+
+A :class:`DATA` object is a regular dataclass: a ``__dict__``, five dicts and lists of fields and a
+``data_meta`` attribute pointing back at itself, so every tag is a reference cycle only the garbage
+collector can free. That is the right shape for code that decorates, mutates and serializes tags, but
+a scan that finds tens of thousands of tags only needs to hold, deduplicate and filter them.
+
+:class:`TagRecord` carries the same information in ``__slots__``: the tag name, file path and schema
+name are interned (one string per distinct value across a scan), offsets are a tuple and the field
+mappings are :class:`FrozenFields`, whose key tuples are shared between every record with the same
+field names. Records cannot be changed after construction.
+
+:class:`LazyDataList` is what the aggregation functions hand to views and plugins: a read-only
+sequence of :class:`DATA` that materializes each element the first time it is read and keeps it, so
+``found[0] is found[0]`` and a plugin that mutates a tag sees its change the next time it looks.
+"""
+
+from __future__ import annotations
+
+import sys
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from dataclasses import FrozenInstanceError
+from typing import TYPE_CHECKING, Any, Callable, Union, overload
+
+from pycodetags.data_tags.data_tags_classes import DATA
+from pycodetags.data_tags.data_tags_methods import upgrade_to_specific_schema
+from pycodetags.exceptions import DataTagError
+
+if TYPE_CHECKING:
+    from pycodetags.data_tags.tag_table import TagTable
+
+__all__ = ["FrozenFields", "TagRecord", "LazyDataList", "EMPTY_FIELDS"]
+
+# Field-name tuples seen so far. Schemas have a handful of fields, so a scan produces a few dozen
+# distinct tuples at most and every record shares one of them.
+_KEY_TUPLES: dict[tuple[str, ...], tuple[str, ...]] = {}
+
+# Field values at most this long are interned too: priorities, statuses, assignees and dates repeat
+# across thousands of tags, free text does not.
+_INTERN_VALUES_UP_TO = 32
+
+
+def _intern(value: str | None) -> str | None:
+    return sys.intern(value) if type(value) is str else value  # pylint: disable=unidiomatic-typecheck
+
+
+def _freeze_value(value: Any) -> Any:
+    if isinstance(value, list):
+        return tuple(_freeze_value(item) for item in value)
+    if type(value) is str and len(value) <= _INTERN_VALUES_UP_TO:  # pylint: disable=unidiomatic-typecheck
+        return sys.intern(value)
+    return value
+
+
+def _thaw_value(value: Any) -> Any:
+    return [_thaw_value(item) for item in value] if isinstance(value, tuple) else value
+
+
+class FrozenFields(Mapping[str, Any]):
+    """A small read-only mapping: one shared tuple of keys and a tuple of values.
+
+    List values are stored as tuples and short string values are interned; :meth:`thaw` turns the
+    mapping back into the plain dict of lists the parsers produced.
+
+    >>> fields = FrozenFields.from_dict({"assignee": ["alice"], "priority": "high"})
+    >>> fields["assignee"], len(fields)
+    (('alice',), 2)
+    >>> fields.thaw()
+    {'assignee': ['alice'], 'priority': 'high'}
+    """
+
+    __slots__ = ("_keys", "_values")
+
+    def __init__(self, keys: tuple[str, ...] = (), values: tuple[Any, ...] = ()) -> None:
+        object.__setattr__(self, "_keys", _KEY_TUPLES.setdefault(keys, keys))
+        object.__setattr__(self, "_values", values)
+
+    @classmethod
+    def from_dict(cls, fields: Mapping[str, Any] | None) -> FrozenFields:
+        """Freeze a field dict; empty or missing dicts share :data:`EMPTY_FIELDS`."""
+        if not fields:
+            return EMPTY_FIELDS
+        return cls(
+            tuple(sys.intern(key) for key in fields),
+            tuple(_freeze_value(value) for value in fields.values()),
+        )
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return self._values[self._keys.index(key)]
+        except ValueError:
+            raise KeyError(key) from None
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise FrozenInstanceError(f"cannot assign to field {name!r}")
+
+    def __repr__(self) -> str:
+        return f"FrozenFields({dict(zip(self._keys, self._values))!r})"
+
+    def thaw(self) -> dict[str, Any]:
+        """A new mutable dict, tuples turned back into lists."""
+        return {key: _thaw_value(value) for key, value in zip(self._keys, self._values)}
+
+
+EMPTY_FIELDS = FrozenFields()
+
+
+class TagRecord:
+    """One found tag, classified against one schema. Immutable and ``__slots__``-only.
+
+    Holds exactly what :func:`~pycodetags.data_tags.data_tags_methods.convert_data_tag_to_data_object`
+    would pass to :class:`DATA`; :meth:`to_data` builds that object.
+    """
+
+    __slots__ = (
+        "code_tag",
+        "comment",
+        "title",
+        "body",
+        "tag_id",
+        "default_fields",
+        "data_fields",
+        "custom_fields",
+        "unprocessed_defaults",
+        "file_path",
+        "original_text",
+        "original_schema",
+        "offsets",
+    )
+
+    code_tag: str | None
+    comment: str | None
+    title: str | None
+    body: str | None
+    tag_id: str | None
+    default_fields: FrozenFields
+    data_fields: FrozenFields
+    custom_fields: FrozenFields
+    unprocessed_defaults: tuple[str, ...]
+    file_path: str | None
+    original_text: str | None
+    original_schema: str | None
+    offsets: tuple[int, int, int, int] | None
+
+    def __init__(
+        self,
+        code_tag: str | None = "DATA",
+        comment: str | None = None,
+        title: str | None = None,
+        body: str | None = None,
+        tag_id: str | None = None,
+        default_fields: Mapping[str, Any] | None = None,
+        data_fields: Mapping[str, Any] | None = None,
+        custom_fields: Mapping[str, Any] | None = None,
+        unprocessed_defaults: Iterable[str] | None = None,
+        file_path: str | None = None,
+        original_text: str | None = None,
+        original_schema: str | None = None,
+        offsets: Iterable[int] | None = None,
+    ) -> None:
+        init = object.__setattr__
+        init(self, "code_tag", _intern(code_tag))
+        init(self, "comment", comment)
+        init(self, "title", title)
+        init(self, "body", body)
+        init(self, "tag_id", tag_id)
+        init(self, "default_fields", FrozenFields.from_dict(default_fields))
+        init(self, "data_fields", FrozenFields.from_dict(data_fields))
+        init(self, "custom_fields", FrozenFields.from_dict(custom_fields))
+        init(self, "unprocessed_defaults", tuple(unprocessed_defaults) if unprocessed_defaults else ())
+        init(self, "file_path", _intern(file_path))
+        init(self, "original_text", original_text)
+        init(self, "original_schema", _intern(original_schema))
+        init(self, "offsets", tuple(offsets) if offsets is not None else None)
+
+    @classmethod
+    def from_data_tag(cls, tag: Any, schema: Any) -> TagRecord:
+        """Classify a parsed ``DataTag`` against ``schema``, as ``convert_data_tag_to_data_object`` does."""
+        return cls(**upgrade_to_specific_schema(tag, schema))
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise FrozenInstanceError(f"cannot assign to field {name!r}")
+
+    def __delattr__(self, name: str) -> None:
+        raise FrozenInstanceError(f"cannot delete field {name!r}")
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, TagRecord):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"TagRecord(code_tag={self.code_tag!r}, comment={self.comment!r}, file_path={self.file_path!r})"
+
+    def to_data(self, data_class: type[DATA] = DATA) -> DATA:
+        """A new ``data_class`` instance with mutable copies of the fields."""
+        return data_class(
+            code_tag=self.code_tag,
+            comment=self.comment,
+            title=self.title,
+            body=self.body,
+            tag_id=self.tag_id,
+            default_fields=self.default_fields.thaw(),
+            data_fields=self.data_fields.thaw(),
+            custom_fields=self.custom_fields.thaw(),
+            unprocessed_defaults=list(self.unprocessed_defaults),
+            file_path=self.file_path,
+            original_text=self.original_text,
+            original_schema=self.original_schema,
+            offsets=self.offsets,
+        )
+
+    def to_flat_dict(self, include_comment_and_tag: bool = False, raise_on_doubles: bool = True) -> dict[str, Any]:
+        """Same as :meth:`DATA.to_flat_dict`, without building the DATA object."""
+        data = self.data_fields.thaw()
+        for key, value in self.custom_fields.items():
+            if raise_on_doubles and key in data:
+                raise DataTagError("Field in data_fields and custom fields")
+            data[key] = _thaw_value(value)
+        if include_comment_and_tag:
+            if self.comment:
+                data["comment"] = self.comment
+            if self.code_tag:
+                data["code_tag"] = self.code_tag
+        return data
+
+
+TagItem = Union[TagRecord, DATA]
+"""What a :class:`LazyDataList` holds: records from source, DATA objects collected from live modules."""
+
+
+class LazyDataList(Sequence[DATA]):
+    """A read-only list of :class:`DATA` backed by :class:`TagRecord` objects.
+
+    Each element is materialized on first access and cached. Compares equal to any sequence with the
+    same DATA objects in the same order. Materializing is not thread safe: call :meth:`materialize`
+    before sharing the list between threads.
+    """
+
+    __slots__ = ("_items", "_materialized", "_data_class", "_table")
+
+    def __init__(self, items: Iterable[TagItem] = (), data_class: type[DATA] = DATA) -> None:
+        self._items: list[TagItem] = list(items)
+        self._materialized: list[DATA | None] | None = None
+        self._data_class = data_class
+        self._table: TagTable | None = None
+
+    @property
+    def table(self) -> TagTable:
+        """The columnar :class:`~pycodetags.data_tags.tag_table.TagTable` over these tags, built once."""
+        if self._table is None:
+            # Imported here to avoid an import cycle (tag_table builds on this module).
+            from pycodetags.data_tags.tag_table import TagTable
+
+            self._table = TagTable.from_items(self)
+        return self._table
+
+    @property
+    def items(self) -> Sequence[TagItem]:
+        """The underlying records (and pre-built DATA objects), without materializing anything."""
+        return tuple(self._items)
+
+    def materialize(self) -> None:
+        """Build every DATA object now, so later reads, from any thread, only return cached ones."""
+        for index in range(len(self._items)):
+            self._get(index)
+
+    def _get(self, index: int) -> DATA:
+        item = self._items[index]
+        if isinstance(item, DATA):
+            return item
+        if self._materialized is None:
+            self._materialized = [None] * len(self._items)
+        data = self._materialized[index]
+        if data is None:
+            data = item.to_data(self._data_class)
+            self._materialized[index] = data
+        return data
+
+    @overload
+    def __getitem__(self, index: int) -> DATA: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[DATA]: ...
+
+    def __getitem__(self, index: int | slice) -> DATA | list[DATA]:
+        if isinstance(index, slice):
+            return [self._get(i) for i in range(*index.indices(len(self._items)))]
+        if index < 0:
+            index += len(self._items)
+        if not 0 <= index < len(self._items):
+            raise IndexError("LazyDataList index out of range")
+        return self._get(index)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[DATA]:
+        for index in range(len(self._items)):
+            yield self._get(index)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Sequence) or isinstance(other, str):
+            return NotImplemented
+        return len(self) == len(other) and all(mine == theirs for mine, theirs in zip(self, other))
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __add__(self, other: Iterable[DATA]) -> list[DATA]:
+        return [*self, *other]
+
+    def __radd__(self, other: Iterable[DATA]) -> list[DATA]:
+        return [*other, *self]
+
+    def __repr__(self) -> str:
+        return f"LazyDataList({len(self._items)} tags)"
+
+    def where(self, predicate: Callable[[TagItem], bool]) -> LazyDataList:
+        """The items for which ``predicate(record_or_data)`` is true, still unmaterialized."""
+        return self.take(index for index, item in enumerate(self._items) if predicate(item))
+
+    def take(self, indices: Iterable[int]) -> LazyDataList:
+        """The items at ``indices``, in that order, still unmaterialized."""
+        selected = LazyDataList(data_class=self._data_class)
+        materialized = self._materialized
+        for index in indices:
+            # Keep an already materialized object so identity (and any edits) survive filtering.
+            cached = materialized[index] if materialized else None
+            selected._items.append(cached if cached is not None else self._items[index])
+        return selected
@@ -0,0 +1,292 @@
+"""
+Column-oriented tag table for filters, grouping, sorting and counts.
+
+Reports mostly ask the same few questions of every tag: which tag, which file, what status, whose. A
+``list[DATA]`` answers each with a Python attribute lookup (or a ``to_flat_dict()``) per tag per pass.
+:class:`TagTable` stores those answers once, as a struct of arrays:
+
+- ``code_tag``, ``file_path``, ``status`` and ``assignee`` are dictionary encoded: a list of distinct
+  values, an ``array`` of integer codes, one per row, and for each value the array of rows holding it.
+- ``start_line``, ``start_char``, ``end_line`` and ``end_char`` are ``array('l')`` columns, ``-1`` for
+  tags without offsets.
+- ``comment`` is a plain list.
+
+Equality filters, counts, grouping and sorting by those columns read the per-value row arrays, so they
+cost the size of the answer rather than a pass over every tag. Rows map back to the sequence the table
+was built from, so a view can still get the :class:`DATA` object for the rows it prints, and only those.
+
+Tables are built once and never change; :meth:`TagTable.take` makes a new table of selected rows.
+
+>>> table = TagTable.from_items([DATA(code_tag="TODO", comment="a"), DATA(code_tag="BUG", comment="b"),
+...                              DATA(code_tag="TODO", comment="c")])
+>>> table.counts("code_tag")
+{'TODO': 2, 'BUG': 1}
+>>> [table.comment[row] for row in table.where_eq("code_tag", "TODO")]
+['a', 'c']
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Hashable, Iterable, Iterator, Sequence
+from itertools import chain, compress
+from typing import Any, Callable
+
+from pycodetags.data_tags.data_tags_classes import DATA
+from pycodetags.data_tags.tag_record import LazyDataList, TagItem
+
+__all__ = ["DictColumn", "TagTable", "DICT_COLUMNS", "OFFSET_COLUMNS"]
+
+DICT_COLUMNS = ("code_tag", "file_path", "status", "assignee")
+OFFSET_COLUMNS = ("start_line", "start_char", "end_line", "end_char")
+
+
+def _hashable(value: Any) -> Hashable:
+    # Field values are strings, dates and ints; lists (several assignees) are held as tuples.
+    return tuple(value) if isinstance(value, list) else value
+
+
+def _merge_rows(postings: list[array]) -> array:
+    """Several ascending row lists as one ascending list."""
+    if len(postings) == 1:
+        return postings[0]
+    return array("l", sorted(chain.from_iterable(postings)))
+
+
+class DictColumn:
+    """A dictionary-encoded column: distinct ``values``, one integer code per row and, per code, the
+    ascending rows that have it (built as rows are added, or on first use for a :meth:`take`)."""
+
+    __slots__ = ("codes", "values", "_index", "_postings")
+
+    def __init__(self, values: list[Any] | None = None, index: dict[Any, int] | None = None) -> None:
+        self.codes = array("l")
+        self.values: list[Any] = values if values is not None else []
+        self._index: dict[Any, int] = index if index is not None else {}
+        self._postings: list[array] | None = [array("l") for _ in self.values]
+
+    def append(self, value: Any) -> None:
+        """Add a row; only used while a table is being built."""
+        code = self._index.get(value)
+        if code is None:
+            code = self._index[value] = len(self.values)
+            self.values.append(value)
+            if self._postings is not None:
+                self._postings.append(array("l"))
+        if self._postings is not None:
+            self._postings[code].append(len(self.codes))
+        self.codes.append(code)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, row: int) -> Any:
+        return self.values[self.codes[row]]
+
+    def code_of(self, value: Any) -> int | None:
+        """The code for ``value``, or None if it is not in the dictionary."""
+        return self._index.get(_hashable(value))
+
+    def postings(self) -> list[array]:
+        """For each code, the ascending rows holding it."""
+        if self._postings is None:
+            postings = [array("l") for _ in self.values]
+            appenders = [rows.append for rows in postings]
+            for row, code in enumerate(self.codes):
+                appenders[code](row)
+            self._postings = postings
+        return self._postings
+
+    def rows_equal(self, value: Any) -> array:
+        """Rows whose value equals ``value``, in row order."""
+        code = self.code_of(value)
+        if code is None:
+            return array("l")
+        return array("l", self.postings()[code])
+
+    def rows_not_equal(self, value: Any) -> array:
+        """Rows whose value differs from ``value``, in row order."""
+        code = self.code_of(value)
+        if code is None:
+            return array("l", range(len(self.codes)))
+        return array("l", compress(range(len(self.codes)), map(code.__ne__, self.codes)))
+
+    def counts(self) -> dict[Any, int]:
+        """``{value: rows}`` for every value present, in dictionary order."""
+        return {value: len(rows) for value, rows in zip(self.values, self.postings()) if rows}
+
+    def take(self, rows: Iterable[int]) -> DictColumn:
+        """A column of the selected rows, sharing this column's dictionary."""
+        taken = DictColumn(self.values, self._index)
+        taken.codes = array("l", map(self.codes.__getitem__, rows))
+        taken._postings = None  # rebuilt on first use
+        return taken
+
+    def grouped_postings(self, key: Callable[[Any], Any]) -> list[tuple[Any, array]]:
+        """``(key(value), rows)`` for each distinct key present, rows ascending, groups in the order
+        their first row appears."""
+        by_key: dict[Any, list[array]] = {}
+        for value, rows in zip(self.values, self.postings()):
+            if rows:
+                by_key.setdefault(key(value), []).append(rows)
+        groups = [(group_key, _merge_rows(postings)) for group_key, postings in by_key.items()]
+        groups.sort(key=lambda group: group[1][0])
+        return groups
+
+
+class TagTable:
+    """Struct-of-arrays view of a sequence of tags. See the module docstring."""
+
+    def __init__(self, source: Sequence[DATA] = (), positions: Sequence[int] | None = None) -> None:
+        self.source = source
+        """The sequence the rows came from; row ``i`` is ``source[positions[i]]``."""
+        self.positions = positions
+        """None when row ``i`` is ``source[i]``."""
+        self.columns: dict[str, DictColumn] = {name: DictColumn() for name in DICT_COLUMNS}
+        self.offsets: dict[str, array] = {name: array("l") for name in OFFSET_COLUMNS}
+        self.comment: list[str | None] = []
+        self.field_conflicts = False
+        """True if some row has a field in both data_fields and custom_fields (``to_flat_dict`` raises)."""
+
+    @classmethod
+    def from_items(cls, found: Sequence[DATA]) -> TagTable:
+        """Build a table over ``found``. A :class:`LazyDataList` is read without materializing DATA."""
+        table = cls(found)
+        items: Iterable[TagItem] = found.items if isinstance(found, LazyDataList) else found
+        code_tag, file_path, status, assignee = (table.columns[name] for name in DICT_COLUMNS)
+        start_line, start_char, end_line, end_char = (table.offsets[name] for name in OFFSET_COLUMNS)
+        comments = table.comment
+        conflicts = False
+        for item in items:
+            data_fields = item.data_fields or {}
+            custom_fields = item.custom_fields or {}
+            if data_fields and custom_fields and not conflicts:
+                conflicts = not data_fields.keys().isdisjoint(custom_fields.keys())
+            # Same precedence as to_flat_dict: custom fields overlay data fields, falsy tags are absent.
+            code_tag.append(item.code_tag or None)
+            file_path.append(item.file_path)
+            status.append(_hashable(custom_fields.get("status", data_fields.get("status"))))
+            assignee.append(_hashable(custom_fields.get("assignee", data_fields.get("assignee"))))
+            comments.append(item.comment)
+            offsets = item.offsets or (-1, -1, -1, -1)
+            start_line.append(offsets[0])
+            start_char.append(offsets[1])
+            end_line.append(offsets[2])
+            end_char.append(offsets[3])
+        table.field_conflicts = conflicts
+        return table
+
+    @classmethod
+    def of(cls, found: Sequence[DATA]) -> TagTable:
+        """The table for ``found``: cached on a :class:`LazyDataList`, built otherwise."""
+        if isinstance(found, LazyDataList):
+            return found.table
+        return cls.from_items(found)
+
+    def __len__(self) -> int:
+        return len(self.comment)
+
+    def column(self, name: str) -> DictColumn:
+        """One of the :data:`DICT_COLUMNS`."""
+        try:
+            return self.columns[name]
+        except KeyError:
+            raise KeyError(f"{name!r} is not a dictionary-encoded column, expected one of {DICT_COLUMNS}") from None
+
+    def where_eq(self, name: str, value: Any) -> array:
+        """Rows where column ``name`` equals ``value``."""
+        return self.column(name).rows_equal(value)
+
+    def where_ne(self, name: str, value: Any) -> array:
+        """Rows where column ``name`` does not equal ``value``."""
+        return self.column(name).rows_not_equal(value)
+
+    def where_in(self, name: str, values: Iterable[Any]) -> array:
+        """Rows where column ``name`` is one of ``values``."""
+        column = self.column(name)
+        codes = {code for code in (column.code_of(value) for value in values) if code is not None}
+        return array("l", compress(range(len(self)), map(codes.__contains__, column.codes)))
+
+    def where_range(self, name: str, low: int | None = None, high: int | None = None) -> array:
+        """Rows where offset column ``name`` is in ``[low, high)``; rows without offsets never match."""
+        values = self.offsets[name]
+        low = 0 if low is None or low < 0 else low
+        if high is None:
+            return array("l", compress(range(len(values)), map(low.__le__, values)))
+        return array("l", (row for row, value in enumerate(values) if low <= value < high))
+
+    def counts(self, name: str) -> dict[Any, int]:
+        """``{value: rows}`` for column ``name``, in first-seen order."""
+        return self.column(name).counts()
+
+    def group_rows(
+        self,
+        name: str,
+        normalize: Callable[[Any], Any] | None = None,
+        rows: Iterable[int] | None = None,
+    ) -> dict[Any, list[int]]:
+        """Rows grouped by the (optionally normalized) value of column ``name``, rows in row order and
+        groups in the order of their first row."""
+        column = self.column(name)
+        if rows is None:
+            groups = column.grouped_postings(normalize or (lambda value: value))
+            return {group_key: list(group_rows) for group_key, group_rows in groups}
+        keys = [normalize(value) if normalize else value for value in column.values]
+        grouped: dict[Any, list[int]] = {}
+        codes = column.codes
+        for row in rows:
+            key = keys[codes[row]]
+            group = grouped.get(key)
+            if group is None:
+                grouped[key] = [row]
+            else:
+                group.append(row)
+        return grouped
+
+    def sorted_rows(
+        self,
+        name: str,
+        key: Callable[[Any], Any] = lambda value: value,
+        rows: Iterable[int] | None = None,
+    ) -> list[int]:
+        """Rows ordered by ``key(value)`` of column ``name``; stable, so ties keep row order.
+
+        ``name`` may also be ``"comment"`` or an offset column.
+        """
+        if name in self.columns and rows is None:
+            # Concatenate each key's rows in key order: no per-row comparison.
+            groups = self.columns[name].grouped_postings(key)
+            groups.sort(key=lambda group: group[0])
+            return list(chain.from_iterable(group_rows for _key, group_rows in groups))
+        selected = range(len(self)) if rows is None else rows
+        if name in self.columns:
+            column = self.columns[name]
+            ranks = {group_key: rank for rank, group_key in enumerate(sorted({key(v) for v in column.values}))}
+            row_keys = [ranks[key(value)] for value in column.values]
+            codes = column.codes
+            return sorted(selected, key=lambda row: row_keys[codes[row]])
+        values = self.comment if name == "comment" else self.offsets[name]
+        return sorted(selected, key=lambda row: key(values[row]))
+
+    def take(self, rows: Iterable[int]) -> TagTable:
+        """A new table of the selected rows, in the given order."""
+        rows = array("l", rows)
+        taken = TagTable(self.source, array("l", map(self.position, rows)))
+        taken.columns = {name: column.take(rows) for name, column in self.columns.items()}
+        taken.offsets = {name: array("l", map(values.__getitem__, rows)) for name, values in self.offsets.items()}
+        taken.comment = [self.comment[row] for row in rows]
+        taken.field_conflicts = self.field_conflicts
+        return taken
+
+    def position(self, row: int) -> int:
+        """Index into :attr:`source` of ``row``."""
+        return row if self.positions is None else self.positions[row]
+
+    def data(self, row: int) -> DATA:
+        """The DATA object for ``row``, materialized if the source is lazy."""
+        return self.source[self.position(row)]
+
+    def iter_data(self, rows: Iterable[int] | None = None) -> Iterator[DATA]:
+        """DATA objects for ``rows`` (all rows by default), in that order."""
+        for row in range(len(self)) if rows is None else rows:
+            yield self.data(row)
@@ -26,12 +26,14 @@ from __future__ import annotations
 
 import logging
 import re
-from collections.abc import Generator
+from collections.abc import Collection, Generator
 from pathlib import Path
 
+from pycodetags.data_tags.compiled_schema import compile_schema, union_matching_tags
 from pycodetags.data_tags.data_tags_methods import DataTag
 from pycodetags.data_tags.data_tags_parsers import parse_fields
 from pycodetags.data_tags.data_tags_schema import DataTagSchema
+from pycodetags.utils.source_text import SourceText
 
 logger = logging.getLogger(__name__)
 
@@ -89,11 +91,9 @@ def _clean_body_line(line: str) -> str:
     return _COMMENT_PREFIX_RE.sub("", line)
 
 
-def _matches_a_tag(tag: str, valid_tags: list[str]) -> bool:
-    return tag in valid_tags
-
-
-def iterate_comments(source: str, source_file: Path | None, schemas: list[DataTagSchema]) -> Generator[DataTag]:
+def iterate_comments(
+    source: str | SourceText, source_file: Path | None, schemas: list[DataTagSchema]
+) -> Generator[DataTag]:
     """Yield TDG-style :class:`DataTag` objects found in ``source``.
 
     Args:
@@ -104,10 +104,11 @@ def iterate_comments(source: str, source_file: Path | None, schemas: list[DataTa
     Yields:
         DataTag dicts with ``original_schema == "TDG"`` and block-relative offsets.
     """
-    if "\r\n" in source:
-        lines = source.split("\r\n")
-    else:
-        lines = source.split("\n")
+    lines = SourceText.coerce(source).lines()
+    compiled = [compile_schema(schema) for schema in schemas]
+    # Set of tag names that count as a terminating "new anchor" within a body. A line like
+    # `# NOTE:` is NOT a recognized tag, so it is body text, not a boundary.
+    valid_tags = union_matching_tags(schemas)
 
     i = 0
     n = len(lines)
@@ -120,21 +121,11 @@ def iterate_comments(source: str, source_file: Path | None, schemas: list[DataTa
         code_tag = anchor.group(1).strip()
 
         # Find the schema that recognizes this tag.
-        active_schema: DataTagSchema | None = None
-        for schema in schemas:
-            if _matches_a_tag(code_tag, schema.get("matching_tags", [])):
-                active_schema = schema
-                break
+        active_schema = next((schema.schema for schema in compiled if schema.matches(code_tag)), None)
         if active_schema is None:
             i += 1
             continue
 
-        # Set of tag names that count as a terminating "new anchor" within a body. A line like
-        # `# NOTE:` is NOT a recognized tag, so it is body text, not a boundary.
-        valid_tags = set()
-        for schema in schemas:
-            valid_tags.update(schema.get("matching_tags", []))
-
         tag, next_i = _parse_one_tag(
             lines, i, code_tag, anchor.group(2).strip(), active_schema, source_file, valid_tags
         )
@@ -143,7 +134,7 @@ def iterate_comments(source: str, source_file: Path | None, schemas: list[DataTa
         i = next_i if next_i > i else i + 1
 
 
-def _is_recognized_anchor(line: str, valid_tags: set[str]) -> bool:
+def _is_recognized_anchor(line: str, valid_tags: Collection[str]) -> bool:
     """True if ``line`` is an anchor whose tag is a recognized (valid) tag name."""
     m = _ANCHOR_RE.match(line)
     return bool(m and m.group(1).strip() in valid_tags)
@@ -156,7 +147,7 @@ def _parse_one_tag(
     title: str,
     schema: DataTagSchema,
     source_file: Path | None,
-    valid_tags: set[str],
+    valid_tags: Collection[str],
 ) -> tuple[DataTag, int]:
     """Parse a single TDG tag starting at ``anchor_idx``. Returns (tag, index_after_tag)."""
     start_line = anchor_idx
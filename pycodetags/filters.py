@@ -1,10 +1,11 @@
 import logging
-from collections.abc import Callable
-from typing import Any
-
-import jmespath
+from collections.abc import Callable, Sequence
+from typing import Any, overload
 
 from pycodetags.data_tags.data_tags_classes import DATA
+from pycodetags.data_tags.tag_record import LazyDataList
+from pycodetags.data_tags.tag_table import TagTable
+from pycodetags.profiling import span
 
 logger = logging.getLogger(__name__)
 
@@ -14,6 +15,9 @@ class InvalidJMESPathFilter(Exception):
 
 
 def compile_jmes_filter(expression: str) -> Callable[[dict[str, Any]], bool]:
+    # Imported here so commands that never filter do not load jmespath.
+    import jmespath
+
     try:
         compiled = jmespath.compile(expression)
     except jmespath.exceptions.JMESPathError as e:
@@ -30,9 +34,67 @@ def compile_jmes_filter(expression: str) -> Callable[[dict[str, Any]], bool]:
     return predicate
 
 
-def filter_data_by_expression(data_list: list[DATA], expression: str) -> list[DATA]:
+# Keys of ``to_flat_dict`` the tag table holds as dictionary-encoded columns (it has no ``file_path``).
+_TABLE_FIELDS = ("code_tag", "status", "assignee")
+
+
+def _field_comparison(node: dict[str, Any]) -> tuple[str, str] | None:
+    """``(field, text)`` for ``field == 'text'`` or ``field != 'text'`` on a table field, else None."""
+    if node["type"] != "comparator" or node["value"] not in ("eq", "ne"):
+        return None
+    left, right = node["children"]
+    if left["type"] == "literal":
+        left, right = right, left
+    if left["type"] != "field" or left["value"] not in _TABLE_FIELDS:
+        return None
+    if right["type"] != "literal" or not isinstance(right["value"], str):
+        return None
+    return left["value"], right["value"]
+
+
+def _table_can_answer(node: dict[str, Any]) -> bool:
+    """True for field comparisons combined with ``&&``, ``||`` and ``!``; each yields a boolean."""
+    if node["type"] in ("and_expression", "or_expression", "not_expression"):
+        return all(_table_can_answer(child) for child in node["children"])
+    return _field_comparison(node) is not None
+
+
+def _table_rows(table: TagTable, node: dict[str, Any]) -> set[int]:
+    """Rows matching an expression :func:`_table_can_answer` accepted; truthiness is set algebra."""
+    kind = node["type"]
+    if kind == "and_expression":
+        return _table_rows(table, node["children"][0]) & _table_rows(table, node["children"][1])
+    if kind == "or_expression":
+        return _table_rows(table, node["children"][0]) | _table_rows(table, node["children"][1])
+    if kind == "not_expression":
+        return set(range(len(table))) - _table_rows(table, node["children"][0])
+    field, text = _field_comparison(node)  # type: ignore[misc]
+    if node["value"] == "eq":
+        return set(table.where_eq(field, text))
+    return set(table.where_ne(field, text))
+
+
+@overload
+def filter_data_by_expression(data_list: LazyDataList, expression: str) -> LazyDataList: ...
+
+
+@overload
+def filter_data_by_expression(data_list: Sequence[DATA], expression: str) -> list[DATA]: ...
+
+
+def filter_data_by_expression(data_list: Sequence[DATA], expression: str) -> Sequence[DATA]:
     # print([
     #     item.to_flat_dict(include_comment_and_tag=True) for item in data_list
     # ])
-    pred = compile_jmes_filter(expression)
-    return [item for item in data_list if pred(item.to_flat_dict(include_comment_and_tag=True))]
+    with span("filter"):
+        pred = compile_jmes_filter(expression)
+        if isinstance(data_list, LazyDataList):
+            import jmespath
+
+            parsed = jmespath.compile(expression).parsed
+            # to_flat_dict raises on a field in both data and custom fields; leave that to the slow path.
+            if _table_can_answer(parsed) and not data_list.table.field_conflicts:
+                return data_list.take(sorted(_table_rows(data_list.table, parsed)))
+            # Tag records flatten to the same dict as DATA, so nothing is materialized just to filter.
+            return data_list.where(lambda item: pred(item.to_flat_dict(include_comment_and_tag=True)))
+        return [item for item in data_list if pred(item.to_flat_dict(include_comment_and_tag=True))]
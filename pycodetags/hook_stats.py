@@ -0,0 +1,205 @@
+"""
+Call counts and time spent in plugin hooks, per hook and per plugin.
+
+Some hooks run on hot paths: ``find_source_tags`` once per file that is not Python, ``validate`` once per
+item validated. A slow plugin there slows every scan, and nothing else in a profile says which plugin it is.
+
+While :meth:`HookStats.monitor` is active, every hook call is timed through pluggy's
+``add_hookcall_monitoring``, and each plugin's implementation is timed on its own. For each hook and for
+each plugin implementing it, the calls, the total and the slowest call, and the number of items returned
+are counted. A plugin's first call includes importing it when it was registered lazily (see
+:class:`pycodetags.plugin_manager.LazyPlugin`).
+
+``pycodetags plugin-info --stats`` and ``pycodetags data --profile`` print the table. Nothing is timed
+unless asked for.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import threading
+import time
+from collections.abc import Iterator, Mapping, Sequence
+from typing import Any, Callable
+
+import pluggy
+
+__all__ = ["CallStats", "HookStats"]
+
+
+class CallStats:
+    """Counters for one hook, or for one plugin's implementation of a hook."""
+
+    __slots__ = ("calls", "total_ns", "max_ns", "results", "errors")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.results = 0
+        """Items returned: the length of a returned list, 1 for any other value, 0 for None."""
+        self.errors = 0
+
+    def add(self, duration_ns: int, results: int, failed: bool = False) -> None:
+        self.calls += 1
+        self.total_ns += duration_ns
+        self.max_ns = max(self.max_ns, duration_ns)
+        self.results += results
+        self.errors += failed
+
+    def as_dict(self) -> dict[str, int]:
+        return {
+            "calls": self.calls,
+            "total_ns": self.total_ns,
+            "max_ns": self.max_ns,
+            "results": self.results,
+            "errors": self.errors,
+        }
+
+
+def result_size(value: Any) -> int:
+    """
+    How many items a hook implementation returned.
+
+    >>> result_size(None), result_size(True), result_size(["a", "b"])
+    (0, 1, 2)
+    """
+    if value is None:
+        return 0
+    if isinstance(value, (list, tuple, set, frozenset, dict)):
+        return len(value)
+    return 1
+
+
+class HookStats:
+    """
+    Times hook calls on a plugin manager while :meth:`monitor` is active.
+
+    >>> class Plugin:
+    ...     @pluggy.HookimplMarker("demo")
+    ...     def greet(self, name):
+    ...         return [f"hello {name}"]
+    >>> class Spec:
+    ...     @pluggy.HookspecMarker("demo")
+    ...     def greet(self, name): ...
+    >>> pm = pluggy.PluginManager("demo")
+    >>> pm.add_hookspecs(Spec)
+    >>> _ = pm.register(Plugin(), name="greeter")
+    >>> stats = HookStats()
+    >>> with stats.monitor(pm):
+    ...     _ = pm.hook.greet(name="you")
+    >>> stats.hooks["greet"].calls, stats.plugins[("greeter", "greet")].results
+    (1, 1)
+    """
+
+    def __init__(self) -> None:
+        self.hooks: dict[str, CallStats] = {}
+        self.plugins: dict[tuple[str, str], CallStats] = {}
+        """Keyed by ``(plugin name, hook name)``."""
+        self._wrapped: dict[pluggy.HookImpl, Callable[..., Any]] = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def monitor(self, pm: pluggy.PluginManager) -> Iterator[HookStats]:
+        """Count the hook calls made on ``pm`` while the block runs."""
+        undo = pm.add_hookcall_monitoring(self._before, self._after)
+        try:
+            yield self
+        finally:
+            undo()
+            with self._lock:
+                for impl, function in self._wrapped.items():
+                    impl.function = function
+                self._wrapped.clear()
+
+    def _starts(self) -> list[int]:
+        starts: list[int] | None = getattr(self._local, "starts", None)
+        if starts is None:
+            starts = self._local.starts = []
+        return starts
+
+    def _before(self, hook_name: str, hook_impls: Sequence[pluggy.HookImpl], kwargs: Mapping[str, Any]) -> None:
+        # Implementations are wrapped when their hook is first called, so plugins registered after
+        # monitoring began are counted too.
+        with self._lock:
+            for impl in hook_impls:
+                if impl not in self._wrapped and not (impl.wrapper or impl.hookwrapper):
+                    self._wrapped[impl] = impl.function
+                    impl.function = self._timed(impl.function, impl.plugin_name, hook_name)
+        self._starts().append(time.perf_counter_ns())
+
+    def _after(
+        self,
+        outcome: pluggy.Result[Any],
+        hook_name: str,
+        hook_impls: Sequence[pluggy.HookImpl],
+        kwargs: Mapping[str, Any],
+    ) -> None:
+        duration = time.perf_counter_ns() - self._starts().pop()
+        failed = outcome.exception is not None
+        results = 0
+        if not failed:
+            value = outcome.get_result()
+            results = sum(result_size(item) for item in value) if isinstance(value, list) else result_size(value)
+        with self._lock:
+            self.hooks.setdefault(hook_name, CallStats()).add(duration, results, failed)
+
+    def _timed(self, function: Callable[..., Any], plugin_name: str, hook_name: str) -> Callable[..., Any]:
+        stats = self.plugins.setdefault((plugin_name, hook_name), CallStats())
+        lock = self._lock
+
+        def timed(*args: Any) -> Any:
+            # pluggy passes hook arguments positionally, in argnames order.
+            started = time.perf_counter_ns()
+            try:
+                result = function(*args)
+            except BaseException:
+                duration = time.perf_counter_ns() - started
+                with lock:
+                    stats.add(duration, 0, failed=True)
+                raise
+            duration = time.perf_counter_ns() - started
+            with lock:
+                stats.add(duration, result_size(result))
+            return result
+
+        return timed
+
+    def as_dict(self) -> dict[str, Any]:
+        """The counters as plain data, for JSON."""
+        return {
+            "hooks": {name: stats.as_dict() for name, stats in sorted(self.hooks.items())},
+            "plugins": [
+                {"plugin": plugin, "hook": hook, **stats.as_dict()}
+                for (plugin, hook), stats in sorted(self.plugins.items())
+                if stats.calls
+            ],
+        }
+
+    def report(self) -> str:
+        """Per hook, then per plugin, slowest first, as text."""
+        called = [(f"{plugin}: {hook}", stats) for (plugin, hook), stats in self.plugins.items() if stats.calls]
+        width = max([30] + [len(label) for label, _stats in called] + [len(name) for name in self.hooks])
+        lines = ["--- pycodetags plugin hooks ---", _header("hook", width)]
+        if not self.hooks:
+            lines.append("No hooks were called.")
+        for name, stats in sorted(self.hooks.items(), key=lambda item: -item[1].total_ns):
+            lines.append(_row(name, stats, width))
+        if called:
+            lines.append(_header("plugin: hook", width))
+            for label, stats in sorted(called, key=lambda item: -item[1].total_ns):
+                lines.append(_row(label, stats, width))
+        return "\n".join(lines)
+
+
+def _header(label: str, width: int) -> str:
+    return f"{label:<{width}} {'calls':>8} {'total ms':>10} {'max ms':>9} {'results':>8}"
+
+
+def _row(label: str, stats: CallStats, width: int) -> str:
+    failed = f"  ({stats.errors} raised)" if stats.errors else ""
+    return (
+        f"{label:<{width}} {stats.calls:>8} {stats.total_ns / 1e6:>10.3f} {stats.max_ns / 1e6:>9.3f}"
+        f" {stats.results:>8}{failed}"
+    )
@@ -12,8 +12,8 @@ writes plain tags with no ``id``. When durable identity is needed, this command:
    TDG-origin tags, so neither is mangled into the other's syntax,
 5. saves the counter.
 
-Performance is intentionally O(files): on a large repo this is a full scan. An incremental ``index``
-is on the roadmap; the counter file format is already index-ready. Do not prematurely optimize here.
+Parsing goes through the incremental scan index (``pycodetags.scan_index``), so on a warm run only
+files that changed since the last scan are re-parsed; the rest cost one ``stat()`` each.
 
 This module is core: it works for PEP-350 tags with no plugins installed. TDG-id support activates only
 when the ``TDG`` schema is active (the issue-tracker plugin provides it) and uses the proven
@@ -29,19 +29,16 @@ from collections.abc import Callable
 from pathlib import Path
 
 from pycodetags import mutator
-from pycodetags.aggregate import dedup_data_objects
+from pycodetags.aggregate import dedup_data_objects, scan_schemas
 from pycodetags.app_config import get_code_tags_config
-from pycodetags.common_interfaces import get_active_schemas, list_available_schemas
-from pycodetags.data_tags import (
-    DATA,
-    DataTagSchema,
-    convert_data_tag_to_data_object,
-    iterate_comments_from_file,
-    tdg_tags_parser,
-)
+from pycodetags.common_interfaces import list_available_schemas
+from pycodetags.data_tags import DATA, DataTagSchema, convert_data_tag_to_data_object, tdg_tags_parser
 from pycodetags.data_tags.identity import content_identity_for_data, resolve_identity
 from pycodetags.identity_counter import IdCounter
+from pycodetags.parallel import parse_python_files
 from pycodetags.pure_data_schema import PureDataSchema
+from pycodetags.scan_index import ScanIndex
+from pycodetags.walker import walk_source_files
 
 logger = logging.getLogger(__name__)
 
@@ -111,7 +108,8 @@ def _with_id(tag: DATA, new_id: str) -> DATA:
 
 
 def _collect_paths(paths: list[str]) -> list[Path]:
-    """Expand the given paths into a flat list of ``.py`` files."""
+    """Expand the given paths into a flat list of ``.py`` files, honouring the walker's ignore rules."""
+    config = get_code_tags_config()
     files: list[Path] = []
     for raw in paths:
         p = Path(raw)
@@ -119,7 +117,10 @@ def _collect_paths(paths: list[str]) -> list[Path]:
             if p.name.endswith(".py"):
                 files.append(p)
         elif p.is_dir():
-            files.extend(sorted(f for f in p.rglob("*.py")))
+            walked = walk_source_files(
+                p, exclude=config.exclude(), include=config.include(), use_ignore_files=config.use_ignore_files()
+            )
+            files.extend(sorted(Path(f) for f in walked if f.endswith(".py")))
         else:
             logger.warning("Path does not exist, skipping: %s", raw)
     return files
@@ -132,6 +133,7 @@ def run(
     check: bool = False,
     counter_root: Path | None = None,
     writer: Callable[[str], None] = print,
+    jobs: int | None = None,
 ) -> tuple[int, IdRunResult]:
     """Run the ``id`` command.
 
@@ -141,6 +143,7 @@ def run(
         check: Assign nothing; exit nonzero if any taggable tag is missing an id. For CI / pre-commit.
         counter_root: Override the project root used to locate ``.pycodetags_ids`` (tests).
         writer: Sink for human-readable output (defaults to ``print``).
+        jobs: Parallel parse workers; ``None`` reads ``jobs`` from config.
 
     Returns:
         ``(exit_code, result)``. Exit code is 0 on success, 1 when ``--check`` finds a missing id.
@@ -149,10 +152,8 @@ def run(
     active = config.active_schemas()
 
     # Build the candidate schema list (primary + any active plugin schemas, e.g. TDG) and a lookup.
-    schemas: list[DataTagSchema] = [PureDataSchema]
-    for extra in get_active_schemas(active):
-        if extra.get("name") != PureDataSchema.get("name"):
-            schemas.append(extra)
+    schemas = scan_schemas(PureDataSchema, active)
+    include_folk_tags = "folk" in active
     schemas_by_name: dict[str, DataTagSchema] = {s.get("name", "").upper(): s for s in list_available_schemas()}
     schemas_by_name.setdefault("PUREDATA", PureDataSchema)
 
@@ -164,8 +165,20 @@ def run(
     pending: dict[str, list[tuple[DATA, DATA, Callable[[DATA], str]]]] = defaultdict(list)
     missing_for_check: list[DATA] = []
 
-    for file in files:
-        raw_tags = list(iterate_comments_from_file(str(file), schemas=schemas, include_folk_tags="folk" in active))
+    index = ScanIndex.open(schemas, include_folk_tags, sources=paths) if config.use_index() else None
+    parsed = parse_python_files(
+        [str(file) for file in files],
+        schemas=schemas,
+        include_folk_tags=include_folk_tags,
+        jobs=config.jobs() if jobs is None else jobs,
+        backend=config.parallel_backend(),
+        index=index,
+        prefilter=config.prefilter(),
+    )
+    if index:
+        index.save()
+
+    for file, raw_tags in zip(files, parsed):
         converted: list[DATA] = []
         for raw in raw_tags:
             origin = (raw.get("original_schema") or "").upper()
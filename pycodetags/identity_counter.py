@@ -16,7 +16,7 @@ import logging
 import os
 from pathlib import Path
 
-from pycodetags.utils.cache_utils import find_project_root
+from pycodetags.utils.project_root import find_project_root
 
 logger = logging.getLogger(__name__)
 
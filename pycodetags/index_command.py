@@ -0,0 +1,122 @@
+"""
+The ``pycodetags index`` command: build or refresh the incremental scan index.
+
+Every scan already maintains the index as a side effect; this command exists to warm it up ahead of
+time (e.g. in CI after restoring a cache), to drop entries for files that were deleted, and to clear it.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import logging
+import shutil
+from collections.abc import Callable
+from pathlib import Path
+
+from pycodetags.aggregate import scan_schemas
+from pycodetags.app_config import get_code_tags_config
+from pycodetags.data_tags import DataTagSchema
+from pycodetags.parallel import parse_python_files
+from pycodetags.parse_cache import ParseCache
+from pycodetags.pure_data_schema import PureDataSchema
+from pycodetags.scan_index import ScanIndex, project_root_of
+from pycodetags.walker import walk_source_files
+
+logger = logging.getLogger(__name__)
+
+
+@dataclasses.dataclass
+class IndexRunResult:
+    """Summary of an ``index`` command run, returned for testing and reporting."""
+
+    files: int = 0
+    unchanged: int = 0
+    parsed: int = 0
+    pruned: int = 0
+
+
+def run(
+    paths: list[str],
+    *,
+    clear: bool = False,
+    schema: DataTagSchema = PureDataSchema,
+    jobs: int | None = None,
+    writer: Callable[[str], None] = print,
+) -> tuple[int, IndexRunResult]:
+    """Run the ``index`` command.
+
+    Each path is indexed in the project that holds it, the way a scan of that path would use it.
+
+    Args:
+        paths: Files or directories to index.
+        clear: Delete the index and the parse cache first, forcing a full re-parse.
+        schema: Primary schema; together with the active schemas it selects which parse cache is filled.
+        jobs: Parallel parse workers; ``None`` reads ``jobs`` from config.
+        writer: Sink for human-readable output (defaults to ``print``).
+
+    Returns:
+        ``(exit_code, result)``. Exit code is 1 when a path does not exist, or is in no project that could
+        hold an index; nothing is indexed then.
+    """
+    config = get_code_tags_config()
+    active = config.active_schemas()
+    schemas = scan_schemas(schema, active)
+    include_folk_tags = "folk" in active
+    result = IndexRunResult()
+
+    missing = [raw for raw in paths if not Path(raw).exists()]
+    if missing:
+        for raw in missing:
+            writer(f"No such file or folder: {raw}")
+        return 1, result
+
+    paths_by_root: dict[Path, list[Path]] = {}
+    for raw in paths:
+        root = project_root_of([raw])
+        if root is None:
+            writer(f"No project root (pyproject.toml) found for {raw}, nowhere to keep an index.")
+            return 1, result
+        paths_by_root.setdefault(root, []).append(Path(raw))
+
+    for root, root_paths in paths_by_root.items():
+        if clear:
+            for directory in (ScanIndex.directory_for(root), ParseCache.directory_for(root)):
+                if directory.is_dir():
+                    shutil.rmtree(directory)
+                    writer(f"Cleared {directory}")
+
+        index = ScanIndex.open(schemas, include_folk_tags, root=root)
+        if index is None:
+            writer(f"Could not open the index of {root}.")
+            return 1, result
+
+        for path in root_paths:
+            files = [
+                f
+                for f in walk_source_files(
+                    path, exclude=config.exclude(), include=config.include(), use_ignore_files=config.use_ignore_files()
+                )
+                if f.endswith(".py")
+            ]
+            parse_python_files(
+                files,
+                schemas=schemas,
+                include_folk_tags=include_folk_tags,
+                jobs=config.jobs() if jobs is None else jobs,
+                backend=config.parallel_backend(),
+                index=index,
+                prefilter=config.prefilter(),
+            )
+            if path.is_dir():
+                result.pruned += index.prune(under=str(path), keep=files)
+            result.files += len(files)
+        result.pruned += index.prune()
+        index.save()
+        result.unchanged += index.hits
+        result.parsed += index.misses
+
+    writer(
+        f"Indexed {result.files} file(s): {result.unchanged} unchanged, {result.parsed} parsed, "
+        f"{result.pruned} stale entr{'y' if result.pruned == 1 else 'ies'} removed."
+    )
+    return 0, result
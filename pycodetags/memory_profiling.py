@@ -0,0 +1,309 @@
+"""
+Memory use of the scan pipeline, per stage, with ``tracemalloc``.
+
+``pycodetags data --memory-profile`` traces every Python allocation of the run and splits it by stage:
+walk, index lookups, parse, convert, dedup, filter and render, plus ``setup`` before the first of them. A stage runs
+from the start of one of its spans (see :mod:`pycodetags.profiling`) until another stage starts, or
+until the span ends when it is nested in another stage's span (streaming output renders while it
+scans). For each stage the report shows the highest traced memory reached while it ran (peak), what
+it left allocated (net), and the source lines that allocated the most during it.
+``--memory-profile-out memory.json`` writes the same numbers as JSON, with source locations relative to
+``sys.path``, so the summaries of two releases can be diffed.
+
+A snapshot of the traced memory is taken when a stage ends and compared with the one before. A run that
+switches stage for every file (``--format jsonl``) would spend all its time in snapshots, so they are
+skipped while they have taken more than :data:`SNAPSHOT_BUDGET` times the time of the rest of the run;
+what changed since the last snapshot is credited to the stage ending when the next one is taken.
+
+Only the process running the CLI is traced. Files parsed by ``--jobs`` worker processes show up as the
+parsed results arriving in the parent; trace with ``--jobs 1`` to see the parser's own allocations.
+Tracing slows a run down several times; the time per stage is not meaningful alongside it.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any, TypeVar
+
+from pycodetags import profiling
+from pycodetags.profiling import Profiler
+
+__all__ = ["MemoryProfiler", "StageMemory", "MEMORY_STAGES", "SNAPSHOT_BUDGET"]
+
+MEMORY_STAGES = {
+    "walk": "walk",
+    "index": "index",
+    "parse_file": "parse",
+    "plugin_source_tags": "parse",
+    "convert": "convert",
+    "dedup": "dedup",
+    "filter": "filter",
+    "render": "render",
+}
+"""Which :mod:`pycodetags.profiling` spans start which memory stage."""
+
+SETUP = "setup"
+SNAPSHOT_BUDGET = 0.5
+"""Time snapshots may take, as a fraction of the time spent on everything else while profiling."""
+
+_Stat = TypeVar("_Stat", tracemalloc.Statistic, tracemalloc.StatisticDiff)
+_SUMMARY_FORMAT = 1
+# The profilers' own bookkeeping is left out of the allocation sites; it still counts towards the totals.
+_IGNORED_FILES = frozenset(
+    (
+        tracemalloc.__file__,
+        __file__,
+        profiling.__file__,
+        "<frozen importlib._bootstrap>",
+        "<frozen importlib._bootstrap_external>",
+    )
+)
+_SITES_KEPT = 50
+_UNTIMED = contextlib.nullcontext()
+
+
+class StageMemory:
+    """Traced memory of one stage over a whole run."""
+
+    __slots__ = ("name", "runs", "peak_bytes", "net_bytes", "sites")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.runs = 0
+        self.peak_bytes = 0
+        """Highest traced total while the stage ran."""
+        self.net_bytes = 0
+        """Traced total at the end of each run minus at its start, summed: what the stage kept."""
+        self.sites: dict[str, list[int]] = {}
+        """Source location -> [bytes, blocks] allocated, from the snapshots credited to this stage."""
+
+    def top_sites(self, count: int) -> list[tuple[str, int, int]]:
+        """``(site, bytes, blocks)`` of the ``count`` locations that allocated the most, largest first."""
+        ranked = sorted(self.sites.items(), key=lambda item: item[1][0], reverse=True)[:count]
+        return [(site, size, blocks) for site, (size, blocks) in ranked]
+
+
+class _StageSpan:
+    """A timed span that also starts a memory stage, and on exit returns to the enclosing one."""
+
+    __slots__ = ("profiler", "stage", "timed")
+
+    def __init__(self, profiler: MemoryProfiler, stage: str, timed: contextlib.AbstractContextManager[Any]) -> None:
+        self.profiler = profiler
+        self.stage = stage
+        self.timed = timed
+
+    def __enter__(self) -> _StageSpan:
+        self.profiler._enter_stage(self.stage)
+        self.timed.__enter__()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.timed.__exit__(*exc_info)
+        self.profiler._leave_stage()
+
+
+class MemoryProfiler(Profiler):
+    """
+    A :class:`Profiler` that also traces memory per stage while active.
+
+    With ``record_spans=False`` it only traces memory, and records no spans for the time report or trace.
+
+    Stages are followed on the thread that activated the profiler; spans on other threads are timed as
+    usual and their allocations land in whatever stage that thread is in.
+
+    >>> profiler = MemoryProfiler()
+    >>> from pycodetags.profiling import span
+    >>> with profiler.activate():
+    ...     with span("convert"):
+    ...         kept = [str(i) * 10 for i in range(1000)]
+    >>> convert = profiler.stages["convert"]
+    >>> convert.runs, convert.net_bytes > 10_000, convert.peak_bytes >= convert.net_bytes
+    (1, True, True)
+    """
+
+    def __init__(
+        self, started_ns: int | None = None, record_spans: bool = True, snapshot_budget: float = SNAPSHOT_BUDGET
+    ) -> None:
+        super().__init__(started_ns=started_ns)
+        self.record_spans = record_spans
+        self.snapshot_budget = snapshot_budget
+        self.snapshots = 0
+        self.stages: dict[str, StageMemory] = {}
+        self.peak_bytes = 0
+        self.retained: list[tuple[str, int, int]] = []
+        """``(site, bytes, blocks)`` still allocated when profiling stopped, largest first."""
+        self._thread: int | None = None
+        self._stage_stack: list[str] = []
+        self._current = SETUP
+        self._run_start = 0
+        self._snapshot: tracemalloc.Snapshot | None = None
+        self._traced_from_ns = 0
+        self._snapshot_ns = 0
+
+    def span(self, name: str, args: dict[str, Any] | None = None) -> Any:
+        # Each recorded span is an allocation of its own; only keep them when they are going to be shown.
+        timed = super().span(name, args) if self.record_spans else _UNTIMED
+        stage = MEMORY_STAGES.get(name)
+        if stage is None or threading.get_ident() != self._thread:
+            return timed
+        return _StageSpan(self, stage, timed)
+
+    @contextlib.contextmanager
+    def activate(self) -> Iterator[Profiler]:
+        """Trace memory, and make this the active profiler, while the block runs."""
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        self._thread = threading.get_ident()
+        self._traced_from_ns = time.perf_counter_ns()
+        self._begin_run(SETUP)
+        self._snapshot = tracemalloc.take_snapshot()
+        try:
+            with super().activate():
+                yield self
+        finally:
+            self._end_run(force_snapshot=True)
+            final = tracemalloc.take_snapshot()
+            self.retained = [
+                (_site(stat.traceback[0]), stat.size, stat.count) for stat in _kept(final.statistics("lineno"))
+            ]
+            self._snapshot = None
+            self._thread = None
+            if started_tracing:
+                tracemalloc.stop()
+
+    def _enter_stage(self, stage: str) -> None:
+        self._stage_stack.append(stage)
+        if stage != self._current:
+            self._end_run()
+            self._begin_run(stage)
+
+    def _leave_stage(self) -> None:
+        self._stage_stack.pop()
+        # Outside every span the stage that ran last goes on, until the next one starts.
+        enclosing = self._stage_stack[-1] if self._stage_stack else self._current
+        if enclosing != self._current:
+            self._end_run()
+            self._begin_run(enclosing)
+
+    def _begin_run(self, stage: str) -> None:
+        self._current = stage
+        self._run_start = tracemalloc.get_traced_memory()[0]
+        if hasattr(tracemalloc, "reset_peak"):
+            # Python 3.9+; before that each stage's peak is the highest point of the run so far.
+            tracemalloc.reset_peak()
+
+    def _end_run(self, force_snapshot: bool = False) -> None:
+        current, peak = tracemalloc.get_traced_memory()
+        stage = self.stages.get(self._current)
+        if stage is None:
+            stage = self.stages[self._current] = StageMemory(self._current)
+        stage.runs += 1
+        stage.peak_bytes = max(stage.peak_bytes, peak)
+        stage.net_bytes += current - self._run_start
+        self.peak_bytes = max(self.peak_bytes, peak)
+        elapsed = time.perf_counter_ns() - self._traced_from_ns - self._snapshot_ns
+        if force_snapshot or self._snapshot_ns <= self.snapshot_budget * elapsed:
+            self._credit_snapshot(stage)
+
+    def _credit_snapshot(self, stage: StageMemory) -> None:
+        started = time.perf_counter_ns()
+        snapshot = tracemalloc.take_snapshot()
+        self.snapshots += 1
+        if self._snapshot is not None:
+            grown = [diff for diff in snapshot.compare_to(self._snapshot, "lineno") if diff.size_diff > 0]
+            for diff in _kept(grown):
+                site = stage.sites.setdefault(_site(diff.traceback[0]), [0, 0])
+                site[0] += diff.size_diff
+                site[1] += max(diff.count_diff, 0)
+        self._snapshot = snapshot
+        self._snapshot_ns += time.perf_counter_ns() - started
+
+    def stage_memory(self) -> list[StageMemory]:
+        """The stages seen, in pipeline order."""
+        order = {name: i for i, name in enumerate(dict.fromkeys((SETUP, *MEMORY_STAGES.values())))}
+        return sorted(self.stages.values(), key=lambda stage: order[stage.name])
+
+    def memory_report(self, top: int = 10) -> str:
+        """Peak and net memory per stage, and where each stage allocated, as text."""
+        lines = [
+            f"--- pycodetags memory profile: {_mib(self.peak_bytes)} MiB peak traced ---",
+            f"{'stage':<10} {'runs':>8} {'peak MiB':>10} {'net MiB':>10}",
+        ]
+        stages = self.stage_memory()
+        for stage in stages:
+            lines.append(f"{stage.name:<10} {stage.runs:>8} {_mib(stage.peak_bytes):>10} {_mib(stage.net_bytes):>10}")
+        for stage in stages:
+            sites = stage.top_sites(top)
+            if sites:
+                lines.append(f"allocated during {stage.name}:")
+                lines.extend(f"{_mib(size):>10} MiB {blocks:>9} blocks  {site}" for site, size, blocks in sites)
+        if self.retained:
+            lines.append("still allocated at the end:")
+            lines.extend(
+                f"{_mib(size):>10} MiB {blocks:>9} blocks  {site}" for site, size, blocks in self.retained[:top]
+            )
+        return "\n".join(lines)
+
+    def memory_summary(self, top: int = 10) -> dict[str, Any]:
+        """The numbers of :meth:`memory_report` as plain data, stable enough to diff between releases."""
+        # Imported here: only needed for the version stamp.
+        from pycodetags.__about__ import __version__
+
+        def sites(rows: list[tuple[str, int, int]]) -> list[dict[str, Any]]:
+            return [{"site": site, "bytes": size, "blocks": blocks} for site, size, blocks in rows]
+
+        return {
+            "format": _SUMMARY_FORMAT,
+            "pycodetags": __version__,
+            "python": ".".join(str(part) for part in sys.version_info[:3]),
+            "peak_bytes": self.peak_bytes,
+            "stages": {
+                stage.name: {
+                    "runs": stage.runs,
+                    "peak_bytes": stage.peak_bytes,
+                    "net_bytes": stage.net_bytes,
+                    "top_sites": sites(stage.top_sites(top)),
+                }
+                for stage in self.stage_memory()
+            },
+            "retained": sites(self.retained[:top]),
+        }
+
+    def write_memory_summary(self, path: str | os.PathLike[str], top: int = 10) -> None:
+        """Write :meth:`memory_summary` to ``path`` as JSON."""
+        with Path(path).open("w", encoding="utf-8") as handle:
+            json.dump(self.memory_summary(top), handle, indent=2, sort_keys=True)
+            handle.write("\n")
+
+
+def _kept(statistics: list[_Stat]) -> list[_Stat]:
+    """The largest ``statistics`` outside the profilers' own files (``Snapshot.filter_traces`` is far slower)."""
+    kept = [stat for stat in statistics if stat.traceback[0].filename not in _IGNORED_FILES]
+    return kept[:_SITES_KEPT]
+
+
+def _mib(size: int) -> str:
+    return f"{size / (1024 * 1024):.2f}"
+
+
+def _site(frame: tracemalloc.Frame) -> str:
+    """``file:line`` with the file relative to the ``sys.path`` entry it is under, so it reads the same anywhere."""
+    filename = frame.filename
+    best = ""
+    for entry in sys.path:
+        root = os.path.abspath(entry or ".")
+        if filename.startswith(root + os.sep) and len(root) > len(best):
+            best = root
+    if best:
+        filename = os.path.relpath(filename, best)
+    return f"{filename.replace(os.sep, '/')}:{frame.lineno}"
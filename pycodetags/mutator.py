@@ -13,6 +13,7 @@ from pathlib import Path
 # In a real package, this would be a relative import, e.g., from .data import DATA
 from pycodetags.data_tags import DATA
 from pycodetags.exceptions import DataTagError
+from pycodetags.utils.source_text import SourceText
 
 
 def apply_mutations(
@@ -60,6 +61,7 @@ def apply_mutations(
         raise OSError(f"Could not read file '{p_file_path}': {e}") from e
 
     # --- 2. Validate and prepare replacements ---
+    source = SourceText(content)
     replacements = []
     for old_tag, new_tag in mutations:
         if not isinstance(old_tag, DATA) or (new_tag is not None and not isinstance(new_tag, DATA)):
@@ -75,20 +77,12 @@ def apply_mutations(
         # the original text of the tag. This prevents overwriting a file
         # that has been modified since the tag was parsed.
         start_line, start_char, end_line, end_char = old_tag.offsets
-
-        # This slicing logic is complex and needs to be precise
-        lines = content.splitlines(True)
-        if start_line == end_line:
-            try:
-                original_slice = lines[start_line][start_char:end_char]
-            except IndexError as ie:
-                raise DataTagError("Tag mismatch") from ie
-        else:
-            # Multi-line tag
-            first_line = lines[start_line][start_char:]
-            middle_lines = "".join(lines[start_line + 1 : end_line])
-            last_line = lines[end_line][:end_char]
-            original_slice = first_line + middle_lines + last_line
+        try:
+            start = source.offset(start_line, start_char)
+            end = source.offset(end_line, end_char)
+        except IndexError as ie:
+            raise DataTagError("Tag mismatch") from ie
+        original_slice = content[start:end]
 
         # We must be careful with how original_text was stored.
         # Let's normalize whitespace for a more robust comparison.
@@ -99,59 +93,31 @@ def apply_mutations(
             )
 
         replacement_text = serializer(new_tag) if new_tag else ""
-        replacements.append((old_tag.offsets, replacement_text))
+        if replacement_text and start_line != end_line:
+            # Multi-line modification: indent continuation lines like the first line of the old tag.
+            indentation = content[source.line_starts[start_line] : start]
+            replacement_text = "".join(
+                f"{indentation}{line.lstrip()}" if index > 0 else line
+                for index, line in enumerate(replacement_text.splitlines(True))
+            )
+        replacements.append((start, end, replacement_text))
 
     # --- 3. Sort by start offset in descending order ---
     # This is the critical step to avoid offset invalidation. By processing
     # from the end of the file backwards, the offsets for earlier parts of
     # the file remain valid for each subsequent replacement.
-    # Sort by (start_line, start_char) so that multiple tags on the same line are also applied
-    # end-to-start, keeping earlier char offsets valid as later ones are rewritten.
-    replacements.sort(key=lambda item: (item[0][0], item[0][1]), reverse=True)
-
-    # --- 4. Apply replacements to the content in memory ---
-    # This is a bit tricky with multi-line content. A simpler approach
-    # might be to work with the raw string content and character offsets.
-    # Let's refine the logic to use character offsets from a full string read.
-    # This requires a different offset calculation during parsing, but let's
-    # assume for now we can derive it. For this implementation, we will
-    # stick to line/char offsets and reconstruct carefully.
-
-    lines = content.splitlines(True)  # Keep endings for reconstruction
-    for (start_line, start_char, end_line, end_char), new_text in replacements:
-        if start_line == end_line:
-            # Single-line modification
-            line = lines[start_line]
-            lines[start_line] = line[:start_char] + new_text + line[end_char:]
-        else:
-            # Multi-line modification
-            # Preserve indentation from the first line for the new text
-            indentation = lines[start_line][:start_char]
-
-            # If removing, the new text is empty. If updating, format it.
-            formatted_new_text = new_text
-            if new_text:
-                # Add indentation to all lines of the new text
-                new_text_lines = new_text.splitlines(True)
-                formatted_new_text = "".join(
-                    [
-                        f"{indentation}{line.lstrip()}" if index > 0 else line
-                        for index, line in enumerate(new_text_lines)
-                    ]
-                )
-
-            # Reconstruct the file around the modification
-            first_line_part = lines[start_line][:start_char]
-            last_line_part = lines[end_line][end_char:]
-
-            # Combine the parts
-            lines[start_line] = first_line_part + formatted_new_text + last_line_part
-
-            # Clear out the lines that were part of the old multi-line tag
-            for i in range(start_line + 1, end_line + 1):
-                lines[i] = ""
-
-    modified_content = "".join(lines)
+    replacements.sort(key=lambda item: item[0], reverse=True)
+
+    # --- 4. Splice the replacements into the content in one pass ---
+    pieces: list[str] = []
+    cursor = len(content)
+    for start, end, new_text in replacements:
+        end = min(end, cursor)
+        pieces.append(content[end:cursor])
+        pieces.append(new_text)
+        cursor = start
+    pieces.append(content[:cursor])
+    modified_content = "".join(reversed(pieces))
 
     # --- 5. Atomically write the modified content back to the file ---
     try:
@@ -232,7 +198,7 @@ def insert_tags(
         raise FileNotFoundError(f"No such file: '{p_file_path}'")
 
     try:
-        lines = p_file_path.read_text(encoding="utf-8").splitlines(True)
+        lines = list(SourceText(p_file_path.read_text(encoding="utf-8")).lines(keepends=True))
         # Ensure we can insert after the last line
         if not lines or not lines[-1].endswith(("\n", "\r")):
             lines.append("\n")
@@ -0,0 +1,458 @@
+"""
+Spread per-file parsing across a worker pool.
+
+Parsing one ``.py`` file is independent of every other file, so a scan of a large tree is
+embarrassingly parallel. This module fans ``iterate_comments_from_file`` out over a process pool (or a
+thread pool on free-threaded CPython builds, where threads really do run in parallel) and hands the
+results back in the same order the files were given, so output stays deterministic no matter how the
+work was scheduled.
+
+Deduplication is *not* done here; callers merge the per-file results and run ``dedup_data_objects``
+afterwards, exactly as in a serial scan.
+"""
+
+from __future__ import annotations
+
+import functools
+import logging
+import os
+import sys
+import sysconfig
+from collections.abc import Iterator, Sequence
+from concurrent.futures import Executor
+from pathlib import Path
+from typing import Callable, NamedTuple, TypeVar
+
+from pycodetags.data_tags import DataTag, DataTagSchema, iterate_comments
+from pycodetags.data_tags.data_tags_parsers import RawCommentBlock, scan_comment_blocks
+from pycodetags.prefilter import prefilter_for, read_candidate
+from pycodetags.profiling import active_profiler, run_profiled, span
+from pycodetags.python.comment_finder import recording_parse_failures
+from pycodetags.scan_index import FileFingerprint, ScanIndex, decode_source, read_file
+from pycodetags.scan_stats import ScanStats, stage
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "parse_python_files",
+    "iter_parse_python_files",
+    "ParseOutcome",
+    "ScanOutcome",
+    "WorkerPool",
+    "scan_python_files",
+    "resolve_jobs",
+    "default_backend",
+    "free_threaded",
+]
+
+# Below this many files per worker the pool start-up costs more than it saves.
+MIN_FILES_PER_WORKER = 4
+
+# Each worker is sent several chunks so a few slow files don't leave the other workers idle.
+CHUNKS_PER_WORKER = 4
+
+BACKENDS = ("process", "thread")
+
+_Task = TypeVar("_Task")
+_Result = TypeVar("_Result")
+
+
+def free_threaded() -> bool:
+    """True when running on a free-threaded (no-GIL) CPython build with the GIL actually disabled."""
+    if not sysconfig.get_config_var("Py_GIL_DISABLED"):
+        return False
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled is not None and not is_gil_enabled()
+
+
+def default_backend() -> str:
+    """Threads on free-threaded builds (cheap to start, share memory), processes everywhere else."""
+    return "thread" if free_threaded() else "process"
+
+
+def resolve_jobs(jobs: int | None) -> int:
+    """Normalize a ``jobs`` setting. ``None``/``1`` is serial, ``0`` or negative means one per CPU."""
+    if jobs is None:
+        return 1
+    if jobs <= 0:
+        return os.cpu_count() or 1
+    return jobs
+
+
+class ParseOutcome(NamedTuple):
+    """What a worker did with one file."""
+
+    fingerprint: FileFingerprint
+    tags: list[DataTag]
+    prefiltered: bool = False
+    """The bytes cannot hold a tag, so the file was not decoded."""
+    failure: str | None = None
+    """Name of the error that stopped the file from being parsed; it then has no tags."""
+
+
+def _parse_one(task: tuple[str, list[DataTagSchema], bool, bool]) -> ParseOutcome:
+    """Worker entry point. Module level so it can be pickled for a process pool.
+
+    The file is read once; its fingerprint comes back with the tags so the scan index can record it.
+    With the prefilter on, a file whose bytes cannot hold a tag is answered with no tags and is never
+    decoded; the empty result is indexed like any other, so it is not read again while unchanged. A file
+    that is not UTF-8 or does not tokenize is logged, reported in ``failure`` and has no tags.
+    """
+    file, schemas, include_folk_tags, use_prefilter = task
+    with span("parse_file", file=file):
+        with span("read"):
+            data: bytes | None
+            if use_prefilter:
+                fingerprint, data = read_candidate(file, prefilter_for(schemas, include_folk_tags))
+            else:
+                fingerprint, data = read_file(file)
+            try:
+                source = None if data is None else decode_source(data)
+            except UnicodeDecodeError as e:
+                logger.warning(f"Can't decode {file} as UTF-8: {e}")
+                return ParseOutcome(fingerprint, [], failure=type(e).__name__)
+        if source is None:
+            logger.debug(f"prefilter: no tag candidates in {file}")
+            return ParseOutcome(fingerprint, [], prefiltered=True)
+        logger.info(f"iterate_comments: processing {file}")
+        with recording_parse_failures() as failures:
+            tags = list(iterate_comments(source, Path(file), schemas, include_folk_tags))
+        return ParseOutcome(fingerprint, tags, failure=failures[0] if failures else None)
+
+
+class ScanOutcome(NamedTuple):
+    """What a worker of :func:`scan_python_files` did with one file."""
+
+    fingerprint: FileFingerprint
+    blocks: list[RawCommentBlock]
+    prefiltered: bool = False
+
+
+def _scan_one(task: tuple[str, list[DataTagSchema] | None, bool, bool]) -> ScanOutcome:
+    """Worker entry point for :func:`scan_python_files`: read a file once, keep its comment blocks."""
+    file, prefilter_schemas, include_folk_tags, keep_untagged = task
+    with span("parse_file", file=file):
+        with span("read"):
+            data: bytes | None
+            if prefilter_schemas is not None:
+                fingerprint, data = read_candidate(file, prefilter_for(prefilter_schemas, include_folk_tags))
+            else:
+                fingerprint, data = read_file(file)
+            try:
+                source = None if data is None else decode_source(data)
+            except UnicodeDecodeError as e:
+                logger.warning(f"Can't decode {file} as UTF-8: {e}")
+                return ScanOutcome(fingerprint, [])
+        if source is None:
+            logger.debug(f"prefilter: no tag candidates in {file}")
+            return ScanOutcome(fingerprint, [], prefiltered=True)
+        logger.info(f"scan_comment_blocks: processing {file}")
+        return ScanOutcome(fingerprint, scan_comment_blocks(source, keep_untagged=keep_untagged))
+
+
+def _make_executor(backend: str, jobs: int) -> Executor:
+    # Imported here: the process pool pulls in multiprocessing, which single-job runs never need.
+    if backend == "thread":
+        from concurrent.futures import ThreadPoolExecutor
+
+        return ThreadPoolExecutor(max_workers=jobs)
+    from concurrent.futures import ProcessPoolExecutor
+
+    return ProcessPoolExecutor(max_workers=jobs)
+
+
+class WorkerPool:
+    """Maps workers over tasks, on a pool started the first time a batch is big enough for one.
+
+    Streaming callers map batch after batch; the pool is started once and reused for all of them. Use
+    it as a context manager so the pool is shut down.
+    """
+
+    def __init__(self, jobs: int | None, backend: str | None) -> None:
+        self.jobs = resolve_jobs(jobs)
+        self.backend = _check_backend(backend)
+        self.executor: Executor | None = None
+        self.workers = 0
+
+    def map(self, worker: Callable[[_Task], _Result], tasks: list[_Task]) -> list[_Result]:
+        """``[worker(task) for task in tasks]``, spread over the pool when there is enough work."""
+        workers = min(self.jobs, max(1, len(tasks) // MIN_FILES_PER_WORKER))
+        if workers <= 1 and self.executor is None:
+            return [worker(task) for task in tasks]
+        if self.executor is None:
+            self.executor = _make_executor(self.backend, workers)
+            self.workers = workers
+        # Executor.map preserves input order regardless of completion order, which is what makes the
+        # merged result deterministic. chunksize batches tasks per round trip for the process backend.
+        chunksize = max(1, len(tasks) // (self.workers * CHUNKS_PER_WORKER))
+        logger.info(f"Parsing {len(tasks)} files with {self.workers} {self.backend} workers, chunksize={chunksize}")
+        profiler = active_profiler()
+        if profiler is None or self.backend != "process":
+            # Threads record straight into the active profiler.
+            return list(self.executor.map(worker, tasks, chunksize=chunksize))
+        results = []
+        for result, events in self.executor.map(functools.partial(run_profiled, worker), tasks, chunksize=chunksize):
+            for event in events:
+                profiler.record(event)
+            results.append(result)
+        return results
+
+    def close(self) -> None:
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    def __enter__(self) -> WorkerPool:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+def _map_tasks(worker: Callable[[_Task], _Result], tasks: list[_Task], jobs: int | None, backend: str) -> list[_Result]:
+    """``[worker(task) for task in tasks]``, spread over a pool when there is enough work."""
+    with WorkerPool(jobs, backend) as pool:
+        return pool.map(worker, tasks)
+
+
+def _check_backend(backend: str | None) -> str:
+    backend = backend or default_backend()
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown parallel backend {backend!r}, expected one of {BACKENDS}")
+    return backend
+
+
+def parse_python_files(
+    files: Sequence[str],
+    schemas: list[DataTagSchema],
+    include_folk_tags: bool,
+    jobs: int | None = 1,
+    backend: str | None = None,
+    index: ScanIndex | None = None,
+    prefilter: bool = True,
+) -> list[list[DataTag]]:
+    """
+    Parse many Python files, optionally in parallel.
+
+    With an ``index``, files whose fingerprint is unchanged are answered from it and only the rest are
+    parsed; fresh results are stored back into the index (the caller saves it).
+
+    Args:
+        files (Sequence[str]): Paths of ``.py`` files to parse.
+        schemas (list[DataTagSchema]): Schemas that will be detected in each file.
+        include_folk_tags (bool): Include folk schemas that do not strictly follow PEP350.
+        jobs (int | None): Number of workers. ``None``/``1`` parses serially, ``0`` uses one per CPU.
+        backend (str | None): ``"process"`` or ``"thread"``. Defaults to :func:`default_backend`.
+        index (ScanIndex | None): Incremental scan index to consult and update.
+        prefilter (bool): Skip files whose raw bytes cannot contain a tag (see :mod:`pycodetags.prefilter`).
+
+    Returns:
+        list[list[DataTag]]: One list of tags per input file, in input order.
+    """
+    return [
+        tags
+        for _file, tags in iter_parse_python_files(
+            files, schemas, include_folk_tags, jobs=jobs, backend=backend, index=index, prefilter=prefilter
+        )
+    ]
+
+
+def iter_parse_python_files(
+    files: Sequence[str],
+    schemas: list[DataTagSchema],
+    include_folk_tags: bool,
+    jobs: int | None = None,
+    backend: str | None = None,
+    index: ScanIndex | None = None,
+    prefilter: bool = True,
+    batch_size: int | None = None,
+    pool: WorkerPool | None = None,
+    stats: ScanStats | None = None,
+) -> Iterator[tuple[str, list[DataTag]]]:
+    """
+    :func:`parse_python_files`, yielding ``(file, tags)`` in input order as each batch of files is done.
+
+    Files are parsed ``batch_size`` at a time (all at once by default) on one pool kept for the whole
+    run, so a consumer sees the first results after one batch and only one batch of results is held.
+    Identical files in later batches are answered by the index's content cache.
+
+    Args:
+        files (Sequence[str]): Paths of ``.py`` files to parse.
+        schemas (list[DataTagSchema]): Schemas that will be detected in each file.
+        include_folk_tags (bool): Include folk schemas that do not strictly follow PEP350.
+        jobs (int | None): Number of workers. ``None``/``1`` parses serially, ``0`` uses one per CPU.
+        backend (str | None): ``"process"`` or ``"thread"``. Defaults to :func:`default_backend`.
+        index (ScanIndex | None): Incremental scan index to consult and update.
+        prefilter (bool): Skip files whose raw bytes cannot contain a tag.
+        batch_size (int | None): Files per batch. None parses every file before yielding the first.
+        pool (WorkerPool | None): A pool to reuse across calls; ``jobs`` and ``backend`` then come from it
+            and must not be given.
+        stats (ScanStats | None): Counts files parsed, prefiltered out, answered from the cache or by a
+            copy and failed, and times the ``index`` and ``parse`` stages.
+
+    Yields:
+        tuple[str, list[DataTag]]: Each file with its tags.
+
+    Raises:
+        ValueError: If ``pool`` is given together with ``jobs`` or ``backend``.
+    """
+    if pool is not None and (jobs is not None or backend is not None):
+        raise ValueError("Pass either a pool or jobs/backend, not both: a pool keeps its own workers.")
+    if pool is None:
+        backend = _check_backend(backend)
+        with WorkerPool(jobs, backend) as own_pool:
+            yield from iter_parse_python_files(
+                files,
+                schemas,
+                include_folk_tags,
+                index=index,
+                prefilter=prefilter,
+                batch_size=batch_size,
+                pool=own_pool,
+                stats=stats,
+            )
+        return
+    step = max(1, batch_size or len(files))
+    for start in range(0, len(files), step):
+        batch = files[start : start + step]
+        yield from zip(batch, _parse_batch(pool, batch, schemas, include_folk_tags, index, prefilter, stats))
+
+
+def _probe_index(
+    files: Sequence[str],
+    probe: Callable[[str], tuple[_Result | None, str | None]],
+    results: list[_Result | None],
+    stats: ScanStats | None,
+    digests: list[str | None] | None = None,
+) -> tuple[list[int], dict[int, list[int]]]:
+    """Answer what the index can into ``results``; return the files left to parse, and for each of those
+    the later files with the same content, which are answered once it is parsed. With ``digests``, the
+    content digest of each file answered is written into it."""
+    todo: list[int] = []
+    same_content: dict[int, list[int]] = {}
+    first_with_digest: dict[str, int] = {}
+    with span("index"), stage(stats, "index"):
+        for i, file in enumerate(files):
+            results[i], digest = probe(file)
+            if results[i] is not None:
+                if digests is not None:
+                    digests[i] = digest
+                continue
+            if digest is not None and digest in first_with_digest:
+                same_content[first_with_digest[digest]].append(i)
+                continue
+            if digest is not None:
+                first_with_digest[digest] = i
+                same_content[i] = []
+            todo.append(i)
+    logger.info(f"Scan index: {len(files) - len(todo)} unchanged or duplicate, {len(todo)} to parse")
+    return todo, same_content
+
+
+def _parse_batch(
+    pool: WorkerPool,
+    files: Sequence[str],
+    schemas: list[DataTagSchema],
+    include_folk_tags: bool,
+    index: ScanIndex | None,
+    prefilter: bool,
+    stats: ScanStats | None = None,
+) -> list[list[DataTag]]:
+    results: list[list[DataTag] | None] = [None] * len(files)
+    # Files with identical content (empty __init__.py, vendored copies) are parsed once.
+    todo: list[int] = list(range(len(files)))
+    same_content: dict[int, list[int]] = {}
+    hit_digests: list[str | None] = [None] * len(files)
+    if index:
+        todo, same_content = _probe_index(files, index.probe, results, stats, hit_digests)
+
+    tasks = [(files[i], schemas, include_folk_tags, prefilter) for i in todo]
+    with stage(stats, "parse"):
+        parsed = pool.map(_parse_one, tasks)
+
+    for i, outcome in zip(todo, parsed):
+        results[i] = outcome.tags
+    if index:
+        with span("index"), stage(stats, "index"):
+            for i, outcome in zip(todo, parsed):
+                index.store(files[i], outcome.fingerprint, outcome.tags, outcome.failure)
+                for twin in same_content.get(i, []):
+                    results[twin] = index.lookup(files[twin])
+    if stats is not None:
+        copies = sum(len(twins) for twins in same_content.values())
+        stats.cache_hits += len(files) - len(todo) - copies
+        stats.files_same_content += copies
+        for i, outcome in zip(todo, parsed):
+            if outcome.prefiltered:
+                stats.files_prefiltered += 1
+            else:
+                stats.files_parsed += 1
+            if outcome.failure:
+                stats.parse_failures[files[i]] = outcome.failure
+                for twin in same_content.get(i, []):
+                    stats.parse_failures[files[twin]] = outcome.failure
+        # Content that failed before is answered with its empty result, but is still reported.
+        for i, digest in enumerate(hit_digests):
+            failure = index.cache.failure(digest) if index and digest else None
+            if failure:
+                stats.parse_failures[files[i]] = failure
+    return [tags or [] for tags in results]
+
+
+def scan_python_files(
+    files: Sequence[str],
+    keep_untagged: bool,
+    jobs: int | None = 1,
+    backend: str | None = None,
+    prefilter_schemas: list[DataTagSchema] | None = None,
+    include_folk_tags: bool = False,
+    index: ScanIndex | None = None,
+    stats: ScanStats | None = None,
+) -> list[list[RawCommentBlock]]:
+    """
+    Read many Python files once each and return their comment blocks, not yet classified by any schema.
+
+    The schema-independent counterpart of :func:`parse_python_files`, for callers that classify the
+    same files under several schemas (see :class:`pycodetags.scan_session.ScanSession`). With an
+    ``index`` opened by :meth:`~pycodetags.scan_index.ScanIndex.open_blocks` for the same
+    ``keep_untagged`` and prefilter, unchanged files are answered from its block pack and only
+    the rest are read; fresh blocks are stored back (the caller saves the index).
+
+    Args:
+        files (Sequence[str]): Paths of ``.py`` files to scan.
+        keep_untagged (bool): Keep blocks without a PEP-350 tag, for the folk and TDG passes.
+        jobs (int | None): Number of workers. ``None``/``1`` scans serially, ``0`` uses one per CPU.
+        backend (str | None): ``"process"`` or ``"thread"``. Defaults to :func:`default_backend`.
+        prefilter_schemas (list[DataTagSchema] | None): Skip files whose raw bytes cannot contain a tag
+            of these schemas. None reads every file.
+        include_folk_tags (bool): Whether the prefilter must let folk tags through.
+        index (ScanIndex | None): Block index to consult and update.
+        stats (ScanStats | None): Counts files read, prefiltered out, answered from the cache or by a copy.
+
+    Returns:
+        list[list[RawCommentBlock]]: One list of blocks per input file, in input order.
+    """
+    backend = _check_backend(backend)
+    results: list[list[RawCommentBlock] | None] = [None] * len(files)
+    todo: list[int] = list(range(len(files)))
+    same_content: dict[int, list[int]] = {}
+    if index:
+        todo, same_content = _probe_index(files, index.probe_blocks, results, stats)
+    tasks = [(files[i], prefilter_schemas, include_folk_tags, keep_untagged) for i in todo]
+    with stage(stats, "parse"):
+        scanned = _map_tasks(_scan_one, tasks, jobs, backend)
+    for i, outcome in zip(todo, scanned):
+        results[i] = outcome.blocks
+        for twin in same_content.get(i, []):
+            results[twin] = outcome.blocks
+    if index:
+        with span("index"), stage(stats, "index"):
+            for i, outcome in zip(todo, scanned):
+                index.store_blocks(files[i], outcome.fingerprint, outcome.blocks)
+    if stats is not None:
+        copies = sum(len(twins) for twins in same_content.values())
+        stats.cache_hits += len(files) - len(todo) - copies
+        stats.files_same_content += copies
+        stats.files_prefiltered += sum(outcome.prefiltered for outcome in scanned)
+        stats.files_parsed += sum(not outcome.prefiltered for outcome in scanned)
+    return [blocks or [] for blocks in results]
@@ -0,0 +1,260 @@
+"""
+Content-addressed cache of parse results.
+
+Maps ``digest of file bytes -> DataTag list`` for one parse configuration (schemas, folk-tag setting,
+parser and Python version). A pack can instead hold the schema-independent comment blocks of
+:func:`~pycodetags.data_tags.data_tags_parsers.scan_comment_blocks`, which
+:class:`~pycodetags.scan_session.ScanSession` classifies under each schema a plugin asks for; its key is
+:func:`blocks_key`. Because the key is the content, a result is reused wherever the same bytes
+turn up again: after a branch switch, in a fresh CI checkout with a restored cache folder, or for a
+file that was moved or copied.
+
+All entries of one configuration live in a single pack file under
+``<project_root>/.pycodetags_cache/parse/``, read once per scan and written once at the end. Entries
+are kept in ``marshal`` form (compact and fast; ``pickle`` only for values marshal cannot hold) and are
+only decoded when hit. Entries not used for :data:`MAX_AGE_DAYS` are dropped when the pack is saved.
+Content that failed to parse (not UTF-8, does not tokenize) is cached with its empty result, and the
+name of the error is kept next to it (:meth:`ParseCache.failure`) so a warm scan still reports it.
+
+The path-keyed :class:`~pycodetags.scan_index.ScanIndex` sits in front of this cache so that unchanged
+files are answered from a ``stat()`` without reading or hashing them.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import marshal
+import os
+import pickle  # nosec
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, TypeVar
+
+from pycodetags.__about__ import __version__
+from pycodetags.data_tags import DataTag, DataTagSchema
+from pycodetags.data_tags.data_tags_parsers import RawCommentBlock
+from pycodetags.utils.project_root import find_project_root
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["ParseCache", "parse_key", "blocks_key", "dump_tags", "load_tags", "dump_blocks", "load_blocks"]
+
+# Bump when the shape of parse results changes without a package version bump.
+PARSER_VERSION = 1
+PACK_VERSION = 2
+PARSE_DIRNAME = "parse"
+MAX_AGE_DAYS = 30
+
+_MARSHAL = b"M"
+_PICKLE = b"P"
+
+_Value = TypeVar("_Value")
+
+
+def parse_key(schemas: list[DataTagSchema], include_folk_tags: bool) -> str:
+    """Everything besides file content that changes what a parse returns."""
+    payload = json.dumps(
+        [PARSER_VERSION, __version__, sys.version_info[:2], include_folk_tags, schemas], sort_keys=True, default=str
+    )
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def blocks_key(keep_untagged: bool, prefilter_schemas: list[DataTagSchema] | None, include_folk_tags: bool) -> str:
+    """Everything besides file content that changes the comment blocks a session scan keeps."""
+    payload = json.dumps(
+        [
+            "blocks",
+            PARSER_VERSION,
+            __version__,
+            sys.version_info[:2],
+            keep_untagged,
+            prefilter_schemas,
+            include_folk_tags,
+        ],
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def dump_tags(tags: list[DataTag]) -> bytes:
+    """Serialize a tag list, with marshal when possible."""
+    try:
+        return _MARSHAL + marshal.dumps(tags, 4)
+    except ValueError:
+        return _PICKLE + pickle.dumps(tags, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def load_tags(blob: bytes) -> list[DataTag]:
+    """Inverse of :func:`dump_tags`."""
+    if blob[:1] == _MARSHAL:
+        return marshal.loads(blob[1:])  # type: ignore[no-any-return] # nosec
+    return pickle.loads(blob[1:])  # type: ignore[no-any-return] # nosec
+
+
+def dump_blocks(blocks: list[RawCommentBlock]) -> bytes:
+    """Serialize comment blocks; they are plain tuples once stored, so :func:`load_tags` can check them."""
+    return _MARSHAL + marshal.dumps([block.to_plain() for block in blocks], 4)
+
+
+def load_blocks(blob: bytes) -> list[RawCommentBlock]:
+    """Inverse of :func:`dump_blocks`."""
+    return [RawCommentBlock.from_plain(plain) for plain in load_tags(blob)]  # type: ignore[arg-type]
+
+
+def _today() -> int:
+    return int(time.time() // 86400)
+
+
+class ParseCache:
+    """``digest -> serialized tags`` for one parse configuration, stored as one pack file."""
+
+    def __init__(
+        self,
+        path: Path | None,
+        key: str,
+        entries: dict[str, tuple[int, bytes]] | None = None,
+        failures: dict[str, str] | None = None,
+    ) -> None:
+        self.path = path
+        self.key = key
+        # digest -> (day last used, serialized tags)
+        self.entries = entries or {}
+        # digest -> name of the error that stopped the content from being parsed
+        self.failures = failures or {}
+        self.dirty = False
+        self.hits = 0
+        self.misses = 0
+        self._today = _today()
+
+    @classmethod
+    def directory_for(cls, root: Path | None = None) -> Path:
+        """Folder holding pack files for the given (or auto-detected) project root."""
+        root = root or find_project_root()
+        return root / ".pycodetags_cache" / PARSE_DIRNAME
+
+    @classmethod
+    def open(cls, schemas: list[DataTagSchema], include_folk_tags: bool, root: Path | None = None) -> ParseCache | None:
+        """Load the cache for this parse configuration, or None if there is no project root to hold it."""
+        key = parse_key(schemas, include_folk_tags)
+        try:
+            directory = cls.directory_for(root)
+        except FileNotFoundError:
+            logger.info("No project root found, parse cache disabled.")
+            return None
+        return cls.load(directory / f"{key}.pack", key)
+
+    @classmethod
+    def open_blocks(
+        cls,
+        keep_untagged: bool,
+        prefilter_schemas: list[DataTagSchema] | None,
+        include_folk_tags: bool,
+        root: Path | None = None,
+    ) -> ParseCache | None:
+        """Load the comment block pack for this scan configuration, see :meth:`get_blocks`."""
+        key = blocks_key(keep_untagged, prefilter_schemas, include_folk_tags)
+        try:
+            directory = cls.directory_for(root)
+        except FileNotFoundError:
+            logger.info("No project root found, parse cache disabled.")
+            return None
+        return cls.load(directory / f"{key}.pack", key)
+
+    @classmethod
+    def load(cls, path: Path, key: str) -> ParseCache:
+        """Load a pack file, starting empty if it is missing, unreadable or for another version."""
+        try:
+            with path.open("rb") as handle:
+                payload = marshal.load(handle)  # nosec
+        except FileNotFoundError:
+            return cls(path, key)
+        except (EOFError, ValueError, TypeError, OSError) as e:
+            logger.warning("Could not read parse cache %s (%s); starting fresh.", path, e)
+            return cls(path, key)
+        if not isinstance(payload, dict) or payload.get("version") != PACK_VERSION or payload.get("key") != key:
+            return cls(path, key)
+        return cls(path, key, payload.get("entries"), payload.get("failures"))
+
+    def get(self, digest: str) -> list[DataTag] | None:
+        """Tags previously parsed from content with this digest, or None."""
+        return self._get(digest, load_tags)
+
+    def get_blocks(self, digest: str) -> list[RawCommentBlock] | None:
+        """Comment blocks previously scanned from content with this digest, or None. Block packs only."""
+        return self._get(digest, load_blocks)
+
+    def _get(self, digest: str, load: Callable[[bytes], _Value]) -> _Value | None:
+        entry = self.entries.get(digest)
+        if entry is None:
+            self.misses += 1
+            return None
+        day, blob = entry
+        try:
+            value = load(blob)
+        except (EOFError, ValueError, TypeError, pickle.UnpicklingError):
+            del self.entries[digest]
+            self.dirty = True
+            self.misses += 1
+            return None
+        if day != self._today:
+            self.entries[digest] = (self._today, blob)
+            self.dirty = True
+        self.hits += 1
+        return value
+
+    def failure(self, digest: str) -> str | None:
+        """Name of the error that stopped content with this digest from being parsed, or None."""
+        return self.failures.get(digest) if digest in self.entries else None
+
+    def put(self, digest: str, tags: list[DataTag], failure: str | None = None) -> None:
+        """Record tags parsed from content with this digest, and the parse error that cut them short."""
+        self.entries[digest] = (self._today, dump_tags(tags))
+        if failure:
+            self.failures[digest] = failure
+        else:
+            self.failures.pop(digest, None)
+        self.dirty = True
+
+    def put_blocks(self, digest: str, blocks: list[RawCommentBlock]) -> None:
+        """Record comment blocks scanned from content with this digest. Block packs only."""
+        self.entries[digest] = (self._today, dump_blocks(blocks))
+        self.dirty = True
+
+    def expire(self, max_age_days: int = MAX_AGE_DAYS) -> int:
+        """Drop entries not used for ``max_age_days``. Returns how many were dropped."""
+        oldest = self._today - max_age_days
+        stale = [digest for digest, (day, _) in self.entries.items() if day < oldest]
+        for digest in stale:
+            del self.entries[digest]
+            self.failures.pop(digest, None)
+        if stale:
+            self.dirty = True
+        return len(stale)
+
+    def save(self) -> None:
+        """Atomically write the pack (temp file + ``os.replace``) if anything changed."""
+        if not self.dirty or self.path is None:
+            return
+        self.expire()
+        payload: dict[str, Any] = {
+            "version": PACK_VERSION,
+            "key": self.key,
+            "entries": self.entries,
+            "failures": self.failures,
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            gitignore = self.path.parent.parent / ".gitignore"
+            if not gitignore.exists():
+                gitignore.write_text("*\n", encoding="utf-8")
+            tmp = self.path.with_suffix(f".{os.getpid()}.tmp")
+            with tmp.open("wb") as handle:
+                marshal.dump(payload, handle, 4)
+            os.replace(tmp, self.path)
+            self.dirty = False
+        except OSError as e:
+            logger.warning("Could not write parse cache %s: %s", self.path, e)
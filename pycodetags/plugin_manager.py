@@ -1,8 +1,36 @@
 """
 The pluggy plugin manager that finds plugins and invokes them when needed.
+
+Finding plugins means reading the metadata of every installed distribution, and loading them imports
+each plugin with all of its dependencies. Neither should be paid on every start:
+
+- The plugin manager is created the first time :func:`get_plugin_manager` is called.
+- What discovery found -- each plugin's entry point and the hooks it implements -- is cached in a small
+  JSON file, keyed by the Python in use and the state of every ``sys.path`` entry. Installing, removing
+  or upgrading a distribution changes its ``site-packages`` folder, which invalidates the cache. So does
+  editing a plugin in place (an editable or development install): each cached plugin records the
+  modification times of its ``entry_points.txt`` and of the files defining it and its hooks, which are
+  checked on start-up.
+- A plugin found in the cache is registered as a :class:`LazyPlugin` that answers for the same hooks.
+  The plugin itself is imported the first time one of those hooks is called.
+
+Set ``PYCODETAGS_PLUGIN_CACHE=off`` to always discover and load plugins up front, or to a folder to keep
+the cache somewhere other than ``$XDG_CACHE_HOME/pycodetags`` (``~/.cache/pycodetags``). Plugin authors
+can set it to ``off`` while developing to rule the cache out.
 """
 
+from __future__ import annotations
+
+import hashlib
+import importlib
+import inspect
+import json
 import logging
+import os
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Callable
 
 import pluggy
 
@@ -10,32 +38,244 @@ from pycodetags.plugin_specs import CodeTagsSpec
 
 logger = logging.getLogger(__name__)
 
-PM = pluggy.PluginManager("pycodetags")
-PM.add_hookspecs(CodeTagsSpec)
-# PM.set_blocked("malicious_plugin")
-PLUGIN_COUNT = PM.load_setuptools_entrypoints("pycodetags")
-logger.info(f"Found {PLUGIN_COUNT} plugins")
+__all__ = [
+    "get_plugin_manager",
+    "reset_plugin_manager",
+    "plugin_currently_loaded",
+    "plugin_cache_path",
+    "LazyPlugin",
+]
+
+PLUGIN_GROUP = "pycodetags"
+CACHE_ENV = "PYCODETAGS_PLUGIN_CACHE"
+_CACHE_FILE = "plugins.json"
+_CACHE_FORMAT = 2
+_OFF = ("0", "off", "false", "no")
+
+_PM: pluggy.PluginManager | None = None
+_PLUGIN_COUNT = 0
+
+
+class LazyPlugin:
+    """
+    Stands in for a plugin found in the discovery cache, until one of its hooks is called.
+
+    Each hook the plugin implements is an attribute with the plugin's argument names and hookimpl
+    options, so pluggy orders and calls it as it would the real one. The first call imports the plugin
+    (``EntryPoint.load``) and every call is passed on to it.
+    """
+
+    def __init__(self, name: str, value: str, hooks: dict[str, dict[str, Any]]) -> None:
+        self.name = name
+        self.value = value
+        self._plugin: Any = None
+        for hook_name, hook in hooks.items():
+            setattr(self, hook_name, self._proxy(hook["attr"], hook["argnames"], hook["opts"]))
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the plugin itself has been imported yet."""
+        return self._plugin is not None
+
+    def load(self) -> Any:
+        """Import the plugin, once, and return it."""
+        if self._plugin is None:
+            # Imported here: importlib.metadata is only needed once a plugin is really loaded.
+            from importlib.metadata import EntryPoint
+
+            logger.info(f"Loading plugin {self.name} ({self.value}) on first use")
+            self._plugin = EntryPoint(name=self.name, value=self.value, group=PLUGIN_GROUP).load()
+        return self._plugin
+
+    def _proxy(self, attr: str, argnames: list[str], opts: dict[str, Any]) -> Callable[..., Any]:
+        def proxy(*args: Any) -> Any:
+            # pluggy passes hook arguments positionally, in argnames order.
+            return getattr(self.load(), attr)(*args)
+
+        proxy.__name__ = attr
+        proxy.__signature__ = inspect.Signature(  # type: ignore[attr-defined]
+            [inspect.Parameter(argname, inspect.Parameter.POSITIONAL_OR_KEYWORD) for argname in argnames]
+        )
+        setattr(proxy, PLUGIN_GROUP + "_impl", dict(opts))
+        return proxy
+
+    def __repr__(self) -> str:
+        return f"<LazyPlugin {self.name}={self.value} {'loaded' if self.loaded else 'not loaded'}>"
+
+
+def plugin_cache_path() -> Path | None:
+    """The discovery cache file, or None when ``PYCODETAGS_PLUGIN_CACHE`` turns it off."""
+    setting = os.environ.get(CACHE_ENV, "")
+    if setting.lower() in _OFF:
+        return None
+    if setting:
+        return Path(setting) / _CACHE_FILE
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(cache_home) / "pycodetags" / _CACHE_FILE
+
+
+def _environment_key() -> str:
+    """Changes whenever something that decides which plugins are installed does."""
+    state: list[Any] = [_CACHE_FORMAT, sys.version, sys.prefix, sys.executable]
+    for entry in sys.path:
+        try:
+            state.append([entry, os.stat(entry or ".").st_mtime_ns])
+        except OSError:
+            state.append([entry, None])
+    return hashlib.sha256(json.dumps(state).encode("utf-8")).hexdigest()
+
+
+def _file_states(files: list[str]) -> list[list[Any]]:
+    """``[file, mtime_ns]`` for each file, with None for a file that is gone."""
+    states: list[list[Any]] = []
+    for file in files:
+        try:
+            states.append([file, os.stat(file).st_mtime_ns])
+        except OSError:
+            states.append([file, None])
+    return states
+
+
+def _plugin_files(plugin: Any, dist: Any, functions: list[Callable[..., Any]]) -> list[str]:
+    """The files whose edits can change what a plugin registers: its ``entry_points.txt`` and source files."""
+    files = set()
+    dist_info = getattr(dist, "_path", None)  # importlib.metadata.PathDistribution's dist-info folder
+    if dist_info is not None:
+        files.add(str(Path(dist_info) / "entry_points.txt"))
+    for source in [plugin if inspect.ismodule(plugin) else type(plugin), *functions]:
+        try:
+            file = inspect.getsourcefile(source)
+        except TypeError:
+            file = None
+        if file:
+            files.add(os.path.abspath(file))
+    return sorted(files)
+
+
+def _read_cache(path: Path, key: str) -> list[dict[str, Any]] | None:
+    try:
+        cached = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(cached, dict) or cached.get("key") != key:
+        return None
+    plugins = cached.get("plugins")
+    if not isinstance(plugins, list):
+        return None
+    for record in plugins:
+        files = record.get("files") or []
+        if _file_states([file for file, _mtime_ns in files]) != files:
+            logger.info(f"Plugin {record.get('name')} changed since it was cached, discovering plugins again")
+            return None
+    return plugins
+
+
+def _write_cache(path: Path, key: str, plugins: list[dict[str, Any]]) -> None:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=path.parent, delete=False) as handle:
+            json.dump({"key": key, "plugins": plugins}, handle)
+        os.replace(handle.name, path)
+    except OSError as ose:
+        logger.info(f"Could not write plugin cache {path}: {ose}")
+
+
+def _describe_plugins(pm: pluggy.PluginManager) -> list[dict[str, Any]]:
+    """Cache records for the entry-point plugins just loaded into ``pm``."""
+    records = []
+    for plugin, dist in pm.list_plugin_distinfo():
+        name = pm.get_name(plugin)
+        value = next(
+            (ep.value for ep in dist.entry_points if ep.group == PLUGIN_GROUP and ep.name == name),
+            None,
+        )
+        if name is None or value is None:
+            continue
+        impls = [
+            (caller.name, impl)
+            for caller in pm.get_hookcallers(plugin) or []
+            for impl in caller.get_hookimpls()
+            if impl.plugin is plugin
+        ]
+        hooks: dict[str, dict[str, Any]] | None = {
+            hook_name: {
+                "attr": impl.function.__name__ if impl.opts.get("specname") else hook_name,
+                "argnames": list(impl.argnames),
+                "opts": {key: option for key, option in impl.opts.items() if key != "specname"},
+            }
+            for hook_name, impl in impls
+        }
+        if any(impl.wrapper or impl.hookwrapper for _hook_name, impl in impls):
+            # A wrapper has to be a generator itself, which a forwarding stand-in is not; load these up front.
+            hooks = None
+        files = _file_states(_plugin_files(plugin, dist, [impl.function for _hook_name, impl in impls]))
+        records.append({"name": name, "value": value, "dist": dist.project_name, "hooks": hooks, "files": files})
+    return records
+
+
+def _load_plugins(pm: pluggy.PluginManager) -> int:
+    """Register the installed plugins, from the discovery cache when it is current."""
+    path = plugin_cache_path()
+    if path is None:
+        return pm.load_setuptools_entrypoints(PLUGIN_GROUP)
+
+    key = _environment_key()
+    records = _read_cache(path, key)
+    if records is None:
+        count = pm.load_setuptools_entrypoints(PLUGIN_GROUP)
+        _write_cache(path, key, _describe_plugins(pm))
+        return count
+
+    count = 0
+    for record in records:
+        name = record["name"]
+        if pm.get_plugin(name) or pm.is_blocked(name):
+            continue
+        lazy = LazyPlugin(name, record["value"], record["hooks"] or {})
+        pm.register(lazy if record["hooks"] is not None else lazy.load(), name=name)
+        count += 1
+    return count
+
+
+def _create_plugin_manager() -> pluggy.PluginManager:
+    global _PLUGIN_COUNT  # nosec # noqa
+    pm = pluggy.PluginManager("pycodetags")
+    pm.add_hookspecs(CodeTagsSpec)
+    # pm.set_blocked("malicious_plugin")
+    _PLUGIN_COUNT = _load_plugins(pm)
+    logger.info(f"Found {_PLUGIN_COUNT} plugins")
+    if logger.isEnabledFor(logging.DEBUG):
+        # magic line to set a writer function
+        pm.trace.root.setwriter(print)
+        pm.enable_tracing()
+    return pm
 
 
 def reset_plugin_manager() -> None:
     """For testing or events can double up"""
     # pylint: disable=global-statement
-    global PM  # nosec # noqa
-    PM = pluggy.PluginManager("pycodetags")
-    PM.add_hookspecs(CodeTagsSpec)
-    PM.load_setuptools_entrypoints("pycodetags")
-
-
-if logger.isEnabledFor(logging.DEBUG):
-    # magic line to set a writer function
-    PM.trace.root.setwriter(print)
-    undo = PM.enable_tracing()
+    global _PM  # nosec # noqa
+    _PM = _create_plugin_manager()
 
 
 # At class level or module-level:
 def get_plugin_manager() -> pluggy.PluginManager:
     """Interface to help with unit testing"""
-    return PM
+    # pylint: disable=global-statement
+    global _PM  # nosec # noqa
+    if _PM is None:
+        _PM = _create_plugin_manager()
+    return _PM
+
+
+def __getattr__(name: str) -> Any:
+    # PM and PLUGIN_COUNT used to be created at import time.
+    if name == "PM":
+        return get_plugin_manager()
+    if name == "PLUGIN_COUNT":
+        get_plugin_manager()
+        return _PLUGIN_COUNT
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def plugin_currently_loaded(pm: pluggy.PluginManager) -> None:
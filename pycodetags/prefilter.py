@@ -0,0 +1,127 @@
+"""
+Byte-level prefilter: skip files that cannot contain a code tag.
+
+Most source files have no code tags, yet parsing one means decoding it, tokenizing it to find comments
+and running the tag parsers over every comment. The prefilter looks at the raw bytes first with one
+compiled alternation built from:
+
+- the PEP-350 shape: an upper-case tag and a colon on a comment line (``# ... TODO:``), followed
+  somewhere later by ``<`` and ``>``;
+- the union of ``matching_tags`` of the active schemas directly after a ``#`` (``# TODO``), which is
+  how folk and TDG tags start.
+
+A file with no hit is answered with an empty tag list without decoding it. The test is deliberately
+looser than the parsers (it ignores whether the ``#`` is really a comment, for instance), so it never
+rejects a file a parser would find a tag in; it only has to be cheap. Files above
+:data:`MMAP_THRESHOLD` are searched through ``mmap`` instead of being read into memory.
+"""
+
+from __future__ import annotations
+
+import logging
+import mmap
+import os
+import re
+from collections.abc import Iterable
+from functools import lru_cache
+
+from pycodetags.data_tags.data_tags_schema import DataTagSchema
+from pycodetags.scan_index import FileFingerprint, content_digest
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["Prefilter", "prefilter_for", "read_candidate"]
+
+# Files at least this large are searched through mmap rather than read into a bytes object.
+MMAP_THRESHOLD = 256 * 1024
+
+# An upper-case tag (as in data_tags_parsers.scan_codetags) with its colon, after a "#" on the same line.
+_PEP350_ANCHOR = rb"#[^\n]*?[A-Z?!]{3,}[ \t\r\f\v]*:"
+
+
+class Prefilter:
+    """Decides from raw bytes whether a file may contain tags of the given shapes.
+
+    Examples:
+        >>> prefilter = Prefilter(["TODO"], folk=True)
+        >>> prefilter.may_contain_tags(b"x = 1  # TODO fix")
+        True
+        >>> prefilter.may_contain_tags(b"TODO = 'not in a comment'")
+        False
+        >>> prefilter.may_contain_tags(b"# FIXME: has fields <due:2026-01-01>")
+        True
+        >>> prefilter.may_contain_tags(b"# NOTE: no field string")
+        False
+    """
+
+    def __init__(self, folk_tags: Iterable[str] = (), folk: bool = False) -> None:
+        alternatives = []
+        tags = sorted({tag for tag in folk_tags if tag}, key=lambda tag: (-len(tag), tag)) if folk else []
+        if tags:
+            # First, so that at a given "#" a folk hit (final) wins over a PEP-350 anchor (needs more checks).
+            words = "|".join(re.escape(tag) for tag in tags)
+            alternatives.append(rf"(?P<folk>#\s*(?:{words})\b)")
+        alternatives.append(f"(?P<pep350>{_PEP350_ANCHOR.decode('ascii')})")
+        self.folk_tags = tuple(tags)
+        self.pattern = re.compile("|".join(alternatives).encode("ascii"))
+        self._folk_pattern = re.compile(alternatives[0].encode("ascii")) if tags else None
+
+    def __repr__(self) -> str:
+        return f"Prefilter(folk_tags={list(self.folk_tags)})"
+
+    def may_contain_tags(self, data: bytes | mmap.mmap) -> bool:
+        """True unless ``data`` certainly holds no tag."""
+        match = self.pattern.search(data)
+        if match is None:
+            return False
+        if match.lastgroup == "folk":
+            return True
+        # A PEP-350 tag needs a field string after it.
+        bracket = data.find(b"<", match.end())
+        if bracket != -1 and data.find(b">", bracket) != -1:
+            return True
+        # No "<...>" after the first anchor means none after any later anchor either; only a folk tag
+        # can still turn up. At most two passes over the data.
+        return self._folk_pattern is not None and self._folk_pattern.search(data, match.start() + 1) is not None
+
+    def file_may_contain_tags(self, path: str | os.PathLike[str]) -> bool:
+        """Like :meth:`may_contain_tags` for a file."""
+        return read_candidate(path, self)[1] is not None
+
+
+def read_candidate(path: str | os.PathLike[str], prefilter: Prefilter) -> tuple[FileFingerprint, bytes | None]:
+    """Fingerprint a file and return its bytes, or None instead of the bytes if it cannot hold a tag.
+
+    The file is opened once. Files of :data:`MMAP_THRESHOLD` bytes or more are searched and hashed
+    through ``mmap`` and only copied into memory when they are going to be parsed.
+    """
+    with open(path, "rb") as handle:
+        st = os.fstat(handle.fileno())
+        if st.st_size < MMAP_THRESHOLD:
+            data = handle.read()
+            candidate = prefilter.may_contain_tags(data)
+            return FileFingerprint(st.st_size, st.st_mtime_ns, content_digest(data)), data if candidate else None
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            with memoryview(mapped) as view:
+                digest = content_digest(view)
+            fingerprint = FileFingerprint(st.st_size, st.st_mtime_ns, digest)
+            if not prefilter.may_contain_tags(mapped):
+                return fingerprint, None
+            return fingerprint, mapped[:]
+
+
+@lru_cache(maxsize=32)
+def _cached_prefilter(folk_tags: tuple[str, ...], folk: bool) -> Prefilter:
+    return Prefilter(folk_tags, folk)
+
+
+def prefilter_for(schemas: list[DataTagSchema], include_folk_tags: bool) -> Prefilter:
+    """The (cached) prefilter matching what ``iterate_comments`` looks for with these settings.
+
+    Folk tags use every schema's ``matching_tags``; TDG tags use those of schemas named ``TDG``.
+    """
+    tags: set[str] = set()
+    for schema in schemas:
+        if include_folk_tags or schema.get("name") == "TDG":
+            tags.update(schema.get("matching_tags", []))
+    return _cached_prefilter(tuple(sorted(tags)), bool(tags))
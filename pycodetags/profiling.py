@@ -0,0 +1,285 @@
+"""
+Lightweight span instrumentation of the scan pipeline.
+
+The stages of a run -- walking folders, reading files, finding comment blocks, parsing tag fields,
+converting tags to records, deduplication, filtering and rendering -- are wrapped in :func:`span`.
+While no :class:`Profiler` is active, :func:`span` returns one shared do-nothing context manager, so an
+unprofiled run pays a function call per file and stage and nothing else.
+
+``pycodetags data --profile`` prints the time per stage and the slowest files to stderr;
+``--trace-out trace.json`` writes the spans in the Chrome trace-event format, which
+``chrome://tracing`` and https://ui.perfetto.dev open.
+
+Parse workers in other processes record into a profiler of their own; :class:`pycodetags.parallel.WorkerPool`
+sends their spans back with the results (see :func:`run_profiled`). Timestamps come from
+``time.perf_counter_ns``, a system-wide monotonic clock, so spans from every worker line up.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import threading
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any, Callable, NamedTuple, TypeVar
+
+__all__ = [
+    "Profiler",
+    "SpanEvent",
+    "StageTotal",
+    "span",
+    "active_profiler",
+    "run_profiled",
+    "STAGES",
+]
+
+STAGES = (
+    "cli setup",
+    "walk",
+    "index",
+    "parse_file",
+    "read",
+    "find_comment_blocks",
+    "parse_fields",
+    "plugin_source_tags",
+    "convert",
+    "dedup",
+    "filter",
+    "render",
+)
+"""The pipeline stages in running order; the report lists them first, then anything else recorded."""
+
+FILE_SPANS = ("parse_file", "plugin_source_tags")
+"""Spans that cover one whole file and carry its path in ``args["file"]``."""
+
+_Task = TypeVar("_Task")
+_Result = TypeVar("_Result")
+
+
+class SpanEvent(NamedTuple):
+    """One finished span."""
+
+    name: str
+    start_ns: int
+    duration_ns: int
+    self_ns: int
+    """Duration minus the time spent in spans nested inside this one, on the same thread."""
+    pid: int
+    tid: int
+    args: dict[str, Any] | None
+
+
+class StageTotal(NamedTuple):
+    """Time recorded for one span name over a whole run."""
+
+    name: str
+    calls: int
+    total_ns: int
+    self_ns: int
+
+
+class _Span:
+    """Context manager recording one span into a profiler."""
+
+    __slots__ = ("profiler", "name", "args", "start_ns", "child_ns")
+
+    def __init__(self, profiler: Profiler, name: str, args: dict[str, Any] | None) -> None:
+        self.profiler = profiler
+        self.name = name
+        self.args = args
+        self.start_ns = 0
+        self.child_ns = 0
+
+    def __enter__(self) -> _Span:
+        self.profiler._stack().append(self)
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        duration = time.perf_counter_ns() - self.start_ns
+        stack = self.profiler._stack()
+        stack.pop()
+        if stack:
+            stack[-1].child_ns += duration
+        self.profiler.record(
+            SpanEvent(
+                self.name,
+                self.start_ns,
+                duration,
+                duration - self.child_ns,
+                os.getpid(),
+                threading.get_ident(),
+                self.args,
+            )
+        )
+
+
+class Profiler:
+    """
+    Collects spans while active. Only one profiler is active in a process at a time.
+
+    ``started_ns`` (a ``time.perf_counter_ns()`` reading) backdates the start of the run, for a caller
+    that only decided to profile some way in; the wall time and the trace count from there.
+
+    >>> profiler = Profiler()
+    >>> with profiler.activate():
+    ...     with span("parse_file", file="a.py"):
+    ...         with span("read"):
+    ...             pass
+    >>> [stage.name for stage in profiler.stage_totals()]
+    ['parse_file', 'read']
+    >>> profiler.slowest_files(5)[0][0]
+    'a.py'
+    """
+
+    def __init__(self, started_ns: int | None = None) -> None:
+        self.events: list[SpanEvent] = []
+        self.started_ns = time.perf_counter_ns() if started_ns is None else started_ns
+        self.stopped_ns: int | None = None
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _stack(self) -> list[_Span]:
+        stack: list[_Span] | None = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def span(self, name: str, args: dict[str, Any] | None = None) -> _Span:
+        return _Span(self, name, args)
+
+    def record(self, event: SpanEvent) -> None:
+        """Add a finished span, e.g. one reported by a worker process."""
+        with self._lock:
+            self.events.append(event)
+
+    def add_span(self, name: str, start_ns: int, end_ns: int, **args: Any) -> None:
+        """Record a span measured without :func:`span`, e.g. one that started before profiling did."""
+        duration = end_ns - start_ns
+        self.record(SpanEvent(name, start_ns, duration, duration, os.getpid(), threading.get_ident(), args or None))
+
+    @contextlib.contextmanager
+    def activate(self) -> Iterator[Profiler]:
+        """Make this the profiler :func:`span` records into while the block runs."""
+        # pylint: disable=global-statement
+        global _ACTIVE  # nosec # noqa
+        previous, _ACTIVE = _ACTIVE, self
+        try:
+            yield self
+        finally:
+            _ACTIVE = previous
+            self.stopped_ns = time.perf_counter_ns()
+
+    @property
+    def wall_ns(self) -> int:
+        """From creation to the end of :meth:`activate`, or to now while still active."""
+        return (self.stopped_ns or time.perf_counter_ns()) - self.started_ns
+
+    def stage_totals(self) -> list[StageTotal]:
+        """Calls, total and self time per span name, pipeline stages first in running order."""
+        totals: dict[str, list[int]] = {}
+        for event in self.events:
+            total = totals.setdefault(event.name, [0, 0, 0])
+            total[0] += 1
+            total[1] += event.duration_ns
+            total[2] += event.self_ns
+        order = {name: i for i, name in enumerate(STAGES)}
+        names = sorted(totals, key=lambda name: (order.get(name, len(order)), -totals[name][1]))
+        return [StageTotal(name, *totals[name]) for name in names]
+
+    def slowest_files(self, count: int) -> list[tuple[str, int]]:
+        """``(file, nanoseconds)`` of the ``count`` files that took longest, slowest first."""
+        per_file: dict[str, int] = {}
+        for event in self.events:
+            if event.name in FILE_SPANS and event.args and "file" in event.args:
+                file = str(event.args["file"])
+                per_file[file] = per_file.get(file, 0) + event.duration_ns
+        return sorted(per_file.items(), key=lambda item: item[1], reverse=True)[:count]
+
+    def report(self, top_files: int = 10) -> str:
+        """The per-stage breakdown and the slowest files, as text."""
+        wall = self.wall_ns or 1
+        lines = [
+            f"--- pycodetags profile: {wall / 1e9:.3f} s wall ---",
+            f"{'stage':<22} {'calls':>8} {'total s':>9} {'self s':>9} {'self %':>7}",
+        ]
+        for stage in self.stage_totals():
+            lines.append(
+                f"{stage.name:<22} {stage.calls:>8} {stage.total_ns / 1e9:>9.3f} {stage.self_ns / 1e9:>9.3f}"
+                f" {100 * stage.self_ns / wall:>6.1f}%"
+            )
+        slowest = self.slowest_files(top_files)
+        if slowest:
+            lines.append("slowest files:")
+            lines.extend(f"{duration / 1e9:>9.4f} s  {file}" for file, duration in slowest)
+        lines.append("Stages in parallel workers add up across workers and can exceed the wall time.")
+        return "\n".join(lines)
+
+    def chrome_trace(self) -> dict[str, Any]:
+        """The spans as a Chrome trace-event document (complete events, microseconds)."""
+        main_pid = os.getpid()
+        trace_events: list[dict[str, Any]] = []
+        for pid in sorted({event.pid for event in self.events} | {main_pid}):
+            name = "pycodetags" if pid == main_pid else f"pycodetags worker {pid}"
+            trace_events.append({"name": "process_name", "ph": "M", "pid": pid, "args": {"name": name}})
+        for event in self.events:
+            trace_event: dict[str, Any] = {
+                "name": event.name,
+                "cat": "pycodetags",
+                "ph": "X",
+                "ts": (event.start_ns - self.started_ns) / 1000,
+                "dur": event.duration_ns / 1000,
+                "pid": event.pid,
+                "tid": event.tid,
+            }
+            if event.args:
+                trace_event["args"] = {key: str(value) for key, value in event.args.items()}
+            trace_events.append(trace_event)
+        return {"traceEvents": trace_events, "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, path: str | os.PathLike[str]) -> None:
+        """Write :meth:`chrome_trace` to ``path`` as JSON."""
+        with Path(path).open("w", encoding="utf-8") as handle:
+            json.dump(self.chrome_trace(), handle)
+
+
+_ACTIVE: Profiler | None = None
+_NO_SPAN = contextlib.nullcontext()
+
+
+def active_profiler() -> Profiler | None:
+    """The profiler spans are recorded into, or None when profiling is off."""
+    return _ACTIVE
+
+
+def span(name: str, **args: Any) -> contextlib.AbstractContextManager[Any]:
+    """
+    Time the enclosed block as one ``name`` span, when a profiler is active.
+
+    Args:
+        name (str): The stage, see :data:`STAGES`.
+        **args: Shown with the span in the trace; ``file=`` marks a span covering one file.
+
+    Returns:
+        A context manager; a shared one that does nothing while profiling is off.
+    """
+    profiler = _ACTIVE
+    if profiler is None:
+        return _NO_SPAN
+    return profiler.span(name, args or None)
+
+
+def run_profiled(worker: Callable[[_Task], _Result], task: _Task) -> tuple[_Result, list[SpanEvent]]:
+    """
+    Run ``worker(task)`` under a profiler of its own and return its spans with the result.
+
+    Used in worker processes, which cannot record into the parent's profiler. Module level so it can be
+    pickled, as ``functools.partial(run_profiled, worker)``.
+    """
+    profiler = Profiler()
+    with profiler.activate():
+        result = worker(task)
+    return result, profiler.events
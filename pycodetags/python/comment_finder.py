@@ -1,38 +1,164 @@
 """
-Finds comments using the AST parser.
+Finds comments using the Python tokenizer.
 
 If we look for comments with regex, we risk finding comments inside of structure that are not comments.
 
-For older versions of python, the code falls back to string parsing instead of AST parsing.
+Two engines are available:
+
+- ``"tokenize"`` (default): one streaming ``tokenize`` pass; comment positions come straight from the
+  tokens, so a comment repeated on several lines is located correctly.
+- ``"ast"``: the original implementation, builds an ``ast_comments`` tree and then searches the source
+  for each comment's text. Kept for comparison, see ``tests/performance/bench_comment_finder.py``.
+
+When ``ast_comments`` is not installed the ``"ast"`` engine falls back to string parsing.
 
 Once a comment block is found, it could still have multiple code tags in it.
 """
 
 from __future__ import annotations
 
+import contextlib
 import logging
+import threading
 import tokenize
 from ast import walk
-from typing import Any
+from collections.abc import Iterator
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any
 
 from pycodetags.exceptions import FileParsingError
-from pycodetags.utils import persistent_memoize
+from pycodetags.utils.source_text import SourceText
 
-try:
-    from ast_comments import Comment, parse
-except ImportError:
-    Comment: Any = None  # type: ignore[no-redef]
-    parse: Any = None  # type: ignore[no-redef]
+if TYPE_CHECKING:
+    from ast_comments import Comment
 
 LOGGER = logging.getLogger(__name__)
 
-__all__ = ["find_comment_blocks_from_string", "find_comment_blocks_from_string_fallback"]
+__all__ = [
+    "find_comment_blocks_from_string",
+    "find_comment_blocks_from_string_tokenize",
+    "find_comment_blocks_from_string_ast",
+    "find_comment_blocks_from_string_fallback",
+    "recording_parse_failures",
+    "COMMENT_ENGINES",
+]
+
+COMMENT_ENGINES = ("tokenize", "ast")
+
+_recorder = threading.local()
 
 
-@persistent_memoize(ttl_seconds=60 * 60 * 24 * 7, use_gzip=True)
-def find_comment_blocks_from_string(source: str) -> list[tuple[int, int, int, int, str]]:
+@contextlib.contextmanager
+def recording_parse_failures() -> Iterator[list[str]]:
+    """
+    Collect, on this thread, the names of the errors that made the comment finder give up on a source.
+
+    A source that does not tokenize is logged and treated as having no comments; inside this block the
+    error's name (``TokenError``, ``SyntaxError``, ...) is also appended to the yielded list.
+    """
+    failures: list[str] = []
+    previous = getattr(_recorder, "failures", None)
+    _recorder.failures = failures
+    try:
+        yield failures
+    finally:
+        _recorder.failures = previous
+
+
+def _gave_up(error: Exception, message: str) -> None:
+    logging.warning(f"{message}, {type(error).__name__}")
+    failures = getattr(_recorder, "failures", None)
+    if failures is not None:
+        failures.append(type(error).__name__)
+
+
+def find_comment_blocks_from_string(
+    source: str | SourceText, engine: str = "tokenize"
+) -> list[tuple[int, int, int, int, str]]:
     """Parses a Python source file and yields comment block ranges.
 
+    Args:
+        source (str | SourceText): Python source text.
+        engine (str): ``"tokenize"`` or ``"ast"``, see module docstring.
+
+    Returns:
+        list[tuple[int, int, int, int, str]]: (start_line, start_char, end_line, end_char, comment)
+        representing the comment block's position in the file (0-based).
+    """
+    if engine == "tokenize":
+        return find_comment_blocks_from_string_tokenize(source)
+    if engine == "ast":
+        return find_comment_blocks_from_string_ast(str(source))
+    raise ValueError(f"Unknown comment engine {engine!r}, expected one of {COMMENT_ENGINES}")
+
+
+def _comment_tokens(lines: list[str]) -> Iterator[tokenize.TokenInfo]:
+    line_iter = iter(lines)
+    for token in tokenize.generate_tokens(lambda: next(line_iter, "")):
+        if token.type == tokenize.COMMENT:
+            yield token
+
+
+def find_comment_blocks_from_string_tokenize(source: str | SourceText) -> list[tuple[int, int, int, int, str]]:
+    """Find comment blocks with a single ``tokenize`` pass.
+
+    Comments on consecutive lines form one block. The block text runs from the first ``#`` to the end
+    of the last comment, including whatever sits between them on the intermediate lines.
+
+    Args:
+        source (str | SourceText): Python source text.
+
+    Returns:
+        list[tuple[int, int, int, int, str]]: (start_line, start_char, end_line, end_char, comment)
+        representing the comment block's position in the file (0-based).
+
+    Examples:
+        >>> find_comment_blocks_from_string_tokenize("x = 1  # a\\n# b\\n\\n# c\\n")
+        [(0, 7, 1, 3, '# a\\n# b'), (3, 0, 3, 3, '# c')]
+    """
+    blocks: list[tuple[int, int, int, int, str]] = []
+    if not source or "#" not in str(source):
+        return blocks
+    src = SourceText.coerce(source)
+
+    def close(start_line: int, start_char: int, end_line: int, end_char: int) -> None:
+        text = src.extract(start_line, start_char, end_line, end_char)
+        blocks.append((start_line, start_char, end_line, end_char, text))
+
+    block: list[int] | None = None  # [start_line, start_char, end_line, end_char]
+    try:
+        for token in _comment_tokens(src.lines(keepends=True)):
+            row = token.start[0] - 1
+            col = token.start[1]
+            end_char = col + len(token.string)
+            if block is not None and row == block[2] + 1:
+                block[2], block[3] = row, end_char
+                continue
+            if block is not None:
+                close(*block)
+            block = [row, col, row, end_char]
+    except (tokenize.TokenError, SyntaxError, ValueError) as e:
+        _gave_up(e, "Can't tokenize source code")
+        return []
+    if block is not None:
+        close(*block)
+    return blocks
+
+
+@lru_cache(maxsize=None)
+def _ast_comments() -> tuple[Any, Any]:
+    """``(Comment, parse)`` from ``ast_comments``, imported on first use of the ``"ast"`` engine."""
+    try:
+        from ast_comments import Comment as comment_type
+        from ast_comments import parse
+    except ImportError:
+        return None, None
+    return comment_type, parse
+
+
+def find_comment_blocks_from_string_ast(source: str) -> list[tuple[int, int, int, int, str]]:
+    """Find comment blocks with ``ast-comments``, the original engine.
+
     Uses `ast-comments` to locate all comments, and determines the exact offsets
     for each block of contiguous comments.
 
@@ -44,6 +170,7 @@ def find_comment_blocks_from_string(source: str) -> list[tuple[int, int, int, in
         representing the comment block's position in the file (0-based).
     """
     blocks: list[tuple[int, int, int, int, str]] = []
+    comment_type, parse = _ast_comments()
     if parse is None:
         # Hack for 3.7!
         return find_comment_blocks_from_string_fallback(source)
@@ -54,21 +181,15 @@ def find_comment_blocks_from_string(source: str) -> list[tuple[int, int, int, in
 
     try:
         tree = parse(source)
-    except tokenize.TokenError:
-        logging.warning("Can't parse source code, TokenError")
-        return []
-    except SyntaxError:
-        logging.warning("Can't parse source code, SyntaxError")
-        return []
-    except ValueError:
-        logging.warning("Can't parse source code, ValueError")
+    except (tokenize.TokenError, SyntaxError, ValueError) as e:
+        _gave_up(e, "Can't parse source code")
         return []
     lines = source.splitlines()
 
     # Filter out comment nodes
     # BUG: fails to walk the whole tree. This is shallow. <matth 2025-07-04
     #  category:parser priority:high status:development release:1.0.0 iteration:1>
-    comments = [node for node in walk(tree) if isinstance(node, Comment)]
+    comments = [node for node in walk(tree) if isinstance(node, comment_type)]
 
     def comment_pos(comment: Comment) -> tuple[int, int, int, int]:
         """Get the position of a comment as (start_line, start_char, end_line, end_char)."""
@@ -122,20 +243,7 @@ def extract_comment_text(text: str, offsets: tuple[int, int, int, int]) -> str:
     Returns:
         str: The exact substring from the file containing the comment block.
     """
-    start_line, start_char, end_line, end_char = offsets
-
-    lines = text.splitlines()
-
-    if start_line == end_line:
-        return lines[start_line][start_char:end_char]
-
-    # Multi-line block
-    block_lines = [lines[start_line][start_char:]]
-    for line_num in range(start_line + 1, end_line):
-        block_lines.append(lines[line_num])
-    block_lines.append(lines[end_line][:end_char])
-
-    return "\n".join(block_lines)
+    return SourceText(text).extract(*offsets)
 
 
 def find_comment_blocks_from_string_fallback(source: str) -> list[tuple[int, int, int, int, str]]:
@@ -199,8 +307,3 @@ def find_comment_blocks_from_string_fallback(source: str) -> list[tuple[int, int
         LOGGER.debug("Ending final comment block at line %d, char %d", end_line, end_char)
         blocks.append((start_line, start_char, end_line, end_char, comment_text))
     return blocks
-
-
-if parse is None:
-    # Hack for 3.7!
-    find_comment_blocks_from_string = find_comment_blocks_from_string_fallback  # type: ignore[no-redef,unused-ignore]
@@ -0,0 +1,233 @@
+"""
+Write several report formats from one scan.
+
+``pycodetags data --format json,html,summary --output-dir reports`` scans the tree once and hands the
+same found tags to the ``print_report`` hook once per format. Each format's output goes to its own file
+in the folder (``codetags.json``, ``codetags.html``, ``codetags-summary.txt``, ...).
+
+Report writers print to standard output, so each one's output is captured: ``sys.stdout`` is replaced,
+for the duration of the dispatch, by a proxy that sends each thread's writes to that thread's buffer.
+That lets the built-in views, which only read the tags and print, run side by side on a thread pool.
+The ``print_report`` hook itself is always called on the calling thread, one format after another:
+nothing says a plugin's writer is safe to run concurrently, and a plugin may answer a built-in format
+name too. While the built-in views run on the pool, the hook is called without them. A writer that
+saves ``output_path`` itself and prints nothing leaves its file alone.
+"""
+
+from __future__ import annotations
+
+import io
+import logging
+import sys
+import threading
+from collections.abc import Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable
+
+import pluggy
+
+from pycodetags.app_config import CodeTagsConfig
+from pycodetags.data_tags import DATA
+from pycodetags.data_tags.tag_record import LazyDataList
+from pycodetags.views import print_html, print_json, print_jsonl, print_summary, print_text
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["BUILTIN_FORMATS", "INTERNAL_VIEWS", "parse_formats", "report_file_name", "write_reports"]
+
+BUILTIN_FORMATS = ("text", "html", "json", "jsonl", "summary")
+"""Formats handled by the built-in views; they only read the tags and print, so they can run in parallel."""
+
+INTERNAL_VIEWS = "pycodetags-internal-views"
+"""Name the CLI registers its built-in views plugin under."""
+
+_VIEWS: dict[str, Callable[[Sequence[DATA]], Any]] = {
+    "text": print_text,
+    "html": print_html,
+    "json": print_json,
+    "jsonl": print_jsonl,
+    "summary": print_summary,
+}
+
+_FILE_NAMES = {
+    "text": "codetags.txt",
+    "html": "codetags.html",
+    "json": "codetags.json",
+    "jsonl": "codetags.jsonl",
+    "summary": "codetags-summary.txt",
+}
+
+
+def parse_formats(value: str, supported: Sequence[str]) -> list[str]:
+    """
+    Split a comma-separated ``--format`` value, dropping repeats and checking each name.
+
+    Args:
+        value (str): E.g. ``"text,json"``.
+        supported (Sequence[str]): The known format names.
+
+    Returns:
+        list[str]: The format names, in the order given.
+
+    Raises:
+        ValueError: If the value is empty or names an unknown format.
+
+    >>> parse_formats("json, html,json", ["text", "html", "json"])
+    ['json', 'html']
+    """
+    formats = list(dict.fromkeys(name.strip() for name in value.split(",") if name.strip()))
+    if not formats:
+        raise ValueError("expected one or more format names")
+    unknown = [name for name in formats if name not in supported]
+    if unknown:
+        raise ValueError(f"unknown format(s) {', '.join(unknown)}; choose from {', '.join(sorted(supported))}")
+    return formats
+
+
+def report_file_name(format_name: str) -> str:
+    """
+    The file a format is written to inside an output folder.
+
+    >>> report_file_name("json"), report_file_name("todo.md")
+    ('codetags.json', 'codetags-todo.md')
+    """
+    return _FILE_NAMES.get(format_name, f"codetags-{format_name}")
+
+
+class _ThreadStdout(io.TextIOBase):
+    """Stands in for ``sys.stdout``: writes go to the current thread's capture buffer, if it has one."""
+
+    def __init__(self, fallback: Any) -> None:
+        super().__init__()
+        self.fallback = fallback
+        self.local = threading.local()
+
+    def _target(self) -> Any:
+        return getattr(self.local, "buffer", None) or self.fallback
+
+    def write(self, text: str) -> int:
+        return self._target().write(text)
+
+    def flush(self) -> None:
+        self._target().flush()
+
+    def writable(self) -> bool:
+        return True
+
+    @contextmanager
+    def capture(self) -> Iterator[io.StringIO]:
+        """Route this thread's writes into a new buffer while the block runs."""
+        buffer = io.StringIO()
+        self.local.buffer = buffer
+        try:
+            yield buffer
+        finally:
+            self.local.buffer = None
+
+
+@contextmanager
+def _thread_stdout() -> Iterator[_ThreadStdout]:
+    original = sys.stdout
+    proxy = _ThreadStdout(original)
+    sys.stdout = proxy
+    try:
+        yield proxy
+    finally:
+        sys.stdout = original
+
+
+def _capture(proxy: _ThreadStdout, write: Callable[[], Any]) -> tuple[str, Any]:
+    """Run ``write`` and return what it printed on this thread, and what it returned."""
+    with proxy.capture() as buffer:
+        result = write()
+    return buffer.getvalue(), result
+
+
+def _dispatch(
+    hook: Callable[..., list[Any]],
+    format_name: str,
+    found: Sequence[DATA],
+    output_path: Path,
+    config: CodeTagsConfig,
+) -> Callable[[], list[Any]]:
+    return lambda: hook(format_name=format_name, output_path=str(output_path), found_data=found, config=config)
+
+
+def _save(format_name: str, output_path: Path, text: str) -> None:
+    if text:
+        output_path.write_text(text, encoding="utf-8")
+    logger.info(f"Report {format_name}: {'wrote ' + str(output_path) if text else 'no output'}")
+
+
+def write_reports(
+    pm: pluggy.PluginManager,
+    formats: Sequence[str],
+    found: Sequence[DATA],
+    config: CodeTagsConfig,
+    output_dir: str | None = None,
+    output_file: str | None = None,
+    parallel: bool = True,
+) -> dict[str, bool]:
+    """
+    Dispatch ``print_report`` once per format over the same found tags, each into its own file.
+
+    Args:
+        pm (pluggy.PluginManager): The plugin manager with the report writers registered.
+        formats (Sequence[str]): Format names, as :func:`parse_formats` returns them.
+        found (Sequence[DATA]): The found tags, shared by every writer.
+        config (CodeTagsConfig): Passed through to the hooks.
+        output_dir (str | None): Folder for the reports, created if missing; files are named by
+            :func:`report_file_name`.
+        output_file (str | None): With exactly one format, the file to write it to instead.
+        parallel (bool): Run the built-in views on a thread pool when there are several of them and the
+            views plugin is registered as :data:`INTERNAL_VIEWS`.
+
+    Returns:
+        dict[str, bool]: For each format, whether any writer handled it.
+    """
+    if output_file is not None:
+        if len(formats) != 1:
+            raise ValueError("An output file takes exactly one format; use an output folder for several.")
+        targets = {formats[0]: Path(output_file)}
+    elif output_dir is not None:
+        folder = Path(output_dir)
+        folder.mkdir(parents=True, exist_ok=True)
+        targets = {name: folder / report_file_name(name) for name in formats}
+    else:
+        raise ValueError("Need an output folder or file.")
+
+    views_plugin = pm.get_plugin(INTERNAL_VIEWS) if parallel else None
+    pooled = [name for name in formats if name in BUILTIN_FORMATS] if views_plugin is not None else []
+    if len(pooled) < 2:
+        pooled = []
+    if pooled and isinstance(found, LazyDataList):
+        # The writers share the list from several threads. Build every DATA object and the table up
+        # front, so the writers only read cached ones: all see the same objects, and none is built twice.
+        found.materialize()
+        _ = found.table
+    handled: dict[str, bool] = {}
+    with _thread_stdout() as proxy:
+        if not pooled:
+            for name in formats:
+                text, results = _capture(proxy, _dispatch(pm.hook.print_report, name, found, targets[name], config))
+                _save(name, targets[name], text)
+                handled[name] = any(results)
+            return handled
+        # Only the views run on the pool; the hook, without them, stays on this thread.
+        without_views = pm.subset_hook_caller("print_report", remove_plugins=[views_plugin])
+        with ThreadPoolExecutor(max_workers=len(pooled), thread_name_prefix="pycodetags-report") as pool:
+            views = {name: pool.submit(_capture, proxy, lambda view=_VIEWS[name]: view(found)) for name in pooled}
+            plugin_output: dict[str, tuple[str, Any]] = {}
+            for name in formats:
+                hook = without_views if name in views else pm.hook.print_report
+                plugin_output[name] = _capture(proxy, _dispatch(hook, name, found, targets[name], config))
+            for name in formats:
+                text, results = plugin_output[name]
+                if name in views:
+                    # The views plugin is registered last, so pluggy runs it before the other writers.
+                    text = views[name].result()[0] + text
+                _save(name, targets[name], text)
+                handled[name] = name in views or any(results)
+    return {name: handled[name] for name in formats}
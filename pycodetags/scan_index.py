@@ -0,0 +1,316 @@
+"""
+Persistent incremental scan index: which content each file had when it was last scanned.
+
+The index maps a file path to its fingerprint ``(size, mtime_ns, content digest)``; the parse results
+themselves live in the content-addressed :class:`~pycodetags.parse_cache.ParseCache`. On a warm scan
+each file costs one ``stat()``: when size and mtime match the stored entry, the digest is taken from the
+index and the tags come from the cache without reading the file. When they differ (edit,
+``git checkout``, ``touch``) or the path is new, the file is read and hashed, and the cache is consulted
+with the new digest -- content seen before (on another branch, at another path) is still a hit.
+
+The index lives in ``<project_root>/.pycodetags_cache/index/`` of the project holding the scanned paths
+(not of the working directory), so scanning a tree elsewhere never adds entries here. Like the rest of
+the cache folder it is ignored by git and safe to delete at any time.
+
+:class:`~pycodetags.scan_session.ScanSession` uses the same index, in front of a pack of comment blocks
+not yet classified by any schema (:meth:`ScanIndex.open_blocks`), so plugin commands re-read only the
+files that changed too.
+
+Caveat: tags are stored after ``promote_fields``, so a schema whose ``value_on_blank`` expressions read
+volatile ``meta`` values (e.g. today's date) sees the value from when the file was last parsed.
+
+See ``spec/id_and_tdg.md`` Part 1.3, which anticipated this index.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import logging
+import marshal
+import os
+import time
+from collections.abc import Iterable, Sequence
+from pathlib import Path
+from typing import Any, Callable, TypeVar
+
+from pycodetags.data_tags import DataTag, DataTagSchema
+from pycodetags.data_tags.data_tags_parsers import RawCommentBlock
+from pycodetags.parse_cache import ParseCache
+from pycodetags.utils.project_root import find_project_root
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "FileFingerprint",
+    "ScanIndex",
+    "content_digest",
+    "decode_source",
+    "project_root_of",
+    "read_file",
+    "read_source",
+]
+
+INDEX_VERSION = 4
+INDEX_DIRNAME = "index"
+INDEX_FILENAME = "paths.bin"
+
+# Files modified this close to the moment the index was written may have been edited again within the
+# same mtime tick, so for them a matching stat is not trusted and the digest is checked too.
+RACY_WINDOW_NS = 2_000_000_000
+
+_Value = TypeVar("_Value")
+
+
+@dataclasses.dataclass(frozen=True)
+class FileFingerprint:
+    """Identity of a file's content as seen by the scanner."""
+
+    size: int
+    mtime_ns: int
+    digest: str
+
+
+def content_digest(data: bytes | memoryview) -> str:
+    """Fast, collision-resistant digest of file bytes."""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def decode_source(data: bytes) -> str:
+    """Decode source bytes the way ``Path.read_text(encoding="utf-8")`` does, newlines included."""
+    return data.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
+
+
+def read_file(file: str | os.PathLike[str]) -> tuple[FileFingerprint, bytes]:
+    """Read a file once, returning its fingerprint and bytes."""
+    st = os.stat(file)
+    with open(file, "rb") as handle:
+        data = handle.read()
+    return FileFingerprint(st.st_size, st.st_mtime_ns, content_digest(data)), data
+
+
+def read_source(file: str | os.PathLike[str]) -> tuple[FileFingerprint, str]:
+    """Read a source file once, returning its fingerprint and decoded text."""
+    fingerprint, data = read_file(file)
+    return fingerprint, decode_source(data)
+
+
+def project_root_of(sources: Sequence[str | os.PathLike[str]]) -> Path | None:
+    """The project root holding every one of ``sources``; None when they are in no project, or in several."""
+    roots = set()
+    for source in sources:
+        try:
+            roots.add(find_project_root(Path(source)))
+        except FileNotFoundError:
+            return None
+    return roots.pop() if len(roots) == 1 else None
+
+
+class ScanIndex:
+    """On-disk map of ``absolute path -> (size, mtime_ns, digest)`` in front of a :class:`ParseCache`."""
+
+    def __init__(
+        self,
+        path: Path | None,
+        cache: ParseCache,
+        entries: dict[str, tuple[int, int, str]] | None = None,
+        written_ns: int = 0,
+    ) -> None:
+        self.path = path
+        self.cache = cache
+        self.entries = entries or {}
+        self.written_ns = written_ns
+        self.dirty = False
+        self.hits = 0
+        # Hits that needed a read and hash because the stat did not match (touched, moved, new path).
+        self.content_hits = 0
+        self.misses = 0
+
+    @classmethod
+    def directory_for(cls, root: Path | None = None) -> Path:
+        """Folder holding the index for the given (or auto-detected) project root."""
+        root = root or find_project_root()
+        return root / ".pycodetags_cache" / INDEX_DIRNAME
+
+    @classmethod
+    def open(
+        cls,
+        schemas: list[DataTagSchema],
+        include_folk_tags: bool,
+        root: Path | None = None,
+        sources: Sequence[str | os.PathLike[str]] | None = None,
+    ) -> ScanIndex | None:
+        """Load the index and the parse cache for this configuration, or None if there is no project root.
+
+        With ``sources``, the index is that of the project holding them all, and is disabled when they
+        are in no project or in different ones; otherwise it is that of ``root`` or the working directory.
+        """
+        directory = cls._directory(root, sources)
+        if directory is None:
+            return None
+        cache = ParseCache.open(schemas, include_folk_tags, root=directory.parent.parent)
+        if cache is None:
+            return None
+        return cls.load(directory / INDEX_FILENAME, cache)
+
+    @classmethod
+    def open_blocks(
+        cls,
+        keep_untagged: bool,
+        prefilter_schemas: list[DataTagSchema] | None,
+        include_folk_tags: bool,
+        sources: Sequence[str | os.PathLike[str]],
+    ) -> ScanIndex | None:
+        """Load the index in front of the comment block pack of this scan configuration.
+
+        Use :meth:`probe_blocks` and :meth:`store_blocks` on it; see :func:`pycodetags.parse_cache.blocks_key`
+        for the configuration and :meth:`open` for ``sources``.
+        """
+        directory = cls._directory(None, sources)
+        if directory is None:
+            return None
+        cache = ParseCache.open_blocks(
+            keep_untagged, prefilter_schemas, include_folk_tags, root=directory.parent.parent
+        )
+        if cache is None:
+            return None
+        return cls.load(directory / INDEX_FILENAME, cache)
+
+    @classmethod
+    def _directory(cls, root: Path | None, sources: Sequence[str | os.PathLike[str]] | None) -> Path | None:
+        if sources is not None:
+            root = project_root_of(sources)
+            if root is None:
+                logger.info("Scanned paths are not all in one project, scan index disabled.")
+                return None
+        try:
+            return cls.directory_for(root)
+        except FileNotFoundError:
+            logger.info("No project root found, scan index disabled.")
+            return None
+
+    @classmethod
+    def load(cls, path: Path, cache: ParseCache) -> ScanIndex:
+        """Load an index file, starting empty if it is missing, unreadable or for another version."""
+        try:
+            with path.open("rb") as handle:
+                payload = marshal.load(handle)  # nosec
+        except FileNotFoundError:
+            return cls(path, cache)
+        except (EOFError, ValueError, TypeError, OSError) as e:
+            logger.warning("Could not read scan index %s (%s); starting fresh.", path, e)
+            return cls(path, cache)
+        if not isinstance(payload, dict) or payload.get("version") != INDEX_VERSION:
+            return cls(path, cache)
+        return cls(path, cache, payload.get("entries"), payload.get("written_ns", 0))
+
+    def lookup(self, file: str) -> list[DataTag] | None:
+        """Return cached tags for ``file``'s current content, else None."""
+        return self.probe(file)[0]
+
+    def probe(self, file: str) -> tuple[list[DataTag] | None, str | None]:
+        """Like :meth:`lookup`, but also return the content digest when it had to be computed.
+
+        On a miss the digest lets callers parse identical files only once.
+        """
+        tags, digest = self._probe(file, self.cache.get)
+        return (None if tags is None else _with_file_path(tags, file)), digest
+
+    def probe_blocks(self, file: str) -> tuple[list[RawCommentBlock] | None, str | None]:
+        """:meth:`probe` of an index opened with :meth:`open_blocks`: the file's cached comment blocks."""
+        return self._probe(file, self.cache.get_blocks)
+
+    def _probe(self, file: str, get: Callable[[str], _Value | None]) -> tuple[_Value | None, str | None]:
+        abs_path = os.path.abspath(file)
+        entry = self.entries.get(abs_path)
+        try:
+            st = os.stat(abs_path)
+        except OSError:
+            self.misses += 1
+            return None, None
+        if (
+            entry is not None
+            and st.st_size == entry[0]
+            and st.st_mtime_ns == entry[1]
+            and st.st_mtime_ns < self.written_ns - RACY_WINDOW_NS
+        ):
+            value = get(entry[2])
+            if value is not None:
+                self.hits += 1
+                return value, entry[2]
+        try:
+            with open(abs_path, "rb") as handle:
+                digest = content_digest(handle.read())
+        except OSError:
+            self.misses += 1
+            return None, None
+        value = get(digest)
+        if value is None:
+            self.misses += 1
+            return None, digest
+        # Touched, racy, moved or new path, but content seen before: re-save so the next scan is stat-only.
+        self.entries[abs_path] = (st.st_size, st.st_mtime_ns, digest)
+        self.dirty = True
+        self.hits += 1
+        self.content_hits += 1
+        return value, digest
+
+    def store(self, file: str, fingerprint: FileFingerprint, tags: list[DataTag], failure: str | None = None) -> None:
+        """Record freshly parsed tags for ``file``, and the name of the error that cut the parse short."""
+        self.entries[os.path.abspath(file)] = (fingerprint.size, fingerprint.mtime_ns, fingerprint.digest)
+        self.cache.put(fingerprint.digest, tags, failure)
+        self.dirty = True
+
+    def store_blocks(self, file: str, fingerprint: FileFingerprint, blocks: list[RawCommentBlock]) -> None:
+        """Record freshly scanned comment blocks for ``file``, in an index opened with :meth:`open_blocks`."""
+        self.entries[os.path.abspath(file)] = (fingerprint.size, fingerprint.mtime_ns, fingerprint.digest)
+        self.cache.put_blocks(fingerprint.digest, blocks)
+        self.dirty = True
+
+    def prune(self, under: str | None = None, keep: Iterable[str] | None = None) -> int:
+        """Drop stale entries and return how many were removed.
+
+        With ``keep``, entries below ``under`` (or anywhere, if ``under`` is None) that are not in ``keep``
+        are dropped: the files were deleted or are now ignored. Without ``keep``, entries whose file no
+        longer exists are dropped, which costs one ``stat()`` per entry.
+        """
+        prefix = os.path.join(os.path.abspath(under), "") if under else ""
+        keep_set = {os.path.abspath(f) for f in keep} if keep is not None else None
+        stale = [
+            path
+            for path in self.entries
+            if path.startswith(prefix) and (path not in keep_set if keep_set is not None else not os.path.exists(path))
+        ]
+        for path in stale:
+            del self.entries[path]
+        if stale:
+            self.dirty = True
+        return len(stale)
+
+    def save(self) -> None:
+        """Atomically write the index (temp file + ``os.replace``) and the parse cache, if changed."""
+        self.cache.save()
+        if not self.dirty or self.path is None:
+            return
+        self.written_ns = time.time_ns()
+        payload: dict[str, Any] = {"version": INDEX_VERSION, "written_ns": self.written_ns, "entries": self.entries}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            gitignore = self.path.parent.parent / ".gitignore"
+            if not gitignore.exists():
+                gitignore.write_text("*\n", encoding="utf-8")
+            tmp = self.path.with_suffix(f".{os.getpid()}.tmp")
+            with tmp.open("wb") as handle:
+                marshal.dump(payload, handle, 4)
+            os.replace(tmp, self.path)
+            self.dirty = False
+        except OSError as e:
+            logger.warning("Could not write scan index %s: %s", self.path, e)
+
+
+def _with_file_path(tags: list[DataTag], file: str) -> list[DataTag]:
+    """Cached tags carry the path spelling of the scan that parsed them; report the caller's spelling."""
+    file_path = str(Path(file))
+    for tag in tags:
+        tag["file_path"] = file_path
+    return tags
@@ -0,0 +1,232 @@
+"""
+Scan once, read under many schemas.
+
+Plugin commands receive a callback that returns the found tags for a schema of their choosing (the
+issue tracker asks for its own ``IssueTrackerSchema``). Running a full aggregation per call meant that
+every call, and every plugin handling the command, walked and parsed the whole tree again.
+
+A :class:`ScanSession` walks each source path and reads each file once, keeping its comment blocks in
+the schema-independent form :func:`~pycodetags.data_tags.data_tags_parsers.scan_comment_blocks`
+returns: PEP-350 tags already found and tokenized, other blocks as text for the folk and TDG passes.
+:meth:`ScanSession.tags` classifies those blocks under a schema (plus the active ones, as a normal scan
+does) and caches the result, so asking again for the same schema is free and asking for another one
+costs only the classification.
+
+The blocks are also kept across runs: like a normal scan, a session goes through the scan index, here
+in front of a pack of comment blocks (:meth:`~pycodetags.scan_index.ScanIndex.open_blocks`), so a
+plugin command on an unchanged tree costs about one ``stat()`` per file.
+"""
+
+from __future__ import annotations
+
+import importlib
+import logging
+import pathlib
+from dataclasses import dataclass, field
+
+from pycodetags.aggregate import dedup_data_objects, find_plugin_source_tags, scan_schemas, walk_files
+from pycodetags.app_config import CodeTagsConfig, get_code_tags_config
+from pycodetags.data_tags import DATA, DataTag, DataTagSchema
+from pycodetags.data_tags.compiled_schema import CompiledSchema, compile_schema
+from pycodetags.data_tags.data_tags_parsers import RawCommentBlock, project_comment_blocks
+from pycodetags.data_tags.tag_record import LazyDataList, TagItem, TagRecord
+from pycodetags.exceptions import FileParsingError, ModuleImportError
+from pycodetags.parallel import scan_python_files
+from pycodetags.prefilter import prefilter_for
+from pycodetags.profiling import span
+from pycodetags.pure_data_schema import PureDataSchema
+from pycodetags.python.collect import collect_all_data
+from pycodetags.scan_index import ScanIndex
+from pycodetags.scan_stats import ScanStats
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["ScanSession"]
+
+
+@dataclass
+class _ScannedFile:
+    """One walked file: comment blocks of a ``.py`` file, or what plugins found in any other file."""
+
+    path: str
+    blocks: list[RawCommentBlock] = field(default_factory=list)
+    plugin_tags: list[DataTag] | None = None
+
+
+class ScanSession:
+    """The sources and modules of one run, scanned once and projected per schema on demand.
+
+    Examples:
+        >>> session = ScanSession([], ["pycodetags/scan_session.py"], use_index=False)
+        >>> first = session.tags(PureDataSchema)
+        >>> session.tags(PureDataSchema) == first, session.files_read
+        (True, 1)
+    """
+
+    def __init__(
+        self,
+        module_names: list[str] | None,
+        source_paths: list[str] | None,
+        jobs: int | None = None,
+        config: CodeTagsConfig | None = None,
+        use_index: bool | None = None,
+    ) -> None:
+        """
+        Args:
+            module_names (list[str] | None): Importable modules to collect live DATA objects from.
+            source_paths (list[str] | None): Folders or files to scan.
+            jobs (int | None): Parallel workers for reading ``.py`` files, see
+                :func:`~pycodetags.aggregate.aggregate_all_kinds`. ``None`` reads ``jobs`` from config.
+            config (CodeTagsConfig | None): Defaults to the process-wide config.
+            use_index (bool | None): Answer unchanged files from the scan index. ``None`` reads
+                ``use_index`` from config.
+        """
+        self.module_names = [name for name in module_names or [] if name and name != "None"]
+        self.source_paths = [path for path in source_paths or [] if path]
+        self.config = config or get_code_tags_config()
+        self.jobs = self.config.jobs() if jobs is None else jobs
+        self.use_index = self.config.use_index() if use_index is None else use_index
+        self.active_schemas = self.config.active_schemas()
+        self.include_folk_tags = "folk" in self.active_schemas
+        self._sources: list[list[_ScannedFile]] | None = None
+        self._kept_untagged = False
+        # The schemas the prefilter of the last scan let tags of through; None when it was off.
+        self._prefilter_schemas: list[DataTagSchema] | None = None
+        self._module_data: list[DATA] | None = None
+        self._projections: dict[int, tuple[CompiledSchema, list[TagItem]]] = {}
+        self.files_read = 0
+        """How many files this session has read; each is read once unless a TDG schema shows up late (or
+        one with tags the prefilter did not let through), and not at all when the scan index answers it."""
+
+    def _needs_untagged(self, schemas: list[DataTagSchema]) -> bool:
+        # Blocks without a PEP-350 tag only matter to the folk and TDG passes.
+        return self.include_folk_tags or any(schema.get("name") == "TDG" for schema in schemas)
+
+    def _covers(self, prefilter_schemas: list[DataTagSchema] | None) -> bool:
+        """Whether the last scan read every file that may hold tags of these schemas."""
+        if self._prefilter_schemas is None:
+            return True
+        if prefilter_schemas is None:
+            return False
+        needed = prefilter_for(prefilter_schemas, self.include_folk_tags).folk_tags
+        return set(needed) <= set(prefilter_for(self._prefilter_schemas, self.include_folk_tags).folk_tags)
+
+    def _scan_sources(self, schemas: list[DataTagSchema]) -> list[list[_ScannedFile]]:
+        keep_untagged = self._needs_untagged(schemas)
+        # Folk tags of schemas asked for later are unknown now, so with folk tags on every file is read.
+        prefilter_schemas = None
+        if self.config.prefilter() and not self.include_folk_tags:
+            # Every schema asked for so far, so a rescan for a new one does not drop the tags of the others.
+            prefilter_schemas = list(self._prefilter_schemas or scan_schemas(PureDataSchema, self.active_schemas))
+            prefilter_schemas += [schema for schema in schemas if schema not in prefilter_schemas]
+        if self._sources is not None:
+            covered = self._covers(prefilter_schemas)
+            if covered and (self._kept_untagged or not keep_untagged):
+                return self._sources
+            if not covered:
+                logger.info("Rescanning sources: the prefilter skipped files that may hold tags of a new schema")
+            else:
+                logger.info("Rescanning sources: a TDG schema needs the comment blocks without PEP-350 tags")
+            keep_untagged = keep_untagged or self._kept_untagged
+        sources: list[list[_ScannedFile]] = []
+        for source_path in self.source_paths:
+            files = walk_files(source_path, self.config)
+            python_files = [file for file in files if file.endswith(".py")]
+            index = None
+            if self.use_index:
+                index = ScanIndex.open_blocks(
+                    keep_untagged, prefilter_schemas, self.include_folk_tags, sources=[source_path]
+                )
+            stats = ScanStats()
+            scanned_blocks = iter(
+                scan_python_files(
+                    python_files,
+                    keep_untagged=keep_untagged,
+                    jobs=self.jobs,
+                    backend=self.config.parallel_backend(),
+                    prefilter_schemas=prefilter_schemas,
+                    include_folk_tags=self.include_folk_tags,
+                    index=index,
+                    stats=stats,
+                )
+            )
+            if index:
+                if not pathlib.Path(source_path).is_file():
+                    index.prune(under=source_path, keep=python_files)
+                index.save()
+            self.files_read += stats.files_parsed + stats.files_prefiltered
+            scanned: list[_ScannedFile] = []
+            previous = {item.path: item for item in self._sources[len(sources)]} if self._sources else {}
+            for file in files:
+                if file.endswith(".py"):
+                    scanned.append(_ScannedFile(file, next(scanned_blocks)))
+                elif file in previous:
+                    scanned.append(previous[file])
+                else:
+                    plugin_results = find_plugin_source_tags(file)
+                    if plugin_results:
+                        tags = [tag for result_list in plugin_results for tag in result_list]
+                        scanned.append(_ScannedFile(file, plugin_tags=tags))
+            if not scanned:
+                raise FileParsingError(f"Can't find any files in source folder {source_path}")
+            sources.append(scanned)
+        self._sources = sources
+        self._kept_untagged = keep_untagged
+        self._prefilter_schemas = prefilter_schemas
+        return sources
+
+    def _collect_modules(self) -> list[DATA]:
+        if self._module_data is None:
+            found: list[DATA] = []
+            for module_name in self.module_names:
+                logger.info(f"Checking {module_name}")
+                try:
+                    module = importlib.import_module(module_name)
+                except ImportError as ie:
+                    logger.error(f"Error: Could not import module(s) '{module_name}'")
+                    raise ModuleImportError(f"Error: Could not import module(s) '{module_name}'") from ie
+                found.extend(collect_all_data(module, include_submodules=False))
+            self._module_data = found
+        return self._module_data
+
+    def tags(self, schema: DataTagSchema | None = None) -> LazyDataList:
+        """
+        The tags of every source and module, classified under ``schema`` and the active schemas.
+
+        Each source path is deduplicated on its own, then the module DATA objects follow, as separate
+        aggregations per source would return them. The records are cached per schema; every call gets
+        its own sequence, so DATA objects one caller materializes and edits are not seen by the next.
+
+        Args:
+            schema (DataTagSchema | None): The primary schema. Defaults to ``PureDataSchema``.
+
+        Returns:
+            LazyDataList: The tags, materialized as DATA on first read.
+        """
+        compiled = compile_schema(schema or PureDataSchema)
+        cached = self._projections.get(id(compiled))
+        if cached is not None:
+            return LazyDataList(cached[1])
+        schema = compiled.schema
+        schemas = scan_schemas(schema, self.active_schemas)
+        sources = self._scan_sources(schemas)
+        items: list[TagItem] = []
+        for scanned_files in sources:
+            found_tags: list[DataTag] = []
+            with span("parse_fields"):
+                for scanned in scanned_files:
+                    if scanned.plugin_tags is not None:
+                        found_tags.extend(scanned.plugin_tags)
+                    elif scanned.blocks:
+                        found_tags.extend(
+                            project_comment_blocks(
+                                scanned.blocks, pathlib.Path(scanned.path), schemas, self.include_folk_tags
+                            )
+                        )
+            with span("convert"):
+                records = [TagRecord.from_data_tag(tag, schema) for tag in found_tags]
+            items.extend(dedup_data_objects(records))
+        items.extend(dedup_data_objects(list(self._collect_modules())))
+        # Keep the compiled schema alive so its id is not reused while the entry exists.
+        self._projections[id(compiled)] = (compiled, items)
+        return LazyDataList(items)
@@ -0,0 +1,136 @@
+"""
+Counts and stage times of a scan, for monitoring without scraping logs.
+
+Pass a :class:`ScanStats` as ``stats=`` to :func:`pycodetags.aggregate.aggregate_all_kinds_multiple_input`,
+:func:`~pycodetags.aggregate.iter_aggregate_by_file` or :func:`pycodetags.scan` and read it once the
+tags are in; like :class:`pycodetags.walker.WalkStats`, the scan fills it in as it goes, and several
+scans given the same record add up. ``pycodetags data --stats`` prints one to stderr,
+``--stats-json FILE`` writes it as JSON.
+
+Files answered from the scan index are not read again; they count as cache hits, and one that failed to
+parse is still listed in ``parse_failures``, as the index keeps the error next to its empty result.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import dataclasses
+import json
+import time
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, ContextManager
+
+if TYPE_CHECKING:
+    from pycodetags.data_tags.tag_record import TagItem
+    from pycodetags.walker import WalkStats
+
+__all__ = ["ScanStats", "STAGES", "stage"]
+
+STAGES = ("walk", "index", "parse", "plugins", "convert", "dedup")
+"""The stages timed, in running order. ``parse`` is the wall time of reading and parsing Python files,
+however many workers share it; ``plugins`` that of the ``find_source_tags`` hooks on other files."""
+
+FORMAT = 1
+
+_UNTIMED = contextlib.nullcontext()
+
+
+@dataclasses.dataclass
+class ScanStats:
+    """What one or more scans did. Counts are of files unless the name says tags."""
+
+    files_walked: int = 0
+    """Files the walker yielded: everything the ignore rules let through."""
+    files_skipped: int = 0
+    """Files pruned by ``.gitignore``, ``.pycodetagsignore``, ``exclude`` and ``include``."""
+    dirs_skipped: int = 0
+    files_prefiltered: int = 0
+    """Python files whose bytes cannot hold a tag, so were never decoded."""
+    files_parsed: int = 0
+    """Python files read, decoded and parsed, failures included."""
+    cache_hits: int = 0
+    """Python files answered from the scan index or parse cache."""
+    files_same_content: int = 0
+    """Python files answered from an identical file parsed in the same scan, so neither parsed nor hits."""
+    plugin_files: int = 0
+    """Other files a ``find_source_tags`` plugin answered."""
+    tags_deduped: int = 0
+    """Tags dropped as duplicates of one found by another schema (or through an overlapping path)."""
+    tags_per_schema: dict[str, int] = dataclasses.field(default_factory=dict)
+    """Tags kept, by the syntax they were written in (``PEP350``, ``folk``, ``TDG``); ``other`` for
+    plugin and module tags that do not say."""
+    parse_failures: dict[str, str] = dataclasses.field(default_factory=dict)
+    """File -> name of the error that stopped it from being parsed (``TokenError``, ``SyntaxError``,
+    ``UnicodeDecodeError``); the scan carries on with no tags for it."""
+    stage_seconds: dict[str, float] = dataclasses.field(default_factory=dict)
+    """Wall time per stage, see :data:`STAGES`."""
+
+    @property
+    def tags(self) -> int:
+        """Tags kept, over every schema."""
+        return sum(self.tags_per_schema.values())
+
+    @contextlib.contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Add the time the block takes to stage ``name``."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stage_seconds[name] = self.stage_seconds.get(name, 0.0) + time.perf_counter() - started
+
+    def add_walk(self, walk_stats: WalkStats) -> None:
+        self.files_walked += walk_stats.files_walked
+        self.files_skipped += walk_stats.files_skipped
+        self.dirs_skipped += walk_stats.dirs_skipped
+
+    def count_tags(self, tags: Iterable[TagItem]) -> None:
+        """Count tags kept after deduplication."""
+        for tag in tags:
+            schema = tag.original_schema or "other"
+            self.tags_per_schema[schema] = self.tags_per_schema.get(schema, 0) + 1
+
+    def as_dict(self) -> dict[str, Any]:
+        """Everything, JSON-ready, with the totals spelled out."""
+        counts = dataclasses.asdict(self)
+        return {
+            "format": FORMAT,
+            **counts,
+            "tags": self.tags,
+            "parse_failure_count": len(self.parse_failures),
+            "elapsed_seconds": sum(self.stage_seconds.values()),
+        }
+
+    def write_json(self, path: str | Path) -> None:
+        Path(path).write_text(json.dumps(self.as_dict(), indent=2) + "\n", encoding="utf-8")
+
+    def report(self) -> str:
+        """A short summary, as text."""
+        walked = f"{self.files_walked} files walked, {self.files_skipped} skipped by ignore rules"
+        python = (
+            f"{self.files_parsed} parsed, {self.cache_hits} from cache, {self.files_same_content} copies of "
+            f"another file, {self.files_prefiltered} prefiltered out"
+        )
+        schemas = ", ".join(f"{count} {schema}" for schema, count in sorted(self.tags_per_schema.items()))
+        lines = [
+            "--- pycodetags scan ---",
+            walked,
+            f"python files: {python}",
+            f"other files answered by plugins: {self.plugin_files}",
+            f"tags: {self.tags} ({schemas or 'none'}), {self.tags_deduped} duplicates dropped",
+            f"parse failures: {len(self.parse_failures)}",
+        ]
+        lines.extend(f"  {file}: {error}" for file, error in sorted(self.parse_failures.items()))
+        ordered = [name for name in STAGES if name in self.stage_seconds]
+        ordered += sorted(name for name in self.stage_seconds if name not in STAGES)
+        timings = ", ".join(f"{name} {self.stage_seconds[name] * 1000:.1f} ms" for name in ordered)
+        lines.append(f"stages: {timings or 'none'}")
+        return "\n".join(lines)
+
+
+def stage(stats: ScanStats | None, name: str) -> ContextManager[None]:
+    """:meth:`ScanStats.stage`, or a shared do-nothing context manager when no stats are kept."""
+    if stats is None:
+        return _UNTIMED
+    return stats.stage(name)
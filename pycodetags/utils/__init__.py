@@ -2,7 +2,55 @@
 Module of code thematically unrelated to pycodetags.
 """
 
-__all__ = ["persistent_memoize", "clear_cache", "load_dotenv"]
+from __future__ import annotations
 
-from pycodetags.utils.cache_utils import clear_cache, persistent_memoize
-from pycodetags.utils.dotenv import load_dotenv
+import importlib
+from typing import TYPE_CHECKING, Any
+
+__all__ = [
+    "persistent_memoize",
+    "clear_cache",
+    "cache_stats",
+    "reset_cache_stats",
+    "stored_cache_stats",
+    "CacheStats",
+    "load_dotenv",
+    "SourceText",
+]
+
+if TYPE_CHECKING:
+    from pycodetags.utils.cache_utils import (
+        CacheStats,
+        cache_stats,
+        clear_cache,
+        persistent_memoize,
+        reset_cache_stats,
+        stored_cache_stats,
+    )
+    from pycodetags.utils.dotenv import load_dotenv
+    from pycodetags.utils.source_text import SourceText
+
+# The cache brings in sqlite3, gzip and pickle; load it only when one of its names is used.
+_LAZY_EXPORTS = {
+    "persistent_memoize": "pycodetags.utils.cache_utils",
+    "clear_cache": "pycodetags.utils.cache_utils",
+    "cache_stats": "pycodetags.utils.cache_utils",
+    "reset_cache_stats": "pycodetags.utils.cache_utils",
+    "stored_cache_stats": "pycodetags.utils.cache_utils",
+    "CacheStats": "pycodetags.utils.cache_utils",
+    "load_dotenv": "pycodetags.utils.dotenv",
+    "SourceText": "pycodetags.utils.source_text",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -1,9 +1,13 @@
 """
-A zero-dependency, persistent, file-system-based memoization decorator for Python.
+A zero-dependency, persistent memoization decorator for Python.
 
-This module provides a decorator that caches the results of function calls on the
-filesystem. This allows the cache to persist across multiple executions of a script,
-making it ideal for CLI tools or build processes that repeatedly process the same data.
+This module provides a decorator that caches the results of function calls on disk.
+This allows the cache to persist across multiple executions of a script, making it
+ideal for CLI tools or build processes that repeatedly process the same data.
+
+It is library API for code built on pycodetags: pycodetags' own scans do not use it (parse results are
+cached by content digest in :mod:`pycodetags.parse_cache`), so its stores, eviction and stats only see
+the functions a caller decorates.
 
 Features:
 - Zero external dependencies (uses only the Python standard library).
@@ -12,57 +16,114 @@ Features:
 - Cache directory can be overridden for testing or custom configurations.
 - Automatically creates a .gitignore file in the cache directory.
 - Provides a `clear_cache` function to purge all cache items on demand.
-- Optional gzip compression for cache files to save disk space.
-- Stale cache entries are automatically removed based on a configurable TTL.
+- Optional gzip compression for cache entries to save disk space.
+- Pluggable storage: by default all entries live in one SQLite file with a size budget and
+  least-recently-used eviction; the original one-file-per-entry directory layout is still available
+  with ``backend="directory"``.
+- Stale entries expire lazily (on read, and in an occasional cheap sweep) rather than in a full
+  directory scan every time the decorator is applied.
 - Cache keys are generated from the function's name and arguments, supporting
   various argument types including complex objects.
-- Handles potential race conditions and corrupted cache files gracefully.
+- Handles concurrent use from several processes, race conditions and corrupted
+  cache entries gracefully.
+- Per-function hit, miss, write and eviction counts, bytes moved and time spent
+  (de)serializing, available for this process with `cache_stats()` and accumulated
+  across runs in the cache folder (`stored_cache_stats()`, `pycodetags cache stats`).
 """
 
 from __future__ import annotations
 
+import abc
+import atexit
+import dataclasses
 import gzip
 import hashlib
+import json
 import logging
+import os
 import pickle  # nosec
 import shutil
+import sqlite3
+import threading
 import time
 from functools import wraps
 from pathlib import Path
 from typing import Callable  # noqa
 from typing import Any, TypeVar
 
+from pycodetags.utils.project_root import find_project_root
+
 logger = logging.getLogger(__name__)
 
+__all__ = [
+    "persistent_memoize",
+    "clear_cache",
+    "find_project_root",
+    "CacheStore",
+    "SQLiteStore",
+    "DirectoryStore",
+    "CACHE_BACKENDS",
+    "make_store",
+    "CacheStats",
+    "cache_stats",
+    "reset_cache_stats",
+    "stored_cache_stats",
+    "open_stores",
+]
+
 # Define a generic TypeVar for annotating the decorated function's return type.
 F = TypeVar("F", bound=Callable[..., Any])
 
-# A global flag to ensure the cache cleanup logic runs only once per process.
-_CACHE_CLEANUP_PERFORMED: dict[str, bool] = {}
+DEFAULT_BACKEND = "sqlite"
+DEFAULT_TTL_SECONDS = 86400
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+SQLITE_FILENAME = "memoize.sqlite3"
+SWEEP_STAMP = ".last_sweep"
+STATS_FILENAME = ".stats.json"
 
+# Stats name for evictions the directory backend cannot attribute (its files don't record the function).
+UNKNOWN_FUNCTION = "<unknown>"
 
-def find_project_root(start: Path | None = None) -> Path:
-    """
-    Locate the project root by searching upward for a ``pyproject.toml`` file.
+# When over budget, evict down to this fraction of it so a full store doesn't evict on every write.
+EVICT_TO = 0.9
 
-    Args:
-        start: Directory to start searching from. Defaults to the current working directory.
+_GZIP_MAGIC = b"\x1f\x8b"
 
-    Returns:
-        The directory containing ``pyproject.toml``.
+# Every store created by persistent_memoize in this process, so stats can be collected and saved at exit.
+_STORES: list[CacheStore] = []
 
-    Raises:
-        FileNotFoundError: If no ``pyproject.toml`` is found in the directory tree.
-    """
-    current_path = (start or Path.cwd()).resolve()
-    for parent in [current_path] + list(current_path.parents):
-        if (parent / "pyproject.toml").is_file():
-            return parent
 
-    raise FileNotFoundError(
-        "Could not find project root. A 'pyproject.toml' file is required to "
-        "determine the project location, or you must provide an explicit path."
-    )
+@dataclasses.dataclass
+class CacheStats:
+    """Counters for one memoized function."""
+
+    hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    evictions: int = 0
+    bytes_read: int = 0
+    bytes_written: int = 0
+    serialize_seconds: float = 0.0
+    deserialize_seconds: float = 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        """Hits as a fraction of lookups, 0.0 when there were none."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def __add__(self, other: CacheStats) -> CacheStats:
+        return CacheStats(*(a + b for a, b in zip(dataclasses.astuple(self), dataclasses.astuple(other))))
+
+    def __sub__(self, other: CacheStats) -> CacheStats:
+        return CacheStats(*(a - b for a, b in zip(dataclasses.astuple(self), dataclasses.astuple(other))))
+
+    def __bool__(self) -> bool:
+        return any(dataclasses.astuple(self))
+
+    def to_dict(self) -> dict[str, Any]:
+        """Plain dict for JSON output, including the derived ``hit_rate``."""
+        return {**dataclasses.asdict(self), "hit_rate": round(self.hit_rate, 4)}
 
 
 def _get_cache_dir(cache_dir_override: Path | None = None) -> Path:
@@ -77,7 +138,535 @@ def _get_cache_dir(cache_dir_override: Path | None = None) -> Path:
     return find_project_root() / ".pycodetags_cache"
 
 
-def clear_cache(cache_dir_override: Path | None = None) -> None:
+class CacheStore(abc.ABC):
+    """
+    Where :func:`persistent_memoize` keeps its entries.
+
+    Keys are hex digests, values are opaque bytes. Implementations must tolerate several processes
+    using the same store at once and must never raise for a broken or missing entry; a miss is fine.
+
+    The base class keeps the in-process :class:`CacheStats`; backends add evictions, persist the counts
+    with :meth:`load_stats`/:meth:`_write_stats` and report their size with :meth:`usage`.
+    """
+
+    backend = ""
+
+    def __init__(self) -> None:
+        self.stats: dict[str, CacheStats] = {}
+        self._saved: dict[str, CacheStats] = {}
+
+    def stats_for(self, name: str) -> CacheStats:
+        """The counters for one function, created on first use."""
+        stats = self.stats.get(name)
+        if stats is None:
+            stats = self.stats[name] = CacheStats()
+        return stats
+
+    def save_stats(self) -> None:
+        """Add everything counted since the last save to the counts kept in the store."""
+        delta = {name: stats - self._saved.get(name, CacheStats()) for name, stats in self.stats.items()}
+        delta = {name: stats for name, stats in delta.items() if stats}
+        if not delta:
+            return
+        self._write_stats(delta)
+        self._saved = {name: stats + CacheStats() for name, stats in self.stats.items()}
+
+    def flush(self) -> None:
+        """Write out bookkeeping the store holds back to batch it, such as access times. Nothing by default."""
+
+    @abc.abstractmethod
+    def _write_stats(self, delta: dict[str, CacheStats]) -> None:
+        """Add ``delta`` to the counts kept in the store."""
+
+    @abc.abstractmethod
+    def load_stats(self) -> dict[str, CacheStats]:
+        """Counts accumulated in the store by every process that saved them."""
+
+    @abc.abstractmethod
+    def usage(self) -> tuple[int, int]:
+        """``(entries, bytes)`` currently stored."""
+
+    @abc.abstractmethod
+    def verify(self) -> tuple[int, int]:
+        """Decode every entry, deleting those that fail. Returns ``(checked, removed)``."""
+
+    @abc.abstractmethod
+    def get(self, key: str) -> bytes | None:
+        """Return the value stored under ``key``, or None if it is missing or expired."""
+
+    @abc.abstractmethod
+    def put(self, key: str, value: bytes, name: str = "") -> bool:
+        """Store ``value`` under ``key``. ``name`` identifies the memoized function. Returns True if stored."""
+
+    @abc.abstractmethod
+    def prune(self) -> int:
+        """Remove expired entries and enforce the size budget. Returns how many entries were removed."""
+
+
+_SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    expires REAL NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed);
+CREATE INDEX IF NOT EXISTS entries_expires ON entries (expires);
+CREATE TABLE IF NOT EXISTS totals (id INTEGER PRIMARY KEY CHECK (id = 0), bytes INTEGER NOT NULL);
+INSERT OR IGNORE INTO totals VALUES (0, 0);
+CREATE TRIGGER IF NOT EXISTS entries_inserted AFTER INSERT ON entries
+BEGIN UPDATE totals SET bytes = bytes + NEW.size; END;
+CREATE TRIGGER IF NOT EXISTS entries_deleted AFTER DELETE ON entries
+BEGIN UPDATE totals SET bytes = bytes - OLD.size; END;
+CREATE TRIGGER IF NOT EXISTS entries_resized AFTER UPDATE OF size ON entries
+BEGIN UPDATE totals SET bytes = bytes - OLD.size + NEW.size; END;
+CREATE TABLE IF NOT EXISTS stats (
+    name TEXT PRIMARY KEY,
+    hits INTEGER NOT NULL,
+    misses INTEGER NOT NULL,
+    writes INTEGER NOT NULL,
+    evictions INTEGER NOT NULL,
+    bytes_read INTEGER NOT NULL,
+    bytes_written INTEGER NOT NULL,
+    serialize_seconds REAL NOT NULL,
+    deserialize_seconds REAL NOT NULL
+);
+"""
+
+_STATS_COLUMNS = [field.name for field in dataclasses.fields(CacheStats)]
+
+
+class SQLiteStore(CacheStore):
+    """
+    All entries in a single SQLite file, bounded by ``max_bytes`` with least-recently-used eviction.
+
+    The database runs in WAL mode, so readers never block and writers from several processes
+    serialize on SQLite's own lock. A hit does not write: it queues the entry's new access time, and
+    the queue is written by the next ``put`` or ``prune`` of the process, in the same transaction and
+    before anything is evicted, or by :meth:`flush` at exit. Every write is one
+    ``BEGIN IMMEDIATE`` transaction that also evicts, so the size budget holds no matter how many
+    processes share the file. Triggers keep a running byte total, so checking the budget does not scan
+    the table.
+
+    Each entry records its own expiry time. Expired entries are dropped when read, and once per
+    process an indexed ``DELETE`` removes the rest; nothing stats or reads the whole store on start-up.
+    """
+
+    backend = "sqlite"
+
+    def __init__(self, directory: Path, ttl_seconds: float, max_bytes: int | None = DEFAULT_MAX_BYTES) -> None:
+        super().__init__()
+        self.path = directory / SQLITE_FILENAME
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self._swept = False
+        # key -> access time of hits not written yet; shared by every thread of the process.
+        self._accessed: dict[str, float] = {}
+        self._accessed_lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """One connection per thread and process; reopened if the file was deleted (``clear_cache``)."""
+        conn: sqlite3.Connection | None = getattr(self._local, "conn", None)
+        if conn is not None and self._local.pid == os.getpid() and self.path.exists():
+            return conn
+        if conn is not None and self._local.pid == os.getpid():
+            conn.close()
+        conn = sqlite3.connect(str(self.path), timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(_SQLITE_SCHEMA)
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        return conn
+
+    def get(self, key: str) -> bytes | None:
+        now = time.time()
+        try:
+            conn = self._connect()
+            row = conn.execute("SELECT value, expires FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            value, expires = row
+            if expires <= now:
+                conn.execute("DELETE FROM entries WHERE key = ? AND expires <= ?", (key, now))
+                return None
+            with self._accessed_lock:
+                self._accessed[key] = now
+            return bytes(value)
+        except sqlite3.Error as e:
+            logger.warning(f"Could not read cache entry {key} from {self.path}: {e}")
+            return None
+
+    def put(self, key: str, value: bytes, name: str = "") -> bool:
+        if self.max_bytes is not None and len(value) > self.max_bytes:
+            logger.info(f"Not caching {name} result of {len(value)} bytes, over the {self.max_bytes} byte budget")
+            return False
+        now = time.time()
+        conn: sqlite3.Connection | None = None
+        try:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            if not self._swept:
+                conn.execute("DELETE FROM entries WHERE expires <= ?", (now,))
+                self._swept = True
+            conn.execute(
+                "INSERT INTO entries (key, name, value, size, expires, accessed) VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET name = excluded.name, value = excluded.value, "
+                "size = excluded.size, expires = excluded.expires, accessed = excluded.accessed",
+                (key, name, value, len(value), now + self.ttl_seconds, now),
+            )
+            self._write_accessed(conn)
+            self._evict(conn)
+            conn.execute("COMMIT")
+            return True
+        except sqlite3.Error as e:
+            if conn is not None and conn.in_transaction:
+                conn.execute("ROLLBACK")
+            logger.warning(f"Could not write cache entry {key} to {self.path}: {e}")
+            return False
+
+    def _write_accessed(self, conn: sqlite3.Connection) -> None:
+        """Inside a write transaction: record the access times of the hits queued since the last write."""
+        with self._accessed_lock:
+            accessed, self._accessed = self._accessed, {}
+        if accessed:
+            conn.executemany(
+                "UPDATE entries SET accessed = ? WHERE key = ? AND accessed < ?",
+                [(when, key, when) for key, when in accessed.items()],
+            )
+
+    def flush(self) -> None:
+        if not self._accessed:
+            return
+        conn: sqlite3.Connection | None = None
+        try:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            self._write_accessed(conn)
+            conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            if conn is not None and conn.in_transaction:
+                conn.execute("ROLLBACK")
+            logger.warning(f"Could not record cache access times in {self.path}: {e}")
+
+    def _evict(self, conn: sqlite3.Connection) -> int:
+        """Inside a write transaction: drop least recently used entries until under budget."""
+        if self.max_bytes is None:
+            return 0
+        (total,) = conn.execute("SELECT bytes FROM totals").fetchone()
+        if total <= self.max_bytes:
+            return 0
+        excess = total - int(self.max_bytes * EVICT_TO)
+        victims = []
+        for key, size, name in conn.execute("SELECT key, size, name FROM entries ORDER BY accessed"):
+            if excess <= 0:
+                break
+            victims.append((key,))
+            excess -= size
+            self.stats_for(name).evictions += 1
+        conn.executemany("DELETE FROM entries WHERE key = ?", victims)
+        return len(victims)
+
+    def prune(self) -> int:
+        conn: sqlite3.Connection | None = None
+        try:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            self._write_accessed(conn)
+            removed = conn.execute("DELETE FROM entries WHERE expires <= ?", (time.time(),)).rowcount
+            removed += self._evict(conn)
+            conn.execute("COMMIT")
+            return removed
+        except sqlite3.Error as e:
+            if conn is not None and conn.in_transaction:
+                conn.execute("ROLLBACK")
+            logger.warning(f"Could not prune cache {self.path}: {e}")
+            return 0
+
+    def _write_stats(self, delta: dict[str, CacheStats]) -> None:
+        columns = ", ".join(_STATS_COLUMNS)
+        updates = ", ".join(f"{column} = {column} + excluded.{column}" for column in _STATS_COLUMNS)
+        sql = (
+            f"INSERT INTO stats (name, {columns}) VALUES (?{', ?' * len(_STATS_COLUMNS)}) "
+            f"ON CONFLICT (name) DO UPDATE SET {updates}"
+        )
+        try:
+            conn = self._connect()
+            with conn:
+                conn.executemany(sql, [(name, *dataclasses.astuple(stats)) for name, stats in delta.items()])
+        except sqlite3.Error as e:
+            logger.warning(f"Could not save cache stats to {self.path}: {e}")
+
+    def load_stats(self) -> dict[str, CacheStats]:
+        try:
+            rows = self._connect().execute(f"SELECT name, {', '.join(_STATS_COLUMNS)} FROM stats ORDER BY name")
+            return {name: CacheStats(*values) for name, *values in rows}
+        except sqlite3.Error as e:
+            logger.warning(f"Could not read cache stats from {self.path}: {e}")
+            return {}
+
+    def usage(self) -> tuple[int, int]:
+        conn = self._connect()
+        (entries,) = conn.execute("SELECT COUNT(*) FROM entries").fetchone()
+        (size,) = conn.execute("SELECT bytes FROM totals").fetchone()
+        return entries, size
+
+    def verify(self) -> tuple[int, int]:
+        """Run SQLite's own consistency check, then decode every entry.
+
+        Raises:
+            sqlite3.DatabaseError: The database file itself is damaged.
+        """
+        conn = self._connect()
+        problems = [row[0] for row in conn.execute("PRAGMA quick_check")]
+        if problems != ["ok"]:
+            raise sqlite3.DatabaseError(f"{self.path} failed its consistency check: {'; '.join(problems[:5])}")
+        broken = []
+        checked = 0
+        for key, value in conn.execute("SELECT key, value FROM entries").fetchall():
+            checked += 1
+            try:
+                _load_value(bytes(value))
+            except Exception:  # nosec # any failure to decode means the entry is useless
+                broken.append((key,))
+        with conn:
+            conn.executemany("DELETE FROM entries WHERE key = ?", broken)
+        return checked, len(broken)
+
+
+class DirectoryStore(CacheStore):
+    """
+    One file per entry, named after the key. The original storage layout.
+
+    An entry expires ``ttl_seconds`` after it was written (its mtime). Expired files are deleted when
+    read; the full sweep of the directory, which also enforces ``max_bytes`` (oldest written first),
+    runs on the first write of a process, and only when the previous sweep is older than the TTL or a
+    day, whichever is shorter. Writes go through a temp file and ``os.replace``.
+    """
+
+    backend = "directory"
+
+    def __init__(
+        self, directory: Path, ttl_seconds: float, max_bytes: int | None = None, use_gzip: bool = False
+    ) -> None:
+        super().__init__()
+        self.directory = directory
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.extension = ".pkl.gz" if use_gzip else ".pkl"
+        self._swept = False
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}{self.extension}"
+
+    def get(self, key: str) -> bytes | None:
+        path = self._path(key)
+        try:
+            if (time.time() - path.stat().st_mtime) >= self.ttl_seconds:
+                path.unlink()
+                return None
+            return path.read_bytes()
+        except OSError:
+            return None
+
+    def put(self, key: str, value: bytes, name: str = "") -> bool:
+        if not self._swept:
+            self._swept = True
+            self._sweep_if_due()
+        path = self._path(key)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            tmp.write_bytes(value)
+            os.replace(tmp, path)
+            return True
+        except OSError as e:
+            logger.warning(f"Could not write cache file {path}: {e}")
+            return False
+
+    def _sweep_if_due(self) -> None:
+        stamp = self.directory / SWEEP_STAMP
+        now = time.time()
+        try:
+            if now - stamp.stat().st_mtime < min(self.ttl_seconds, 86400):
+                return
+        except OSError:
+            pass
+        try:
+            stamp.touch()
+        except OSError as e:
+            logger.warning(f"Could not write {stamp}: {e}")
+        self.prune()
+
+    def prune(self) -> int:
+        now = time.time()
+        removed = 0
+        live: list[tuple[float, int, Path]] = []
+        entries = self._entries()
+        for entry in entries:
+            try:
+                st = entry.stat()
+                if (now - st.st_mtime) > self.ttl_seconds:
+                    entry.unlink()
+                    removed += 1
+                else:
+                    live.append((st.st_mtime, st.st_size, entry))
+            except OSError:
+                pass
+        if self.max_bytes is not None:
+            total = sum(size for _, size, _ in live)
+            if total > self.max_bytes:
+                target = int(self.max_bytes * EVICT_TO)
+                for _, size, entry in sorted(live, key=lambda item: item[0]):
+                    if total <= target:
+                        break
+                    try:
+                        entry.unlink()
+                        removed += 1
+                        total -= size
+                        self.stats_for(UNKNOWN_FUNCTION).evictions += 1
+                    except OSError:
+                        pass
+        return removed
+
+    def _entries(self) -> list[Path]:
+        try:
+            return [entry for entry in self.directory.iterdir() if entry.name.endswith((".pkl", ".pkl.gz"))]
+        except OSError:
+            return []
+
+    def _write_stats(self, delta: dict[str, CacheStats]) -> None:
+        # Read-modify-write of a small JSON file; two processes saving at the same instant can lose one
+        # run's counts, which is acceptable for statistics.
+        totals = self.load_stats()
+        for name, stats in delta.items():
+            totals[name] = totals.get(name, CacheStats()) + stats
+        path = self.directory / STATS_FILENAME
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            tmp.write_text(json.dumps({name: dataclasses.asdict(stats) for name, stats in totals.items()}))
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.warning(f"Could not save cache stats to {path}: {e}")
+
+    def load_stats(self) -> dict[str, CacheStats]:
+        try:
+            payload = json.loads((self.directory / STATS_FILENAME).read_text())
+            return {name: CacheStats(**values) for name, values in sorted(payload.items())}
+        except (OSError, ValueError, TypeError, AttributeError):
+            return {}
+
+    def usage(self) -> tuple[int, int]:
+        sizes = []
+        for entry in self._entries():
+            try:
+                sizes.append(entry.stat().st_size)
+            except OSError:
+                pass
+        return len(sizes), sum(sizes)
+
+    def verify(self) -> tuple[int, int]:
+        checked = removed = 0
+        for entry in self._entries():
+            try:
+                value = entry.read_bytes()
+            except OSError:
+                continue
+            checked += 1
+            try:
+                _load_value(value)
+            except Exception:  # nosec # any failure to decode means the entry is useless
+                try:
+                    entry.unlink()
+                    removed += 1
+                except OSError:
+                    pass
+        return checked, removed
+
+
+CACHE_BACKENDS = ("sqlite", "directory")
+
+
+def make_store(
+    backend: str, directory: Path, ttl_seconds: float, max_bytes: int | None = DEFAULT_MAX_BYTES, use_gzip: bool = False
+) -> CacheStore:
+    """Build the named storage backend for a cache directory."""
+    if backend == "sqlite":
+        return SQLiteStore(directory, ttl_seconds, max_bytes)
+    if backend == "directory":
+        return DirectoryStore(directory, ttl_seconds, max_bytes, use_gzip)
+    raise ValueError(f"Unknown cache backend {backend!r}, expected one of {CACHE_BACKENDS}")
+
+
+def open_stores(cache_dir_override: Path | None = None, max_bytes: int | None = DEFAULT_MAX_BYTES) -> list[CacheStore]:
+    """
+    The stores holding data in a cache folder, for inspection and maintenance.
+
+    Raises:
+        FileNotFoundError: No cache folder was given and there is no project root.
+    """
+    cache_dir = _get_cache_dir(cache_dir_override)
+    stores: list[CacheStore] = []
+    if (cache_dir / SQLITE_FILENAME).is_file():
+        stores.append(SQLiteStore(cache_dir, DEFAULT_TTL_SECONDS, max_bytes))
+    directory = DirectoryStore(cache_dir, DEFAULT_TTL_SECONDS, max_bytes)
+    if directory._entries() or (cache_dir / STATS_FILENAME).is_file():
+        stores.append(directory)
+    return stores
+
+
+def cache_stats() -> dict[str, CacheStats]:
+    """Counters for every function memoized in this process, keyed by ``module.qualname``."""
+    totals: dict[str, CacheStats] = {}
+    for store in _STORES:
+        for name, stats in store.stats.items():
+            totals[name] = totals.get(name, CacheStats()) + stats
+    return dict(sorted(totals.items()))
+
+
+def reset_cache_stats() -> None:
+    """Forget this process's counters. Counts already saved to the cache folder are kept."""
+    for store in _STORES:
+        store.save_stats()
+        store.stats.clear()
+        store._saved.clear()
+
+
+def stored_cache_stats(cache_dir_override: Path | None = None) -> dict[str, CacheStats]:
+    """
+    Counters accumulated in a cache folder across runs; each process adds its own when it exits.
+
+    Raises:
+        FileNotFoundError: No cache folder was given and there is no project root.
+    """
+    totals: dict[str, CacheStats] = {}
+    for store in open_stores(cache_dir_override):
+        for name, stats in store.load_stats().items():
+            totals[name] = totals.get(name, CacheStats()) + stats
+    return dict(sorted(totals.items()))
+
+
+def _save_all_stats() -> None:
+    for store in _STORES:
+        store.flush()
+        store.save_stats()
+
+
+def _dump_value(result: Any, use_gzip: bool) -> bytes:
+    data = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+    return gzip.compress(data) if use_gzip else data
+
+
+def _load_value(value: bytes) -> Any:
+    # Decide by content rather than by the decorator's setting so gzip and plain entries can share a store.
+    if value[:2] == _GZIP_MAGIC:
+        value = gzip.decompress(value)
+    return pickle.loads(value)  # nosec
+
+
+def clear_cache(cache_dir_override: Path | None = None, writer: Callable[[str], None] = print) -> int:
     """
     Deletes all items in the cache directory, except for the .gitignore file.
 
@@ -85,12 +674,17 @@ def clear_cache(cache_dir_override: Path | None = None) -> None:
         cache_dir_override: Specify the cache directory to clear. If None, it
                             will be determined automatically by looking for
                             pyproject.toml.
+        writer: Sink for progress messages (defaults to ``print``).
+
+    Returns:
+        The number of items removed.
     """
+    removed = 0
     try:
         cache_dir = _get_cache_dir(cache_dir_override)
         if not cache_dir.is_dir():
-            print(f"Cache directory {cache_dir} does not exist. Nothing to clear.")
-            return
+            writer(f"Cache directory {cache_dir} does not exist. Nothing to clear.")
+            return 0
 
         for item in cache_dir.iterdir():
             try:
@@ -100,21 +694,25 @@ def clear_cache(cache_dir_override: Path | None = None) -> None:
                     shutil.rmtree(item)
                 else:
                     item.unlink()
+                removed += 1
             except OSError as e:
-                print(f"Warning: Could not remove cache item {item}. Error: {e}")
-        print(f"Cache cleared successfully at {cache_dir}.")
+                writer(f"Warning: Could not remove cache item {item}. Error: {e}")
+        writer(f"Cache cleared successfully at {cache_dir}.")
     except (FileNotFoundError, OSError) as e:
-        print(f"Error clearing cache: {e}")
+        writer(f"Error clearing cache: {e}")
+    return removed
 
 
 def persistent_memoize(
-    ttl_seconds: int = 86400,
+    ttl_seconds: int = DEFAULT_TTL_SECONDS,
     cache_dir_override: Path | None = None,
     use_gzip: bool = False,
     raise_on_missing_config: bool = False,
+    backend: str | CacheStore = DEFAULT_BACKEND,
+    max_bytes: int | None = DEFAULT_MAX_BYTES,
 ) -> Callable[[F], F]:
     """
-    A decorator factory for filesystem-based memoization.
+    A decorator factory for persistent memoization.
 
     Args:
         ttl_seconds: The time-to-live for cache entries, in seconds.
@@ -122,55 +720,56 @@ def persistent_memoize(
         cache_dir_override: An optional Path object to specify the cache
                             directory, bypassing project root detection.
                             Ideal for unit tests.
-        use_gzip: If True, compresses cache files using gzip. This can save
+        use_gzip: If True, compresses cache entries using gzip. This can save
                   significant disk space but adds a small CPU overhead.
                   Defaults to False.
         raise_on_missing_config: Raise exception if pyproject.toml not found.
+        backend: ``"sqlite"`` (one database file, the default), ``"directory"``
+                 (one file per entry) or a ready-made :class:`CacheStore`.
+        max_bytes: Size budget for the stored entries; least recently used
+                   entries are evicted beyond it. ``None`` means unbounded.
 
     Returns:
         A decorator that can be applied to a function.
     """
-    try:
-        cache_dir = _get_cache_dir(cache_dir_override)
-        cache_dir.mkdir(exist_ok=True)
+    if isinstance(backend, CacheStore):
+        store = backend
+    else:
+        if backend not in CACHE_BACKENDS:
+            raise ValueError(f"Unknown cache backend {backend!r}, expected one of {CACHE_BACKENDS}")
+        try:
+            cache_dir = _get_cache_dir(cache_dir_override)
+            cache_dir.mkdir(exist_ok=True)
 
-        # Ensure the cache directory is ignored by git
-        gitignore_path = cache_dir / ".gitignore"
-        if not gitignore_path.exists():
-            with gitignore_path.open("w") as f:
-                f.write("*\n")
+            # Ensure the cache directory is ignored by git
+            gitignore_path = cache_dir / ".gitignore"
+            if not gitignore_path.exists():
+                with gitignore_path.open("w") as f:
+                    f.write("*\n")
 
-    except (FileNotFoundError, OSError) as e:
-        print(f"Warning: Persistent memoization disabled. Reason: {e}")
-        if raise_on_missing_config:
-            raise FileNotFoundError(
-                "Persistent memoization requires a 'pyproject.toml' file to determine "
-                "the cache location, or you must provide a 'cache_dir_override'."
-            ) from e
+        except (FileNotFoundError, OSError) as e:
+            print(f"Warning: Persistent memoization disabled. Reason: {e}")
+            if raise_on_missing_config:
+                raise FileNotFoundError(
+                    "Persistent memoization requires a 'pyproject.toml' file to determine "
+                    "the cache location, or you must provide a 'cache_dir_override'."
+                ) from e
 
-        def no_op_decorator(func: F) -> F:
-            return func
+            def no_op_decorator(func: F) -> F:
+                return func
 
-        return no_op_decorator
+            return no_op_decorator
 
-    # --- Stale Cache Cleanup (runs once per session per cache_dir) ---
-    cache_dir_str = str(cache_dir)
-    if not _CACHE_CLEANUP_PERFORMED.get(cache_dir_str):
-        now = time.time()
-        try:
-            for cache_file in cache_dir.iterdir():
-                if cache_file.is_file() and cache_file.name != ".gitignore":
-                    try:
-                        modification_time = cache_file.stat().st_mtime
-                        if (now - modification_time) > ttl_seconds:
-                            cache_file.unlink()
-                    except OSError:
-                        pass
-        except OSError as e:
-            print(f"Warning: Could not perform cache cleanup. Error: {e}")
-        _CACHE_CLEANUP_PERFORMED[cache_dir_str] = True
+        store = make_store(backend, cache_dir, ttl_seconds, max_bytes, use_gzip)
+
+    if not _STORES:
+        atexit.register(_save_all_stats)
+    if store not in _STORES:
+        _STORES.append(store)
 
     def decorator(func: F) -> F:
+        name = f"{func.__module__}.{func.__qualname__}"
+
         @wraps(func)
         def wrapper(*args: Any, **kwargs: Any) -> Any:
             try:
@@ -181,26 +780,36 @@ def persistent_memoize(
             hasher = hashlib.sha256()
             hasher.update(func.__qualname__.encode("utf-8"))
             hasher.update(key_data)
+            key = hasher.hexdigest()
 
-            extension = ".pkl.gz" if use_gzip else ".pkl"
-            cache_filename = f"{hasher.hexdigest()}{extension}"
-            cache_filepath = cache_dir / cache_filename
-
-            if cache_filepath.is_file() and (time.time() - cache_filepath.stat().st_mtime) < ttl_seconds:
+            stats = store.stats_for(name)
+            cached = store.get(key)
+            if cached is not None:
+                started = time.perf_counter()
                 try:
-                    open_func = gzip.open if use_gzip else open
-                    with open_func(cache_filepath, "rb") as f:
-                        return pickle.load(f)  # nosec
-                except (pickle.UnpicklingError, EOFError, OSError, gzip.BadGzipFile) as e:
-                    print(f"Warning: Could not read cache file {cache_filepath}. Recomputing. Error: {e}")
+                    loaded = _load_value(cached)
+                except (pickle.UnpicklingError, EOFError, OSError, ValueError, TypeError, AttributeError) as e:
+                    logger.warning(f"Could not read cache entry {key} for {name}. Recomputing. Error: {e}")
+                else:
+                    stats.hits += 1
+                    stats.bytes_read += len(cached)
+                    return loaded
+                finally:
+                    stats.deserialize_seconds += time.perf_counter() - started
+            stats.misses += 1
 
             result = func(*args, **kwargs)
+            started = time.perf_counter()
             try:
-                open_func = gzip.open if use_gzip else open
-                with open_func(cache_filepath, "wb") as f:
-                    pickle.dump(result, f)
-            except OSError as e:
-                print(f"Warning: Could not write to cache file {cache_filepath}. Error: {e}")
+                value = _dump_value(result, use_gzip)
+            except (pickle.PickleError, TypeError, AttributeError) as e:
+                logger.warning(f"Could not serialize result of {name} for the cache. Error: {e}")
+                return result
+            finally:
+                stats.serialize_seconds += time.perf_counter() - started
+            if store.put(key, value, name):
+                stats.writes += 1
+                stats.bytes_written += len(value)
 
             return result
 
@@ -0,0 +1,36 @@
+"""
+Find the project a run belongs to.
+
+Kept apart from :mod:`pycodetags.utils.cache_utils` so the scanner, which only needs to know where the
+project lives, does not import the cache's SQLite, gzip and pickle machinery at startup.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+__all__ = ["find_project_root"]
+
+
+def find_project_root(start: Path | None = None) -> Path:
+    """
+    Locate the project root by searching upward for a ``pyproject.toml`` file.
+
+    Args:
+        start: Directory to start searching from. Defaults to the current working directory.
+
+    Returns:
+        The directory containing ``pyproject.toml``.
+
+    Raises:
+        FileNotFoundError: If no ``pyproject.toml`` is found in the directory tree.
+    """
+    current_path = (start or Path.cwd()).resolve()
+    for parent in [current_path] + list(current_path.parents):
+        if (parent / "pyproject.toml").is_file():
+            return parent
+
+    raise FileNotFoundError(
+        "Could not find project root. A 'pyproject.toml' file is required to "
+        "determine the project location, or you must provide an explicit path."
+    )
@@ -0,0 +1,93 @@
+"""
+Source text held once, with a line-start table for fast position arithmetic.
+
+Every stage that works with ``(line, col)`` offsets -- the comment finder, the tag parsers and the
+mutator -- used to re-split the text to find a line. :class:`SourceText` splits it once, the same way
+``str.splitlines`` does, and converts between ``(line, col)`` and absolute character offsets without
+rescanning.
+"""
+
+from __future__ import annotations
+
+import bisect
+from itertools import accumulate
+from typing import Any
+
+__all__ = ["SourceText"]
+
+
+class SourceText:
+    """Decoded source text plus the offset of each line start.
+
+    Lines are 0-based and split exactly like ``str.splitlines``, so line numbers agree with anything
+    else that uses it.
+
+    Examples:
+        >>> src = SourceText("a = 1\\n# b\\n")
+        >>> src.offset(1, 0), src.position(8), src.line(1)
+        (6, (1, 2), '# b')
+        >>> src.extract(0, 4, 1, 3)
+        '1\\n# b'
+    """
+
+    __slots__ = ("text", "line_starts", "_lines", "_plain_newlines")
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self._lines = text.splitlines(keepends=True)
+        # line_starts[i] is the offset of line i; the final entry is len(text).
+        self.line_starts = [0, *accumulate(len(line) for line in self._lines)]
+        # True when every line break is a bare "\n", so a raw slice already reads like joined lines.
+        self._plain_newlines = text.count("\n") == len(self._lines) - (not text.endswith("\n")) and "\r" not in text
+
+    @classmethod
+    def coerce(cls, source: str | SourceText) -> SourceText:
+        """Wrap a string, or return an existing :class:`SourceText` unchanged."""
+        return source if isinstance(source, SourceText) else cls(source)
+
+    def __reduce__(self) -> tuple[Any, tuple[str]]:
+        # Pickle (and cache keys built from pickles) only need the text; the table is rebuilt.
+        return SourceText, (self.text,)
+
+    def __len__(self) -> int:
+        """Number of lines."""
+        return len(self._lines)
+
+    def __str__(self) -> str:
+        return self.text
+
+    def __repr__(self) -> str:
+        return f"SourceText({len(self.text)} chars, {len(self._lines)} lines)"
+
+    def lines(self, keepends: bool = False) -> list[str]:
+        """All lines, like ``text.splitlines(keepends)``. The returned list must not be mutated."""
+        if keepends:
+            return self._lines
+        return self.text.splitlines()
+
+    def line(self, index: int) -> str:
+        """One line without its line break."""
+        return (self._lines[index].splitlines() or [""])[0]
+
+    def offset(self, line: int, col: int) -> int:
+        """Absolute character offset of ``(line, col)``. Raises IndexError for a line past the end."""
+        if not 0 <= line < len(self.line_starts):
+            raise IndexError(f"line {line} out of range")
+        return self.line_starts[line] + col
+
+    def position(self, offset: int) -> tuple[int, int]:
+        """``(line, col)`` of an absolute character offset."""
+        line = bisect.bisect_right(self.line_starts, offset, 0, len(self._lines)) - 1
+        line = max(line, 0)
+        return line, offset - self.line_starts[line]
+
+    def slice(self, start_line: int, start_char: int, end_line: int, end_char: int) -> str:
+        """The raw text between two positions, line breaks included as written."""
+        return self.text[self.offset(start_line, start_char) : self.offset(end_line, end_char)]
+
+    def extract(self, start_line: int, start_char: int, end_line: int, end_char: int) -> str:
+        """The text between two positions with line breaks normalized to ``\\n``."""
+        raw = self.slice(start_line, start_char, end_line, end_char)
+        if self._plain_newlines or start_line == end_line:
+            return raw
+        return "\n".join(raw.splitlines())
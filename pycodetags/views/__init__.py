@@ -1,3 +1,21 @@
-__all__ = ["print_html", "print_json", "print_summary", "print_text", "print_validate", "print_data_md"]
+__all__ = [
+    "print_html",
+    "print_json",
+    "print_summary",
+    "print_text",
+    "print_validate",
+    "print_data_md",
+    "print_jsonl",
+    "write_jsonl",
+]
 
-from pycodetags.views.views import print_data_md, print_html, print_json, print_summary, print_text, print_validate
+from pycodetags.views.views import (
+    print_data_md,
+    print_html,
+    print_json,
+    print_jsonl,
+    print_summary,
+    print_text,
+    print_validate,
+    write_jsonl,
+)
@@ -7,6 +7,12 @@ from __future__ import annotations
 from collections import defaultdict
 from typing import Any, Callable  # noqa
 
+from pycodetags.data_tags.tag_table import TagTable
+
+
+def _group_key(raw_key: Any) -> str:
+    return str(raw_key).strip().lower() if raw_key else "(unlabeled)"
+
 
 def group_and_sort(
     items: list[Any],
@@ -30,9 +36,7 @@ def group_and_sort(
     grouped: dict[str, list[Any]] = defaultdict(list)
 
     for item in items:
-        raw_key = key_fn(item)
-        norm_key = str(raw_key).strip().lower() if raw_key else "(unlabeled)"
-        grouped[norm_key].append(item)
+        grouped[_group_key(key_fn(item))].append(item)
 
     if sort_items:
         for norm_key, group in grouped.items():
@@ -42,3 +46,35 @@ def group_and_sort(
                 raise ValueError(f"Failed to sort group '{norm_key}': {e}") from e
 
     return dict(sorted(grouped.items(), key=lambda x: x[0]))
+
+
+def group_and_sort_rows(
+    table: TagTable,
+    column: str,
+    key_fn: Callable[[Any], Any] = lambda value: value,
+    sort_items: bool = True,
+    sort_column: str | None = None,
+    sort_key: Callable[[Any], Any] | None = None,
+) -> dict[str, list[int]]:
+    """
+    :func:`group_and_sort` for a :class:`TagTable`: groups row numbers by a column instead of items by
+    a key function, so each distinct value is normalized once rather than once per item.
+
+    Args:
+        table: The tag table to group.
+        column: The dictionary-encoded column to group by.
+        key_fn: Maps a column value to the grouping key, before normalization.
+        sort_items: Whether to sort the rows within each group.
+        sort_column: Column to sort rows by (``"comment"`` or an offset column are allowed too);
+            defaults to ``column``.
+        sort_key: Maps a ``sort_column`` value to its sort key; defaults to ``key_fn``.
+
+    Returns:
+        A dictionary mapping normalized keys to lists of row numbers, keys sorted.
+    """
+    grouped = table.group_rows(column, normalize=lambda value: _group_key(key_fn(value)))
+    if sort_items:
+        by_column = sort_column or column
+        for norm_key, rows in grouped.items():
+            grouped[norm_key] = table.sorted_rows(by_column, key=sort_key or key_fn, rows=rows)
+    return dict(sorted(grouped.items(), key=lambda x: x[0]))
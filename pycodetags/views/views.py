@@ -6,10 +6,13 @@ from __future__ import annotations
 
 import json
 import logging
-from typing import Any
+import sys
+from collections.abc import Iterable
+from typing import Any, TextIO
 
 from pycodetags.data_tags.data_tags_classes import DATA
-from pycodetags.views.view_tools import group_and_sort
+from pycodetags.data_tags.tag_table import TagTable
+from pycodetags.views.view_tools import group_and_sort_rows
 
 logger = logging.getLogger(__name__)
 
@@ -22,7 +25,8 @@ def print_validate(found: list[DATA]) -> bool:
         found (list[DATA]): The collected TODOs and Dones.
     """
     found_problems = False
-    for item in sorted(found, key=lambda x: x.code_tag or ""):
+    table = TagTable.of(found)
+    for item in table.iter_data(table.sorted_rows("code_tag", key=lambda code_tag: code_tag or "")):
         validations = item.validate()
         if validations:
             found_problems = True
@@ -44,19 +48,13 @@ def print_html(found: list[DATA]) -> None:
     Args:
         found (list[DATA]): The collected TODOs and Dones.
     """
-    tags = set()
-    for todo in found:
-        tags.add(todo.code_tag)
-
-    for tag in tags:
-        for todo in found:
-            # TODO: find more efficient way to filter.<matth 2025-07-04 priority:low category:views
-            #  status:development release:1.0.0 iteration:1>
-            if todo.code_tag == tag:
-                print(f"<h1>{tag}</h1>")
-                print("<ul>")
-                print(f"<li><strong>{todo.comment}</strong><br>{todo.data_fields}</li>")
-                print("</ul>")
+    table = TagTable.of(found)
+    for tag, rows in table.group_rows("code_tag").items():
+        for todo in table.iter_data(rows):
+            print(f"<h1>{tag}</h1>")
+            print("<ul>")
+            print(f"<li><strong>{todo.comment}</strong><br>{todo.data_fields}</li>")
+            print("</ul>")
 
 
 def print_text(found: list[DATA]) -> None:
@@ -65,14 +63,18 @@ def print_text(found: list[DATA]) -> None:
     Args:
         found (list[DATA]): The collected TODOs and Dones.
     """
-    todos = found
-    if todos:
-        grouped = group_and_sort(
-            todos, key_fn=lambda x: x.code_tag or "N/A", sort_items=True, sort_key=lambda x: x.comment or "N/A"
+    if found:
+        table = TagTable.of(found)
+        grouped = group_and_sort_rows(
+            table,
+            "code_tag",
+            key_fn=lambda code_tag: code_tag or "N/A",
+            sort_column="comment",
+            sort_key=lambda comment: comment or "N/A",
         )
-        for tag, items in grouped.items():
+        for tag, rows in grouped.items():
             print(f"--- {tag.upper()} ---")
-            for todo in items:
+            for todo in table.iter_data(rows):
                 print(todo.as_data_comment())
                 print(todo.terminal_link())
                 print()
@@ -80,6 +82,13 @@ def print_text(found: list[DATA]) -> None:
         print("No Code Tags found.")
 
 
+def _json_default(o: Any) -> str:
+    if hasattr(o, "data_meta"):
+        o.data_meta = None
+
+    return json.dumps(o.to_dict()) if hasattr(o, "to_dict") else str(o)
+
+
 def print_json(found: list[DATA]) -> None:
     """
     Prints TODOs and Dones in a structured JSON format.
@@ -90,13 +99,45 @@ def print_json(found: list[DATA]) -> None:
 
     output = [t.to_dict() for t in todos]
 
-    def default(o: Any) -> str:
-        if hasattr(o, "data_meta"):
-            o.data_meta = None
+    print(json.dumps(output, indent=2, default=_json_default))
+
+
+def print_jsonl(found: Iterable[DATA]) -> int:
+    """
+    Prints one JSON object per line (JSON Lines), each the same object ``print_json`` lists.
+
+    Args:
+        found (Iterable[DATA]): The collected tags.
+
+    Returns:
+        int: How many tags were printed.
+    """
+    return write_jsonl([found])
 
-        return json.dumps(o.to_dict()) if hasattr(o, "to_dict") else str(o)
 
-    print(json.dumps(output, indent=2, default=default))
+def write_jsonl(batches: Iterable[Iterable[DATA]], stream: TextIO | None = None) -> int:
+    """
+    Writes batches of tags as JSON Lines, flushing after each batch.
+
+    Fed one batch per file by :func:`~pycodetags.aggregate.iter_aggregate_by_file`, a consumer reading
+    the stream (``jq``, a log shipper) gets each file's tags as soon as it is parsed, and nothing but the
+    current batch is held in memory.
+
+    Args:
+        batches (Iterable[Iterable[DATA]]): Tags, in batches.
+        stream (TextIO | None): Where to write; defaults to the current ``sys.stdout``.
+
+    Returns:
+        int: How many tags were written.
+    """
+    out = stream or sys.stdout
+    written = 0
+    for batch in batches:
+        lines = [json.dumps(tag.to_dict(), default=_json_default) + "\n" for tag in batch]
+        out.write("".join(lines))
+        out.flush()
+        written += len(lines)
+    return written
 
 
 def print_data_md(found: list[DATA]) -> None:
@@ -104,12 +145,12 @@ def print_data_md(found: list[DATA]) -> None:
     Outputs DATA items in a markdown format.
 
     """
-    # pylint:disable=protected-access
-    grouped = group_and_sort(found, lambda _: "" if not _.file_path else _.file_path, sort_items=False)
-    for file, items in grouped.items():
+    table = TagTable.of(found)
+    grouped = group_and_sort_rows(table, "file_path", lambda file_path: file_path or "", sort_items=False)
+    for file, rows in grouped.items():
         print(file)
         print("```python")
-        for item in items:
+        for item in table.iter_data(rows):
             print(item.as_data_comment())
             print()
         print("```")
@@ -125,7 +166,10 @@ def print_summary(found: list[DATA]) -> None:
     """
     from collections import Counter
 
-    tag_counter = Counter(tag.code_tag or "UNKNOWN" for tag in found)
+    # Counts come straight off the dictionary-encoded column; no tag is visited.
+    tag_counter: Counter[str] = Counter()
+    for tag, count in TagTable.of(found).counts("code_tag").items():
+        tag_counter[tag or "UNKNOWN"] += count
 
     if not tag_counter:
         print("No code tags found.")
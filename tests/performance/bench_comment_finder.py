@@ -0,0 +1,69 @@
+"""
+Benchmark comment extraction engines on large synthetic files.
+
+Run from the repository root:
+
+    python -m tests.performance.bench_comment_finder [--functions 2000] [--repeat 5]
+
+Reports the best-of-``repeat`` time per engine and the speedup of ``tokenize`` over ``ast``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import timeit
+
+from pycodetags.python.comment_finder import (
+    find_comment_blocks_from_string_ast,
+    find_comment_blocks_from_string_tokenize,
+)
+
+ENGINES = {
+    "ast": find_comment_blocks_from_string_ast,
+    "tokenize": find_comment_blocks_from_string_tokenize,
+}
+
+
+def make_source(functions: int) -> str:
+    """A module with a realistic mix of code, docstrings, block comments and inline comments."""
+    parts = ['"""Synthetic module. # not a comment"""', "import os", ""]
+    for i in range(functions):
+        parts.append(f"""
+# Section {i}
+# TODO: refactor function {i} <owner:dev{i % 7} priority:{i % 3}>
+def function_{i}(value):
+    \"\"\"Docstring with a # hash that is not a comment.\"\"\"
+    total = value + {i}  # inline note
+    #
+    if total > 10:
+        # FIXME: magic number <due:2030-01-01>
+        return "# still not a comment"
+    return total
+""")
+    return "\n".join(parts)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--functions", type=int, nargs="*", default=[100, 500, 2000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'lines':>8} {'blocks':>7} " + " ".join(f"{name + ' (s)':>14}" for name in ENGINES) + f" {'speedup':>8}")
+    for functions in args.functions:
+        source = make_source(functions)
+        timings = {}
+        blocks = 0
+        for name, engine in ENGINES.items():
+            blocks = len(engine(source))
+            timings[name] = min(timeit.repeat(lambda engine=engine: engine(source), number=1, repeat=args.repeat))
+        speedup = timings["ast"] / timings["tokenize"]
+        print(
+            f"{source.count(chr(10)):>8} {blocks:>7} "
+            + " ".join(f"{timings[name]:>14.4f}" for name in ENGINES)
+            + f" {speedup:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Benchmark the content-addressed parse cache against no cache and the old per-source memoize.
+
+Run from the repository root:
+
+    python -m tests.performance.bench_parse_cache [--files 300] [--repeat 3]
+
+Each scenario parses the same synthetic tree in a throwaway project folder:
+
+- ``uncached``: parse every file, no cache at all.
+- ``memoize cold/warm``: the previous setup, ``persistent_memoize(use_gzip=True)`` around the comment
+  finder, starting from an empty and from a filled cache folder.
+- ``cache cold``: scan index and parse cache, both empty.
+- ``cache warm, new paths``: parse cache filled, path index empty (fresh checkout with a restored
+  cache folder); every file is read and hashed, nothing is parsed.
+- ``cache warm``: both filled; one ``stat()`` per file.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from pycodetags.data_tags import data_tags_parsers
+from pycodetags.parallel import parse_python_files
+from pycodetags.pure_data_schema import PureDataSchema
+from pycodetags.scan_index import ScanIndex
+from pycodetags.utils.cache_utils import persistent_memoize
+
+SCHEMAS = [PureDataSchema]
+
+
+def make_tree(root: Path, files: int) -> list[str]:
+    """Synthetic modules, a few tags each, with mtimes safely in the past.
+
+    Every tenth file is a package ``__init__.py`` carrying the same license header, as in real trees.
+    """
+    (root / "pyproject.toml").write_text("", encoding="utf-8")
+    paths = []
+    for i in range(files):
+        path = root / "src" / f"pkg_{i // 10}" / (f"mod_{i}.py" if i % 10 else "__init__.py")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if not i % 10:
+            path.write_text("# Copyright (c) Example Corp.\n# TODO: add a package docstring <owner:docs>\n")
+            paths.append(str(path))
+            continue
+        body = "".join(f"""
+# TODO: item {i}.{j} <owner:dev{j} priority:{j % 3}>
+def func_{j}(x):
+    return x + {j}  # plain comment
+""" for j in range(10))
+        path.write_text(f'"""Module {i}."""\n{body}', encoding="utf-8")
+        past = time.time_ns() - 3_600_000_000_000
+        os.utime(path, ns=(past, past))
+        paths.append(str(path))
+    return paths
+
+
+def timed(action: Callable[[], object]) -> float:
+    started = time.perf_counter()
+    action()
+    return time.perf_counter() - started
+
+
+def scan_with_index(root: Path, files: list[str]) -> None:
+    index = ScanIndex.open(SCHEMAS, False, root=root)
+    assert index is not None  # nosec
+    parse_python_files(files, SCHEMAS, False, index=index)
+    index.save()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--files", type=int, default=300)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    results: dict[str, list[float]] = {}
+    original = data_tags_parsers.find_comment_blocks_from_string
+    for _ in range(args.repeat):
+        with tempfile.TemporaryDirectory() as temp:
+            root = Path(temp)
+            files = make_tree(root, args.files)
+            cache_dir = root / ".pycodetags_cache"
+
+            def run(name: str, action: Callable[[], object]) -> None:
+                results.setdefault(name, []).append(timed(action))
+
+            run("uncached", lambda: parse_python_files(files, SCHEMAS, False))
+
+            memo_dir = root / "memo"
+            memo_dir.mkdir()
+            data_tags_parsers.find_comment_blocks_from_string = persistent_memoize(  # type: ignore[assignment]
+                ttl_seconds=60 * 60 * 24 * 7, cache_dir_override=memo_dir, use_gzip=True
+            )(original)
+            try:
+                run("memoize cold", lambda: parse_python_files(files, SCHEMAS, False))
+                run("memoize warm", lambda: parse_python_files(files, SCHEMAS, False))
+            finally:
+                data_tags_parsers.find_comment_blocks_from_string = original  # type: ignore[assignment]
+
+            run("cache cold", lambda: scan_with_index(root, files))
+            shutil.rmtree(cache_dir / "index")
+            run("cache warm, new paths", lambda: scan_with_index(root, files))
+            run("cache warm", lambda: scan_with_index(root, files))
+
+    baseline = min(results["uncached"])
+    print(f"{args.files} files, best of {args.repeat}")
+    print(f"{'scenario':<24} {'seconds':>9} {'vs uncached':>12}")
+    for name, times in results.items():
+        best = min(times)
+        print(f"{name:<24} {best:>9.3f} {baseline / best:>11.1f}x")
+
+
+if __name__ == "__main__":
+    main()
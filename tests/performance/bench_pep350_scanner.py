@@ -0,0 +1,72 @@
+"""
+Benchmark the linear PEP-350 scanner against the regex it replaced, on adversarial comment blocks.
+
+Run from the repository root:
+
+    python -m tests.performance.bench_pep350_scanner [--lines 250 500 1000] [--repeat 3]
+
+Each corpus is one comment block of the given number of lines:
+
+- ``license``: a license header full of ``NOTE:``/``WARRANTY:`` anchors and no ``<``.
+- ``code``: commented-out code with ``TODO:`` and ``<`` comparisons but no ``>`` (a tenth of the lines).
+- ``banner``: ASCII-art banners of ``!`` and ``?`` runs without a colon.
+- ``tagged``: ordinary ``# TODO: ... <fields>`` lines, to show normal input is not slower.
+
+The regex time grows with the square of the block length on ``license``, with its cube on ``code`` and with
+the square of each run's length on ``banner``; the scanner's grows linearly.
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import time
+from collections.abc import Callable
+
+from pycodetags.data_tags.data_tags_parsers import scan_codetags
+
+OLD_REGEX = re.compile(
+    r"(?P<code_tag>[A-Z\?\!]{3,})\s*:\s*(?P<comment>.*?)<(?P<field_string>.*?)>",
+    re.DOTALL,
+)
+
+# Line factory and a divisor for the line count: the regex is cubic on ``code`` (every ``<`` without a
+# ``>`` restarts the field-string search), so that corpus is kept smaller to finish at all.
+CORPORA: dict[str, tuple[Callable[[int], str], int]] = {
+    "license": (lambda i: f"# NOTE: clause {i} applies. NO WARRANTY: provided as is, see LICENSE section {i}.", 1),
+    "code": (lambda i: f"# if count_{i} < LIMIT:  TODO: re-enable once x_{i} < y_{i}", 10),
+    "banner": (lambda i: "# " + "!" * 200 + " ?????????? " + "!" * 200, 1),
+    "tagged": (lambda i: f"# TODO: item {i} <alice 2025-01-01 priority:high>", 1),
+}
+
+
+def make_block(kind: str, lines: int) -> str:
+    line, divisor = CORPORA[kind]
+    return "\n".join(line(i) for i in range(max(1, lines // divisor)))
+
+
+def timed(action: Callable[[], object]) -> float:
+    started = time.perf_counter()
+    action()
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--lines", type=int, nargs="+", default=[250, 500, 1000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"best of {args.repeat}, milliseconds per block")
+    print(f"{'corpus':<10} {'lines':>7} {'regex':>11} {'scanner':>9} {'speedup':>9}")
+    for kind in CORPORA:
+        for lines in args.lines:
+            block = make_block(kind, lines)
+            lines = block.count("\n") + 1
+            old = min(timed(lambda: list(OLD_REGEX.finditer(block))) for _ in range(args.repeat))
+            new = min(timed(lambda: list(scan_codetags(block))) for _ in range(args.repeat))
+            print(f"{kind:<10} {lines:>7} {old * 1000:>11.2f} {new * 1000:>9.2f} {old / new if new else 0:>8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
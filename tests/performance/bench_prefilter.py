@@ -0,0 +1,101 @@
+"""
+Benchmark the byte-level prefilter on a tree where most files have no tags.
+
+Run from the repository root:
+
+    python -m tests.performance.bench_prefilter [--files 1000] [--tagged 0.1] [--repeat 3]
+
+Scenarios, all without the scan index so every file is looked at:
+
+- ``no prefilter``: decode, tokenize and scan every file.
+- ``prefilter``: search the raw bytes first and parse only candidate files.
+- ``prefilter + folk``: the same with folk tags on, which adds the ``matching_tags`` alternation.
+- ``prefilter, 1 MiB files``: a few large untagged files, searched through ``mmap``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from pycodetags.parallel import parse_python_files
+from pycodetags.pure_data_schema import PureDataSchema
+
+SCHEMAS = [{**PureDataSchema, "matching_tags": ["TODO", "FIXME", "BUG", "HACK"]}]
+
+UNTAGGED = '''
+def func_{j}(values: list[int]) -> dict[str, int]:
+    """Sum things up. NOTE: purely synthetic."""
+    total = 0  # running total
+    for value in values:
+        if value < {j}:
+            total += value
+    return {{"TOTAL": total}}
+'''
+
+
+def make_tree(root: Path, files: int, tagged: float) -> list[str]:
+    paths = []
+    every = max(1, round(1 / tagged)) if tagged else 0
+    for i in range(files):
+        path = root / "src" / f"pkg_{i // 50}" / f"mod_{i}.py"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        body = "".join(UNTAGGED.format(j=j) for j in range(15))
+        if every and i % every == 0:
+            body += "\n# TODO: look at this <owner:dev priority:1>\n"
+        path.write_text(f'"""Module {i}."""\n{body}', encoding="utf-8")
+        paths.append(str(path))
+    return paths
+
+
+def make_large(root: Path, files: int) -> list[str]:
+    paths = []
+    chunk = "".join(UNTAGGED.format(j=j) for j in range(15))
+    for i in range(files):
+        path = root / "big" / f"big_{i}.py"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(chunk * (1024 * 1024 // len(chunk)), encoding="utf-8")
+        paths.append(str(path))
+    return paths
+
+
+def timed(action: Callable[[], object]) -> float:
+    started = time.perf_counter()
+    action()
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--files", type=int, default=1000)
+    parser.add_argument("--tagged", type=float, default=0.1, help="Fraction of files with a tag")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    results: dict[str, list[float]] = {}
+    with tempfile.TemporaryDirectory() as temp:
+        root = Path(temp)
+        files = make_tree(root, args.files, args.tagged)
+        large = make_large(root, 4)
+        for _ in range(args.repeat):
+
+            def run(name: str, action: Callable[[], object]) -> None:
+                results.setdefault(name, []).append(timed(action))
+
+            run("no prefilter", lambda: parse_python_files(files, SCHEMAS, False, prefilter=False))
+            run("prefilter", lambda: parse_python_files(files, SCHEMAS, False))
+            run("prefilter + folk", lambda: parse_python_files(files, SCHEMAS, True))
+            run("no prefilter, 1 MiB files", lambda: parse_python_files(large, SCHEMAS, False, prefilter=False))
+            run("prefilter, 1 MiB files", lambda: parse_python_files(large, SCHEMAS, False))
+
+    print(f"{args.files} files, {args.tagged:.0%} tagged, best of {args.repeat}")
+    print(f"{'scenario':<28} {'seconds':>9}")
+    for name, times in results.items():
+        print(f"{name:<28} {min(times):>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmark ``iterate_comments`` as more schemas are activated.
+
+Run from the repository root:
+
+    python -m tests.performance.bench_schemas [--tags 2000] [--repeat 3]
+
+Each comment block is matched once and each found tag is classified against every schema, so the time
+should grow with the number of tags produced (one per schema, as before) rather than with rescans of
+the source. Scenarios:
+
+- ``pep350``: one ``# TODO: ... <fields>`` tag per line.
+- ``folk``: two-line ``# TODO ...`` folk tags with folk tags on.
+- ``tdg``: three-line TDG tags with a ``TDG`` schema among the active ones.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from collections.abc import Callable
+
+from pycodetags.data_tags.data_tags_parsers import iterate_comments
+from pycodetags.data_tags.data_tags_schema import DataTagSchema
+from pycodetags.pure_data_schema import PureDataSchema
+
+SCHEMA_COUNTS = (1, 2, 4, 8)
+
+
+def make_schema(i: int) -> DataTagSchema:
+    return {
+        "name": "TDG" if i == 0 else f"SCHEMA_{i}",
+        "matching_tags": ["TODO", "FIXME", "BUG", f"TAG{chr(ord('A') + i)}"],
+        "default_fields": {"str|list[str]": "assignee", "date": "origination_date"},
+        "data_fields": {"priority": "str", "assignee": "str", "origination_date": "date", "category": "str"},
+        "data_field_aliases": {"p": "priority", "a": "assignee"},
+        "field_infos": {},
+    }
+
+
+def make_source(kind: str, tags: int) -> str:
+    if kind == "pep350":
+        return "\n".join(f"x_{i} = 1  # TODO: item {i} <alice 2025-01-01 priority:high>" for i in range(tags))
+    if kind == "folk":
+        return "\n".join(f"x_{i} = 1\n# TODO fix item {i}\n# more detail\n" for i in range(tags))
+    return "\n".join(f"x_{i} = 1\n# TODO: item {i}\n# category=core issue={i}\n# body text\n" for i in range(tags))
+
+
+def timed(action: Callable[[], object]) -> float:
+    started = time.perf_counter()
+    action()
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tags", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    results: dict[tuple[str, int], list[float]] = {}
+    for kind in ("pep350", "folk", "tdg"):
+        source = make_source(kind, args.tags)
+        for count in SCHEMA_COUNTS:
+            schemas = [PureDataSchema, *(make_schema(i) for i in range(count - 1))]
+            for _ in range(args.repeat):
+                results.setdefault((kind, count), []).append(
+                    timed(lambda: list(iterate_comments(source, None, schemas, kind == "folk")))
+                )
+
+    print(f"{args.tags} tags per source, best of {args.repeat}")
+    print(f"{'scenario':<10} " + " ".join(f"{f'{count} schema(s)':>12}" for count in SCHEMA_COUNTS))
+    for kind in ("pep350", "folk", "tdg"):
+        print(f"{kind:<10} " + " ".join(f"{min(results[(kind, count)]):>12.3f}" for count in SCHEMA_COUNTS))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Measure how long pycodetags takes to start, against a budget.
+
+Run from the repository root:
+
+    python -m tests.performance.bench_startup [--repeat 5]
+
+Each entry point is imported in a fresh interpreter with ``-X importtime``. The time reported is the
+cumulative import time of everything imported after interpreter startup (after ``site``), best of the
+runs, so it does not depend on what ``site`` happens to load. ``pycodetags --help`` is also timed wall
+clock, next to a bare interpreter. Modules an entry point should leave alone until they are needed are
+listed with any that were loaded anyway.
+
+Exits 1 when an import is over its budget or loads a module it should not. Wall-clock budgets depend on
+the machine and its load, so only this script checks them; ``tests/test_just_import.py`` checks the
+deferred imports, which do not.
+"""
+
+from __future__ import annotations
+
+import argparse
+import subprocess  # nosec
+import sys
+import time
+
+BUDGETS_MS = {
+    "pycodetags": 20.0,
+    "pycodetags.__main__": 150.0,
+}
+"""Import-time budget per entry point, in milliseconds; generous, so a slow CI machine still passes."""
+
+NOT_AT_STARTUP = {
+    "pycodetags": ("pluggy", "jmespath", "ast_comments", "sqlite3", "multiprocessing", "importlib.metadata"),
+    "pycodetags.__main__": ("jmespath", "ast_comments", "sqlite3", "multiprocessing", "importlib.metadata"),
+}
+"""Modules each entry point should only load when a command needs them."""
+
+
+def import_time_ms(module: str) -> float:
+    """Cumulative ``-X importtime`` of importing ``module`` in a fresh interpreter, excluding ``site``."""
+    completed = subprocess.run(  # nosec
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total_us = 0
+    after_site = False
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        if name.strip() == "site" and not name.startswith("  "):
+            after_site = True
+            continue
+        if after_site and not name.startswith("  ") and cumulative_us.strip().isdigit():
+            # Top-level entries only; nested ones are already in their parent's cumulative time.
+            total_us += int(cumulative_us)
+    return total_us / 1000
+
+
+def loaded_at_startup(module: str, candidates: tuple[str, ...]) -> list[str]:
+    """Which of ``candidates`` importing ``module`` loads."""
+    code = f"import sys, {module}; print(' '.join(name for name in {candidates!r} if name in sys.modules))"
+    completed = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)  # nosec
+    return completed.stdout.split()
+
+
+def wall_ms(command: list[str], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        subprocess.run(command, capture_output=True, check=False)  # nosec
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    failed = False
+    print(f"best of {args.repeat}")
+    print(f"{'import':<22} {'ms':>8} {'budget':>8}  loaded too early")
+    for module, budget in BUDGETS_MS.items():
+        best = min(import_time_ms(module) for _ in range(args.repeat))
+        early = loaded_at_startup(module, NOT_AT_STARTUP[module])
+        failed = failed or best > budget or bool(early)
+        print(f"{module:<22} {best:>8.1f} {budget:>8.1f}  {', '.join(early) or '-'}")
+
+    print()
+    print(f"{'wall clock':<22} {'ms':>8}")
+    print(f"{'python -c pass':<22} {wall_ms([sys.executable, '-c', 'pass'], args.repeat):>8.1f}")
+    help_ms = wall_ms([sys.executable, "-m", "pycodetags", "--help"], args.repeat)
+    print(f"{'pycodetags --help':<22} {help_ms:>8.1f}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
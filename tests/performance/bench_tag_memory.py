@@ -0,0 +1,84 @@
+"""
+Measure the memory a scan's results hold: bytes per tag as DATA objects versus as tag records.
+
+Run from the repository root:
+
+    python -m tests.performance.bench_tag_memory [--tags 1000 10000 50000] [--files 50]
+
+The tags are parsed once from a synthetic source spread over ``--files`` file paths, then converted
+the old way (one ``DATA`` per tag) and the new way (one ``TagRecord`` per tag). The parse results are
+dropped before measuring, so the figure is what each representation keeps alive, strings included.
+``cycles`` is how many objects only the cycle collector could free once the list is released.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import tracemalloc
+from collections.abc import Callable
+
+from pycodetags.data_tags.data_tags_methods import DataTag, convert_data_tag_to_data_object
+from pycodetags.data_tags.data_tags_parsers import iterate_comments
+from pycodetags.data_tags.tag_record import LazyDataList, TagRecord
+from pycodetags.pure_data_schema import PureDataSchema
+
+SCHEMA = {
+    **PureDataSchema,
+    "default_fields": {"str|list[str]": "assignee", "date": "origination_date"},
+    "data_fields": {**PureDataSchema["data_fields"], "priority": "str", "assignee": "str", "origination_date": "date"},
+}
+
+
+def make_tags(tags: int, files: int) -> list[DataTag]:
+    source = "\n".join(f"x_{i} = 1  # TODO: item {i} <alice 2025-01-01 priority:high status:open>" for i in range(tags))
+    found = list(iterate_comments(source, None, [SCHEMA], include_folk_tags=False))
+    for i, tag in enumerate(found):
+        # A new string per tag, as the walker produces them.
+        tag["file_path"] = "".join(["src/package/module_", str(i % files), ".py"])
+    return found
+
+
+def retained(build: Callable[[list[DataTag]], object], tags: int, files: int) -> tuple[float, int]:
+    """Bytes per tag kept alive by ``build``'s result, and the objects left for the cycle collector."""
+    make_tags(10, files)  # warm the schema and pattern caches outside the measurement
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    parsed = make_tags(tags, files)
+    result = build(parsed)
+    del parsed
+    gc.collect()
+    kept = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    gc.disable()
+    del result
+    cycles = gc.collect()
+    gc.enable()
+    return kept / tags, cycles
+
+
+def as_data(parsed: list[DataTag]) -> object:
+    return [convert_data_tag_to_data_object(tag, SCHEMA) for tag in parsed]
+
+
+def as_records(parsed: list[DataTag]) -> object:
+    return LazyDataList(TagRecord.from_data_tag(tag, SCHEMA) for tag in parsed)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tags", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--files", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'tags':>7} {'DATA B/tag':>11} {'record B/tag':>13} {'saved':>7} {'DATA cycles':>12} {'record cycles':>14}")
+    for tags in args.tags:
+        old, old_cycles = retained(as_data, tags, args.files)
+        new, new_cycles = retained(as_records, tags, args.files)
+        saved = 1 - new / old if old else 0
+        print(f"{tags:>7} {old:>11.0f} {new:>13.0f} {saved:>7.0%} {old_cycles:>12} {new_cycles:>14}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark summary-style questions on a columnar ``TagTable`` against passes over ``list[DATA]``.
+
+Run from the repository root:
+
+    python -m tests.performance.bench_tag_table [--tags 100000 1000000] [--list-up-to 200000]
+
+For each size, synthetic tag records (10 tag names, 1000 files, 4 statuses, 20 assignees) are put in a
+``LazyDataList`` and its table is built once (``build``). Then, each timed on its own:
+
+- ``summary``: tag counts, as ``print_summary`` does.
+- ``filter``: the rows with ``status == 'open'``.
+- ``group``: rows grouped by file, as ``print_data_md`` does.
+- ``sort``: rows ordered by tag name, as ``print_validate`` does.
+
+The ``list`` column does the same with ``Counter``, a comprehension, ``group_and_sort`` and ``sorted``
+over materialized DATA objects, which is skipped above ``--list-up-to`` tags to bound memory.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from collections import Counter
+from collections.abc import Callable
+
+from pycodetags.data_tags.tag_record import LazyDataList, TagRecord
+from pycodetags.data_tags.tag_table import TagTable
+from pycodetags.views.view_tools import group_and_sort, group_and_sort_rows
+
+TAGS = ("TODO", "FIXME", "BUG", "HACK", "NOTE", "DONE", "XXX", "REQ", "IDEA", "PORT")
+STATUSES = ("open", "done", "wontfix", "development")
+
+
+def make_records(count: int) -> LazyDataList:
+    return LazyDataList(
+        TagRecord(
+            code_tag=TAGS[i % len(TAGS)],
+            comment=f"item {i}",
+            file_path=f"src/module_{i % 1000}.py",
+            data_fields={"status": STATUSES[i % len(STATUSES)], "assignee": f"dev{i % 20}"},
+            offsets=(i % 500, 0, i % 500, 10),
+        )
+        for i in range(count)
+    )
+
+
+def timed(action: Callable[[], object]) -> float:
+    started = time.perf_counter()
+    action()
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tags", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--list-up-to", type=int, default=200_000)
+    args = parser.parse_args()
+
+    print("milliseconds")
+    print(f"{'tags':>9} {'question':<9} {'table':>9} {'list':>9}")
+    for count in args.tags:
+        found = make_records(count)
+        build = timed(lambda: found.table)
+        table = found.table
+        table_runs: dict[str, Callable[[], object]] = {
+            "summary": lambda: table.counts("code_tag"),
+            "filter": lambda: table.where_eq("status", "open"),
+            "group": lambda: group_and_sort_rows(table, "file_path", lambda path: path or "", sort_items=False),
+            "sort": lambda: table.sorted_rows("code_tag", key=lambda tag: tag or ""),
+        }
+        items = list(found) if count <= args.list_up_to else None
+        list_runs: dict[str, Callable[[], object]] = {
+            "summary": lambda: Counter(tag.code_tag or "UNKNOWN" for tag in items or ()),
+            "filter": lambda: [tag for tag in items or () if (tag.data_fields or {}).get("status") == "open"],
+            "group": lambda: group_and_sort(items or [], lambda tag: tag.file_path or "", sort_items=False),
+            "sort": lambda: sorted(items or (), key=lambda tag: tag.code_tag or ""),
+        }
+        print(f"{count:>9} {'build':<9} {build * 1000:>9.1f} {'':>9}")
+        for question, run in table_runs.items():
+            listed = f"{timed(list_runs[question]) * 1000:>9.1f}" if items is not None else f"{'-':>9}"
+            print(f"{count:>9} {question:<9} {timed(run) * 1000:>9.1f} {listed}")
+
+
+if __name__ == "__main__":
+    main()
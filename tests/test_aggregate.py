@@ -2,12 +2,13 @@
 
 import sys
 import textwrap
+from collections.abc import Sequence
 from pathlib import Path
 
 import pytest
 
 from pycodetags import PureDataSchema
-from pycodetags.aggregate import aggregate_all_kinds, aggregate_all_kinds_multiple_input
+from pycodetags.aggregate import aggregate_all_kinds, aggregate_all_kinds_multiple_input, iter_aggregate_by_file
 from pycodetags.data_tags.data_tags_classes import DATA
 from pycodetags.exceptions import FileParsingError
 
@@ -48,7 +49,7 @@ def test_aggregate_all_kinds_multiple_input(tmp_path):
     create_python_file(tmp_path, content)
 
     results = aggregate_all_kinds_multiple_input(module_names=[], source_paths=[str(tmp_path)], schema=PureDataSchema)
-    assert isinstance(results, list)
+    assert isinstance(results, Sequence)
     assert any(isinstance(item, DATA) for item in results)
     assert any(item.code_tag == "TODO" for item in results)
 
@@ -80,7 +81,7 @@ def test_aggregate_from_module(tmp_path):
 
 def test_aggregate_with_empty_inputs(tmp_path):
     results = aggregate_all_kinds_multiple_input([], [], PureDataSchema)
-    assert isinstance(results, list)
+    assert isinstance(results, Sequence)
     assert len(results) == 0
 
 
@@ -89,3 +90,29 @@ def test_aggregate_raises_on_invalid_path(tmp_path):
 
     with pytest.raises(FileParsingError, match="Can't find any files in source folder"):
         aggregate_all_kinds(module_name="", source_path=str(bad_path), schema=PureDataSchema)
+
+
+def test_aggregate_keeps_module_data_alongside_sources(tmp_path):
+    create_python_file(tmp_path, "# TODO: From source <originator:AB>\n")
+
+    results = aggregate_all_kinds_multiple_input(["tests.demo.demo"], [str(tmp_path)], PureDataSchema)
+    from_modules = aggregate_all_kinds_multiple_input(["tests.demo.demo"], [], PureDataSchema)
+
+    assert len(from_modules) > 0
+    assert len(results) == len(from_modules) + 1
+
+
+def test_iter_aggregate_by_file_matches_list_version(tmp_path):
+    for i in range(3):
+        (tmp_path / f"mod_{i}.py").write_text(f"# TODO: task {i} <originator:AB>\n# BUG: bug {i} <originator:CD>\n")
+    (tmp_path / "empty.py").write_text("x = 1\n")
+    # The second source path repeats a file of the first; its tags must not come out twice.
+    sources = [str(tmp_path), str(tmp_path / "mod_1.py")]
+
+    batches = list(iter_aggregate_by_file(["tests.demo.demo"], sources, PureDataSchema, use_index=False, batch_size=2))
+    expected = aggregate_all_kinds_multiple_input(["tests.demo.demo"], sources, PureDataSchema, use_index=False)
+
+    assert all(batches)
+    assert len({batch[0].file_path for batch in batches[:-1]}) == 3
+    flat = [item.to_data() if hasattr(item, "to_data") else item for batch in batches for item in batch]
+    assert flat == list(expected)
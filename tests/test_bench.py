@@ -0,0 +1,143 @@
+import json
+
+from pycodetags.bench.__main__ import main
+from pycodetags.bench.compare import Thresholds, compare_results
+from pycodetags.bench.suite import Corpus, bench_config, run_suite
+from pycodetags.bench.synthetic import TreeSpec, ensure_tree, generate_tree
+
+
+def test_same_spec_same_tree(tmp_path):
+    spec = TreeSpec(files=40, pathological_every=5)
+    first = generate_tree(tmp_path / "a", spec)
+    second = generate_tree(tmp_path / "b", spec)
+    assert first.digest == second.digest
+    assert first.files == 40 and first.lines > 0
+    assert generate_tree(tmp_path / "c", spec._replace(seed=1)).digest != first.digest
+    # One file in 5 is pathological, each kind in turn: the eighth is the empty file.
+    assert (tmp_path / "a" / "pkg_000" / "mod_00" / "file_000039.py").read_bytes() == b""
+
+
+def test_ensure_tree_reuses_what_is_there(tmp_path):
+    spec = TreeSpec(files=10)
+    root = tmp_path / "tree"
+    info = ensure_tree(root, spec)
+    assert not any(path.name.endswith(".bench.json") for path in root.rglob("*"))
+    (root / "pkg_000" / "mod_00" / "file_000000.py").unlink()
+    assert ensure_tree(root, spec) == info
+    assert not (root / "pkg_000" / "mod_00" / "file_000000.py").exists()
+    assert ensure_tree(root, spec._replace(files=11)).files == 11
+
+
+def test_run_suite_over_a_small_tree(tmp_path):
+    info = generate_tree(tmp_path / "tree", TreeSpec(files=30, pathological_every=10))
+    scratch = tmp_path / "scratch"
+    scratch.mkdir()
+    with bench_config(tmp_path):
+        result = run_suite(
+            [Corpus("small", info.root, scratch)], names=["aggregate", "mutate", "filter", "view_json"], repeat=2
+        )
+    benchmarks = result["benchmarks"]
+    assert list(benchmarks) == ["small/aggregate", "small/mutate", "small/filter", "small/view_json"]
+    aggregate = benchmarks["small/aggregate"]
+    assert aggregate["files"] == 30 and aggregate["tags"] > 0
+    assert len(aggregate["times_s"]) == 2 and aggregate["peak_bytes"] > 0
+    assert aggregate["tags_per_s"] > 0
+    assert benchmarks["small/filter"]["tags"] == aggregate["tags"]
+    # The tree itself is left alone; mutate rewrites copies.
+    assert generate_tree(tmp_path / "again", TreeSpec(files=30, pathological_every=10)).digest == info.digest
+
+
+def test_cli_run(tmp_path):
+    output = tmp_path / "result.json"
+    code = main(
+        [
+            "run",
+            "--sizes",
+            "20",
+            "--no-stdlib",
+            "--only",
+            "comment_finder,parse_fields",
+            "--repeat",
+            "1",
+            "--no-memory",
+            "--workdir",
+            str(tmp_path / "work"),
+            "-o",
+            str(output),
+        ]
+    )
+    assert code == 0
+    result = json.loads(output.read_text(encoding="utf-8"))
+    assert set(result["benchmarks"]) == {"20/comment_finder", "20/parse_fields"}
+    assert result["corpora"]["20"]["spec"]["files"] == 20
+    assert result["benchmarks"]["20/parse_fields"]["peak_bytes"] is None
+
+
+def _result(**benchmarks):
+    return {
+        "format": 1,
+        "python": "3.12.0",
+        "benchmarks": {key: {"times_s": times, "peak_bytes": peak} for key, (times, peak) in benchmarks.items()},
+    }
+
+
+def test_compare_only_flags_significant_changes():
+    baseline = _result(
+        **{
+            "1k/aggregate": ([1.0, 1.02, 0.98, 1.01, 0.99], 10_000_000),
+            "1k/noisy": ([1.0, 1.5, 0.6, 1.4, 0.7], 10_000_000),
+            "1k/tiny": ([0.0001] * 5, 1_000),
+            "1k/view_text": ([0.1] * 5, 1_000),
+            "1k/gone": ([0.1], None),
+        }
+    )
+    current = _result(
+        **{
+            "1k/aggregate": ([1.3, 1.31, 1.29, 1.3, 1.32], 12_000_000),
+            "1k/noisy": ([1.3, 1.6, 0.9, 1.5, 1.0], 10_000_000),
+            "1k/tiny": ([0.0005] * 5, 900_000),
+            "1k/view_text": ([0.13] * 5, 1_000),
+            "1k/new": ([0.1], None),
+        }
+    )
+    comparisons = compare_results(current=current, baseline=baseline, tolerances=[("view_*", {"time": 0.5})])
+    status = {comparison.key: comparison.status for comparison in comparisons}
+    assert status == {
+        "1k/aggregate": ["slower", "more memory"],
+        "1k/noisy": ["noise"],
+        "1k/tiny": [],
+        "1k/view_text": [],
+        "1k/gone": ["missing"],
+        "1k/new": ["new"],
+    }
+    assert [comparison.key for comparison in comparisons if comparison.regressed] == ["1k/aggregate"]
+    assert round(comparisons[0].time_change, 2) == 0.3
+
+    baseline["tolerances"] = {"1k/aggregate": {"time": 0.5, "memory": 0.5}}
+    assert not compare_results(baseline, current, Thresholds(min_memory=0))[0].status
+    assert compare_results(baseline, current, Thresholds(), [("aggregate", {"time": 0.1})])[0].status == ["slower"]
+
+
+def test_cli_compare_exit_codes(tmp_path, capsys):
+    baseline = _result(**{"1k/aggregate": ([1.0, 1.0, 1.0], 10_000_000)})
+    current = _result(**{"1k/aggregate": ([2.0, 2.0, 2.0], 10_000_000)})
+    (tmp_path / "baseline.json").write_text(json.dumps(baseline), encoding="utf-8")
+    (tmp_path / "current.json").write_text(json.dumps(current), encoding="utf-8")
+    arguments = ["compare", str(tmp_path / "baseline.json"), "--current", str(tmp_path / "current.json")]
+
+    assert main(arguments) == 1
+    table = capsys.readouterr().out
+    assert "1k/aggregate" in table and "+100.0%" in table and "slower" in table
+    assert main(arguments + ["--tolerance", "1.5"]) == 0
+    assert main(arguments + ["--tolerance-for", "1k/*=1.5"]) == 0
+
+
+def test_cli_compare_runs_the_baseline_again(tmp_path, capsys):
+    workdir = str(tmp_path / "work")
+    baseline = str(tmp_path / "baseline.json")
+    switches = ["--only", "parse_fields", "--repeat", "2", "--no-memory", "--workdir", workdir]
+    assert main(["run", "--sizes", "20", "--no-stdlib", *switches, "-o", baseline]) == 0
+    code = main(["compare", baseline, *switches, "--tolerance", "100", "-o", str(tmp_path / "new.json")])
+    assert code == 0
+    assert "20/parse_fields" in capsys.readouterr().out
+    assert set(json.loads((tmp_path / "new.json").read_text(encoding="utf-8"))["benchmarks"]) == {"20/parse_fields"}
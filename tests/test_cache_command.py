@@ -0,0 +1,83 @@
+import json
+import time
+from pathlib import Path
+
+from pycodetags import cache_command
+from pycodetags.__main__ import main
+from pycodetags.parse_cache import ParseCache, dump_tags
+from pycodetags.utils.cache_utils import SQLITE_FILENAME, SQLiteStore, persistent_memoize
+
+
+def fill(cache_dir: Path) -> SQLiteStore:
+    store = SQLiteStore(cache_dir, ttl_seconds=3600)
+    square = persistent_memoize(backend=store)(lambda x: x * x)
+    for x in (1, 2, 1):
+        square(x)
+    store.save_stats()
+    return store
+
+
+def test_stats_json(tmp_path):
+    fill(tmp_path)
+    lines = []
+    exit_code, report = cache_command.run("stats", as_json=True, cache_dir_override=tmp_path, writer=lines.append)
+
+    assert exit_code == 0
+    assert json.loads(lines[0]) == report
+    assert report["stores"] == [{"backend": "sqlite", "entries": 2, "bytes": report["stores"][0]["bytes"]}]
+    assert report["totals"]["hits"] == 1
+    assert report["totals"]["misses"] == 2
+    assert report["totals"]["hit_rate"] == 0.3333
+
+
+def test_stats_text(tmp_path):
+    fill(tmp_path)
+    lines = []
+    cache_command.run("stats", cache_dir_override=tmp_path, writer=lines.append)
+    assert lines[1].startswith("  sqlite store: 2 entries")
+    assert lines[-1].split()[:3] == ["TOTAL", "1", "2"]
+
+
+def test_prune_drops_expired(tmp_path):
+    store = SQLiteStore(tmp_path, ttl_seconds=0)
+    store._swept = True
+    store.put("k", b"value")
+    _, report = cache_command.run("prune", cache_dir_override=tmp_path, writer=lambda _: None)
+    assert report["memoize"] == 1
+
+
+def test_verify_removes_broken_entries(tmp_path):
+    store = fill(tmp_path)
+    store.put("broken", b"not a pickle")
+    today = int(time.time() // 86400)
+    pack = ParseCache(tmp_path / "parse" / "k.pack", "k", {"ok": (today, dump_tags([])), "bad": (today, b"Mgarbage")})
+    pack.dirty = True
+    pack.save()
+
+    exit_code, report = cache_command.run("verify", cache_dir_override=tmp_path, writer=lambda _: None)
+    assert exit_code == 0
+    assert report["memoize"] == {"checked": 3, "removed": 1}
+    assert report["parse_cache"] == {"checked": 2, "removed": 1}
+    assert store.get("broken") is None
+
+
+def test_verify_reports_damaged_database(tmp_path):
+    (tmp_path / SQLITE_FILENAME).write_bytes(b"this is not a database" * 100)
+    lines = []
+    exit_code, report = cache_command.run("verify", cache_dir_override=tmp_path, writer=lines.append)
+    assert exit_code == 1
+    assert report["errors"]
+    assert lines[-1].startswith("Error:")
+
+
+def test_clear(tmp_path):
+    fill(tmp_path)
+    _, report = cache_command.run("clear", cache_dir_override=tmp_path, writer=lambda _: None)
+    assert report["removed"] >= 1
+    assert not (tmp_path / SQLITE_FILENAME).exists()
+
+
+def test_cli_cache_stats(capsys):
+    assert main(["cache", "stats", "--json"]) == 0
+    report = json.loads(capsys.readouterr().out)
+    assert report["cache_dir"].endswith(".pycodetags_cache")
@@ -1,9 +1,12 @@
 # tests/test_main.py
+import json
 import sys
+import time
 from pathlib import Path
 
 import pytest
 
+import pycodetags.__main__ as cli
 from pycodetags.__main__ import main
 
 
@@ -90,3 +93,137 @@ def test_cli_main_no_args(capsys):
 
     assert exit_code == 1
     assert "usage:" in captured.out.lower()
+
+
+def test_cli_report_several_formats_into_folder(tmp_path, capsys, monkeypatch):
+    src = tmp_path / "src"
+    src.mkdir()
+    make_test_source_file(src)
+    scans = []
+    real_aggregate = cli.aggregate_all_kinds_multiple_input
+
+    def counting_aggregate(*args, **kwargs):
+        scans.append(args)
+        return real_aggregate(*args, **kwargs)
+
+    monkeypatch.setattr(cli, "aggregate_all_kinds_multiple_input", counting_aggregate)
+    out = tmp_path / "reports"
+
+    exit_code = main(["data", "--src", str(src), "--format", "text,json,html,summary", "--output-dir", str(out)])
+
+    assert exit_code == 0
+    assert len(scans) == 1
+    assert capsys.readouterr().out == ""
+    assert "--- TODO ---" in (out / "codetags.txt").read_text(encoding="utf-8")
+    assert '"code_tag": "TODO"' in (out / "codetags.json").read_text(encoding="utf-8")
+    assert "<h1>TODO</h1>" in (out / "codetags.html").read_text(encoding="utf-8")
+    assert "TODO: 1" in (out / "codetags-summary.txt").read_text(encoding="utf-8")
+
+
+def test_parallel_writers_share_one_materialized_list(tmp_path, monkeypatch):
+    from pycodetags import PureDataSchema
+    from pycodetags.aggregate import aggregate_all_kinds_multiple_input
+    from pycodetags.app_config import get_code_tags_config
+    from pycodetags.data_tags.tag_record import TagRecord
+    from pycodetags.plugin_manager import get_plugin_manager
+    from pycodetags.report_writer import INTERNAL_VIEWS, write_reports
+
+    src = tmp_path / "src"
+    src.mkdir()
+    for i in range(20):
+        (src / f"mod_{i}.py").write_text(f"# TODO: task {i} <priority:{i % 3}>\n", encoding="utf-8")
+    found = aggregate_all_kinds_multiple_input([], [str(src)], PureDataSchema, use_index=False)
+    built = []
+    real_to_data = TagRecord.to_data
+
+    def counting_to_data(self, *args, **kwargs):
+        built.append(self)
+        time.sleep(0.001)  # Widen the window in which racing writers would build the same row twice.
+        return real_to_data(self, *args, **kwargs)
+
+    monkeypatch.setattr(TagRecord, "to_data", counting_to_data)
+    pm = get_plugin_manager()
+    if not pm.has_plugin(INTERNAL_VIEWS):
+        pm.register(cli.InternalViews(), name=INTERNAL_VIEWS)
+    formats = ["text", "json", "html", "summary"]
+    handled = write_reports(pm, formats, found, get_code_tags_config(), str(tmp_path / "out"))
+
+    assert all(handled.values())
+    assert len(built) == len(found) == 20
+    assert all(found[i] is found[i] for i in range(len(found)))
+
+
+def test_plugin_writers_run_on_the_calling_thread(tmp_path):
+    import threading
+
+    import pluggy
+
+    from pycodetags import PureDataSchema
+    from pycodetags.aggregate import aggregate_all_kinds_multiple_input
+    from pycodetags.app_config import get_code_tags_config
+    from pycodetags.plugin_manager import get_plugin_manager
+    from pycodetags.report_writer import INTERNAL_VIEWS, write_reports
+
+    class ThreadRecordingPlugin:
+        def __init__(self):
+            self.threads = []
+
+        @pluggy.HookimplMarker("pycodetags")
+        def print_report(self, format_name, found_data):
+            self.threads.append(threading.current_thread())
+            if format_name == "json":
+                print("plugin extra")
+            return False
+
+    src = make_test_source_file(tmp_path).parent
+    found = aggregate_all_kinds_multiple_input([], [str(src)], PureDataSchema, use_index=False)
+    pm = get_plugin_manager()
+    if not pm.has_plugin(INTERNAL_VIEWS):
+        pm.register(cli.InternalViews(), name=INTERNAL_VIEWS)
+    plugin = ThreadRecordingPlugin()
+    pm.register(plugin, name="thread-recorder")
+    try:
+        handled = write_reports(pm, ["text", "json", "html"], found, get_code_tags_config(), str(tmp_path / "out"))
+    finally:
+        pm.unregister(name="thread-recorder")
+
+    assert all(handled.values())
+    assert plugin.threads == [threading.current_thread()] * 3
+    json_report = (tmp_path / "out" / "codetags.json").read_text(encoding="utf-8")
+    assert '"code_tag": "TODO"' in json_report
+    assert json_report.endswith("plugin extra\n")
+
+
+def test_cli_report_single_format_to_file(tmp_path, capsys):
+    src = tmp_path / "src"
+    src.mkdir()
+    make_test_source_file(src)
+    out = tmp_path / "report.json"
+
+    exit_code = main(["data", "--src", str(src), "--format", "json", "--output", str(out)])
+
+    assert exit_code == 0
+    assert capsys.readouterr().out == ""
+    assert '"code_tag": "TODO"' in out.read_text(encoding="utf-8")
+
+
+def test_cli_report_several_formats_need_a_folder(tmp_path, capsys):
+    make_test_source_file(tmp_path)
+
+    exit_code = main(["data", "--src", str(tmp_path), "--format", "text,json"])
+
+    assert exit_code == 1
+    assert "--output-dir" in capsys.readouterr().err
+
+
+def test_cli_report_jsonl_streams_same_tags_as_json(tmp_path, capsys):
+    make_test_source_file(tmp_path)
+    (tmp_path / "other.py").write_text("# BUG: second <originator:AB>\n")
+
+    assert main(["data", "--src", str(tmp_path), "--format", "json"]) == 0
+    as_json = json.loads(capsys.readouterr().out)
+    assert main(["data", "--src", str(tmp_path), "--format", "jsonl"]) == 0
+    as_lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+
+    assert len(as_lines) == 2
+    assert sorted(as_lines, key=str) == sorted(as_json, key=str)
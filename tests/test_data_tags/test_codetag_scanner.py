@@ -0,0 +1,83 @@
+import re
+
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+
+from pycodetags.data_tags.data_tags_parsers import parse_codetags_with_spans, scan_codetags
+from pycodetags.pure_data_schema import PureDataSchema
+
+# The regex scan_codetags replaced, kept as the reference for its output.
+REFERENCE_REGEX = re.compile(
+    r"""
+    (?P<code_tag>[A-Z\?\!]{3,})
+    \s*:\s*
+    (?P<comment>.*?)
+    <
+    (?P<field_string>.*?)
+    >
+    """,
+    re.DOTALL | re.VERBOSE,
+)
+
+
+def reference(text):
+    return [
+        (m.group("code_tag"), m.group("comment"), m.group("field_string"), m.span())
+        for m in REFERENCE_REGEX.finditer(text)
+    ]
+
+
+# Few distinct characters, so tags, colons, brackets and whitespace collide often.
+tricky_text = st.text(alphabet="TODOX?!:<> \n\t#ab,=\u00a0", max_size=80)
+
+
+@given(text=tricky_text)
+def test_same_as_reference_regex(text):
+    assert list(scan_codetags(text)) == reference(text)
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "",
+        "# TODO: plain <a:1>",
+        "# TODO : spaced\n\n : <x>",
+        "# TODO\n:\n comment\n<\nfields\n>",
+        "# TO: too short <x> FIX: ok <y>",
+        "# ABCTODO: run start <x>",
+        "# TODO: one <a> TODO: two <b>TODO:three<c>",
+        "# TODO: no close < never",
+        "# TODO: no open at all",
+        "# TODO: >< reversed then <ok>",
+        "# ??? : odd tag <x> !!!:<>",
+        "# TODOS: x <a>\n# NOTE: y",
+        "# TODO:\u00a0nbsp\u2003<a>",
+        "# TODO: <a> NOTE: then < no close",
+        "# TODO: fields <a <b> c>",
+    ],
+)
+def test_same_as_reference_regex_examples(text):
+    assert list(scan_codetags(text)) == reference(text)
+
+
+def test_spans_and_tags_unchanged_for_parser():
+    block = "# TODO: first <alice>\n# FIXME: second\n# <p:high>"
+    tags = parse_codetags_with_spans(block, PureDataSchema, strict=False)
+    assert [span for _tag, span in tags] == [m[3] for m in reference(block)]
+    assert [tag["comment"] for tag, _span in tags] == ["first", "second"]
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "# NOTE: see below\n" * 20_000,
+        "# TODO: a < b\n" * 20_000,
+        "#" + "?" * 200_000,
+        "# " + "A" * 100_000 + " " * 100_000 + "B",
+    ],
+    ids=["anchors-without-brackets", "open-without-close", "long-tag-run", "run-then-whitespace"],
+)
+def test_adversarial_blocks_finish(text):
+    # Each of these takes the reference regex seconds to minutes; the scanner is linear.
+    assert list(scan_codetags(text)) == []
@@ -0,0 +1,109 @@
+import copy
+import pickle
+
+import pytest
+
+from pycodetags.common_interfaces import list_available_schemas
+from pycodetags.data_tags import data_tags_methods
+from pycodetags.data_tags.compiled_schema import compile_schema, union_matching_tags
+from pycodetags.data_tags.data_tags_methods import ExpressionEvaluationError, promote_fields
+from pycodetags.data_tags.data_tags_parsers import parse_codetags, parse_fields
+from pycodetags.data_tags.meta_builder import get_project_version_from_toml
+from pycodetags.plugin_manager import reset_plugin_manager
+
+
+@pytest.fixture
+def schema():
+    return {
+        "name": "TEST",
+        "matching_tags": ["TODO", "FIXME"],
+        "default_fields": {"str": "assignee", "date": "origination_date"},
+        "data_fields": {"priority": "str", "assignee": "str", "origination_date": "date", "status": "str"},
+        "data_field_aliases": {"p": "priority", "a": "assignee"},
+        "field_infos": {
+            "status": {"name": "status", "value_on_blank": "'open'"},
+            "priority": {"name": "priority", "value_on_blank": "lookup(meta.priority_map, tag.code_tag)"},
+        },
+    }
+
+
+def test_cached_by_identity_and_by_content(schema):
+    compiled = compile_schema(schema)
+    assert compile_schema(schema) is compiled
+    assert compile_schema(compiled) is compiled
+    # A process-pool worker gets an unpickled copy of the schema with each task.
+    assert compile_schema(pickle.loads(pickle.dumps(schema))) is compiled
+    changed = copy.deepcopy(schema)
+    changed["matching_tags"].append("BUG")
+    assert compile_schema(changed) is not compiled
+
+
+def test_derived_tables(schema):
+    compiled = compile_schema(schema)
+    assert compiled.matching_tags == frozenset({"TODO", "FIXME"})
+    assert compiled.field_aliases["p"] == "priority"
+    assert compiled.field_aliases["status"] == "status"
+    # Dispatch order is int, date, str, str|list[str] whatever order the schema lists them in.
+    assert compiled.default_dispatch == (("date", "origination_date"), ("str", "assignee"))
+    assert [name for name, _expr, _parsed in compiled.blank_expressions] == ["status", "priority"]
+    assert union_matching_tags([schema, {"matching_tags": ["BUG"]}]) == {"TODO", "FIXME", "BUG"}
+
+
+def test_parse_fields_uses_aliases_and_defaults(schema):
+    fields = parse_fields("p:high 2025-01-02 alice", schema, strict=False)
+    assert fields["data_fields"] == {"priority": "high"}
+    assert fields["default_fields"] == {"origination_date": "2025-01-02", "assignee": "alice"}
+
+
+def test_blank_fields_evaluated_without_rebuilding_meta_when_full(schema, monkeypatch):
+    tags = parse_codetags("# FIXME: broken <alice p:low status:closed>", schema, strict=False)
+    assert tags[0]["fields"]["data_fields"]["status"] == "closed"
+
+    tags = parse_codetags("# FIXME: broken <alice p:low>", schema, strict=False)
+    assert tags[0]["fields"]["data_fields"]["status"] == "open"
+    tags = parse_codetags("# FIXME: broken <alice>", schema, strict=False)
+    assert tags[0]["fields"]["data_fields"]["priority"] == "high"
+
+    def fail(*_args, **_kwargs):
+        raise AssertionError("meta built although no field was blank")
+
+    monkeypatch.setattr(data_tags_methods, "build_meta_object", fail)
+    parse_codetags("# TODO: done <alice p:low status:closed>", schema, strict=False)
+
+
+def test_invalid_expression_still_fails_on_evaluation(schema):
+    schema["field_infos"]["status"]["value_on_blank"] = "this is (not jmespath"
+    tag = {
+        "code_tag": "TODO",
+        "comment": "",
+        "fields": {
+            "default_fields": {},
+            "data_fields": {},
+            "custom_fields": {"x": "1"},
+            "unprocessed_defaults": [],
+            "identity_fields": [],
+        },
+    }
+    with pytest.raises(ExpressionEvaluationError):
+        promote_fields(tag, schema)
+
+
+def test_project_version_reread_only_when_file_changes(tmp_path):
+    pyproject = tmp_path / "pyproject.toml"
+    pyproject.write_text('[project]\nversion = "1.0.0"\n', encoding="utf-8")
+    assert get_project_version_from_toml(str(pyproject)) == "1.0.0"
+    pyproject.write_text('[project]\nversion = "1.0.10"\n', encoding="utf-8")
+    assert get_project_version_from_toml(str(pyproject)) == "1.0.10"
+    assert get_project_version_from_toml(str(tmp_path / "missing.toml")) == "0.0.0"
+
+
+def test_list_available_schemas_is_cached_per_plugin_manager():
+    first = list_available_schemas()
+    second = list_available_schemas()
+    assert first == second and first is not second
+    assert all(a is b for a, b in zip(first, second))
+    second.append({"name": "EXTRA"})
+    assert len(list_available_schemas()) == len(first)
+
+    reset_plugin_manager()
+    assert [s["name"] for s in list_available_schemas()] == [s["name"] for s in first]
@@ -0,0 +1,68 @@
+from pycodetags.data_tags.data_tags_parsers import (
+    classify_fields,
+    iterate_comments,
+    parse_codetags,
+    parse_fields,
+    tokenize_field_string,
+)
+from pycodetags.data_tags.folk_tags_parser import process_text, process_text_for_tag_sets
+from pycodetags.pure_data_schema import PureDataSchema
+
+TRACKER = {
+    "name": "TRACKER",
+    "matching_tags": ["TODO", "FIXME", "BUG"],
+    "default_fields": {"str|list[str]": "assignee", "date": "origination_date"},
+    "data_fields": {"priority": "str", "assignee": "str", "origination_date": "date"},
+    "data_field_aliases": {"p": "priority"},
+    "field_infos": {},
+}
+OTHER = {**TRACKER, "name": "OTHER", "matching_tags": ["TODO", "HACK"], "data_field_aliases": {}}
+
+SOURCE = """
+x = 1  # TODO: first <alice p:high 2025-01-02>
+y = 2
+# BUG: second <bob>
+"""
+
+
+def test_parse_fields_is_tokenize_then_classify():
+    field_string = "alice,bob p:high 'quoted':x note=\"two words\" 2025-01-02 #"
+    assert parse_fields(field_string, TRACKER, strict=False) == classify_fields(
+        tokenize_field_string(field_string), TRACKER
+    )
+
+
+def test_each_schema_yields_its_own_classification_in_order():
+    tags = list(iterate_comments(SOURCE, None, [PureDataSchema, TRACKER], include_folk_tags=False))
+    # Block by block, and within a block schema by schema.
+    assert [(t["code_tag"], t["comment"]) for t in tags] == [("TODO", "first")] * 2 + [("BUG", "second")] * 2
+    for expected_schema, tag in zip([PureDataSchema, TRACKER, PureDataSchema, TRACKER], tags):
+        [alone] = [
+            t
+            for t in parse_codetags(tag["original_text"], expected_schema, strict=False)
+            if t["code_tag"] == tag["code_tag"]
+        ]
+        assert tag["fields"] == alone["fields"]
+    assert tags[0]["offsets"] == tags[1]["offsets"]
+    assert tags[0] is not tags[1] and tags[0]["fields"] is not tags[1]["fields"]
+
+
+def test_folk_tag_sets_match_separate_passes():
+    text = "# TODO fix it\n# more words\n# HACK around it\n# BUG later"
+    tag_sets = [["TODO", "BUG"], ["TODO", "HACK"], ["TODO", "BUG", "ZZZ"], ["TODO", "BUG"]]
+    combined = process_text_for_tag_sets(text, True, "assignee", "f.py", tag_sets)
+    for valid_tags, found in zip(tag_sets, combined):
+        separate: list = []
+        process_text(text, True, "assignee", separate, "f.py", valid_tags)
+        assert found == separate
+    # Sets that only differ in tags absent from the block share the work but not the dicts.
+    assert combined[0] == combined[2] == combined[3]
+    assert combined[0][0] is not combined[2][0]
+    assert combined[0][0]["fields"]["default_fields"] is not combined[3][0]["fields"]["default_fields"]
+
+
+def test_folk_tags_relocated_once_per_copy():
+    source = "x = 1\n# TODO fix it\n"
+    tags = list(iterate_comments(source, None, [TRACKER, OTHER], include_folk_tags=True))
+    assert len(tags) == 2
+    assert tags[0]["offsets"] == tags[1]["offsets"] == (1, 0, 1, 13)
@@ -155,3 +155,26 @@ def test_mutating_both_tags_in_block(tmp_path: Path):
     assert out.count("id:9") == 2
     assert "# FIXME: first thing <category:core id:9>" in out
     assert "# BUG: tracked one <priority:high id:9>" in out
+
+
+def test_many_tags_in_one_block_rewrite_in_one_pass(tmp_path):
+    from pycodetags.data_tags import iterate_comments_from_file
+    from pycodetags.data_tags.data_tags_methods import convert_data_tag_to_data_object
+    from pycodetags.mutator import apply_mutations
+    from pycodetags.pure_data_schema import PureDataSchema
+
+    count = 300
+    path = tmp_path / "many.py"
+    lines = [f"    # TODO: task {i} <n:{i}>" for i in range(count)]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    tags = [
+        convert_data_tag_to_data_object(raw, PureDataSchema)
+        for raw in iterate_comments_from_file(str(path), [PureDataSchema], include_folk_tags=False)
+    ]
+    assert [tag.offsets for tag in tags] == [(i, 4, i, len(line)) for i, line in enumerate(lines)]
+
+    apply_mutations(path, [(tag, None) for tag in tags[::2]])
+
+    rewritten = path.read_text(encoding="utf-8").splitlines()
+    assert rewritten[0] == "    " and rewritten[1] == lines[1]
@@ -0,0 +1,124 @@
+import dataclasses
+import gc
+
+import pytest
+
+from pycodetags.aggregate import aggregate_all_kinds_multiple_input, dedup_data_objects
+from pycodetags.data_tags.data_tags_classes import DATA
+from pycodetags.data_tags.data_tags_methods import convert_data_tag_to_data_object
+from pycodetags.data_tags.data_tags_parsers import iterate_comments
+from pycodetags.data_tags.tag_record import EMPTY_FIELDS, FrozenFields, LazyDataList, TagRecord
+from pycodetags.filters import filter_data_by_expression
+from pycodetags.pure_data_schema import PureDataSchema
+
+SOURCE = """
+x = 1  # TODO: first <alice,bob 2025-01-02 priority:high>
+# BUG: second <carol color:red>
+# DONE: third <title="a title" id=7>
+"""
+
+
+def raw_tags():
+    return list(iterate_comments(SOURCE, None, [PureDataSchema], include_folk_tags=False))
+
+
+def test_record_materializes_same_data_as_direct_conversion():
+    for tag in raw_tags():
+        tag["file_path"] = "sample.py"
+        record = TagRecord.from_data_tag(tag, PureDataSchema)
+        assert record.to_data() == convert_data_tag_to_data_object(tag, PureDataSchema)
+
+
+def test_record_is_slotted_and_immutable():
+    record = TagRecord.from_data_tag(raw_tags()[0], PureDataSchema)
+    assert not hasattr(record, "__dict__")
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        record.comment = "changed"
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        record.data_fields._values = ()
+    assert isinstance(TagRecord(default_fields={"assignee": ["alice"]}).default_fields["assignee"], tuple)
+
+
+def test_records_share_interned_strings_and_key_tuples():
+    first, second = (TagRecord(code_tag="".join(["TO", "DO"]), file_path="".join(["a", ".py"])) for _ in range(2))
+    assert first.code_tag is second.code_tag
+    assert first.file_path is second.file_path
+    one = FrozenFields.from_dict({"priority": "high", "status": "open"})
+    two = FrozenFields.from_dict({"priority": "low", "status": "done"})
+    assert one._keys is two._keys
+    assert FrozenFields.from_dict({}) is EMPTY_FIELDS
+
+
+def test_materialized_data_does_not_share_mutable_state():
+    record = TagRecord(default_fields={"assignee": ["alice"]})
+    data = record.to_data()
+    data.default_fields["assignee"].append("bob")
+    assert record.to_data().default_fields == {"assignee": ["alice"]}
+
+
+def test_to_flat_dict_matches_data():
+    for tag in raw_tags():
+        record = TagRecord.from_data_tag(tag, PureDataSchema)
+        assert record.to_flat_dict(include_comment_and_tag=True) == record.to_data().to_flat_dict(
+            include_comment_and_tag=True
+        )
+
+
+def test_lazy_list_materializes_on_first_access_only():
+    records = [TagRecord.from_data_tag(tag, PureDataSchema) for tag in raw_tags()]
+    module_item = DATA(comment="from a module")
+    lazy = LazyDataList([*records, module_item])
+    assert lazy._materialized is None
+    assert len(lazy) == 4
+    assert lazy[-1] is module_item
+    assert lazy._materialized is None
+    assert lazy[0] is lazy[0]
+    assert [item is None for item in lazy._materialized] == [False, True, True, True]
+    assert [item.comment for item in lazy] == ["first", "second", "third", "from a module"]
+    assert lazy == list(lazy) and lazy[1:3] == list(lazy)[1:3]
+    with pytest.raises(IndexError):
+        lazy[4]
+
+
+def test_where_keeps_materialized_identity():
+    lazy = LazyDataList(TagRecord.from_data_tag(tag, PureDataSchema) for tag in raw_tags())
+    second = lazy[1]
+    second.comment = "edited"
+    selected = lazy.where(lambda item: item.code_tag != "TODO")
+    assert selected[0] is second
+    assert [item.comment for item in selected] == ["edited", "third"]
+
+
+def test_filter_does_not_materialize(tmp_path):
+    (tmp_path / "sample.py").write_text(SOURCE)
+    found = aggregate_all_kinds_multiple_input([], [str(tmp_path)], PureDataSchema, use_index=False)
+    filtered = filter_data_by_expression(found, "code_tag=='BUG'")
+    assert isinstance(filtered, LazyDataList)
+    assert found._materialized is None and filtered._materialized is None
+    assert [item.comment for item in filtered] == ["second"]
+    assert filtered == filter_data_by_expression(list(found), "code_tag=='BUG'")
+
+
+def test_dedup_records_same_as_data():
+    tags = raw_tags() * 2
+    for tag in tags:
+        tag["file_path"] = "sample.py"
+    records = dedup_data_objects([TagRecord.from_data_tag(tag, PureDataSchema) for tag in tags])
+    data = dedup_data_objects([convert_data_tag_to_data_object(tag, PureDataSchema) for tag in tags])
+    assert [record.to_data() for record in records] == data
+
+
+def test_records_are_freed_without_the_cycle_collector():
+    tags = raw_tags()
+    gc.collect()
+    gc.disable()
+    try:
+        records = [TagRecord.from_data_tag(tag, PureDataSchema) for tag in tags]
+        del records
+        assert gc.collect() == 0
+        data = [convert_data_tag_to_data_object(tag, PureDataSchema) for tag in tags]
+        del data
+        # Every DATA object points at itself through data_meta.
+        assert gc.collect() > 0
+    finally:
+        gc.enable()
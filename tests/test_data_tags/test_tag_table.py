@@ -0,0 +1,83 @@
+from collections import Counter
+
+import pytest
+
+from pycodetags.data_tags.data_tags_classes import DATA
+from pycodetags.data_tags.tag_record import LazyDataList, TagRecord
+from pycodetags.data_tags.tag_table import TagTable
+from pycodetags.filters import filter_data_by_expression
+
+
+def make_items():
+    return [
+        TagRecord(code_tag="TODO", comment="b", file_path="a.py", data_fields={"status": "open"}, offsets=(1, 0, 1, 9)),
+        TagRecord(code_tag="BUG", comment="a", file_path="b.py", custom_fields={"assignee": ["bob", "eve"]}),
+        DATA(code_tag="TODO", comment="c", file_path="a.py", data_fields={"status": "done"}, offsets=(5, 2, 6, 0)),
+        TagRecord(code_tag="", comment="d", file_path=None, custom_fields={"status": "open"}, offsets=(9, 0, 9, 4)),
+    ]
+
+
+def test_lazy_table_is_built_without_materializing():
+    found = LazyDataList(make_items())
+    table = TagTable.of(found)
+    assert table is found.table
+    assert found._materialized is None
+    assert len(table) == 4
+    assert table.counts("code_tag") == {"TODO": 2, "BUG": 1, None: 1}
+    assert table.counts("status") == {"open": 2, None: 1, "done": 1}
+    assert table.columns["assignee"][1] == ("bob", "eve")
+    assert list(table.offsets["start_line"]) == [1, -1, 5, 9]
+
+
+def test_filters_and_take():
+    found = LazyDataList(make_items())
+    table = found.table
+    assert list(table.where_eq("code_tag", "TODO")) == [0, 2]
+    assert list(table.where_ne("status", "open")) == [1, 2]
+    assert list(table.where_in("file_path", ["b.py", None])) == [1, 3]
+    assert list(table.where_eq("code_tag", "MISSING")) == []
+    assert list(table.where_range("start_line", 2, 10)) == [2, 3]
+    assert list(table.where_range("start_line", None, None)) == [0, 2, 3]
+
+    taken = table.take(table.where_eq("code_tag", "TODO"))
+    assert taken.counts("status") == {"open": 1, "done": 1}
+    assert taken.comment == ["b", "c"]
+    assert [item.comment for item in taken.iter_data()] == ["b", "c"]
+    assert taken.data(1) is found[2]
+    with pytest.raises(KeyError):
+        table.column("comment")
+
+
+def test_group_and_sort_rows():
+    table = TagTable.from_items(make_items())
+    assert table.group_rows("file_path") == {"a.py": [0, 2], "b.py": [1], None: [3]}
+    assert table.sorted_rows("comment") == [1, 0, 2, 3]
+    assert table.sorted_rows("code_tag", key=lambda tag: tag or "") == [3, 1, 0, 2]
+    assert table.sorted_rows("start_line", rows=[2, 0]) == [0, 2]
+
+
+def test_counts_on_many_values_match_counter():
+    items = [DATA(code_tag="TODO", file_path=f"f{i % 50}.py") for i in range(500)]
+    table = TagTable.from_items(items)
+    taken = table.take(range(0, 500, 3))
+    assert taken.counts("file_path") == dict(Counter(items[i].file_path for i in range(0, 500, 3)))
+
+
+@pytest.mark.parametrize(
+    "expression",
+    [
+        "code_tag=='TODO'",
+        "'TODO'==code_tag",
+        "status!='open'",
+        "code_tag=='TODO' && status=='done'",
+        "code_tag=='BUG' || !(status=='open')",
+        "code_tag==''",
+        "contains(comment, 'a')",
+        "assignee=='bob'",
+    ],
+)
+def test_table_filter_matches_generic_filter(expression):
+    found = LazyDataList(make_items())
+    fast = filter_data_by_expression(found, expression)
+    slow = filter_data_by_expression(list(found), expression)
+    assert [item.comment for item in fast] == [item.comment for item in slow]
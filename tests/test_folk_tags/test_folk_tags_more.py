@@ -109,3 +109,20 @@ def test_integration_end_to_end_single_person():
     tags = []
     process_text(text, True, "assignee", tags, file_path=__file__, valid_tags=["TODO"])
     assert len(tags) == 1
+
+
+def test_folk_offsets_are_source_positions():
+    import copy
+
+    from pycodetags.data_tags import iterate_comments
+    from pycodetags.pure_data_schema import PureDataSchema
+    from pycodetags.utils.source_text import SourceText
+
+    schema = copy.deepcopy(PureDataSchema)
+    schema["matching_tags"] = ["TODO"]
+    source = "x = 1\n    # TODO: hello\n    # more\ny = 2\n"
+
+    [tag] = iterate_comments(source, None, [schema], include_folk_tags=True)
+
+    assert tag["offsets"] == (1, 4, 2, 10)
+    assert SourceText(source).slice(*tag["offsets"]) == "# TODO: hello\n    # more"
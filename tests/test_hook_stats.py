@@ -0,0 +1,88 @@
+import pluggy
+import pytest
+
+from pycodetags.__main__ import main
+from pycodetags.hook_stats import HookStats
+from pycodetags.plugin_specs import CodeTagsSpec
+
+hookimpl = pluggy.HookimplMarker("pycodetags")
+
+
+class SlowSourcePlugin:
+    @hookimpl
+    def find_source_tags(self, already_processed, file_path, config):
+        return [] if file_path.endswith(".md") else ["tag one", "tag two"]
+
+    @hookimpl
+    def validate(self, item, config):
+        if item == "bad":
+            raise ValueError("bad item")
+        return ["problem"]
+
+
+class QuietPlugin:
+    @hookimpl
+    def find_source_tags(self, already_processed, file_path, config):
+        return None
+
+
+def make_pm():
+    pm = pluggy.PluginManager("pycodetags")
+    pm.add_hookspecs(CodeTagsSpec)
+    pm.register(SlowSourcePlugin(), name="slow")
+    return pm
+
+
+def test_counts_per_hook_and_per_plugin():
+    pm = make_pm()
+    originals = [impl.function for impl in pm.hook.find_source_tags.get_hookimpls()]
+    stats = HookStats()
+
+    with stats.monitor(pm):
+        pm.register(QuietPlugin(), name="quiet")
+        for file_path in ("a.txt", "b.md", "c.txt"):
+            pm.hook.find_source_tags(already_processed=False, file_path=file_path, config=None)
+        pm.hook.validate(item="ok", config=None)
+        with pytest.raises(ValueError):
+            pm.hook.validate(item="bad", config=None)
+    pm.hook.validate(item="ok", config=None)
+
+    assert stats.hooks["find_source_tags"].calls == 3
+    assert stats.hooks["find_source_tags"].results == 4
+    assert stats.hooks["validate"].calls == 2
+    assert stats.hooks["validate"].errors == 1
+    assert stats.plugins[("slow", "find_source_tags")].results == 4
+    assert stats.plugins[("quiet", "find_source_tags")].calls == 3
+    assert stats.plugins[("slow", "validate")].errors == 1
+    slow = stats.plugins[("slow", "find_source_tags")]
+    assert 0 < slow.max_ns <= slow.total_ns
+    # Monitoring stopped: nothing more counted and the plugins' own functions are back.
+    assert originals[0] in [impl.function for impl in pm.hook.find_source_tags.get_hookimpls()]
+    assert stats.plugins[("slow", "validate")].calls == 2
+
+    report = stats.report()
+    assert "slow: find_source_tags" in report
+    assert "(1 raised)" in report
+    assert stats.as_dict()["hooks"]["validate"]["errors"] == 1
+
+
+def test_plugin_info_stats(tmp_path, capsys):
+    (tmp_path / "mod.py").write_text("# TODO: measure <owner:me>\n", encoding="utf-8")
+    (tmp_path / "notes.md").write_text("nothing here\n", encoding="utf-8")
+
+    assert main(["plugin-info", "--stats", "--src", str(tmp_path)]) == 0
+
+    out = capsys.readouterr().out
+    assert "--- pycodetags plugin hooks ---" in out
+    for hook in ("print_report_style_name", "add_cli_subcommands", "find_source_tags"):
+        assert f"\n{hook} " in out
+
+
+def test_profile_includes_hooks(tmp_path, capsys):
+    (tmp_path / "mod.py").write_text("# TODO: profile hooks <owner:me>\n", encoding="utf-8")
+
+    assert main(["data", "--src", str(tmp_path), "--format", "json", "--profile"]) == 0
+
+    err = capsys.readouterr().err
+    assert "--- pycodetags plugin hooks ---" in err
+    assert "pycodetags-internal-views: print_report" in err
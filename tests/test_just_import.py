@@ -1,9 +1,26 @@
+import pytest
+
 import pycodetags.__about__
 import pycodetags.logging_config
 from pycodetags.pure_data_schema import PureDataSchema
+from tests.performance import bench_startup
 
 
 def test_imports():
     assert dir(pycodetags.__about__)
     assert dir(pycodetags.logging_config)
     assert dir(PureDataSchema)
+
+
+@pytest.mark.parametrize("module", sorted(bench_startup.BUDGETS_MS))
+def test_startup_defers_heavy_imports(module):
+    assert bench_startup.loaded_at_startup(module, bench_startup.NOT_AT_STARTUP[module]) == []
+
+
+def test_lazy_exports():
+    import pycodetags
+
+    assert set(pycodetags.__all__) <= set(dir(pycodetags))
+    assert all(getattr(pycodetags, name) for name in pycodetags.__all__)
+    with pytest.raises(AttributeError):
+        _ = pycodetags.no_such_export
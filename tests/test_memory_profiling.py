@@ -0,0 +1,54 @@
+import json
+import tracemalloc
+
+from pycodetags.__main__ import main
+from pycodetags.memory_profiling import MemoryProfiler
+from pycodetags.profiling import span
+
+
+def test_allocations_are_credited_to_their_stage():
+    profiler = MemoryProfiler(record_spans=False, snapshot_budget=float("inf"))
+    with profiler.activate():
+        with span("walk"):
+            small = ["w" * 10 for _ in range(10)]
+        with span("convert"):
+            kept = [str(i) * 20 for i in range(20_000)]
+        with span("render"):
+            with span("parse_file", file="a.py"):
+                pass
+            with span("parse_file", file="b.py"):
+                pass
+
+    assert not tracemalloc.is_tracing()
+    assert profiler.events == []
+    stages = {stage.name: stage for stage in profiler.stage_memory()}
+    assert list(stages) == ["setup", "walk", "parse", "convert", "render"]
+    assert stages["convert"].net_bytes > 20 * 20_000 > stages["walk"].net_bytes
+    assert stages["convert"].peak_bytes >= stages["convert"].net_bytes
+    # Back in render after each nested parse.
+    assert stages["parse"].runs == 2
+    assert stages["render"].runs == 3
+    convert_site = stages["convert"].top_sites(1)[0][0]
+    assert convert_site.endswith("test_memory_profiling.py:15")
+    assert len(small) == 10 and len(kept) == 20_000
+
+
+def test_cli_memory_profile(tmp_path, capsys):
+    for i in range(5):
+        (tmp_path / f"mod_{i}.py").write_text(f"# TODO: remember {i} <owner:me>\n", encoding="utf-8")
+    summary_path = tmp_path / "memory.json"
+
+    exit_code = main(
+        ["data", "--src", str(tmp_path), "--format", "json", "--jobs", "1", "--memory-profile"]
+        + ["--memory-profile-out", str(summary_path), "--memory-top", "3"]
+    )
+
+    err = capsys.readouterr().err
+    summary = json.loads(summary_path.read_text(encoding="utf-8"))
+    assert exit_code == 0
+    assert "--- pycodetags memory profile:" in err
+    assert "still allocated at the end:" in err
+    assert {"walk", "convert", "dedup", "render"} <= set(summary["stages"])
+    assert summary["peak_bytes"] >= max(stage["peak_bytes"] for stage in summary["stages"].values())
+    assert all(len(stage["top_sites"]) <= 3 for stage in summary["stages"].values())
+    assert not tracemalloc.is_tracing()
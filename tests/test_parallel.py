@@ -0,0 +1,88 @@
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from pycodetags import PureDataSchema
+from pycodetags.__main__ import main
+from pycodetags.aggregate import aggregate_all_kinds_multiple_input
+from pycodetags.parallel import WorkerPool, iter_parse_python_files, parse_python_files, resolve_jobs
+
+
+def make_tree(tmp_path: Path, count: int = 20) -> list[str]:
+    files = []
+    for i in range(count):
+        file = tmp_path / f"mod_{i:03}.py"
+        file.write_text(
+            textwrap.dedent(f"""
+                # TODO: task {i} <priority:{i % 3}>
+                def func_{i}():
+                    # FIXME: second {i} <owner:me>
+                    pass
+                """),
+            encoding="utf-8",
+        )
+        files.append(str(file))
+    return files
+
+
+def test_resolve_jobs():
+    assert resolve_jobs(None) == 1
+    assert resolve_jobs(1) == 1
+    assert resolve_jobs(3) == 3
+    assert resolve_jobs(0) >= 1
+
+
+@pytest.mark.parametrize("backend", ["process", "thread"])
+def test_parallel_matches_serial_in_order(tmp_path, backend):
+    files = make_tree(tmp_path)
+    serial = parse_python_files(files, [PureDataSchema], include_folk_tags=False, jobs=1)
+    parallel = parse_python_files(files, [PureDataSchema], include_folk_tags=False, jobs=3, backend=backend)
+
+    assert parallel == serial
+    assert [tags[0]["comment"] for tags in parallel] == [f"task {i}" for i in range(len(files))]
+
+
+def test_unknown_backend_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        parse_python_files([], [PureDataSchema], include_folk_tags=False, jobs=2, backend="gpu")
+
+
+def test_aggregate_with_jobs_matches_serial(tmp_path):
+    make_tree(tmp_path)
+    serial = aggregate_all_kinds_multiple_input([], [str(tmp_path)], PureDataSchema, jobs=1)
+    parallel = aggregate_all_kinds_multiple_input([], [str(tmp_path)], PureDataSchema, jobs=4)
+
+    assert [(t.file_path, t.offsets, t.comment) for t in parallel] == [
+        (t.file_path, t.offsets, t.comment) for t in serial
+    ]
+
+
+def test_cli_jobs_switch(tmp_path, capsys):
+    make_tree(tmp_path, count=8)
+
+    exit_code = main(["data", "--src", str(tmp_path), "--format", "summary", "--jobs", "2"])
+
+    captured = capsys.readouterr()
+    assert exit_code == 0
+    assert "TODO: 8" in captured.out
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_batched_iteration_matches_parse(tmp_path, jobs):
+    files = make_tree(tmp_path, count=10)
+    expected = parse_python_files(files, [PureDataSchema], include_folk_tags=False, jobs=1)
+    batched = iter_parse_python_files(
+        files, [PureDataSchema], include_folk_tags=False, jobs=jobs, backend="thread", batch_size=3
+    )
+    assert next(batched) == (files[0], expected[0])
+    assert [tags for _file, tags in batched] == expected[1:]
+
+
+def test_a_pool_cannot_be_combined_with_jobs(tmp_path):
+    files = make_tree(tmp_path, count=2)
+    with WorkerPool(2, "thread") as pool:
+        with pytest.raises(ValueError, match="either a pool or jobs"):
+            list(iter_parse_python_files(files, [PureDataSchema], include_folk_tags=False, jobs=4, pool=pool))
+        parsed = list(iter_parse_python_files(files, [PureDataSchema], include_folk_tags=False, pool=pool))
+    assert [file for file, _tags in parsed] == files
@@ -0,0 +1,38 @@
+import datetime
+
+from pycodetags import PureDataSchema
+from pycodetags.parse_cache import ParseCache, dump_tags, load_tags, parse_key
+
+
+def test_round_trip_marshal_and_pickle():
+    plain = [{"code_tag": "TODO", "comment": "x", "offsets": (0, 0, 0, 5), "fields": {"data_fields": {}}}]
+    exotic = [{"code_tag": "TODO", "fields": {"data_fields": {"due": datetime.date(2030, 1, 1)}}}]
+
+    assert dump_tags(plain)[:1] == b"M" and load_tags(dump_tags(plain)) == plain
+    assert dump_tags(exotic)[:1] == b"P" and load_tags(dump_tags(exotic)) == exotic
+
+
+def test_save_load_and_expire(tmp_path):
+    key = parse_key([PureDataSchema], False)
+    cache = ParseCache(tmp_path / "parse" / f"{key}.pack", key)
+    cache.put("new", [])
+    cache.put("old", [{"comment": "x"}])
+    cache.entries["old"] = (cache.entries["old"][0] - 365, cache.entries["old"][1])
+    cache.save()
+
+    reloaded = ParseCache.load(cache.path, key)
+    assert reloaded.get("new") == [] and reloaded.get("old") is None
+    assert (reloaded.hits, reloaded.misses) == (1, 1)
+    assert (tmp_path / ".gitignore").read_text(encoding="utf-8") == "*\n"
+
+
+def test_key_depends_on_schemas_and_folk():
+    assert parse_key([PureDataSchema], False) != parse_key([PureDataSchema], True)
+    assert parse_key([PureDataSchema], False) != parse_key([{**PureDataSchema, "name": "other"}], False)  # type: ignore
+
+
+def test_other_key_is_ignored(tmp_path):
+    cache = ParseCache(tmp_path / "a.pack", "one")
+    cache.put("digest", [])
+    cache.save()
+    assert ParseCache.load(tmp_path / "a.pack", "two").entries == {}
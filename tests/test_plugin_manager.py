@@ -1,7 +1,128 @@
+import os
+import sys
+import textwrap
+
+import pytest
+
 import pycodetags.plugin_manager as pm
+from pycodetags.plugin_manager import LazyPlugin
 
 
 def test_basics():
     # Not really good candidates for unit tests.
     assert pm.get_plugin_manager()
     pm.reset_plugin_manager()
+
+
+PLUGIN_SOURCE = textwrap.dedent("""
+    import pluggy
+
+    hookimpl = pluggy.HookimplMarker("pycodetags")
+
+
+    @hookimpl
+    def print_report_style_name():
+        return ["fake"]
+
+
+    @hookimpl(tryfirst=True)
+    def print_report(format_name, found_data):
+        return format_name == "fake" and len(found_data) == 2
+    """)
+
+WRAPPER_SOURCE = textwrap.dedent("""
+    import pluggy
+
+    hookimpl = pluggy.HookimplMarker("pycodetags")
+
+
+    @hookimpl(wrapper=True)
+    def print_report_style_name():
+        names = yield
+        return names + ["wrapped"]
+    """)
+
+
+@pytest.fixture
+def fake_site(tmp_path, monkeypatch):
+    site = tmp_path / "site"
+    site.mkdir()
+    for module, source in (("fake_report_plugin", PLUGIN_SOURCE), ("fake_wrapper_plugin", WRAPPER_SOURCE)):
+        (site / f"{module}.py").write_text(source, encoding="utf-8")
+        dist_info = site / f"{module}-1.0.dist-info"
+        dist_info.mkdir()
+        (dist_info / "METADATA").write_text(f"Metadata-Version: 2.1\nName: {module}\nVersion: 1.0\n", encoding="utf-8")
+        (dist_info / "entry_points.txt").write_text(f"[pycodetags]\n{module} = {module}\n", encoding="utf-8")
+    monkeypatch.syspath_prepend(str(site))
+    monkeypatch.setenv("PYCODETAGS_PLUGIN_CACHE", str(tmp_path / "cache"))
+    yield site
+    monkeypatch.undo()
+    for module in ("fake_report_plugin", "fake_wrapper_plugin"):
+        sys.modules.pop(module, None)
+    pm.reset_plugin_manager()
+
+
+def test_cached_plugins_load_on_first_hook_call(fake_site, tmp_path):
+    pm.reset_plugin_manager()
+    assert (tmp_path / "cache" / "plugins.json").is_file()
+    assert "fake_report_plugin" in sys.modules
+    del sys.modules["fake_report_plugin"]
+
+    pm.reset_plugin_manager()
+    manager = pm.get_plugin_manager()
+    lazy = manager.get_plugin("fake_report_plugin")
+
+    assert isinstance(lazy, LazyPlugin)
+    assert pm.PLUGIN_COUNT == 2
+    assert "fake_report_plugin" not in sys.modules
+    assert manager.hook.print_report(format_name="fake", found_data=[1, 2], output_path=None, config=None)[0] is True
+    assert lazy.loaded and "fake_report_plugin" in sys.modules
+
+
+def test_wrapper_plugins_are_loaded_up_front(fake_site):
+    pm.reset_plugin_manager()
+    pm.reset_plugin_manager()
+    manager = pm.get_plugin_manager()
+
+    assert not isinstance(manager.get_plugin("fake_wrapper_plugin"), LazyPlugin)
+    assert manager.hook.print_report_style_name() == [["fake"], "wrapped"]
+
+
+def test_installing_a_plugin_invalidates_the_cache(fake_site):
+    pm.reset_plugin_manager()
+    (fake_site / "extra_plugin.py").write_text(PLUGIN_SOURCE, encoding="utf-8")
+    (fake_site / "extra_plugin-1.0.dist-info").mkdir()
+    (fake_site / "extra_plugin-1.0.dist-info" / "METADATA").write_text(
+        "Metadata-Version: 2.1\nName: extra_plugin\nVersion: 1.0\n", encoding="utf-8"
+    )
+    (fake_site / "extra_plugin-1.0.dist-info" / "entry_points.txt").write_text(
+        "[pycodetags]\nextra_plugin = extra_plugin\n", encoding="utf-8"
+    )
+    pm.reset_plugin_manager()
+
+    assert pm.get_plugin_manager().get_plugin("extra_plugin") is not None
+    sys.modules.pop("extra_plugin", None)
+
+
+def test_cache_can_be_turned_off(fake_site, monkeypatch):
+    monkeypatch.setenv("PYCODETAGS_PLUGIN_CACHE", "off")
+    pm.reset_plugin_manager()
+    pm.reset_plugin_manager()
+
+    assert pm.plugin_cache_path() is None
+    assert not isinstance(pm.get_plugin_manager().get_plugin("fake_report_plugin"), LazyPlugin)
+
+
+def test_editing_a_plugin_invalidates_the_cache(fake_site):
+    pm.reset_plugin_manager()
+    plugin_file = fake_site / "fake_report_plugin.py"
+    st = plugin_file.stat()
+    plugin_file.write_text(
+        PLUGIN_SOURCE + "\n\n@hookimpl\ndef validate(item, config):\n    return ['edited']\n", encoding="utf-8"
+    )
+    # An editable install: the file changes in place, so no sys.path entry is touched.
+    os.utime(plugin_file, ns=(st.st_atime_ns, st.st_mtime_ns + 5_000_000_000))
+    del sys.modules["fake_report_plugin"]
+    pm.reset_plugin_manager()
+
+    assert pm.get_plugin_manager().hook.validate(item={}, config=None) == [["edited"]]
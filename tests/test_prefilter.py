@@ -0,0 +1,96 @@
+from pathlib import Path
+
+import pytest
+
+from pycodetags import PureDataSchema
+from pycodetags import parallel, prefilter
+from pycodetags.data_tags import iterate_comments
+from pycodetags.parallel import parse_python_files
+from pycodetags.parse_cache import ParseCache, parse_key
+from pycodetags.prefilter import Prefilter, prefilter_for, read_candidate
+from pycodetags.scan_index import ScanIndex, read_source
+
+TDG_SCHEMA = {**PureDataSchema, "name": "TDG", "matching_tags": ["TODO", "FIXME"]}
+FOLK_SCHEMA = {**PureDataSchema, "name": "folkish", "matching_tags": ["TODO", "HACK"]}
+
+REPO = Path(__file__).parent.parent
+
+
+def test_folk_tags_only_count_when_folk_is_on():
+    source = b"x = 1  # HACK around the bug\n"
+    assert not prefilter_for([FOLK_SCHEMA], include_folk_tags=False).may_contain_tags(source)
+    assert prefilter_for([FOLK_SCHEMA], include_folk_tags=True).may_contain_tags(source)
+
+
+def test_tdg_tags_count_without_folk():
+    source = b"# TODO: write the docs\n# category=docs\n"
+    assert not prefilter_for([PureDataSchema], include_folk_tags=False).may_contain_tags(source)
+    assert prefilter_for([PureDataSchema, TDG_SCHEMA], include_folk_tags=False).may_contain_tags(source)
+
+
+def test_folk_tag_after_bracketless_anchor():
+    source = b"# NOTE: nothing here\nx = 1\n# TODO fix this\n"
+    assert Prefilter(["TODO"], folk=True).may_contain_tags(source)
+    assert not Prefilter().may_contain_tags(source)
+
+
+def test_multiline_pep350_tag():
+    assert Prefilter().may_contain_tags(b"# TODO: a long\n# comment <\n#   due:2026-01-01>\n")
+
+
+@pytest.mark.parametrize(
+    "schemas,folk",
+    [([PureDataSchema], False), ([PureDataSchema, TDG_SCHEMA], False), ([PureDataSchema, FOLK_SCHEMA], True)],
+)
+def test_never_rejects_a_file_with_tags(schemas, folk):
+    checked = 0
+    for file in sorted((REPO / "pycodetags").rglob("*.py")) + sorted((REPO / "tests").rglob("*.py")):
+        _, source = read_source(file)
+        if list(iterate_comments(source, file, schemas, folk)):
+            checked += 1
+            assert prefilter_for(schemas, folk).file_may_contain_tags(file), file
+    assert checked > 5
+
+
+def test_mmap_path_matches_read(tmp_path, monkeypatch):
+    monkeypatch.setattr(prefilter, "MMAP_THRESHOLD", 16)
+    tagged = tmp_path / "tagged.py"
+    tagged.write_text("x = 1\n" * 20 + "# TODO: fix <due:2026-01-01>\n", encoding="utf-8")
+    plain = tmp_path / "plain.py"
+    plain.write_text("x = 1\n" * 20, encoding="utf-8")
+
+    fingerprint, data = read_candidate(tagged, Prefilter())
+    assert (fingerprint, data.decode("utf-8")) == read_source(tagged)
+    fingerprint, data = read_candidate(plain, Prefilter())
+    assert data is None
+    assert fingerprint == read_source(plain)[0]
+
+
+def test_skipped_files_are_indexed_and_not_decoded(tmp_path, monkeypatch):
+    tagless = tmp_path / "tagless.py"
+    tagless.write_text(f"# {tmp_path.name}: just a comment\nx = 1\n", encoding="utf-8")
+    tagged = tmp_path / "tagged.py"
+    tagged.write_text("# DATA: hello <due:2026-01-01>\n", encoding="utf-8")
+
+    parsed_sources = []
+    real_iterate = parallel.iterate_comments
+
+    def spy(source, *args):
+        parsed_sources.append(str(args[0]))
+        return real_iterate(source, *args)
+
+    monkeypatch.setattr(parallel, "iterate_comments", spy)
+    key = parse_key([PureDataSchema], False)
+    index = ScanIndex(tmp_path / "index.bin", ParseCache(tmp_path / f"{key}.pack", key))
+    results = parse_python_files([str(tagless), str(tagged)], [PureDataSchema], False, index=index)
+
+    assert results[0] == []
+    assert len(results[1]) == 1
+    assert parsed_sources == [str(tagged)]
+    assert index.lookup(str(tagless)) == []
+
+
+def test_prefilter_off_parses_everything(tmp_path):
+    file = tmp_path / "a.py"
+    file.write_text("x = 1\n", encoding="utf-8")
+    assert parse_python_files([str(file)], [PureDataSchema], False, prefilter=False) == [[]]
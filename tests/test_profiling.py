@@ -0,0 +1,89 @@
+import json
+import textwrap
+import threading
+from pathlib import Path
+
+import pytest
+
+from pycodetags import PureDataSchema, profiling
+from pycodetags.__main__ import main
+from pycodetags.parallel import parse_python_files
+from pycodetags.profiling import Profiler, span
+
+
+def make_tree(tmp_path: Path, count: int = 16) -> list[str]:
+    files = []
+    for i in range(count):
+        file = tmp_path / f"mod_{i:03}.py"
+        file.write_text(
+            textwrap.dedent(f"""
+                # TODO: task {i} <priority:{i % 3}>
+                def func_{i}():
+                    # FIXME: second {i} <owner:me>
+                    pass
+                """),
+            encoding="utf-8",
+        )
+        files.append(str(file))
+    return files
+
+
+def test_spans_do_nothing_while_inactive():
+    assert profiling.active_profiler() is None
+    assert span("read") is span("parse_file", file="a.py")
+
+
+def test_nested_spans_split_self_time():
+    profiler = Profiler()
+    with profiler.activate():
+        with span("parse_file", file="a.py"):
+            with span("read"):
+                pass
+            with span("read"):
+                pass
+        worker = threading.Thread(target=lambda: span("read").__enter__().__exit__(None, None, None))
+        worker.start()
+        worker.join()
+
+    totals = {stage.name: stage for stage in profiler.stage_totals()}
+    assert profiling.active_profiler() is None
+    assert totals["read"].calls == 3
+    assert totals["parse_file"].self_ns == totals["parse_file"].total_ns - sum(
+        event.duration_ns for event in profiler.events[:2]
+    )
+    assert profiler.slowest_files(1) == [("a.py", totals["parse_file"].total_ns)]
+
+
+@pytest.mark.parametrize("backend", ["process", "thread"])
+def test_worker_spans_come_back(tmp_path, backend):
+    files = make_tree(tmp_path)
+    profiler = Profiler()
+    with profiler.activate():
+        parse_python_files(files, [PureDataSchema], include_folk_tags=False, jobs=2, backend=backend)
+
+    totals = {stage.name: stage.calls for stage in profiler.stage_totals()}
+    assert totals["parse_file"] == totals["read"] == totals["find_comment_blocks"] == len(files)
+    assert {file for file, _duration in profiler.slowest_files(100)} == set(files)
+
+
+def test_cli_profile_and_trace(tmp_path, capsys):
+    # tmp_path is in no project, so there is no scan index and every file is parsed.
+    files = make_tree(tmp_path, count=3)
+    trace = tmp_path / "trace.json"
+
+    exit_code = main(
+        ["data", "--src", str(tmp_path), "--format", "json", "--profile", "--profile-files", "2"]
+        + ["--trace-out", str(trace)]
+    )
+
+    err = capsys.readouterr().err
+    events = json.loads(trace.read_text(encoding="utf-8"))["traceEvents"]
+    spans = [event for event in events if event["ph"] == "X"]
+    assert exit_code == 0
+    assert "--- pycodetags profile" in err
+    for stage in ("cli setup", "walk", "parse_file", "find_comment_blocks", "convert", "dedup", "render"):
+        assert f"\n{stage} " in err
+    assert "slowest files:" in err
+    assert sum(file in err for file in files) == 2
+    assert {"cli setup", "read", "parse_fields", "render"} <= {event["name"] for event in spans}
+    assert min(event["ts"] for event in spans) >= 0
@@ -3,7 +3,12 @@ from pathlib import Path
 
 import pytest
 
-from pycodetags.python.comment_finder import extract_comment_text, find_comment_blocks_from_string
+from pycodetags.python.comment_finder import (
+    extract_comment_text,
+    find_comment_blocks_from_string,
+    find_comment_blocks_from_string_ast,
+    find_comment_blocks_from_string_tokenize,
+)
 
 
 def _write_temp_file(tmp_path: Path, content: str) -> Path:
@@ -98,3 +103,31 @@ def some_function():
 """
     blocks = list(find_comment_blocks_from_string(content))
     assert len(blocks) == 2
+
+
+def test_repeated_comment_text_gets_its_own_position():
+    content = """\
+x = 1  # same
+y = 2
+
+z = 3  # same
+"""
+    assert find_comment_blocks_from_string_tokenize(content) == [(0, 7, 0, 13, "# same"), (3, 7, 3, 13, "# same")]
+
+
+def test_engines_agree_on_unambiguous_source():
+    content = """\
+# TODO: Finish this module <priority:high assignee:dev_a>
+# A regular comment
+def some_function():
+    x = "# not a comment"  # inline
+    # BUG: This might cause an error <status:open>
+    #   continued
+    pass
+"""
+    assert find_comment_blocks_from_string_tokenize(content) == find_comment_blocks_from_string_ast(content)
+
+
+def test_unknown_engine_rejected():
+    with pytest.raises(ValueError):
+        find_comment_blocks_from_string("# a\n", engine="regex")
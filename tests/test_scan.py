@@ -0,0 +1,64 @@
+from pathlib import Path
+
+import pycodetags
+import pycodetags.parallel as parallel
+from pycodetags import PureDataSchema
+from pycodetags.aggregate import aggregate_all_kinds_multiple_input
+
+
+def make_tree(tmp_path: Path, count: int = 12) -> Path:
+    for i in range(count):
+        (tmp_path / f"mod_{i:02}.py").write_text(
+            f"# TODO: task {i} <priority:{i % 3}>\n# BUG: bug {i} <owner:me>\nx = 1\n# HACK: plain folk tag {i}\n",
+            encoding="utf-8",
+        )
+    return tmp_path
+
+
+def test_scan_matches_aggregation(tmp_path):
+    src = make_tree(tmp_path)
+    paths = [str(src), str(src / "mod_03.py")]
+
+    scanned = list(pycodetags.scan(paths, use_index=False, batch_size=5))
+    expected = aggregate_all_kinds_multiple_input([], paths, PureDataSchema, use_index=False)
+
+    assert len(scanned) == 24
+    assert scanned == list(expected)
+
+
+def test_scan_parses_one_batch_per_step(tmp_path, monkeypatch):
+    src = make_tree(tmp_path)
+    parsed = []
+    real_parse_one = parallel._parse_one
+
+    def counting_parse_one(task):
+        parsed.append(task[0])
+        return real_parse_one(task)
+
+    monkeypatch.setattr(parallel, "_parse_one", counting_parse_one)
+    tags = pycodetags.scan(src, jobs=1, use_index=False, batch_size=4)
+
+    assert parsed == []
+    first = next(tags)
+    assert first.file_path == str(src / "mod_00.py")
+    assert len(parsed) == 4
+    assert len(list(tags)) == 23
+    assert len(parsed) == 12
+
+
+def test_scan_options(tmp_path):
+    src = make_tree(tmp_path, count=6)
+    default = list(pycodetags.scan(src, use_index=False))
+    with_hack = {**PureDataSchema, "name": "HACKS", "matching_tags": ["TODO", "BUG", "HACK"]}
+    no_folk = list(pycodetags.scan(src, schemas=[with_hack], use_index=False, include_folk_tags=False))
+    folk = list(pycodetags.scan(src, schemas=[with_hack], use_index=False, include_folk_tags=True))
+    parallel_unfiltered = list(pycodetags.scan(src, use_index=False, jobs=2, prefilter=False))
+    with_owner = {**PureDataSchema, "name": "OWNED", "data_fields": {**PureDataSchema["data_fields"], "owner": "str"}}
+    owned = list(pycodetags.scan(src, schemas=[with_owner], use_index=False))
+
+    assert {tag.code_tag for tag in default} == {"TODO", "BUG"}
+    assert {tag.code_tag for tag in no_folk} == {"TODO", "BUG"}
+    assert {tag.code_tag for tag in folk} == {"TODO", "BUG", "HACK"}
+    assert parallel_unfiltered == default
+    assert [tag.custom_fields for tag in default if tag.code_tag == "BUG"][0] == {"owner": "me"}
+    assert [tag.data_fields for tag in owned if tag.code_tag == "BUG"][0] == {"owner": "me"}
@@ -0,0 +1,161 @@
+import os
+from pathlib import Path
+
+from pycodetags import PureDataSchema
+from pycodetags import parallel
+from pycodetags.__main__ import main
+from pycodetags.parallel import parse_python_files
+from pycodetags.parse_cache import ParseCache, parse_key
+from pycodetags.scan_index import ScanIndex, read_source
+
+
+def new_index(tmp_path: Path) -> ScanIndex:
+    key = parse_key([PureDataSchema], False)
+    return ScanIndex(tmp_path / "index.bin", ParseCache(tmp_path / f"{key}.pack", key))
+
+
+def write(path: Path, content: str) -> str:
+    path.write_text(content, encoding="utf-8")
+    return str(path)
+
+
+def age(file: str, seconds: int = 60) -> None:
+    """Move mtime into the past so the entry is outside the racy window."""
+    st = os.stat(file)
+    os.utime(file, ns=(st.st_atime_ns, st.st_mtime_ns - seconds * 1_000_000_000))
+
+
+def test_warm_scan_does_not_reparse(tmp_path, monkeypatch):
+    file = write(tmp_path / "a.py", "# TODO: first <a:b>\n")
+    age(file)
+    index = new_index(tmp_path)
+    cold = parse_python_files([file], [PureDataSchema], False, index=index)
+    index.save()
+
+    def boom(task):
+        raise AssertionError(f"re-parsed {task[0]}")
+
+    monkeypatch.setattr(parallel, "_parse_one", boom)
+    reloaded = ScanIndex.load(index.path, ParseCache.load(index.cache.path, index.cache.key))
+    warm = parse_python_files([file], [PureDataSchema], False, index=reloaded)
+
+    assert warm == cold
+    assert reloaded.hits == 1 and reloaded.misses == 0 and reloaded.content_hits == 0
+
+
+def test_edit_is_a_miss_and_touch_is_a_hit(tmp_path):
+    file = write(tmp_path / "a.py", "# TODO: first <a:b>\n")
+    index = new_index(tmp_path)
+    parse_python_files([file], [PureDataSchema], False, index=index)
+
+    os.utime(file, ns=(0, os.stat(file).st_mtime_ns + 5_000_000_000))
+    assert index.lookup(file) is not None
+
+    write(tmp_path / "a.py", "# TODO: second, longer <a:b>\n")
+    assert index.lookup(file) is None
+    [tags] = parse_python_files([file], [PureDataSchema], False, index=index)
+    assert tags[0]["comment"] == "second, longer"
+
+
+def test_lookup_reports_callers_path_spelling(tmp_path, monkeypatch):
+    file = write(tmp_path / "a.py", "# TODO: first <a:b>\n")
+    index = new_index(tmp_path)
+    index.store(file, read_source(file)[0], [{"file_path": "elsewhere/a.py", "comment": "first"}])  # type: ignore
+
+    monkeypatch.chdir(tmp_path)
+    assert index.lookup("a.py") == [{"file_path": "a.py", "comment": "first"}]
+
+
+def test_same_content_at_new_path_is_a_content_hit(tmp_path):
+    first = write(tmp_path / "a.py", "# TODO: shared <a:b>\n")
+    index = new_index(tmp_path)
+    [cold] = parse_python_files([first], [PureDataSchema], False, index=index)
+
+    copy = write(tmp_path / "b.py", "# TODO: shared <a:b>\n")
+    [warm] = parse_python_files([copy], [PureDataSchema], False, index=index)
+
+    assert index.content_hits == 1
+    assert [tag["file_path"] for tag in warm] == [copy]
+    assert [{**tag, "file_path": None} for tag in warm] == [{**tag, "file_path": None} for tag in cold]
+
+
+def test_prune_drops_deleted_and_unwalked_files(tmp_path):
+    keep = write(tmp_path / "keep.py", "# TODO: keep <a:b>\n")
+    gone = write(tmp_path / "gone.py", "# TODO: gone <a:b>\n")
+    index = new_index(tmp_path)
+    parse_python_files([keep, gone], [PureDataSchema], False, index=index)
+
+    assert index.prune(under=str(tmp_path), keep=[keep]) == 1
+    os.remove(keep)
+    assert index.prune() == 1
+    assert not index.entries
+
+
+def test_corrupt_files_start_fresh(tmp_path):
+    path = tmp_path / "broken.bin"
+    path.write_bytes(b"not marshal data")
+    assert ParseCache.load(path, "key").entries == {}
+    assert ScanIndex.load(path, ParseCache(None, "key")).entries == {}
+
+
+def test_cli_index_command(tmp_path, capsys):
+    write(tmp_path / "pyproject.toml", "")
+    write(tmp_path / "a.py", "# TODO: first <a:b>\n")
+
+    assert main(["index", str(tmp_path)]) == 0
+    assert main(["index", str(tmp_path)]) == 0
+
+    out = capsys.readouterr().out.splitlines()
+    assert out[0].startswith("Indexed 1 file(s): 0 unchanged, 1 parsed")
+    assert out[1].startswith("Indexed 1 file(s): 1 unchanged, 0 parsed")
+    assert (tmp_path / ".pycodetags_cache" / "index" / "paths.bin").is_file()
+
+
+def test_cli_index_rejects_missing_paths(tmp_path, capsys, monkeypatch):
+    write(tmp_path / "pyproject.toml", "")
+    write(tmp_path / "a.py", "# TODO: first <a:b>\n")
+    monkeypatch.chdir(tmp_path)
+
+    assert main(["index", "status"]) == 1
+    assert main(["index", str(tmp_path), str(tmp_path / "typo")]) == 1
+
+    out = capsys.readouterr().out
+    assert "No such file or folder: status" in out
+    assert f"No such file or folder: {tmp_path / 'typo'}" in out
+    assert "Indexed" not in out
+    assert not (tmp_path / ".pycodetags_cache").exists()
+
+
+def test_index_belongs_to_the_scanned_project(tmp_path, monkeypatch):
+    project = tmp_path / "project"
+    project.mkdir()
+    write(project / "pyproject.toml", "")
+    outside = tmp_path / "outside"
+    outside.mkdir()
+    write(outside / "a.py", "# TODO: first <a:b>\n")
+    monkeypatch.chdir(project)
+
+    assert ScanIndex.open([PureDataSchema], False, sources=[str(outside)]) is None
+    assert ScanIndex.open([PureDataSchema], False, sources=[str(project), str(outside)]) is None
+    index = ScanIndex.open([PureDataSchema], False, sources=[str(project)])
+    assert index is not None and index.path == project / ".pycodetags_cache" / "index" / "paths.bin"
+
+    assert main(["index", str(outside)]) == 1
+    assert main(["data", "--src", str(outside), "--format", "jsonl"]) == 0
+    assert not (project / ".pycodetags_cache").exists()
+
+
+def test_identical_files_are_parsed_once(tmp_path, monkeypatch):
+    files = [write(tmp_path / f"{name}.py", "# TODO: same <a:b>\n") for name in ("a", "b", "c")]
+    calls = []
+    original = parallel._parse_one
+
+    def counting(task):
+        calls.append(task[0])
+        return original(task)
+
+    monkeypatch.setattr(parallel, "_parse_one", counting)
+    results = parse_python_files(files, [PureDataSchema], False, index=new_index(tmp_path))
+
+    assert calls == [files[0]]
+    assert [tags[0]["file_path"] for tags in results] == files
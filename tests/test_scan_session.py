@@ -0,0 +1,149 @@
+import os
+import textwrap
+from pathlib import Path
+
+import pytest
+
+import pycodetags.scan_session as scan_session_module
+from pycodetags import PureDataSchema, parallel
+from pycodetags.__main__ import source_and_modules_searcher
+from pycodetags.aggregate import aggregate_all_kinds_multiple_input
+from pycodetags.app_config import CodeTagsConfig
+from pycodetags.exceptions import ModuleImportError
+from pycodetags.scan_session import ScanSession
+
+OTHER_SCHEMA = {
+    **PureDataSchema,
+    "name": "OTHER",
+    "matching_tags": ["TODO", "FIXME"],
+    "data_fields": {**PureDataSchema["data_fields"], "priority": "str", "owner": "str"},
+}
+
+
+def make_tree(tmp_path: Path, count: int = 5) -> str:
+    for i in range(count):
+        (tmp_path / f"mod_{i}.py").write_text(
+            textwrap.dedent(f"""
+                # TODO: task {i} <priority:{i % 3}>
+                def func_{i}():
+                    # FIXME: second {i} <owner:me>
+                    pass
+                """),
+            encoding="utf-8",
+        )
+    return str(tmp_path)
+
+
+def as_dicts(found):
+    return [(tag.code_tag, tag.comment, tag.file_path, tag.offsets, tag.to_flat_dict()) for tag in found]
+
+
+@pytest.mark.parametrize("schema", [PureDataSchema, OTHER_SCHEMA])
+def test_tags_match_a_full_aggregation(tmp_path, schema):
+    src = make_tree(tmp_path)
+    session = ScanSession([], [src], jobs=1)
+    expected = aggregate_all_kinds_multiple_input([""], [src], schema, jobs=1, use_index=False)
+    assert as_dicts(session.tags(schema)) == as_dicts(expected)
+
+
+def test_each_file_is_read_once_across_schemas(tmp_path, monkeypatch):
+    src = make_tree(tmp_path)
+    scans = []
+    real_scan = scan_session_module.scan_python_files
+
+    def counting_scan(files, **kwargs):
+        scans.append(list(files))
+        return real_scan(files, **kwargs)
+
+    monkeypatch.setattr(scan_session_module, "scan_python_files", counting_scan)
+    session = ScanSession([], [src], jobs=1)
+    first = session.tags(PureDataSchema)
+    again = session.tags(PureDataSchema)
+    other = session.tags(OTHER_SCHEMA)
+
+    assert len(scans) == 1
+    assert session.files_read == 5
+    assert again == first and again is not first
+    assert len(other) == len(first) == 10
+    assert other[0].data_fields != first[0].data_fields
+
+
+def test_callers_do_not_share_materialized_objects(tmp_path):
+    session = ScanSession([], [make_tree(tmp_path)], jobs=1)
+    session.tags(PureDataSchema)[0].comment = "edited"
+    assert session.tags(PureDataSchema)[0].comment != "edited"
+
+
+def test_modules_follow_sources(tmp_path):
+    src = make_tree(tmp_path, count=1)
+    session = ScanSession(["tests.demo.demo"], [src], jobs=1)
+    found = session.tags(PureDataSchema)
+    from_modules = aggregate_all_kinds_multiple_input(["tests.demo.demo"], [], PureDataSchema, jobs=1)
+
+    assert len(from_modules) > 0
+    assert list(found)[-len(from_modules) :] == list(from_modules)
+    assert [tag.file_path for tag in found[:2]] == [str(Path(src) / "mod_0.py")] * 2
+
+
+def test_missing_module_raises():
+    with pytest.raises(ModuleImportError):
+        ScanSession(["no_such_module_anywhere"], []).tags()
+
+
+def test_searcher_filters_session_results(tmp_path):
+    session = ScanSession([], [make_tree(tmp_path)], jobs=1)
+    found = source_and_modules_searcher("any", [], [], PureDataSchema, "code_tag == 'FIXME'", session=session)
+    assert [tag.code_tag for tag in found] == ["FIXME"] * 5
+
+
+def test_second_run_reads_nothing(tmp_path, monkeypatch):
+    (tmp_path / "pyproject.toml").write_text("", encoding="utf-8")
+    (tmp_path / "src").mkdir()
+    src = make_tree(tmp_path / "src")
+    for file in Path(src).glob("*.py"):
+        st = file.stat()
+        os.utime(file, ns=(st.st_atime_ns, st.st_mtime_ns - 60_000_000_000))
+    cold = ScanSession([], [src], jobs=1, use_index=True)
+    expected = as_dicts(cold.tags(PureDataSchema))
+    assert cold.files_read == 5
+
+    def boom(task):
+        raise AssertionError(f"re-read {task[0]}")
+
+    monkeypatch.setattr(parallel, "_scan_one", boom)
+    warm = ScanSession([], [src], jobs=1, use_index=True)
+    assert as_dicts(warm.tags(PureDataSchema)) == expected
+    assert as_dicts(warm.tags(OTHER_SCHEMA)) == as_dicts(cold.tags(OTHER_SCHEMA))
+    assert warm.files_read == 0
+
+    monkeypatch.undo()
+    (Path(src) / "mod_0.py").write_text("# TODO: edited <priority:2>\n", encoding="utf-8")
+    edited = ScanSession([], [src], jobs=1, use_index=True)
+    assert [tag.comment for tag in edited.tags(PureDataSchema)][:1] == ["edited"]
+    assert edited.files_read == 1
+
+
+def test_schemas_outside_the_active_ones_get_their_files_read(tmp_path, monkeypatch):
+    # No folk tags active, so the session prefilters.
+    monkeypatch.setattr(CodeTagsConfig, "_instance", CodeTagsConfig(str(tmp_path / "missing.toml")))
+    (tmp_path / "tdg_only.py").write_text("# TODO: write the thing\n# category=core\nx = 1\n", encoding="utf-8")
+    (tmp_path / "hack_only.py").write_text("# HACK: work around it\n# category=core\nx = 1\n", encoding="utf-8")
+    src = str(tmp_path)
+    tdg = {**PureDataSchema, "name": "TDG", "matching_tags": ["TODO"]}
+    other_tdg = {**tdg, "matching_tags": ["HACK"]}
+    session = ScanSession([], [src], jobs=1, use_index=False)
+
+    def tags_of(found):
+        return sorted((tag.code_tag, tag.comment) for tag in found)
+
+    def aggregated(schema):
+        return tags_of(aggregate_all_kinds_multiple_input([""], [src], schema, jobs=1, use_index=False))
+
+    found = tags_of(session.tags(tdg))
+    assert found == aggregated(tdg)
+    assert ("TODO", "write the thing") in found
+    # A later TDG schema with other tags: the files the first prefilter skipped are read after all.
+    found = tags_of(session.tags(other_tdg))
+    assert found == aggregated(other_tdg)
+    assert ("HACK", "work around it") in found
+    assert session.files_read == 4
@@ -0,0 +1,105 @@
+import json
+import os
+import shutil
+from pathlib import Path
+
+import pycodetags
+from pycodetags import PureDataSchema
+from pycodetags.__main__ import main
+from pycodetags.aggregate import aggregate_all_kinds_multiple_input
+from pycodetags.scan_stats import ScanStats
+
+
+def make_tree(tmp_path: Path, tagged: int = 2) -> Path:
+    src = tmp_path / "src"
+    src.mkdir()
+    for i in range(tagged):
+        (src / f"tagged_{i}.py").write_text(f"# TODO: task {i} <priority:1>\nx = 1\n", encoding="utf-8")
+    (src / "broken.py").write_text('# TODO: lost <owner:me>\ndef f(:\n    """never closed\n', encoding="utf-8")
+    (src / "latin1.py").write_bytes("# TODO: caf\xe9 <owner:me>\n".encode("latin-1"))
+    (src / "plain.py").write_text("x = 1\n", encoding="utf-8")
+    (src / "ignored.py").write_text("# TODO: not walked <owner:me>\n", encoding="utf-8")
+    (src / ".gitignore").write_text("ignored.py\n", encoding="utf-8")
+    return src
+
+
+def test_stats_count_the_scan(tmp_path):
+    src = make_tree(tmp_path)
+    stats = ScanStats()
+
+    found = aggregate_all_kinds_multiple_input([], [str(src)], PureDataSchema, use_index=False, stats=stats)
+
+    assert stats.files_walked == 6
+    assert stats.files_skipped == 1
+    assert stats.files_prefiltered == 1
+    assert stats.files_parsed == 4
+    assert stats.cache_hits == 0
+    assert stats.parse_failures == {
+        str(src / "broken.py"): "TokenError",
+        str(src / "latin1.py"): "UnicodeDecodeError",
+    }
+    assert stats.tags == len(found) == 2
+    assert stats.tags_per_schema["PEP350"] == 2
+    assert {"walk", "parse", "convert", "dedup"} <= set(stats.stage_seconds)
+    summary = stats.as_dict()
+    assert summary["parse_failure_count"] == 2
+    assert json.loads(json.dumps(summary)) == summary
+    assert "parse failures: 2" in stats.report()
+
+
+def test_warm_scans_still_report_parse_failures(tmp_path):
+    (tmp_path / "pyproject.toml").write_text("[project]\nname = 'scanned'\n", encoding="utf-8")
+    src = make_tree(tmp_path)
+    shutil.copy(src / "broken.py", src / "broken_copy.py")
+    for file in src.iterdir():
+        # Old enough for the index to trust a matching stat.
+        os.utime(file, (1_000_000_000, 1_000_000_000))
+    expected = {
+        str(src / "broken.py"): "TokenError",
+        str(src / "broken_copy.py"): "TokenError",
+        str(src / "latin1.py"): "UnicodeDecodeError",
+    }
+    cold, warm = ScanStats(), ScanStats()
+
+    aggregate_all_kinds_multiple_input([], [str(src)], PureDataSchema, use_index=True, stats=cold)
+    aggregate_all_kinds_multiple_input([], [str(src)], PureDataSchema, use_index=True, stats=warm)
+
+    assert cold.parse_failures == expected
+    # The copy is answered by the parse of broken.py, not by the (still empty) index.
+    assert cold.cache_hits == 0
+    assert cold.files_same_content == 1
+    assert cold.files_parsed == 4
+    assert warm.files_parsed == 0
+    assert warm.cache_hits == 6
+    assert warm.files_same_content == 0
+    assert warm.parse_failures == expected
+    assert "parse failures: 3" in warm.report()
+
+
+def test_streaming_and_parallel_scans_count_the_same(tmp_path):
+    src = make_tree(tmp_path, tagged=10)
+    paths = [str(src), str(src / "tagged_0.py")]
+    listed, streamed, parallel = ScanStats(), ScanStats(), ScanStats()
+
+    aggregate_all_kinds_multiple_input([], paths, PureDataSchema, use_index=False, stats=listed)
+    list(pycodetags.scan(paths, use_index=False, batch_size=3, stats=streamed))
+    list(pycodetags.scan(paths, use_index=False, jobs=2, stats=parallel))
+
+    for stats in (listed, streamed, parallel):
+        stats.stage_seconds.clear()
+    assert streamed == listed == parallel
+    assert listed.tags_deduped == 1
+    assert len(listed.parse_failures) == 2
+
+
+def test_cli_stats(tmp_path, capsys):
+    src = make_tree(tmp_path)
+    stats_file = tmp_path / "stats.json"
+
+    code = main(["data", "--src", str(src), "--format", "jsonl", "--stats", "--stats-json", str(stats_file)])
+
+    assert code == 0
+    assert "--- pycodetags scan ---" in capsys.readouterr().err
+    written = json.loads(stats_file.read_text(encoding="utf-8"))
+    assert written["tags"] == 2
+    assert written["files_walked"] == 6
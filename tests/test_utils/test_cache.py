@@ -7,6 +7,7 @@ do not interfere with any real cache or the filesystem.
 """
 
 import gzip
+import os
 import pickle
 import time
 from pathlib import Path
@@ -14,7 +15,14 @@ from pathlib import Path
 import pytest
 
 # Assuming the code from the artifact is in a file named `memoizer.py`
-from pycodetags.utils import clear_cache, persistent_memoize
+from pycodetags.utils import cache_stats, clear_cache, persistent_memoize, stored_cache_stats
+from pycodetags.utils.cache_utils import (
+    SQLITE_FILENAME,
+    SWEEP_STAMP,
+    CacheStore,
+    DirectoryStore,
+    SQLiteStore,
+)
 
 # A global list to track call timestamps for testing purposes.
 # We reset this in each test function.
@@ -43,7 +51,7 @@ def test_basic_memoization_and_cache_hit(tmp_path: Path):
     call_log = []
 
     slow_function = slow_function_factory()
-    memoized_func = persistent_memoize(cache_dir_override=tmp_path)(slow_function)
+    memoized_func = persistent_memoize(cache_dir_override=tmp_path, backend="directory")(slow_function)
 
     # First call - should be slow and execute the function
     result1 = memoized_func(1, y="test")
@@ -59,7 +67,7 @@ def test_basic_memoization_and_cache_hit(tmp_path: Path):
     assert result1 == result2
 
     # Assert that a cache file was created
-    cache_files = list(f for f in tmp_path.iterdir() if f.name != ".gitignore")
+    cache_files = list(f for f in tmp_path.iterdir() if f.name not in (".gitignore", SWEEP_STAMP))
     assert len(cache_files) == 1
 
 
@@ -72,7 +80,7 @@ def test_different_arguments_create_different_caches(tmp_path: Path):
     call_log = []
 
     slow_function = slow_function_factory()
-    memoized_func = persistent_memoize(cache_dir_override=tmp_path)(slow_function)
+    memoized_func = persistent_memoize(cache_dir_override=tmp_path, backend="directory")(slow_function)
 
     # Call with first set of arguments
     result1 = memoized_func(1, y="one")
@@ -87,7 +95,7 @@ def test_different_arguments_create_different_caches(tmp_path: Path):
     assert result1["timestamp"] != result2["timestamp"]
 
     # There should be two separate cache files
-    cache_files = list(f for f in tmp_path.iterdir() if f.name != ".gitignore")
+    cache_files = list(f for f in tmp_path.iterdir() if f.name not in (".gitignore", SWEEP_STAMP))
     assert len(cache_files) == 2
 
 
@@ -123,19 +131,19 @@ def test_clear_cache_works(tmp_path: Path):
     Tests that the clear_cache function correctly removes cache files.
     """
     slow_function = slow_function_factory()
-    memoized_func = persistent_memoize(cache_dir_override=tmp_path)(slow_function)
+    memoized_func = persistent_memoize(cache_dir_override=tmp_path, backend="directory")(slow_function)
 
     # Create a couple of cache files
     memoized_func(1, "a")
     memoized_func(2, "b")
 
-    cache_files_before = list(f for f in tmp_path.iterdir() if f.name != ".gitignore")
+    cache_files_before = list(f for f in tmp_path.iterdir() if f.name not in (".gitignore", SWEEP_STAMP))
     assert len(cache_files_before) == 2
 
     # Clear the cache
     clear_cache(cache_dir_override=tmp_path)
 
-    cache_files_after = list(f for f in tmp_path.iterdir() if f.name != ".gitignore")
+    cache_files_after = list(f for f in tmp_path.iterdir() if f.name not in (".gitignore", SWEEP_STAMP))
     assert len(cache_files_after) == 0
 
     # Ensure .gitignore is NOT deleted
@@ -151,7 +159,7 @@ def test_gzip_compression_works(tmp_path: Path):
     call_log = []
 
     slow_function = slow_function_factory()
-    memoized_func = persistent_memoize(cache_dir_override=tmp_path, use_gzip=True)(slow_function)
+    memoized_func = persistent_memoize(cache_dir_override=tmp_path, use_gzip=True, backend="directory")(slow_function)
 
     # First call, creates the gzipped cache
     result1 = memoized_func(100, "gzip")
@@ -214,3 +222,179 @@ def test_no_pyproject_toml_raises_error(tmp_path, monkeypatch):
             pass
 
         some_function(1)
+
+
+def test_sqlite_backend_is_one_file(tmp_path: Path):
+    """The default backend keeps every entry in a single database file."""
+    global call_log
+    call_log = []
+
+    memoized_func = persistent_memoize(cache_dir_override=tmp_path)(slow_function_factory(0))
+    results = [memoized_func(i) for i in range(20)]
+    assert [memoized_func(i) for i in range(20)] == results
+    assert len(call_log) == 20
+
+    entries = {f.name for f in tmp_path.iterdir()} - {".gitignore"}
+    assert entries <= {SQLITE_FILENAME, f"{SQLITE_FILENAME}-wal", f"{SQLITE_FILENAME}-shm"}
+
+
+def test_sqlite_evicts_least_recently_used(tmp_path: Path):
+    store = SQLiteStore(tmp_path, ttl_seconds=3600, max_bytes=1000)
+    for key in "abcd":
+        store.put(key, b"x" * 200)
+    assert store.get("a") is not None  # a is now the most recently used
+    store.put("e", b"x" * 300)  # 1100 bytes, over budget: evict down to 900
+
+    assert store.get("b") is None
+    assert all(store.get(key) is not None for key in "acde")
+
+
+def test_sqlite_hits_do_not_write(tmp_path: Path):
+    store = SQLiteStore(tmp_path, ttl_seconds=3600)
+    store.put("k", b"value")
+    conn = store._connect()
+    conn.execute("UPDATE entries SET accessed = 0")
+    changes = conn.total_changes
+
+    assert all(store.get("k") == b"value" for _ in range(3))
+    assert conn.total_changes == changes
+    assert conn.execute("SELECT accessed FROM entries").fetchone() == (0,)
+
+    store.flush()
+    (accessed,) = conn.execute("SELECT accessed FROM entries").fetchone()
+    assert accessed > 0 and not store._accessed
+
+
+def test_cache_store_is_abstract():
+    with pytest.raises(TypeError):
+        CacheStore()  # type: ignore[abstract]
+
+
+def test_sqlite_skips_values_over_budget(tmp_path: Path):
+    store = SQLiteStore(tmp_path, ttl_seconds=3600, max_bytes=100)
+    store.put("small", b"x" * 50)
+    store.put("huge", b"x" * 500)
+    assert store.get("huge") is None
+    assert store.get("small") is not None
+
+
+def test_sqlite_expires_lazily(tmp_path: Path):
+    store = SQLiteStore(tmp_path, ttl_seconds=0)
+    store.put("k", b"value")
+    assert store.get("k") is None
+    assert store.prune() == 0  # already dropped by the read
+
+
+def test_sqlite_survives_clear_cache(tmp_path: Path):
+    store = SQLiteStore(tmp_path, ttl_seconds=3600)
+    store.put("k", b"value")
+    clear_cache(cache_dir_override=tmp_path)
+    assert store.get("k") is None
+    store.put("k", b"again")
+    assert store.get("k") == b"again"
+
+
+def _write_entries(args: tuple[str, int]) -> int:
+    directory, worker = args
+    store = SQLiteStore(Path(directory), ttl_seconds=3600, max_bytes=20_000)
+    for i in range(25):
+        store.put(f"{worker}-{i}", bytes([worker]) * 100)
+    return worker
+
+
+def test_sqlite_concurrent_processes(tmp_path: Path):
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=4) as executor:
+        assert sorted(executor.map(_write_entries, [(str(tmp_path), w) for w in range(4)])) == [0, 1, 2, 3]
+
+    store = SQLiteStore(tmp_path, ttl_seconds=3600)
+    assert all(store.get(f"{w}-{i}") == bytes([w]) * 100 for w in range(4) for i in range(25))
+    (total,) = store._connect().execute("SELECT bytes FROM totals").fetchone()
+    assert total == 4 * 25 * 100
+
+
+def test_gzip_and_plain_entries_share_a_store(tmp_path: Path):
+    plain = persistent_memoize(cache_dir_override=tmp_path)(lambda x: [x])
+    assert plain(1) == [1]
+    zipped = persistent_memoize(cache_dir_override=tmp_path, use_gzip=True)(lambda x: [x])
+    assert zipped(1) == [1]
+
+
+def test_directory_backend_does_not_sweep_on_decoration(tmp_path: Path):
+    old = tmp_path / ("0" * 64 + ".pkl")
+    old.write_bytes(pickle.dumps("stale"))
+    long_ago = time.time() - 7200
+    os.utime(old, (long_ago, long_ago))
+
+    memoized_func = persistent_memoize(ttl_seconds=3600, cache_dir_override=tmp_path, backend="directory")(
+        slow_function_factory(0)
+    )
+    assert old.exists()
+
+    memoized_func(1)  # the first write of the process runs the sweep
+    assert not old.exists()
+    assert (tmp_path / SWEEP_STAMP).exists()
+
+
+def test_directory_backend_sweeps_at_most_once_per_interval(tmp_path: Path):
+    (tmp_path / SWEEP_STAMP).touch()
+    old = tmp_path / ("0" * 64 + ".pkl")
+    old.write_bytes(b"x")
+    long_ago = time.time() - 7200
+    os.utime(old, (long_ago, long_ago))
+
+    store = DirectoryStore(tmp_path, ttl_seconds=3600)
+    store.put("k", b"value")
+    assert old.exists()  # swept recently by another process
+    assert store.get("0" * 64) is None  # but still expired when read
+    assert not old.exists()
+
+
+def test_directory_backend_prune_enforces_budget(tmp_path: Path):
+    store = DirectoryStore(tmp_path, ttl_seconds=3600, max_bytes=1000)
+    store._swept = True
+    now = time.time()
+    for i, key in enumerate("abcde"):
+        store.put(key, b"x" * 300)
+        os.utime(tmp_path / f"{key}.pkl", (now - 100 + i, now - 100 + i))
+
+    assert store.prune() == 2
+    assert [key for key in "abcde" if store.get(key) is not None] == ["c", "d", "e"]
+
+
+def test_stats_count_hits_misses_and_bytes(tmp_path: Path):
+    store = SQLiteStore(tmp_path, ttl_seconds=3600)
+    memoized_func = persistent_memoize(backend=store)(slow_function_factory(0))
+    memoized_func(1)
+    memoized_func(1)
+    memoized_func(2)
+
+    (stats,) = store.stats.values()
+    assert (stats.hits, stats.misses, stats.writes) == (1, 2, 2)
+    assert stats.bytes_read > 0 and stats.bytes_written > stats.bytes_read
+    assert stats.serialize_seconds > 0 and stats.deserialize_seconds > 0
+    assert stats.hit_rate == pytest.approx(1 / 3)
+    assert cache_stats()[f"{__name__}.slow_function_factory.<locals>._slow_function"].hits >= 1
+
+
+def test_stats_count_evictions_per_function(tmp_path: Path):
+    store = SQLiteStore(tmp_path, ttl_seconds=3600, max_bytes=1000)
+    for key in "abcd":
+        store.put(key, b"x" * 200, name="f")
+    store.put("e", b"x" * 300, name="g")
+    assert store.stats["f"].evictions == 1
+    assert "g" not in store.stats
+
+
+@pytest.mark.parametrize("backend", ["sqlite", "directory"])
+def test_stats_accumulate_across_runs(tmp_path: Path, backend: str):
+    for _run in range(2):
+        store = DirectoryStore(tmp_path, 3600) if backend == "directory" else SQLiteStore(tmp_path, 3600)
+        store.stats_for("f").hits += 2
+        store.stats_for("f").misses += 1
+        store.save_stats()
+        store.save_stats()  # nothing new to add
+
+    stored = stored_cache_stats(tmp_path)
+    assert (stored["f"].hits, stored["f"].misses) == (4, 2)
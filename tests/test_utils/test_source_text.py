@@ -0,0 +1,43 @@
+import pytest
+
+from pycodetags.utils.source_text import SourceText
+
+
+def test_offsets_round_trip():
+    text = "a = 1\n\n    # b\nlast"
+    src = SourceText(text)
+
+    assert len(src) == 4
+    assert src.line_starts == [0, 6, 7, 15, 19]
+    for offset in range(len(text)):
+        line, col = src.position(offset)
+        assert src.offset(line, col) == offset
+        assert src.lines(keepends=True)[line][col] == text[offset]
+
+
+def test_lines_match_splitlines():
+    text = "one\r\ntwo\rthree\x0cfour\n"
+    src = SourceText(text)
+
+    assert src.lines() == text.splitlines()
+    assert src.lines(keepends=True) == text.splitlines(keepends=True)
+    assert src.line(0) == "one"
+
+
+def test_extract_normalizes_line_breaks():
+    src = SourceText("x  # a\r\n# b\r\n")
+
+    assert src.slice(0, 3, 1, 3) == "# a\r\n# b"
+    assert src.extract(0, 3, 1, 3) == "# a\n# b"
+
+
+def test_offset_out_of_range():
+    with pytest.raises(IndexError):
+        SourceText("a\n").offset(5, 0)
+
+
+def test_pickles_as_text():
+    import pickle
+
+    src = pickle.loads(pickle.dumps(SourceText("a\nb")))
+    assert src.text == "a\nb" and src.line_starts == [0, 2, 3]
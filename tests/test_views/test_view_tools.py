@@ -49,3 +49,24 @@ def test_raises_error_on_invalid_sort_key():
 
     with pytest.raises(ValueError):
         group_and_sort(items, key_fn, sort_key=int)
+
+
+def test_group_and_sort_rows_matches_group_and_sort():
+    from pycodetags.data_tags.data_tags_classes import DATA
+    from pycodetags.data_tags.tag_table import TagTable
+    from pycodetags.views.view_tools import group_and_sort_rows
+
+    items = [
+        DATA(code_tag="TODO", comment="b"),
+        DATA(code_tag="todo", comment="a"),
+        DATA(code_tag="BUG", comment=None),
+        DATA(code_tag=None, comment="c"),
+        DATA(code_tag="TODO", comment="a"),
+    ]
+    expected = group_and_sort(items, lambda x: x.code_tag or "N/A", sort_key=lambda x: x.comment or "N/A")
+    table = TagTable.from_items(items)
+    grouped = group_and_sort_rows(
+        table, "code_tag", lambda tag: tag or "N/A", sort_column="comment", sort_key=lambda c: c or "N/A"
+    )
+    assert {key: [items[row] for row in rows] for key, rows in grouped.items()} == expected
+    assert list(grouped) == list(expected)
@@ -7,7 +7,7 @@ from contextlib import redirect_stdout
 import pytest
 
 from pycodetags.data_tags.data_tags_classes import DATA
-from pycodetags.views import print_data_md, print_html, print_json, print_text, print_validate
+from pycodetags.views import print_data_md, print_html, print_json, print_jsonl, print_text, print_validate, write_jsonl
 
 
 @pytest.fixture
@@ -88,6 +88,32 @@ def test_print_json(sample_data):
     assert any("comment" in item for item in parsed)
 
 
+def test_print_jsonl_matches_print_json(sample_data):
+    as_json = io.StringIO()
+    with redirect_stdout(as_json):
+        print_json(sample_data)
+    as_lines = io.StringIO()
+    with redirect_stdout(as_lines):
+        count = print_jsonl(sample_data)
+
+    assert count == 2
+    assert [json.loads(line) for line in as_lines.getvalue().splitlines()] == json.loads(as_json.getvalue())
+
+
+def test_write_jsonl_flushes_each_batch(sample_data):
+    class Recorder(io.StringIO):
+        def __init__(self):
+            super().__init__()
+            self.flushed_at = []
+
+        def flush(self):
+            self.flushed_at.append(self.getvalue().count("\n"))
+
+    stream = Recorder()
+    assert write_jsonl([sample_data[:1], [], sample_data[1:]], stream) == 2
+    assert stream.flushed_at == [1, 1, 2]
+
+
 def test_print_data_md(sample_data):
     buf = io.StringIO()
     with redirect_stdout(buf):
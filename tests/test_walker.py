@@ -0,0 +1,109 @@
+from pathlib import Path
+
+from pycodetags import PureDataSchema
+from pycodetags.aggregate import aggregate_all_kinds
+from pycodetags.walker import IgnoreRules, WalkStats, walk_source_files
+
+
+def touch(root: Path, rel: str, content: str = "# TODO: x <a:b>\n") -> Path:
+    path = root / rel
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding="utf-8")
+    return path
+
+
+def relative(root: Path, files) -> list[str]:
+    return [Path(f).relative_to(root).as_posix() for f in files]
+
+
+def test_prunes_default_dirs_and_binaries(tmp_path):
+    touch(tmp_path, "pkg/mod.py")
+    touch(tmp_path, ".git/hooks/pre-commit.py")
+    touch(tmp_path, ".venv/lib/site.py")
+    touch(tmp_path, "node_modules/x/index.js")
+    touch(tmp_path, "pkg/__pycache__/mod.cpython-313.pyc")
+    touch(tmp_path, "uv.lock")
+    touch(tmp_path, "Makefile")
+
+    stats = WalkStats()
+    found = relative(tmp_path, walk_source_files(tmp_path, stats=stats))
+
+    assert found == ["pkg/mod.py"]
+    assert stats.dirs_skipped == 4
+    assert stats.files_skipped == 1  # uv.lock; Makefile has no suffix and was never a candidate
+
+
+def test_gitignore_and_pycodetagsignore(tmp_path):
+    touch(tmp_path, ".gitignore", "generated/\n*.log\n/top_only.py\n")
+    touch(tmp_path, ".pycodetagsignore", "vendored_*.py\n!vendored_keep.py\n")
+    touch(tmp_path, "generated/out.py")
+    touch(tmp_path, "a.log")
+    touch(tmp_path, "top_only.py")
+    touch(tmp_path, "sub/top_only.py")
+    touch(tmp_path, "sub/vendored_lib.py")
+    touch(tmp_path, "sub/vendored_keep.py")
+
+    found = relative(tmp_path, walk_source_files(tmp_path))
+
+    assert "sub/top_only.py" in found
+    assert "sub/vendored_keep.py" in found
+    assert "top_only.py" not in found
+    assert "generated/out.py" not in found
+    assert "a.log" not in found
+    assert "sub/vendored_lib.py" not in found
+
+
+def test_nested_gitignore_is_relative_to_its_folder(tmp_path):
+    touch(tmp_path, "sub/.gitignore", "/local.py\n")
+    touch(tmp_path, "local.py")
+    touch(tmp_path, "sub/local.py")
+
+    found = relative(tmp_path, walk_source_files(tmp_path))
+
+    assert "local.py" in found
+    assert "sub/local.py" not in found
+
+
+def test_ancestor_ignore_files_apply_to_subfolder_walk(tmp_path):
+    touch(tmp_path, "pyproject.toml", "")
+    touch(tmp_path, ".gitignore", "src/skip_me.py\n")
+    touch(tmp_path, "src/skip_me.py")
+    touch(tmp_path, "src/keep.py")
+
+    found = relative(tmp_path / "src", walk_source_files(tmp_path / "src"))
+
+    assert found == ["keep.py"]
+
+
+def test_exclude_and_include_globs(tmp_path):
+    touch(tmp_path, "src/a.py")
+    touch(tmp_path, "src/a_pb2.py")
+    touch(tmp_path, "docs/conf.py")
+    touch(tmp_path, "notes.txt")
+
+    found = relative(tmp_path, walk_source_files(tmp_path, exclude=["*_pb2.py"], include=["src/**"]))
+
+    assert found == ["src/a.py"]
+
+
+def test_ignore_files_can_be_disabled(tmp_path):
+    touch(tmp_path, ".gitignore", "*.py\n")
+    touch(tmp_path, "a.py")
+
+    assert relative(tmp_path, walk_source_files(tmp_path)) == [".gitignore"]
+    assert "a.py" in relative(tmp_path, walk_source_files(tmp_path, use_ignore_files=False))
+
+
+def test_ignore_rules_last_match_wins():
+    rules = IgnoreRules(["*.py", "!keep.py", "keep.py"])
+    assert rules.match("keep.py", is_dir=False) is True
+    assert rules.match("other.txt", is_dir=False) is None
+
+
+def test_aggregate_skips_ignored_folders(tmp_path):
+    touch(tmp_path, "mod.py", "# TODO: keep <a:b>\n")
+    touch(tmp_path, ".venv/lib/dep.py", "# TODO: from a dependency <a:b>\n")
+
+    found_tags, _ = aggregate_all_kinds("", str(tmp_path), PureDataSchema)
+
+    assert [tag["comment"] for tag in found_tags] == ["keep"]